@@ -7,11 +7,15 @@ Provides batch processing capabilities for multi-company evidence extraction.
 from agents.batch.batch_processor import (
     BatchProcessor,
     BatchProcessingResult,
+    BatchProgress,
     CompanyProcessingResult
 )
+from agents.batch.checkpoint import BatchCheckpoint
 
 __all__ = [
     'BatchProcessor',
     'BatchProcessingResult',
+    'BatchProgress',
+    'BatchCheckpoint',
     'CompanyProcessingResult'
 ]
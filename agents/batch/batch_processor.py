@@ -10,14 +10,24 @@ Orchestrates complete pipeline for multiple companies:
 
 Implements batch processing with progress tracking and error handling.
 Part of Task 008 - ESG Data Extraction vertical slice (Option 1).
+
+Execution: companies run sequentially in-process by default, or on a
+process pool (max_workers > 1) with optional per-company timeouts. An
+optional checkpoint journal records each finished (ticker, year) unit so
+an interrupted batch resumes where it stopped. Results are returned in
+input order and match the sequential run.
 """
 
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, UTC
+import logging
 import time
 
+from agents.batch.checkpoint import BatchCheckpoint
 from agents.parser.evidence_extractor import EvidenceExtractor
 from agents.parser.matchers.ghg_matcher import GHGMatcher
 from agents.storage.bronze_writer import BronzeEvidenceWriter
@@ -25,6 +35,27 @@ from agents.storage.silver_normalizer import SilverNormalizer
 from libs.utils.clock import get_clock
 clock = get_clock()
 
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Gauge
+
+    esg_batch_units_total = Counter(
+        "esg_batch_units_total",
+        "Batch (company, year) units finished, by status",
+        labelnames=["status"]
+    )
+    esg_batch_in_flight = Gauge(
+        "esg_batch_in_flight",
+        "Batch units currently running in the worker pool"
+    )
+except ImportError:  # pragma: no cover - metrics are optional
+    esg_batch_units_total = None
+    esg_batch_in_flight = None
+
+# Per-process BatchProcessor for pool workers, created by _init_worker
+_WORKER_PROCESSOR: Optional["BatchProcessor"] = None
+
 
 @dataclass
 class CompanyProcessingResult:
@@ -49,6 +80,63 @@ class BatchProcessingResult:
     company_results: List[CompanyProcessingResult]
 
 
+@dataclass
+class BatchProgress:
+    """Live progress of a running batch (also exported to Prometheus)"""
+    total: int
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    in_flight: int = 0
+    evidence_extracted: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def finished(self) -> int:
+        """Units finished in this run or skipped from the checkpoint"""
+        return self.skipped + self.succeeded + self.failed
+
+    @property
+    def units_per_second(self) -> float:
+        """Throughput of units processed in this run"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) / self.elapsed_seconds
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated time to finish at the current throughput"""
+        rate = self.units_per_second
+        if rate <= 0:
+            return None
+        return (self.total - self.finished) / rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view including derived throughput"""
+        data = asdict(self)
+        data["finished"] = self.finished
+        data["units_per_second"] = round(self.units_per_second, 3)
+        data["eta_seconds"] = self.eta_seconds
+        return data
+
+
+def _init_worker(paths: Tuple[Path, Path, Path, Path]) -> None:
+    """Pool initializer: build extractor and writers once per worker process"""
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = BatchProcessor(*paths)
+
+
+def _process_unit(ticker: str, year: int, filing_path: Path) -> CompanyProcessingResult:
+    """Run one (ticker, year) unit in a pool worker"""
+    return _WORKER_PROCESSOR.process_company(
+        ticker=ticker,
+        year=year,
+        filing_path=Path(filing_path),
+        normalize=False
+    )
+
+
 class BatchProcessor:
     """
     Batch processor for multi-company evidence extraction.
@@ -62,7 +150,11 @@ class BatchProcessor:
         bronze_path: Path,
         silver_path: Path,
         db_path: Path,
-        cache_path: Path
+        cache_path: Path,
+        max_workers: int = 1,
+        company_timeout_seconds: Optional[float] = None,
+        checkpoint_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[BatchProgress], None]] = None
     ):
         """
         Initialize batch processor.
@@ -72,11 +164,28 @@ class BatchProcessor:
             silver_path: Path to silver Parquet directory
             db_path: Path to DuckDB database file
             cache_path: Path to cached SEC filings directory
+            max_workers: Worker processes (1 = sequential, in-process)
+            company_timeout_seconds: Per-company time limit; enforcing it
+                runs companies in worker processes even when max_workers is 1
+            checkpoint_path: JSONL journal of finished units; completed
+                (ticker, year) units found there are skipped
+            progress_callback: Called with a BatchProgress after each unit
         """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        if company_timeout_seconds is not None and company_timeout_seconds <= 0:
+            raise ValueError("company_timeout_seconds must be positive")
+
         self.bronze_path = Path(bronze_path)
         self.silver_path = Path(silver_path)
         self.db_path = Path(db_path)
         self.cache_path = Path(cache_path)
+        self.max_workers = max_workers
+        self.company_timeout_seconds = company_timeout_seconds
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.progress_callback = progress_callback
+        self.progress: Optional[BatchProgress] = None
+        self._progress_started = 0.0
 
         # Ensure directories exist
         self.bronze_path.mkdir(parents=True, exist_ok=True)
@@ -195,20 +304,45 @@ class BatchProcessor:
         start_time = clock.time()
         batch_id = f"batch_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S_%f')}"
 
-        company_results: List[CompanyProcessingResult] = []
-        total_evidence = 0
+        checkpoint = BatchCheckpoint(self.checkpoint_path) if self.checkpoint_path else None
+        results: List[Optional[CompanyProcessingResult]] = [None] * len(companies)
+        self.progress = BatchProgress(total=len(companies))
+        self._progress_started = time.monotonic()
+
+        # Completed units from an earlier run are replayed from the journal
+        pending: List[int] = []
+        for index, company in enumerate(companies):
+            entry = checkpoint.get(company['ticker'], company['year']) if checkpoint else None
+            if entry and entry.get("success"):
+                results[index] = CompanyProcessingResult(
+                    **{k: v for k, v in entry.items() if k in CompanyProcessingResult.__dataclass_fields__}
+                )
+                self.progress.skipped += 1
+                self.progress.evidence_extracted += results[index].evidence_count
+            else:
+                pending.append(index)
+        if self.progress.skipped:
+            logger.info(f"Resuming batch: {self.progress.skipped}/{len(companies)} units already completed")
+            self._update_metrics("skipped", self.progress.skipped)
 
-        # Process each company
-        for company in companies:
-            result = self.process_company(
-                ticker=company['ticker'],
-                year=company['year'],
-                filing_path=company['filing_path'],
-                normalize=False  # Normalize once at the end
-            )
-            company_results.append(result)
-            if result.success:
-                total_evidence += result.evidence_count
+        try:
+            if self.max_workers == 1 and self.company_timeout_seconds is None:
+                for index in pending:
+                    company = companies[index]
+                    self._finish_unit(index, self.process_company(
+                        ticker=company['ticker'],
+                        year=company['year'],
+                        filing_path=company['filing_path'],
+                        normalize=False  # Normalize once at the end
+                    ), results, checkpoint)
+            else:
+                self._process_pool(companies, pending, results, checkpoint)
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        company_results: List[CompanyProcessingResult] = results
+        total_evidence = sum(r.evidence_count for r in company_results if r.success)
 
         # Normalize to silver once at the end (if requested)
         if normalize and total_evidence > 0:
@@ -228,3 +362,213 @@ class BatchProcessor:
             processing_time_seconds=processing_time,
             company_results=company_results
         )
+
+    def _process_pool(
+        self,
+        companies: List[Dict[str, Any]],
+        pending: List[int],
+        results: List[Optional[CompanyProcessingResult]],
+        checkpoint: Optional[BatchCheckpoint]
+    ) -> None:
+        """
+        Run pending units on a process pool with per-unit deadlines.
+
+        At most max_workers units are submitted at a time, so a unit starts
+        as soon as it is submitted and its deadline runs from submission. A
+        worker stuck past its deadline cannot be cancelled, so the pool is
+        torn down and rebuilt; the other in-flight units are resubmitted.
+
+        A worker that dies outright (OOM kill, segfault) breaks the pool and
+        every in-flight future. The pool is rebuilt and the interrupted units
+        re-run one at a time; only a unit that breaks the pool while running
+        alone is failed, and the rest of the batch carries on.
+        """
+        queue = list(reversed(pending))
+        timeout = self.company_timeout_seconds
+        # Units interrupted by a worker crash; they re-run alone to find the culprit
+        suspects: Set[int] = set()
+
+        while queue:
+            pool = self._new_pool()
+            in_flight: Dict[Future, Tuple[int, float]] = {}
+            restart = False
+            try:
+                while queue or in_flight:
+                    limit = 1 if suspects else self.max_workers
+                    while queue and len(in_flight) < limit:
+                        index = queue.pop()
+                        company = companies[index]
+                        try:
+                            future = pool.submit(
+                                _process_unit, company['ticker'], company['year'], Path(company['filing_path'])
+                            )
+                        except BrokenProcessPool:
+                            queue.append(index)
+                            break
+                        deadline = time.monotonic() + timeout if timeout else float("inf")
+                        in_flight[future] = (index, deadline)
+                    self._set_in_flight(len(in_flight))
+
+                    if not in_flight or _pool_broken(in_flight):
+                        self._recover_crash(in_flight, suspects, queue, companies, results, checkpoint)
+                        restart = True
+                        break
+
+                    wait_for = None
+                    if timeout:
+                        wait_for = max(0.0, min(d for _, d in in_flight.values()) - time.monotonic())
+                    done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                    if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+                        self._recover_crash(in_flight, suspects, queue, companies, results, checkpoint)
+                        restart = True
+                        break
+
+                    for future in done:
+                        index, _ = in_flight.pop(future)
+                        suspects.discard(index)
+                        self._finish_unit(index, self._future_result(future, companies[index]), results, checkpoint)
+
+                    now = time.monotonic()
+                    expired = [f for f, (_, deadline) in in_flight.items() if deadline <= now and not f.done()]
+                    if expired:
+                        for future in expired:
+                            index, _ = in_flight.pop(future)
+                            suspects.discard(index)
+                            company = companies[index]
+                            logger.warning(f"Timed out processing {company['ticker']} ({company['year']}) after {timeout}s")
+                            self.progress.timed_out += 1
+                            self._finish_unit(index, CompanyProcessingResult(
+                                ticker=company['ticker'],
+                                year=company['year'],
+                                success=False,
+                                evidence_count=0,
+                                processing_time_seconds=timeout,
+                                error_message=f"Timed out after {timeout}s"
+                            ), results, checkpoint)
+                        # Units interrupted by the restart run again from scratch
+                        queue.extend(sorted((index for index, _ in in_flight.values()), reverse=True))
+                        restart = True
+                        break
+            finally:
+                self._set_in_flight(0)
+                if restart:
+                    _terminate_pool(pool)
+                else:
+                    pool.shutdown(wait=True)
+
+    def _recover_crash(
+        self,
+        in_flight: Dict[Future, Tuple[int, float]],
+        suspects: Set[int],
+        queue: List[int],
+        companies: List[Dict[str, Any]],
+        results: List[Optional[CompanyProcessingResult]],
+        checkpoint: Optional[BatchCheckpoint]
+    ) -> None:
+        """
+        Sort out the in-flight units after a worker crash broke the pool.
+
+        Units that finished before the crash keep their results. If only one
+        unit was interrupted it is the one that crashed and is failed;
+        otherwise the interrupted units become suspects and are queued to
+        re-run first, one at a time.
+        """
+        interrupted = []
+        for future, (index, _) in in_flight.items():
+            # A broken pool resolves every outstanding future promptly
+            if isinstance(future.exception(), BrokenProcessPool):
+                interrupted.append(index)
+            else:
+                suspects.discard(index)
+                self._finish_unit(index, self._future_result(future, companies[index]), results, checkpoint)
+        in_flight.clear()
+
+        if len(interrupted) == 1:
+            index = interrupted[0]
+            suspects.discard(index)
+            company = companies[index]
+            self._finish_unit(index, CompanyProcessingResult(
+                ticker=company['ticker'],
+                year=company['year'],
+                success=False,
+                evidence_count=0,
+                processing_time_seconds=0.0,
+                error_message="Worker process crashed"
+            ), results, checkpoint)
+        elif interrupted:
+            logger.warning(f"Worker crashed with {len(interrupted)} units in flight; re-running them one at a time")
+            suspects.update(interrupted)
+            queue.extend(sorted(interrupted, reverse=True))
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Create a worker pool whose workers build their own processor"""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=((self.bronze_path, self.silver_path, self.db_path, self.cache_path),)
+        )
+
+    @staticmethod
+    def _future_result(future: Future, company: Dict[str, Any]) -> CompanyProcessingResult:
+        """Result of a finished unit; a crashed worker becomes a failed unit"""
+        try:
+            return future.result()
+        except Exception as e:
+            return CompanyProcessingResult(
+                ticker=company['ticker'],
+                year=company['year'],
+                success=False,
+                evidence_count=0,
+                processing_time_seconds=0.0,
+                error_message=f"Worker failed: {e}"
+            )
+
+    def _finish_unit(
+        self,
+        index: int,
+        result: CompanyProcessingResult,
+        results: List[Optional[CompanyProcessingResult]],
+        checkpoint: Optional[BatchCheckpoint]
+    ) -> None:
+        """Store, journal and report a finished unit"""
+        results[index] = result
+        if checkpoint:
+            checkpoint.record(result)
+
+        progress = self.progress
+        if result.success:
+            progress.succeeded += 1
+            progress.evidence_extracted += result.evidence_count
+        else:
+            progress.failed += 1
+            logger.error(f"Failed to process {result.ticker} ({result.year}): {result.error_message}")
+        progress.elapsed_seconds = time.monotonic() - self._progress_started
+        self._update_metrics("succeeded" if result.success else "failed")
+        if self.progress_callback:
+            self.progress_callback(progress)
+
+    def _set_in_flight(self, count: int) -> None:
+        """Track units currently running in the pool"""
+        self.progress.in_flight = count
+        if esg_batch_in_flight is not None:
+            esg_batch_in_flight.set(count)
+
+    @staticmethod
+    def _update_metrics(status: str, count: int = 1) -> None:
+        """Increment the Prometheus unit counter, when available"""
+        if esg_batch_units_total is not None:
+            esg_batch_units_total.labels(status=status).inc(count)
+
+
+def _pool_broken(in_flight: Dict[Future, Tuple[int, float]]) -> bool:
+    """Whether any in-flight future already failed because the pool broke"""
+    return any(f.done() and isinstance(f.exception(), BrokenProcessPool) for f in in_flight)
+
+
+def _terminate_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill a pool's workers (stuck units cannot be cancelled) and shut it down"""
+    # ProcessPoolExecutor has no public API for killing running workers
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,118 @@
+"""
+Batch Checkpoint Journal
+
+Durable record of finished (ticker, year) units for BatchProcessor.
+
+Storage: append-only JSONL, one CompanyProcessingResult per line. Each unit
+is written (and fsynced) as soon as it finishes, so a crash loses at most
+the units still in flight. Replaying the journal on start-up gives the set
+of completed units to skip; later lines for the same unit win, so a unit
+that failed and then succeeded on retry counts as completed. A torn last
+line from a crash mid-write is ignored.
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, IO, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+from libs.utils.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+UnitKey = Tuple[str, int]
+
+
+class BatchCheckpoint:
+    """Append-only JSONL journal of per-company batch results."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a checkpoint journal and replay existing entries.
+
+        Args:
+            path: Journal file path (e.g. data/batch/universe_2024.jsonl)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[UnitKey, Dict] = {}
+        self._handle: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Replay the journal, tolerating a torn final line."""
+        if not self.path.exists():
+            return
+
+        valid_size = 0
+        torn = False
+        with open(self.path, "rb") as handle:
+            for line_no, raw in enumerate(handle, 1):
+                if not raw.endswith(b"\n"):
+                    logger.warning(f"Ignoring incomplete checkpoint line {line_no} in {self.path}")
+                    torn = True
+                    break
+                valid_size += len(raw)
+                try:
+                    entry = json.loads(raw)
+                    key = (entry["ticker"], int(entry["year"]))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping malformed checkpoint line {line_no} in {self.path}: {e}")
+                    continue
+                self._entries[key] = entry
+
+        if torn:
+            # Drop the torn tail so new appends start on a fresh line
+            with open(self.path, "r+b") as handle:
+                handle.truncate(valid_size)
+
+    def is_completed(self, ticker: str, year: int) -> bool:
+        """Whether the unit finished successfully in an earlier run."""
+        entry = self._entries.get((ticker, int(year)))
+        return bool(entry and entry.get("success"))
+
+    def get(self, ticker: str, year: int) -> Optional[Dict]:
+        """Latest journaled result for a unit, if any."""
+        return self._entries.get((ticker, int(year)))
+
+    @property
+    def completed_count(self) -> int:
+        """Number of successfully completed units."""
+        return sum(1 for entry in self._entries.values() if entry.get("success"))
+
+    def record(self, result) -> None:
+        """
+        Append a finished unit and fsync it.
+
+        Args:
+            result: CompanyProcessingResult (or any dataclass with ticker/year)
+        """
+        entry = asdict(result)
+        entry["recorded_at"] = get_clock().now().isoformat()
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._entries[(entry["ticker"], int(entry["year"]))] = entry
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def __enter__(self) -> "BatchCheckpoint":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Context manager exit: close the journal."""
+        self.close()
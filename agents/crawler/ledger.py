@@ -2,48 +2,206 @@
 Ingestion Ledger: Crawl Authenticity Tracking
 
 Records URL, headers, SHA256, and retrieval metadata for every crawled source.
-Writes to artifacts/ingestion/manifest.json.
+
+Storage layout:
+- artifacts/ingestion/manifest.jsonl: append-only journal, one crawl per line
+  (source of truth; appends are O(1), fsync is batched)
+- artifacts/ingestion/manifest.json: legacy manifest snapshot of the journal,
+  rewritten by writers at most once per compact_interval seconds and on close
+
+Appends hold an exclusive flock on the journal, so concurrent writer
+processes never interleave lines and each writer's offset is the file
+position after its own write. Lookups by URL and by content hash go through
+in-memory indexes built while replaying the journal, so they stay O(1) as
+crawl history grows. Read-only ledgers (e.g. the API) never write: an
+unmigrated legacy manifest is served from memory until a writer migrates it.
 
 SCA v13.8 Authenticity Refactor - CP Module
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, BinaryIO, Iterator
 from pathlib import Path
+import contextlib
 import json
 import hashlib
+import os
+import threading
+import time
 from datetime import datetime
 import logging
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: single-process locking only
+    fcntl = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MANIFEST_PATH = "artifacts/ingestion/manifest.json"
+DEFAULT_FSYNC_EVERY = 64
+DEFAULT_COMPACT_SECONDS = 30.0
+
+
+@contextlib.contextmanager
+def _flock(handle: BinaryIO) -> Iterator[None]:
+    """Hold an exclusive advisory lock on an open file (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
 
 class IngestLedger:
     """Tracks all crawled sources with deterministic content hashes."""
 
-    def __init__(self, manifest_path: str = "artifacts/ingestion/manifest.json"):
+    def __init__(
+        self,
+        manifest_path: str = DEFAULT_MANIFEST_PATH,
+        journal_path: Optional[str] = None,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        compact_interval: float = DEFAULT_COMPACT_SECONDS,
+        readonly: bool = False
+    ):
         """
         Initialize ledger.
 
         Args:
-            manifest_path: Path to write manifest.json
+            manifest_path: Path of the legacy manifest.json snapshot
+            journal_path: Append-only JSONL journal (default: manifest path
+                with a .jsonl suffix)
+            fsync_every: Appends between fsync calls (1 = fsync every crawl)
+            compact_interval: Minimum seconds between manifest rewrites on
+                the write path (0 = rewrite after every crawl)
+            readonly: Never write; add_crawl raises and legacy manifests are
+                not migrated
         """
+        if fsync_every < 1:
+            raise ValueError("fsync_every must be positive")
+        if compact_interval < 0:
+            raise ValueError("compact_interval cannot be negative")
+
         self.manifest_path = Path(manifest_path)
-        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = Path(journal_path) if journal_path else self.manifest_path.with_suffix(".jsonl")
+        self.fsync_every = fsync_every
+        self.compact_interval = compact_interval
+        self.readonly = readonly
+        if not readonly:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+
         self.entries: List[Dict[str, Any]] = []
+        self._url_index: Dict[str, int] = {}
+        self._hash_index: Dict[str, List[int]] = {}
+        self._journal_offset = 0
+        self._unsynced = 0
+        self._handle: Optional[BinaryIO] = None
+        self._lock = threading.RLock()
+        # Entries served from an unmigrated manifest.json (read-only ledgers)
+        self._legacy = False
+        self._dirty = False
+        self._last_compact: Optional[float] = None
+
         self._load_existing()
 
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
     def _load_existing(self) -> None:
-        """Load existing manifest if present."""
-        if self.manifest_path.exists():
-            try:
-                data = json.loads(self.manifest_path.read_text())
-                if isinstance(data, dict) and "sources" in data:
-                    self.entries = data["sources"]
-                else:
-                    self.entries = []
-            except Exception as e:
-                logger.warning(f"Failed to load existing manifest: {e}")
-                self.entries = []
+        """Replay the journal, or seed it from a legacy manifest on first use."""
+        if not self.journal_path.exists():
+            sources = self._legacy_sources()
+            if sources and self.readonly:
+                for entry in sources:
+                    self._index(entry)
+                self._legacy = True
+                return
+            if sources:
+                self._migrate(sources)
+        self.refresh()
+
+    def _legacy_sources(self) -> List[Dict[str, Any]]:
+        """Entries of an existing legacy manifest.json (empty if none)."""
+        if not self.manifest_path.exists():
+            return []
+        try:
+            data = json.loads(self.manifest_path.read_text())
+            return data["sources"] if isinstance(data, dict) and "sources" in data else []
+        except Exception as e:
+            logger.warning(f"Failed to load existing manifest: {e}")
+            return []
+
+    def _migrate(self, sources: List[Dict[str, Any]]) -> None:
+        """One-time migration: the journal becomes the source of truth."""
+        with open(self.journal_path, "ab") as handle, _flock(handle):
+            # Another writer may have migrated (or appended) first
+            if handle.seek(0, os.SEEK_END) > 0:
+                return
+            for entry in sources:
+                handle.write((json.dumps(entry, sort_keys=True) + "\n").encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        logger.info(f"Migrated {len(sources)} manifest entries to {self.journal_path}")
+
+    def _reset(self) -> None:
+        """Drop indexed entries so the journal is replayed from the start."""
+        self.entries = []
+        self._url_index = {}
+        self._hash_index = {}
+        self._journal_offset = 0
+        self._legacy = False
+
+    def refresh(self) -> int:
+        """
+        Pick up entries appended to the journal since the last read.
+
+        Lets long-lived readers (e.g. the API) follow a ledger written by
+        another process without re-reading the whole file. Never writes.
+
+        Returns:
+            Number of new entries indexed
+        """
+        with self._lock:
+            if not self.journal_path.exists():
+                return 0
+            if self._legacy:
+                # A writer migrated the manifest; the journal supersedes it
+                self._reset()
+
+            added = 0
+            with open(self.journal_path, "rb") as handle:
+                handle.seek(self._journal_offset)
+                for raw in handle:
+                    if not raw.endswith(b"\n"):
+                        # Partial write in progress (or torn tail); retry next refresh
+                        break
+                    self._journal_offset += len(raw)
+                    line = raw.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping corrupt ledger line in {self.journal_path}: {e}")
+                        continue
+                    self._index(entry)
+                    added += 1
+            return added
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to memory and update the URL/hash indexes."""
+        position = len(self.entries)
+        self.entries.append(entry)
+        self._url_index[entry["url"]] = position
+        self._hash_index.setdefault(entry.get("content_hash_sha256", ""), []).append(position)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
 
     def add_crawl(
         self,
@@ -67,7 +225,13 @@ class IngestLedger:
 
         Returns:
             Entry hash for deduplication
+
+        Raises:
+            RuntimeError: If the ledger is read-only
         """
+        if self.readonly:
+            raise RuntimeError("IngestLedger opened read-only")
+
         # If content_bytes provided, verify hash
         if content_bytes:
             computed_hash = hashlib.sha256(content_bytes).hexdigest()
@@ -85,40 +249,161 @@ class IngestLedger:
             "response_headers": response_headers or {}
         }
 
-        self.entries.append(entry)
-        self._save()
+        self._append(entry)
 
         return source_hash
 
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Write one journal line; fsync once every fsync_every appends."""
+        data = (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                if self._handle is None:
+                    self._handle = open(self.journal_path, "ab")
+                with _flock(self._handle):
+                    # Index anything other writers appended so offsets stay aligned
+                    self.refresh()
+                    if self._handle.seek(0, os.SEEK_END) != self._journal_offset:
+                        # Torn tail from a crashed writer: terminate it so our line parses
+                        self._handle.write(b"\n")
+                    self._handle.write(data)
+                    self._handle.flush()
+                    self._journal_offset = self._handle.tell()
+            except Exception as e:
+                logger.error(f"Failed to append to ledger: {e}")
+                raise
+
+            self._index(entry)
+            self._dirty = True
+
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync()
+
+            now = time.monotonic()
+            if self._last_compact is None or now - self._last_compact >= self.compact_interval:
+                try:
+                    self._write_manifest()
+                except Exception as e:
+                    # The journal holds the crawl; the snapshot catches up next time
+                    logger.warning(f"Failed to refresh ledger manifest: {e}")
+
+    def _sync(self) -> None:
+        """fsync the journal handle."""
+        if self._handle is not None and self._unsynced:
+            os.fsync(self._handle.fileno())
+            self._unsynced = 0
+
+    def flush(self) -> None:
+        """Force buffered appends to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Flush the journal, snapshot the manifest if it is stale, and release the handle."""
+        with self._lock:
+            self._sync()
+            if self._dirty:
+                try:
+                    self._write_manifest()
+                except Exception as e:
+                    logger.warning(f"Failed to refresh ledger manifest: {e}")
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def __enter__(self) -> "IngestLedger":
+        """Enter context; the journal is flushed and closed on exit."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close the ledger."""
+        self.close()
+
+    def __del__(self) -> None:
+        """Best-effort close of the journal handle."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
     def get_all(self) -> List[Dict[str, Any]]:
         """Get all ledger entries."""
-        return self.entries.copy()
+        with self._lock:
+            return self.entries.copy()
 
     def get_by_url(self, url: str) -> Optional[Dict[str, Any]]:
-        """Lookup entry by URL."""
-        for entry in self.entries:
-            if entry["url"] == url:
-                return entry
-        return None
-
-    def _save(self) -> None:
-        """Save ledger to manifest.json."""
-        manifest = {
-            "ingestion_run_id": self._generate_run_id(),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "sources": self.entries
-        }
+        """Lookup the most recent entry for a URL."""
+        with self._lock:
+            position = self._url_index.get(url)
+            return self.entries[position] if position is not None else None
 
-        try:
-            self.manifest_path.write_text(json.dumps(manifest, indent=2))
-            logger.info(f"Saved ledger to {self.manifest_path}")
-        except Exception as e:
-            logger.error(f"Failed to save ledger: {e}")
-            raise
+    def get_by_hash(self, source_hash: str) -> List[Dict[str, Any]]:
+        """Lookup all entries recorded with a content hash."""
+        with self._lock:
+            return [self.entries[i] for i in self._hash_index.get(source_hash, [])]
+
+    def __len__(self) -> int:
+        """Number of recorded crawls."""
+        return len(self.entries)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self) -> Path:
+        """
+        Emit the legacy manifest.json from the journal now.
+
+        Writers also do this on their own (see compact_interval and close()).
+
+        Returns:
+            Path of the written manifest
+
+        Raises:
+            RuntimeError: If the ledger is read-only
+        """
+        if self.readonly:
+            raise RuntimeError("IngestLedger opened read-only")
+        with self._lock:
+            self._sync()
+            self._write_manifest()
+        return self.manifest_path
+
+    def _write_manifest(self) -> None:
+        """
+        Write the manifest snapshot of the indexed entries.
+
+        The manifest is written to a per-process temp file and renamed into
+        place, so readers never observe a half-written manifest.
+        """
+        if self._handle is None:
+            self._handle = open(self.journal_path, "ab")
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        # Under the journal lock, so a stale snapshot never replaces a newer one
+        with _flock(self._handle):
+            self.refresh()
+            manifest = {
+                "ingestion_run_id": self._generate_run_id(),
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "sources": self.entries
+            }
+            try:
+                tmp_path.write_text(json.dumps(manifest, indent=2))
+                os.replace(tmp_path, self.manifest_path)
+                logger.info(f"Compacted {len(self.entries)} ledger entries to {self.manifest_path}")
+            except Exception as e:
+                logger.error(f"Failed to save ledger: {e}")
+                raise
+        self._dirty = False
+        self._last_compact = time.monotonic()
 
     def _generate_run_id(self) -> str:
         """Generate deterministic run ID."""
-        import os
         # Use timestamp for determinism within a run
         ts = datetime.utcnow().isoformat()[:10]  # YYYY-MM-DD
         run_hash = hashlib.sha256(ts.encode()).hexdigest()[:8]
@@ -5,7 +5,7 @@ scoring evidence matching via cosine similarity.
 """
 
 import os
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, cast
 import numpy as np
 from dataclasses import dataclass
 import hashlib
@@ -153,6 +153,8 @@ class WatsonxEmbedder:
     def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
         """Generate embeddings for multiple texts efficiently.
 
+        Uncached texts are sent in a single API request.
+
         Args:
             texts: List of text strings to embed
 
@@ -165,15 +167,62 @@ class WatsonxEmbedder:
         """
         if not texts:
             raise ValueError("Text list cannot be empty")
-
-        # For efficiency, batch uncached texts
-        embeddings: List[np.ndarray] = []
-
         for text in texts:
-            # Use individual embed_text which handles caching
-            embeddings.append(self.embed_text(text))
+            if not text or not text.strip():
+                raise ValueError("Text cannot be empty")
 
-        return embeddings
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+
+        for index, text in enumerate(texts):
+            if self.cache_embeddings:
+                cached = self._cache.get(self._get_cache_key(text))
+                if cached is not None:
+                    embeddings[index] = cached
+                    continue
+            # Duplicate texts share one request slot
+            pending.setdefault(text, []).append(index)
+
+        if pending:
+            unique_texts = list(pending)
+            try:
+                response = self.client.embeddings(
+                    inputs=unique_texts,
+                    model_id=self.model_id
+                )
+                vectors = [
+                    np.array(item["embedding"], dtype=np.float32)
+                    for item in response["results"]
+                ]
+                if len(vectors) != len(unique_texts):
+                    raise EmbeddingError(
+                        f"Expected {len(unique_texts)} embeddings, got {len(vectors)}"
+                    )
+                for embedding in vectors:
+                    if embedding.shape[0] != self.embedding_dim:
+                        raise EmbeddingError(
+                            f"Unexpected embedding dimension: {embedding.shape[0]} "
+                            f"(expected {self.embedding_dim})"
+                        )
+            except NotImplementedError:
+                # For testing: return zero vectors when API not implemented
+                vectors = [
+                    np.zeros(self.embedding_dim, dtype=np.float32)
+                    for _ in unique_texts
+                ]
+            except EmbeddingError:
+                raise
+            except Exception as e:
+                raise EmbeddingError(f"Failed to generate embeddings: {str(e)}") from e
+
+            for text, embedding in zip(unique_texts, vectors):
+                if self.cache_embeddings:
+                    self._cache[self._get_cache_key(text)] = embedding
+                for index in pending[text]:
+                    embeddings[index] = embedding
+
+        # Every slot is filled from the cache or the request by now
+        return cast(List[np.ndarray], embeddings)
 
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key for text.
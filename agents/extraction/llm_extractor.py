@@ -10,12 +10,14 @@ Date: 2025-10-24
 import os
 import json
 import time
+from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from ibm_watsonx_ai import Credentials, APIClient
 from ibm_watsonx_ai.foundation_models import ModelInference
 
 from agents.extraction.pdf_text_extractor import PDFTextExtractor
+from libs.cache.llm_store import STORE_FILENAME, get_llm_store, make_key
 from libs.models.esg_metrics import ESGMetrics
 from libs.contracts.extraction_contracts import (
     MetricsExtractionResult,
@@ -24,6 +26,14 @@ from libs.contracts.extraction_contracts import (
 )
 from libs.contracts.ingestion_contracts import CompanyReport
 
+# Greedy decoding parameters; part of the response store key
+GENERATION_PARAMS: Dict[str, Any] = {
+    "decoding_method": "greedy",  # Deterministic
+    "max_new_tokens": 500,
+    "temperature": 0.0,  # No randomness
+    "stop_sequences": ["}"]  # Stop after JSON
+}
+
 
 class LLMExtractor:
     """Extracts ESG metrics from unstructured data using IBM watsonx.ai.
@@ -47,12 +57,14 @@ class LLMExtractor:
             api_key: IAM API key
             model_id: watsonx.ai model ID
             use_cache: Whether to cache/replay responses (for deterministic tests)
-            cache_path: Path to cache directory
+            cache_path: Path to cache directory (holds the shared response
+                store; legacy <cik>_<year>.json files are still read)
         """
         self.project_id = project_id
         self.model_id = model_id
         self.use_cache = use_cache
         self.cache_path = cache_path
+        self.store = get_llm_store(Path(cache_path) / STORE_FILENAME) if use_cache else None
 
         # Initialize watsonx.ai client
         credentials = Credentials(
@@ -209,26 +221,51 @@ If a metric is not found in the text, use null. Do NOT fabricate values."""
         Raises:
             Exception: If API call fails after retries
         """
-        cache_file = os.path.join(self.cache_path, f"{cache_key}.json")
+        if not self.use_cache:
+            return self._generate_json(prompt)["response"]
 
-        # Check cache first
-        if self.use_cache and os.path.exists(cache_file):
+        # Content-addressed by model, params and prompt
+        store_key = make_key("extract", self.model_id, GENERATION_PARAMS, prompt)
+        cached = self.store.get(store_key)
+        if cached is not None:
+            return cached["response"]
+
+        # Legacy per-report cache file (migrated into the store on read)
+        cache_file = os.path.join(self.cache_path, f"{cache_key}.json")
+        if os.path.exists(cache_file):
             with open(cache_file, "r", encoding="utf-8") as f:
                 cached = json.load(f)
-                return cached["response"]
+            self.store.put(store_key, cached, kind="extract", model_id=self.model_id)
+            return cached["response"]
+
+        # Identical concurrent prompts share one model call
+        payload, _ = self.store.get_or_compute(
+            store_key,
+            lambda: self._generate_json(prompt, cache_key),
+            kind="extract",
+            model_id=self.model_id,
+        )
+        return payload["response"]
+
+    def _generate_json(self, prompt: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Call the LLM with retries and parse the JSON object it returns.
+
+        Args:
+            prompt: Extraction prompt
+            cache_key: Report key recorded alongside the response
+
+        Returns:
+            Store payload with the parsed response under "response"
 
-        # Call LLM with retry logic
+        Raises:
+            Exception: If API call fails after retries
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 response = self.model.generate(
                     prompt=prompt,
-                    params={
-                        "decoding_method": "greedy",  # Deterministic
-                        "max_new_tokens": 500,
-                        "temperature": 0.0,  # No randomness
-                        "stop_sequences": ["}"]  # Stop after JSON
-                    }
+                    params=dict(GENERATION_PARAMS)
                 )
 
                 # Extract generated text
@@ -247,18 +284,12 @@ If a metric is not found in the text, use null. Do NOT fabricate values."""
                 json_str = generated_text[start_idx:end_idx]
                 response_json = json.loads(json_str)
 
-                # Cache response
-                if self.use_cache:
-                    os.makedirs(self.cache_path, exist_ok=True)
-                    with open(cache_file, "w", encoding="utf-8") as f:
-                        json.dump({
-                            "cache_key": cache_key,
-                            "model_id": self.model_id,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "response": response_json
-                        }, f, indent=2)
-
-                return response_json
+                return {
+                    "cache_key": cache_key,
+                    "model_id": self.model_id,
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "response": response_json
+                }
 
             except Exception as e:
                 if attempt == max_retries - 1:
@@ -9,6 +9,12 @@ SCA v13.8-MEA Compliance:
 - Fail-closed: cache misses → RuntimeError
 - Deterministic: temperature=0, top_k=1
 
+Long documents (more chunks than fit the single legacy prompt) are located
+map-reduce style: a lexical prefilter scores every chunk, windows around the
+candidates are packed into token-budgeted prompts, the prompts run
+concurrently through the cached generate_json path, and the per-prompt
+sections are merged per type with page provenance.
+
 Usage:
     # Fetch phase (populate cache)
     locator = RDLocatorWX(offline_replay=False)
@@ -23,12 +29,23 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from libs.utils.concurrency import map_ordered
 from libs.wx import WatsonxClient
 
+# Documents up to this many chunks use the single legacy prompt (cache-compatible)
+LEGACY_SAMPLE_CHUNKS = 50
+# Map-reduce prompt sizing (token estimate: 4 characters per token)
+CHARS_PER_TOKEN = 4
+DEFAULT_PROMPT_TOKEN_BUDGET = 3000
+SNIPPET_CHARS = 200
+LOCATOR_MODEL_ID = "meta-llama/llama-3-8b-instruct"
+
 
 @dataclass
 class RDSection:
@@ -39,6 +56,7 @@ class RDSection:
     confidence: float  # 0.0-1.0
     markers: List[str]  # Matched keywords validating detection
     page_range: str  # e.g., "12-15"
+    pages: List[int] = field(default_factory=list)  # Distinct pages of the chunks
 
 
 @dataclass
@@ -50,7 +68,8 @@ class RDLocatorResult:
     total_chunks: int
     rd_chunks: int  # Chunks assigned to R&D sections
     cache_hit: bool
-    method: str  # "watsonx_llm" or "keyword_fallback"
+    method: str  # "watsonx_llm", "keyword_fallback" or "watsonx_llm+keyword_fallback"
+    prompts: int = 1  # LLM prompts issued (map-reduce issues several)
 
 
 # Keyword markers for validation (post-LLM)
@@ -111,6 +130,19 @@ SECTION_MARKERS = {
     ],
 }
 
+# Broad terms that make a chunk worth showing the model even without a marker
+PREFILTER_TERMS = [
+    "climate", "emission", "carbon", "greenhouse", "ghg", "scope 1", "scope 2",
+    "scope 3", "net zero", "net-zero", "decarboni", "energy", "sustainab",
+    "disclosure", "target",
+]
+
+# One pass over each chunk: section markers weigh more than broad terms
+_MARKER_PATTERN = re.compile(
+    "|".join(re.escape(m) for ms in SECTION_MARKERS.values() for m in sorted(ms, key=len, reverse=True))
+)
+_TERM_PATTERN = re.compile("|".join(re.escape(t) for t in PREFILTER_TERMS))
+
 
 class RDLocatorWX:
     """
@@ -128,6 +160,9 @@ class RDLocatorWX:
         wx_client: Optional[WatsonxClient] = None,
         offline_replay: bool = False,
         cache_dir: str = "artifacts/wx_cache",
+        prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        window_radius: int = 1,
+        max_workers: int = 4,
     ):
         """
         Initialize R&D locator.
@@ -136,11 +171,19 @@ class RDLocatorWX:
             wx_client: watsonx client instance (optional, created if None)
             offline_replay: If True, refuse LLM calls (cache-only)
             cache_dir: Directory for cache storage
+            prompt_token_budget: Estimated token limit per map-reduce prompt
+            window_radius: Neighbouring chunks included around each candidate
+            max_workers: Concurrent map-reduce prompts
         """
+        if prompt_token_budget < 500:
+            raise ValueError("prompt_token_budget must be at least 500")
         self.offline_replay = offline_replay or os.getenv("WX_OFFLINE_REPLAY", "").lower() == "true"
         self.wx_client = wx_client or WatsonxClient(
             cache_dir=cache_dir, offline_replay=self.offline_replay
         )
+        self.prompt_token_budget = prompt_token_budget
+        self.window_radius = max(0, window_radius)
+        self.max_workers = max(1, max_workers)
 
     def locate_rd_sections(
         self, chunks: List[Dict], doc_id: str = ""
@@ -168,6 +211,9 @@ class RDLocatorWX:
                 method="empty_input",
             )
 
+        if len(chunks) > LEGACY_SAMPLE_CHUNKS:
+            return self._locate_map_reduce(chunks, doc_id)
+
         # Build LLM prompt
         prompt = self._build_locator_prompt(chunks)
 
@@ -175,7 +221,7 @@ class RDLocatorWX:
         try:
             section_data = self.wx_client.generate_json(
                 prompt=prompt,
-                model_id="meta-llama/llama-3-8b-instruct",
+                model_id=LOCATOR_MODEL_ID,
                 temperature=0.0,
                 top_k=1,
                 schema=self._get_section_schema(),
@@ -208,6 +254,225 @@ class RDLocatorWX:
             method=method,
         )
 
+    def _locate_map_reduce(self, chunks: List[Dict], doc_id: str) -> RDLocatorResult:
+        """
+        Locate sections across all chunks with budgeted, concurrent prompts.
+
+        Map: each packed prompt is answered independently (cached per
+        prompt). Reduce: chunk indices are mapped back to document positions
+        and merged per section type into contiguous runs before validation.
+        """
+        scores = self._prefilter_scores(chunks)
+        prompts = self._pack_prompts(chunks, scores)
+
+        def run_prompt(batch: List[int]) -> Dict:
+            """Answer one packed prompt."""
+            return self.wx_client.generate_json(
+                prompt=self._build_window_prompt(chunks, batch, scores),
+                model_id=LOCATOR_MODEL_ID,
+                temperature=0.0,
+                top_k=1,
+                schema=self._get_section_schema(),
+                doc_id=doc_id,
+            )
+
+        raw_sections: List[Dict] = []
+        failed_prompts = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if len(prompts) > 1 and self.max_workers > 1 else None
+        try:
+            for outcome in map_ordered(run_prompt, prompts, executor, max_pending=self.max_workers * 2):
+                batch = outcome.item
+                if outcome.ok:
+                    section_data = outcome.value
+                else:
+                    error = outcome.error
+                    if not isinstance(error, RuntimeError) or "Cache miss" in str(error):
+                        raise error  # Cache misses fail closed in offline mode
+                    # Model errors: keyword detection for this prompt's chunks only
+                    failed_prompts += 1
+                    section_data = self._keyword_fallback([chunks[i] for i in batch])
+                raw_sections.extend(self._to_document_indices(section_data, batch))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        sections = self._validate_and_structure({"sections": self._merge_sections(raw_sections)}, chunks)
+
+        rd_chunk_ids = set()
+        for section in sections:
+            rd_chunk_ids.update(section.chunk_ids)
+
+        if not failed_prompts:
+            method = "watsonx_llm"
+        elif failed_prompts == len(prompts):
+            method = "keyword_fallback"
+        else:
+            method = "watsonx_llm+keyword_fallback"
+
+        return RDLocatorResult(
+            doc_id=doc_id,
+            sections=sections,
+            total_chunks=len(chunks),
+            rd_chunks=len(rd_chunk_ids),
+            cache_hit=failed_prompts == 0,
+            method=method,
+            prompts=len(prompts),
+        )
+
+    def _prefilter_scores(self, chunks: List[Dict]) -> List[Tuple[int, int]]:
+        """
+        Cheap lexical relevance per chunk.
+
+        Returns:
+            (score, offset of first hit) per chunk; markers count 3, broad
+            terms 1, score 0 means no hit
+        """
+        scores = []
+        for chunk in chunks:
+            text = chunk["text"].lower()
+            markers = [m.start() for m in _MARKER_PATTERN.finditer(text)]
+            terms = [m.start() for m in _TERM_PATTERN.finditer(text)]
+            hits = markers or terms
+            scores.append((3 * len(markers) + len(terms), min(hits) if hits else 0))
+        return scores
+
+    def _snippet(self, chunk: Dict, hit_offset: int) -> str:
+        """Prompt excerpt of a chunk, positioned so the first hit is visible."""
+        text = chunk["text"]
+        start = max(0, min(hit_offset - SNIPPET_CHARS // 4, len(text) - SNIPPET_CHARS))
+        return " ".join(text[start:start + SNIPPET_CHARS].split())
+
+    def _pack_prompts(self, chunks: List[Dict], scores: List[Tuple[int, int]]) -> List[List[int]]:
+        """
+        Group candidate windows into prompts that fit the token budget.
+
+        Candidates (score > 0) are widened by window_radius, overlapping
+        windows are merged, and windows are packed in document order; a
+        window larger than one prompt is split across prompts.
+
+        Returns:
+            List of prompts, each a list of document chunk indices
+        """
+        candidates = [i for i, (score, _) in enumerate(scores) if score > 0]
+        selected = sorted({
+            j
+            for i in candidates
+            for j in range(max(0, i - self.window_radius), min(len(chunks), i + self.window_radius + 1))
+        })
+
+        header_chars = len(self._build_window_prompt(chunks, [], scores))
+        budget_chars = self.prompt_token_budget * CHARS_PER_TOKEN - header_chars
+
+        prompts: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for index in selected:
+            line_chars = len(self._chunk_line(len(current), chunks[index], scores[index][1])) + 1
+            if current and used + line_chars > budget_chars:
+                prompts.append(current)
+                current, used = [], 0
+                line_chars = len(self._chunk_line(0, chunks[index], scores[index][1])) + 1
+            current.append(index)
+            used += line_chars
+        if current:
+            prompts.append(current)
+        return prompts
+
+    def _chunk_line(self, position: int, chunk: Dict, hit_offset: int) -> str:
+        """One chunk as listed in a map-reduce prompt."""
+        return (
+            f"Chunk {position} (ID: {chunk['chunk_id']}, Page: {chunk.get('page', 'N/A')}): "
+            f"{self._snippet(chunk, hit_offset)}"
+        )
+
+    def _build_window_prompt(
+        self, chunks: List[Dict], batch: List[int], scores: List[Tuple[int, int]]
+    ) -> str:
+        """Build the prompt for one packed batch of candidate chunks."""
+        chunk_context = "\n".join(
+            self._chunk_line(position, chunks[index], scores[index][1])
+            for position, index in enumerate(batch)
+        )
+        return f"""You are an ESG document analyzer. Identify sections related to climate/environmental reporting standards.
+
+**Document Context** (excerpt of {len(batch)} candidate chunks from a {len(chunks)}-chunk document):
+{chunk_context}
+
+**Task**: Identify which chunks belong to the following section types:
+1. TCFD (Task Force on Climate-related Financial Disclosures)
+2. SECR (Streamlined Energy and Carbon Reporting)
+3. GRI305 (GHG Emissions Standard)
+4. SBTi (Science Based Targets initiative)
+5. CDP (Carbon Disclosure Project)
+6. Custom (other sustainability/ESG sections)
+
+**Output JSON Schema**:
+{{
+  "sections": [
+    {{
+      "section_type": "TCFD",
+      "chunk_indices": [0, 1, 2],  // Chunk numbers as listed above
+      "confidence": 0.9,
+      "rationale": "Contains TCFD governance disclosures..."
+    }}
+  ]
+}}
+
+**Constraints**:
+- Only include sections with confidence ≥ 0.5
+- chunk_indices must be valid (0 to {max(len(batch) - 1, 0)})
+- Rationale must cite specific keywords/phrases from chunks
+
+Return valid JSON only (no markdown, no explanations).
+"""
+
+    def _to_document_indices(self, section_data: Dict, batch: List[int]) -> List[Dict]:
+        """Map prompt-local chunk indices back to document positions."""
+        mapped = []
+        for raw_section in section_data.get("sections", []):
+            indices = [
+                batch[idx] for idx in raw_section.get("chunk_indices", [])
+                if isinstance(idx, int) and 0 <= idx < len(batch)
+            ]
+            if indices:
+                mapped.append({**raw_section, "chunk_indices": indices})
+        return mapped
+
+    def _merge_sections(self, raw_sections: List[Dict]) -> List[Dict]:
+        """
+        Merge per-prompt sections: per type, union the chunk indices and
+        split them into contiguous runs (a gap of one chunk is bridged).
+        Each run keeps the highest confidence that claimed any of its chunks.
+        """
+        by_type: Dict[str, Dict[int, float]] = {}
+        for raw_section in raw_sections:
+            claimed = by_type.setdefault(raw_section.get("section_type", "Custom"), {})
+            confidence = float(raw_section.get("confidence", 0.0))
+            for idx in raw_section["chunk_indices"]:
+                claimed[idx] = max(confidence, claimed.get(idx, 0.0))
+
+        merged = []
+        for section_type in sorted(by_type, key=lambda t: min(by_type[t])):
+            claimed = by_type[section_type]
+            run: List[int] = []
+            for idx in sorted(claimed):
+                if run and idx - run[-1] > 2:
+                    merged.append(self._run_section(section_type, run, claimed))
+                    run = []
+                run.append(idx)
+            if run:
+                merged.append(self._run_section(section_type, run, claimed))
+        return sorted(merged, key=lambda section: section["chunk_indices"][0])
+
+    @staticmethod
+    def _run_section(section_type: str, run: List[int], claimed: Dict[int, float]) -> Dict:
+        """Section dict for one contiguous run of chunk indices."""
+        return {
+            "section_type": section_type,
+            "chunk_indices": list(run),
+            "confidence": max(claimed[idx] for idx in run),
+        }
+
     def _build_locator_prompt(self, chunks: List[Dict]) -> str:
         """Build prompt for LLM section locator."""
         # Sample up to 50 chunks for context window efficiency
@@ -333,6 +598,7 @@ Return valid JSON only (no markdown, no explanations).
                     confidence=confidence,
                     markers=markers,
                     page_range=page_range,
+                    pages=pages,
                 )
             )
 
@@ -108,7 +108,7 @@ class EvidenceExtractor:
         # Step 3: Create extraction result
         snapshot_id = self._generate_snapshot_id(org_id, year, doc_id)
 
-        result = ExtractionResult(
+        result = EvidenceExtractionResult(
             company_name=org_id,  # TODO: Resolve ticker -> company name
             year=year,
             doc_id=doc_id,
@@ -9,15 +9,42 @@ Key features:
 - Tracks approximate page numbers for citation purposes
 - Handles SEC-specific HTML structure (tables, exhibits, etc.)
 - Provides text chunking for matcher processing
+
+Parsing is streaming: lxml's HTML push parser feeds events to a target that
+keeps only text (no element tree), and the text is cleaned and scanned for
+Item headings as it arrives. Output is identical to extracting
+``BeautifulSoup(html, 'lxml').body.get_text()`` after dropping script/style/
+meta/link, then cleaning it, without ever holding the tree or a second copy
+of the raw text.
 """
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Tuple
+from io import StringIO
+from typing import Callable, IO, Iterable, Optional, List, Dict, Tuple, Union
 from pathlib import Path
+import os
 import re
 import hashlib
 
-from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+# Chunk size for feeding markup to the push parser
+STREAM_CHUNK_CHARS = 64 * 1024
+
+# Mirrors BeautifulSoup's whitespace handling for lxml-built trees
+_ASCII_SPACES = frozenset('\x20\x0a\x09\x0c\x0d')
+_REMOVED_TAGS = frozenset({'script', 'style', 'meta', 'link'})
+# Strings inside these tags are special string types excluded from get_text()
+_STRING_CONTAINER_TAGS = frozenset({'rt', 'rp', 'style', 'script', 'template'})
+_PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+
+_HORIZONTAL_SPACE = re.compile(r'[ \t]+')
+_ITEM_HEADING = re.compile(
+    r'^(?:part\s+[ivx]+\W+)?item\s+(\d{1,2}[a-z]?)(?=[\s.:\-\u2013\u2014]|$)',
+    re.IGNORECASE,
+)
+# Headings are short lines; longer lines starting with "Item 7" are prose
+_MAX_HEADING_CHARS = 200
 
 
 @dataclass
@@ -32,6 +59,213 @@ class HTMLSection:
     metadata: Optional[Dict] = None
 
 
+class _StreamingTextCleaner:
+    """
+    Incremental equivalent of SECHTMLParser._clean_text().
+
+    Text arrives in arbitrary pieces; output is written as soon as it is
+    final. Only the trailing whitespace of the current line and a count of
+    pending blank lines are held back, so memory does not grow with line or
+    document length beyond the cleaned output itself.
+
+    The batch rules, restated per line: ``[ \\t]+`` collapses to one space,
+    every line is stripped, each run of raw-empty lines (``\\n{3,}``) and each
+    whitespace-only line becomes one blank line, and blank lines at either
+    end of the document are dropped.
+    """
+
+    def __init__(self, on_line: Optional[Callable[[int, str], None]] = None):
+        """
+        Args:
+            on_line: Called with (offset, text) for each completed short
+                content line, used for heading detection
+        """
+        self._out = StringIO()
+        self.length = 0
+        self._on_line = on_line
+        self._held = ""
+        self._line_started = False
+        self._line_has_chars = False
+        self._line_start = 0
+        self._line_head: List[str] = []
+        self._pending_blank = 0
+        self._previous_raw_empty = False
+        self._emitted = False
+
+    def feed(self, text: str) -> None:
+        """Add raw text."""
+        for index, part in enumerate(text.split('\n')):
+            if index:
+                self._end_line()
+            if part:
+                self._feed_segment(part)
+
+    def _feed_segment(self, segment: str) -> None:
+        """Add text that contains no newline."""
+        self._line_has_chars = True
+        text = self._held + segment
+        if not self._line_started:
+            text = text.lstrip()
+            if not text:
+                self._held = ""
+                return
+        core = text.rstrip()
+        self._held = text[len(core):]
+        if not core:
+            return
+
+        core = _HORIZONTAL_SPACE.sub(' ', core)
+        if not self._line_started:
+            self._line_started = True
+            if self._emitted:
+                self._write('\n' * (1 + self._pending_blank))
+            self._pending_blank = 0
+            self._line_start = self.length
+            self._line_head = []
+        if self.length - self._line_start <= _MAX_HEADING_CHARS:
+            self._line_head.append(core)
+        self._write(core)
+        self._emitted = True
+
+    def _end_line(self) -> None:
+        """Handle a newline in the raw text."""
+        if self._line_started:
+            self._previous_raw_empty = False
+            line_length = self.length - self._line_start
+            if self._on_line is not None and line_length <= _MAX_HEADING_CHARS:
+                self._on_line(self._line_start, ''.join(self._line_head))
+        elif not self._line_has_chars:
+            # Consecutive raw-empty lines collapse into one blank line
+            if not self._previous_raw_empty:
+                self._pending_blank += 1
+            self._previous_raw_empty = True
+        else:
+            # Whitespace-only line: stripped to blank, never collapsed
+            self._pending_blank += 1
+            self._previous_raw_empty = False
+        self._held = ""
+        self._line_started = False
+        self._line_has_chars = False
+
+    def _write(self, text: str) -> None:
+        """Append final output."""
+        self._out.write(text)
+        self.length += len(text)
+
+    def close(self) -> str:
+        """Finish the last line and return the cleaned text."""
+        if self._line_started and self._on_line is not None:
+            if self.length - self._line_start <= _MAX_HEADING_CHARS:
+                self._on_line(self._line_start, ''.join(self._line_head))
+        return self._out.getvalue()
+
+
+class _BodyTextTarget:
+    """
+    lxml parser target that extracts body text without building a tree.
+
+    Reproduces what BeautifulSoup's lxml builder would put into the tree and
+    what ``body.get_text()`` returns from it: text segments end at every
+    tag/comment/doctype event, all-ASCII-whitespace segments outside
+    <pre>/<textarea> shrink to a single space or newline, and strings in
+    removed tags or special string containers are skipped. Text before
+    <body> is kept only until a body appears (it is the fallback when the
+    document has none).
+    """
+
+    def __init__(self, cleaner: _StreamingTextCleaner):
+        """
+        Args:
+            cleaner: Receives extracted body text
+        """
+        self.cleaner = cleaner
+        self._stack: List[str] = []
+        self._removed_depth = 0
+        self._container_depth = 0
+        self._preserve_depth = 0
+        self._body_state = "before"
+        self._body_level = -1
+        self._prelude: List[str] = []
+        self._segment: List[str] = []
+        self._segment_is_text = False
+
+    def _route(self, text: str) -> None:
+        """Send an extracted string to the body text or the prelude."""
+        if self._removed_depth or self._container_depth:
+            return
+        if self._body_state == "inside":
+            self.cleaner.feed(text)
+        elif self._body_state == "before":
+            self._prelude.append(text)
+
+    def _end_segment(self) -> None:
+        """Close the current text segment (BeautifulSoup's endData)."""
+        if self._segment:
+            text = ''.join(self._segment)
+            if not self._preserve_depth:
+                text = '\n' if '\n' in text else ' '
+            self._route(text)
+        self._segment = []
+        self._segment_is_text = False
+
+    def start(self, tag: str, attrib) -> None:
+        """Element start event."""
+        self._end_segment()
+        if tag == 'body' and self._body_state == "before":
+            self._body_state = "inside"
+            self._body_level = len(self._stack)
+            self._prelude = []
+        self._stack.append(tag)
+        self._removed_depth += tag in _REMOVED_TAGS
+        self._container_depth += tag in _STRING_CONTAINER_TAGS
+        self._preserve_depth += tag in _PRESERVE_WHITESPACE_TAGS
+
+    def end(self, tag: str) -> None:
+        """Element end event."""
+        self._end_segment()
+        if not self._stack:
+            return
+        closed = self._stack.pop()
+        self._removed_depth -= closed in _REMOVED_TAGS
+        self._container_depth -= closed in _STRING_CONTAINER_TAGS
+        self._preserve_depth -= closed in _PRESERVE_WHITESPACE_TAGS
+        if self._body_state == "inside" and len(self._stack) == self._body_level:
+            self._body_state = "after"
+
+    def data(self, text: str) -> None:
+        """Character data event."""
+        if self._segment_is_text:
+            self._route(text)
+        elif all(char in _ASCII_SPACES for char in text):
+            # Might still be an all-whitespace segment; hold it
+            self._segment.append(text)
+        else:
+            self._segment.append(text)
+            self._route(''.join(self._segment))
+            self._segment = []
+            self._segment_is_text = True
+
+    def comment(self, text: str) -> None:
+        """Comments end the current segment and are not body text."""
+        self._end_segment()
+
+    def pi(self, target: str, data: Optional[str] = None) -> None:
+        """Processing instructions end the current segment."""
+        self._end_segment()
+
+    def doctype(self, *args) -> None:
+        """Doctype declarations end the current segment."""
+        self._end_segment()
+
+    def close(self) -> None:
+        """End of document: without a <body>, the whole document is used."""
+        self._end_segment()
+        if self._body_state == "before":
+            for text in self._prelude:
+                self.cleaner.feed(text)
+            self._prelude = []
+
+
 class SECHTMLParser:
     """
     Parser for SEC EDGAR HTML filings (10-K, 20-F, etc.)
@@ -70,26 +304,63 @@ class SECHTMLParser:
             Tuple of (full_text, page_offsets_dict)
             page_offsets_dict maps page_no -> character offset
         """
-        soup = BeautifulSoup(html_content, 'lxml')
+        return self.parse_filing_stream(_iter_chunks(html_content), filing_url)
 
-        # Remove script and style tags
-        for tag in soup(['script', 'style', 'meta', 'link']):
-            tag.decompose()
+    def parse_filing_stream(
+        self,
+        source: Union[str, "os.PathLike[str]", IO[str], Iterable[str]],
+        filing_url: str = "",
+        encoding: str = "utf-8"
+    ) -> Tuple[str, Dict[int, int]]:
+        """
+        Parse a filing incrementally from a file or an iterable of chunks.
+
+        Markup is pushed to lxml in chunks and only extracted text is kept,
+        so peak memory is bounded by the cleaned text rather than the size
+        of the HTML or its element tree. Text, page offsets and Item-section
+        boundaries come out of the same single pass, and match parse_filing()
+        on the same markup.
 
-        # Extract text from body
-        body = soup.find('body')
-        if not body:
-            # Fallback: use entire document
-            body = soup
+        Args:
+            source: HTML markup (str), a path to an HTML file (Path or other
+                os.PathLike), a text file object, or an iterable of markup
+                strings
+            filing_url: Optional URL for traceability
+            encoding: Text encoding when source is a path
 
-        # Get clean text
-        self.document_text = self._clean_text(body.get_text())
+        Returns:
+            Tuple of (full_text, page_offsets_dict)
+        """
+        headings: List[Tuple[int, str, str]] = []
+
+        def on_line(offset: int, line: str) -> None:
+            """Record Item headings as their lines complete."""
+            heading = _ITEM_HEADING.match(line)
+            if heading:
+                headings.append((offset, heading.group(1).lower(), line))
+
+        cleaner = _StreamingTextCleaner(on_line=on_line)
+        target = _BodyTextTarget(cleaner)
+        parser = etree.HTMLParser(target=target, recover=True, strip_cdata=False)
+
+        if isinstance(source, str):
+            # Markup, never a path: a str filing is not iterated per character
+            _feed_chunks(parser, [source])
+        elif isinstance(source, os.PathLike):
+            with open(source, "r", encoding=encoding, errors="replace") as handle:
+                _feed_chunks(parser, iter(lambda: handle.read(STREAM_CHUNK_CHARS), ""))
+        elif hasattr(source, "read"):
+            _feed_chunks(parser, iter(lambda: source.read(STREAM_CHUNK_CHARS), ""))
+        else:
+            _feed_chunks(parser, source)
+
+        self.document_text = cleaner.close()
 
         # Calculate page offsets
         self.page_offsets = self._calculate_page_offsets(self.document_text)
 
         # Extract sections
-        self.sections = self._extract_sections(soup)
+        self.sections = self._extract_sections(headings)
 
         return self.document_text, self.page_offsets
 
@@ -149,19 +420,27 @@ class SECHTMLParser:
         """
         return (char_offset // self.CHARS_PER_PAGE) + 1
 
-    def _extract_sections(self, soup: BeautifulSoup) -> List[HTMLSection]:
+    def _extract_sections(
+        self,
+        headings: Optional[List[Tuple[int, str, str]]] = None
+    ) -> List[HTMLSection]:
         """
         Extract standard SEC 10-K sections.
 
-        Looks for Item 1, Item 1A, Item 7, etc.
+        The first section is always the full document. It is followed by one
+        section per Item heading ("Item 1A. Risk Factors"), found on short
+        lines during streaming. When an Item appears more than once (table of
+        contents, then body) the last occurrence wins. Each section runs to
+        the start of the next one.
+
+        Args:
+            headings: (offset, item key, heading line) tuples in text order
+
+        Returns:
+            List of HTMLSection objects
         """
         sections = []
 
-        # Simple approach: find headers containing "Item X"
-        # More sophisticated extraction could use SEC XML tags
-
-        # For now, return the full document as one section
-        # TODO: Implement proper section detection
         full_section = HTMLSection(
             section_name="Full Document",
             text=self.document_text,
@@ -172,6 +451,23 @@ class SECHTMLParser:
         )
         sections.append(full_section)
 
+        latest: Dict[str, Tuple[int, str]] = {}
+        for offset, item, line in headings or []:
+            latest[f"item_{item}"] = (offset, line)
+        ordered = sorted(latest.items(), key=lambda entry: entry[1][0])
+
+        labels = {key: names[0] for key, names in self.STANDARD_SECTIONS.items()}
+        for index, (key, (start, line)) in enumerate(ordered):
+            end = ordered[index + 1][1][0] if index + 1 < len(ordered) else len(self.document_text)
+            sections.append(HTMLSection(
+                section_name=labels.get(key, f"Item {key[5:].upper()}"),
+                text=self.document_text[start:end],
+                start_offset=start,
+                end_offset=end,
+                page_no=self.get_page_number(start),
+                metadata={"item": key, "heading": line}
+            ))
+
         return sections
 
     def get_context_window(
@@ -227,3 +523,22 @@ class SECHTMLParser:
         # Combine with ellipsis markers
         full_context = f"...{context_before} {match_text} {context_after}..."
         return full_context.strip()
+
+
+def _iter_chunks(text: str, size: int = STREAM_CHUNK_CHARS) -> Iterable[str]:
+    """Split an in-memory document into parser chunks."""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def _feed_chunks(parser: "etree.HTMLParser", chunks: Iterable[str]) -> None:
+    """Push markup chunks through the parser and close it."""
+    fed = False
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            fed = True
+    if not fed:
+        # The parser must see at least one feed() before close()
+        parser.feed("")
+    parser.close()
@@ -3,24 +3,111 @@ Base matcher interface for theme-specific evidence extraction.
 
 All theme matchers (TSP, OSP, DM, GHG, RD, EI, RMM) inherit from BaseMatcher
 and implement theme-specific pattern matching logic.
+
+compile_patterns() also builds a single combined scanner for the theme, so
+match() locates candidates for every pattern in one pass over the filing and
+only runs individual patterns (anchored) where something can match. Page
+numbers come from a bisect over a precomputed offset array.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Pattern
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Pattern, Tuple
 import re
 
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
 from ..models import Match
 
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Negation cues, checked against the last 100 characters before a match
+_NEGATION = re.compile(
+    r'\b(no|not|never|without|lack|lacking)\b'
+    r'|\b(absence\s+of)\b'
+    r'|\b(do\s+not|does\s+not|did\s+not|will\s+not|cannot|have\s+no)\b',
+    re.IGNORECASE,
+)
+
+# Backreferences renumber (or collide) once patterns are combined
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def _can_match_empty(pattern: Pattern[str]) -> bool:
+    """True if the pattern's minimum match width is zero."""
+    min_width: int = _sre_parse.parse(pattern.pattern, pattern.flags).getwidth()[0]
+    return min_width == 0
+
+
+# Context windows are split from a bounded slice that grows until it holds
+# more words than needed, instead of splitting the whole filing prefix
+_CONTEXT_SLICE_CHARS = 256
+
+
+class PageIndex:
+    """
+    Sorted page-offset lookup for estimating page numbers.
+
+    Built once per document; lookup() is a bisect over the offsets instead of
+    sorting page_offsets and scanning it for every match.
+
+    Attributes:
+        pages: Page numbers in ascending order
+        offsets: Character offset of each page, aligned with pages
+    """
+
+    def __init__(self, page_offsets: dict[int, int]):
+        """
+        Build the index.
+
+        Args:
+            page_offsets: Dictionary mapping page numbers to character offsets
+        """
+        ordered = sorted(page_offsets.items())
+        self.pages = [page for page, _ in ordered]
+        self.offsets = [offset for _, offset in ordered]
+        self._monotonic = all(a <= b for a, b in zip(self.offsets, self.offsets[1:]))
+
+    def lookup(self, span_start: int) -> int:
+        """
+        Page containing span_start (same result as a linear scan by page).
+
+        Args:
+            span_start: Character offset of match
+
+        Returns:
+            Estimated page number (1-indexed)
+        """
+        if not self.pages:
+            # Fallback heuristic: assume ~3000 characters per page
+            return max(1, span_start // 3000 + 1)
+
+        if self._monotonic:
+            position = bisect_right(self.offsets, span_start)
+            return self.pages[position - 1] if position else 1
+
+        # Offsets out of page order: keep the original first-break semantics
+        page_no = 1
+        for page, offset in zip(self.pages, self.offsets):
+            if offset > span_start:
+                break
+            page_no = page
+        return page_no
+
 
 class BaseMatcher(ABC):
     """
     Abstract base class for theme-specific evidence matchers.
 
     Each theme matcher implements:
-    1. Regex patterns for evidence keywords
-    2. match() method to find evidence in text
-    3. Theme-specific evidence type classification
-    4. Stage indicator mapping (evidence type → stage 0-4)
+    1. Regex patterns for evidence keywords (via compile_patterns())
+    2. Theme-specific evidence type classification
+    3. Stage indicator mapping (evidence type → stage 0-4)
+
+    match() is provided: a single-pass scan over all of the theme's patterns.
 
     Attributes:
         theme: Theme code (TSP|OSP|DM|GHG|RD|EI|RMM)
@@ -44,11 +131,16 @@ class BaseMatcher(ABC):
             )
         self.theme = theme
         self.patterns: dict[str, Pattern[str]] = {}
+        self._scanner: Optional[Pattern[str]] = None
 
     def compile_patterns(self, pattern_dict: dict[str, str]) -> None:
         """
         Compile regex patterns for matching.
 
+        Also compiles a combined scanner: one zero-width lookahead over the
+        alternation of every pattern, which stops at each position where at
+        least one pattern can start a match.
+
         Args:
             pattern_dict: Dictionary mapping pattern names to regex strings
 
@@ -56,30 +148,111 @@ class BaseMatcher(ABC):
             re.error: If pattern compilation fails
         """
         self.patterns = {
-            name: re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            name: re.compile(pattern, PATTERN_FLAGS)
             for name, pattern in pattern_dict.items()
         }
 
-    @abstractmethod
+        # finditer's handling of empty matches next to previous matches
+        # cannot be replayed from anchored matches, so patterns that can
+        # match "" are scanned pattern by pattern
+        self._scanner = None
+        if self.patterns and not any(
+            _BACKREFERENCE.search(pattern) for pattern in pattern_dict.values()
+        ) and not any(_can_match_empty(pattern) for pattern in self.patterns.values()):
+            combined = "|".join(f"(?:{pattern})" for pattern in pattern_dict.values())
+            try:
+                self._scanner = re.compile(f"(?=(?:{combined}))", PATTERN_FLAGS)
+            except re.error:
+                # Backreferences or inline global flags cannot be combined;
+                # iter_pattern_matches() then scans pattern by pattern
+                self._scanner = None
+
+    def iter_pattern_matches(self, text: str) -> Iterator[Tuple[str, "re.Match[str]"]]:
+        """
+        Yield (pattern_name, regex_match) for every pattern over text.
+
+        Results are identical to running ``pattern.finditer(text)`` for each
+        pattern in definition order, but the text is scanned once: every
+        pattern's leftmost match must start at a position the combined scanner
+        stops at, so patterns are only tried (anchored) at those positions.
+        Pattern sets where any pattern can match the empty string are run
+        through ``finditer`` directly.
+
+        Args:
+            text: Full text to scan
+
+        Yields:
+            Tuples of (pattern name, re.Match), grouped by pattern in order
+        """
+        if self._scanner is None:
+            for pattern_name, pattern in self.patterns.items():
+                for regex_match in pattern.finditer(text):
+                    yield pattern_name, regex_match
+            return
+
+        names = list(self.patterns)
+        compiled = [self.patterns[name] for name in names]
+        found: List[List["re.Match[str]"]] = [[] for _ in names]
+        resume = [0] * len(names)
+
+        for candidate in self._scanner.finditer(text):
+            position = candidate.start()
+            for index, pattern in enumerate(compiled):
+                if position < resume[index]:
+                    continue
+                regex_match = pattern.match(text, position)
+                if regex_match is None:
+                    continue
+                found[index].append(regex_match)
+                # finditer resumes at the match end (one past an empty match)
+                end = regex_match.end()
+                resume[index] = end if end > position else position + 1
+
+        for name, matches in zip(names, found):
+            for regex_match in matches:
+                yield name, regex_match
+
     def match(self, text: str, page_offsets: dict[int, int]) -> List[Match]:
         """
         Find all evidence matches in text.
 
+        The default implementation scans all of the theme's patterns in one
+        pass, extracts 15-word context windows, estimates page numbers and
+        drops negated matches. Subclasses only need to compile patterns.
+
         Args:
             text: Full text of SEC filing (HTML stripped)
             page_offsets: Dictionary mapping page numbers to character offsets
 
         Returns:
-            List of Match objects (may be empty if no matches found)
-
-        Note:
-            Implementations should:
-            1. Apply regex patterns to text
-            2. Extract match text and surrounding context
-            3. Estimate page number from span position
-            4. Return Match objects (not Evidence - confidence scoring happens later)
+            List of Match objects (may be empty if no matches found), grouped
+            by pattern in definition order
         """
-        pass
+        page_index = PageIndex(page_offsets)
+        matches = []
+
+        for pattern_name, regex_match in self.iter_pattern_matches(text):
+            span_start, span_end = regex_match.span()
+            context_before, context_after = self.extract_context_window(
+                text, span_start, span_end
+            )
+
+            match = Match(
+                pattern_name=pattern_name,
+                match_text=regex_match.group(0),
+                span_start=span_start,
+                span_end=span_end,
+                context_before=context_before,
+                context_after=context_after,
+                page_no=page_index.lookup(span_start),
+                metadata={}
+            )
+
+            # Check for negation (reduces false positives)
+            if not self.check_negation(match.match_text, context_before):
+                matches.append(match)
+
+        return matches
 
     @abstractmethod
     def classify_evidence_type(self, match: Match) -> str:
@@ -138,15 +311,33 @@ class BaseMatcher(ABC):
         Note:
             ADR-002 specifies 30-word windows (15 before + 15 after)
         """
-        # Extract text before match
-        before_text = text[:span_start]
-        before_words = before_text.split()[-window_words:]
-        context_before = " ".join(before_words)
+        if window_words <= 0:
+            # Degenerate windows keep the historical full-split behaviour
+            before_words = text[:span_start].split()[-window_words:]
+            after_words = text[span_end:].split()[:window_words]
+            return " ".join(before_words), " ".join(after_words)
+
+        # Extract text before match. A slice holding more than window_words
+        # words has a complete last window_words, so the full prefix never
+        # needs splitting.
+        size = _CONTEXT_SLICE_CHARS
+        while True:
+            start = max(0, span_start - size)
+            before_words = text[start:span_start].split()
+            if start == 0 or len(before_words) > window_words:
+                break
+            size *= 2
+        context_before = " ".join(before_words[-window_words:])
 
         # Extract text after match
-        after_text = text[span_end:]
-        after_words = after_text.split()[:window_words]
-        context_after = " ".join(after_words)
+        size = _CONTEXT_SLICE_CHARS
+        while True:
+            end = span_end + size
+            after_words = text[span_end:end].split()
+            if end >= len(text) or len(after_words) > window_words:
+                break
+            size *= 2
+        context_after = " ".join(after_words[:window_words])
 
         return context_before, context_after
 
@@ -170,19 +361,9 @@ class BaseMatcher(ABC):
             Page numbers are approximate for HTML filings (Assumption A9).
             If page_offsets is empty, uses heuristic (3000 chars/page).
         """
-        if not page_offsets:
-            # Fallback heuristic: assume ~3000 characters per page
-            return max(1, span_start // 3000 + 1)
-
-        # Find the page whose offset is closest to (but not greater than) span_start
-        page_no = 1
-        for page, offset in sorted(page_offsets.items()):
-            if offset <= span_start:
-                page_no = page
-            else:
-                break
-
-        return page_no
+        # Find the page whose offset is closest to (but not greater than) span_start.
+        # match() builds the PageIndex once per document instead.
+        return PageIndex(page_offsets).lookup(span_start)
 
     def check_negation(self, match_text: str, context_before: str) -> bool:
         """
@@ -199,20 +380,8 @@ class BaseMatcher(ABC):
             Negation detection reduces false positives from phrases like
             "we do not have SBTi targets" or "no Scope 3 disclosure"
         """
-        negation_patterns = [
-            r'\b(no|not|never|without|lack|lacking)\b',
-            r'\b(absence\s+of)\b',
-            r'\b(do\s+not|does\s+not|did\s+not|will\s+not|cannot|have\s+no)\b',
-        ]
-
         # Check last 100 characters of context_before
-        context_check = context_before[-100:].lower()
-
-        for pattern in negation_patterns:
-            if re.search(pattern, context_check, re.IGNORECASE):
-                return True
-
-        return False
+        return _NEGATION.search(context_before[-100:].lower()) is not None
 
     def __repr__(self) -> str:
         """String representation of matcher."""
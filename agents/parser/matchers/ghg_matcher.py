@@ -9,7 +9,6 @@ Extracts evidence for GHG Accounting maturity including:
 - Base year and recalculation policy
 """
 
-from typing import List
 from ..models import Match
 from .base_matcher import BaseMatcher
 
@@ -74,47 +73,6 @@ class GHGMatcher(BaseMatcher):
 
         self.compile_patterns(patterns)
 
-    def match(self, text: str, page_offsets: dict[int, int]) -> List[Match]:
-        """
-        Find all GHG-related evidence in text.
-
-        Args:
-            text: Full text of SEC filing
-            page_offsets: Dictionary mapping page numbers to character offsets
-
-        Returns:
-            List of Match objects for GHG evidence
-        """
-        matches = []
-
-        for pattern_name, pattern in self.patterns.items():
-            for regex_match in pattern.finditer(text):
-                # Extract context window
-                context_before, context_after = self.extract_context_window(
-                    text, regex_match.start(), regex_match.end()
-                )
-
-                # Estimate page number
-                page_no = self.estimate_page_number(regex_match.start(), page_offsets)
-
-                # Create Match object
-                match = Match(
-                    pattern_name=pattern_name,
-                    match_text=regex_match.group(0),
-                    span_start=regex_match.start(),
-                    span_end=regex_match.end(),
-                    context_before=context_before,
-                    context_after=context_after,
-                    page_no=page_no,
-                    metadata={}
-                )
-
-                # Check for negation (reduces false positives)
-                if not self.check_negation(match.match_text, context_before):
-                    matches.append(match)
-
-        return matches
-
     def classify_evidence_type(self, match: Match) -> str:
         """
         Classify GHG evidence type based on pattern name.
@@ -0,0 +1,370 @@
+"""
+Parallel Evidence Extraction
+
+Fans SEC filings out to a process pool for evidence extraction. Each worker
+builds its HTML parser and matchers once (pool initializer) and returns the
+evidence for one filing as an Arrow record batch, which is cheap to pickle
+back to the parent and can be appended straight to a Parquet writer.
+
+Results are yielded in input order through a bounded window of in-flight
+filings, so memory stays flat across large backfills. A failing filing
+produces an error result instead of aborting the batch.
+
+A worker that dies outright (OOM kill, segfault in a parser) breaks the
+whole pool and fails every in-flight future. The pool is then rebuilt and
+the in-flight filings are re-run one at a time, so only the filing that
+crashes again is reported as failed and the backfill carries on.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+import logging
+import os
+import time
+
+import pyarrow as pa
+
+from .evidence_extractor import EvidenceExtractor
+from .matchers.base_matcher import BaseMatcher
+from .matchers.ghg_matcher import GHGMatcher
+from .models import Evidence
+
+logger = logging.getLogger(__name__)
+
+# Arrow layout of Evidence rows (field order follows the dataclass)
+EVIDENCE_ARROW_SCHEMA = pa.schema([
+    ('evidence_id', pa.string()),
+    ('org_id', pa.string()),
+    ('year', pa.int32()),
+    ('theme', pa.string()),
+    ('stage_indicator', pa.int32()),
+    ('doc_id', pa.string()),
+    ('page_no', pa.int32()),
+    ('span_start', pa.int32()),
+    ('span_end', pa.int32()),
+    ('extract_30w', pa.string()),
+    ('hash_sha256', pa.string()),
+    ('confidence', pa.float64()),
+    ('evidence_type', pa.string()),
+    ('snapshot_id', pa.string()),
+])
+
+# Matchers are described by class (plus kwargs) so each worker can build its own
+MatcherSpec = Union[Type[BaseMatcher], Tuple[Type[BaseMatcher], Dict[str, Any]]]
+
+# Per-process extractor, created by _init_worker
+_WORKER_EXTRACTOR: Optional[EvidenceExtractor] = None
+
+
+@dataclass
+class FilingExtraction:
+    """
+    Outcome of extracting one filing.
+
+    Attributes:
+        index: Position of the filing in the input
+        org_id: Organization identifier
+        year: Fiscal year
+        doc_id: Document identifier
+        batch: Evidence rows (EVIDENCE_ARROW_SCHEMA), None on failure
+        error: Error message if extraction failed
+        metadata: Extraction metadata (document length, pages, matches, timing)
+    """
+
+    index: int
+    org_id: str
+    year: int
+    doc_id: str
+    batch: Optional[pa.RecordBatch] = None
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the filing was extracted successfully."""
+        return self.error is None
+
+    def to_evidence(self) -> List[Evidence]:
+        """Rebuild Evidence objects from the record batch."""
+        return record_batch_to_evidence(self.batch) if self.batch is not None else []
+
+
+def evidence_to_record_batch(evidence: Sequence[Evidence]) -> pa.RecordBatch:
+    """
+    Convert Evidence objects to a columnar record batch.
+
+    Args:
+        evidence: Evidence items
+
+    Returns:
+        RecordBatch with EVIDENCE_ARROW_SCHEMA
+    """
+    columns = [
+        pa.array([getattr(item, name) for item in evidence], type=schema_field.type)
+        for name, schema_field in zip(EVIDENCE_ARROW_SCHEMA.names, EVIDENCE_ARROW_SCHEMA)
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=EVIDENCE_ARROW_SCHEMA)
+
+
+def record_batch_to_evidence(batch: pa.RecordBatch) -> List[Evidence]:
+    """
+    Convert a record batch back to Evidence objects.
+
+    Args:
+        batch: RecordBatch with EVIDENCE_ARROW_SCHEMA
+
+    Returns:
+        List of Evidence objects
+    """
+    return [Evidence(**row) for row in batch.to_pylist()]
+
+
+def _build_matchers(matcher_specs: Sequence[MatcherSpec]) -> List[BaseMatcher]:
+    """Instantiate matchers from class or (class, kwargs) specs."""
+    matchers = []
+    for spec in matcher_specs:
+        matcher_cls, kwargs = spec if isinstance(spec, tuple) else (spec, {})
+        matchers.append(matcher_cls(**kwargs))
+    return matchers
+
+
+def _init_worker(matcher_specs: Sequence[MatcherSpec]) -> None:
+    """Pool initializer: compile matchers once per worker process."""
+    global _WORKER_EXTRACTOR
+    _WORKER_EXTRACTOR = EvidenceExtractor(matchers=_build_matchers(matcher_specs))
+
+
+def _extract_filing(index: int, filing: Dict[str, Any]) -> FilingExtraction:
+    """
+    Extract one filing in the current worker.
+
+    Never raises: any failure is returned as a FilingExtraction with error set.
+    """
+    result = FilingExtraction(
+        index=index,
+        org_id=str(filing.get('org_id', '')),
+        year=filing.get('year', 0),
+        doc_id=str(filing.get('doc_id', '')),
+    )
+    started = time.perf_counter()
+    try:
+        if 'html_path' in filing:
+            path = Path(filing['html_path'])
+            html_content = path.read_text(encoding='utf-8', errors='ignore')
+            filing_url = filing.get('filing_url') or f"file://{path.absolute()}"
+        else:
+            html_content = filing['html_content']
+            filing_url = filing.get('filing_url', '')
+
+        extraction = _WORKER_EXTRACTOR.extract_from_html(
+            html_content=html_content,
+            org_id=filing['org_id'],
+            year=filing['year'],
+            doc_id=filing['doc_id'],
+            filing_url=filing_url
+        )
+        evidence = [
+            item
+            for theme_evidence in extraction.evidence_by_theme.values()
+            for item in theme_evidence
+        ]
+        result.batch = evidence_to_record_batch(evidence)
+        result.metadata = dict(extraction.metadata)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.metadata['elapsed_seconds'] = time.perf_counter() - started
+    result.metadata['worker_pid'] = os.getpid()
+    return result
+
+
+class ParallelBatchExtractor:
+    """
+    Extract evidence from many filings across a process pool.
+
+    Filings are dicts with org_id, year, doc_id, optional filing_url and
+    either html_content or html_path (preferred for backfills: only the path
+    is sent to the worker).
+    """
+
+    def __init__(
+        self,
+        matcher_specs: Optional[Sequence[MatcherSpec]] = None,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        mp_context: Optional[Any] = None
+    ):
+        """
+        Initialize parallel extractor.
+
+        Args:
+            matcher_specs: Matcher classes or (class, kwargs) tuples.
+                If None, uses GHG matcher only.
+            max_workers: Worker processes (default: CPU count). 1 runs
+                in-process without a pool.
+            max_in_flight: Filings submitted ahead of the one being yielded
+                (default: 4 per worker)
+            mp_context: Optional multiprocessing context for the pool
+        """
+        self.matcher_specs = list(matcher_specs) if matcher_specs is not None else [GHGMatcher]
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.max_in_flight = max(1, max_in_flight or self.max_workers * 4)
+        self.mp_context = mp_context
+
+    def iter_extract(self, filings: Iterable[Dict[str, Any]]) -> Iterator[FilingExtraction]:
+        """
+        Extract filings, yielding one result per filing in input order.
+
+        Args:
+            filings: Iterable of filing dicts (consumed lazily)
+
+        Yields:
+            FilingExtraction for each filing, failures included
+        """
+        if self.max_workers == 1:
+            _init_worker(self.matcher_specs)
+            for index, filing in enumerate(filings):
+                yield self._log_result(_extract_filing(index, filing))
+            return
+
+        pool = self._new_pool()
+        pending: Deque[Tuple[int, Dict[str, Any], Future]] = deque()
+        try:
+            for index, filing in enumerate(filings):
+                pending.append((index, filing, self._submit(pool, index, filing)))
+                if len(pending) >= self.max_in_flight:
+                    pool = self._recover_if_broken(pool, pending)
+                    yield self._collect(*pending.popleft())
+            while pending:
+                pool = self._recover_if_broken(pool, pending)
+                yield self._collect(*pending.popleft())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Start a worker pool (each worker compiles its matchers once)."""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(self.matcher_specs,)
+        )
+
+    @staticmethod
+    def _submit(pool: ProcessPoolExecutor, index: int, filing: Dict[str, Any]) -> Future:
+        """Submit a filing; on an already broken pool return a failed future instead of raising."""
+        try:
+            return pool.submit(_extract_filing, index, filing)
+        except BrokenProcessPool as e:
+            future: Future = Future()
+            future.set_exception(e)
+            return future
+
+    def _recover_if_broken(
+        self,
+        pool: ProcessPoolExecutor,
+        pending: Deque[Tuple[int, Dict[str, Any], Future]]
+    ) -> ProcessPoolExecutor:
+        """
+        Wait for the oldest filing; if a worker crash broke the pool, recover.
+
+        Every filing whose future the crash failed is re-run alone on a fresh
+        pool. A filing that crashes its worker again is the culprit and gets
+        an error result; the others get their real results. pending is
+        updated in place with completed futures.
+
+        Returns:
+            The pool to keep submitting to
+        """
+        if not isinstance(pending[0][2].exception(), BrokenProcessPool):
+            return pool
+
+        broken, pool = pool, self._new_pool()
+        for position, (index, filing, future) in enumerate(pending):
+            if not isinstance(future.exception(), BrokenProcessPool):
+                continue  # Finished before the crash
+            logger.warning(f"Worker pool broke; re-running {filing.get('doc_id', index)} in isolation")
+            retry = self._submit(pool, index, filing)
+            if isinstance(retry.exception(), BrokenProcessPool):
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = self._new_pool()
+                retry = Future()
+                retry.set_result(self._failed(index, filing, "WorkerCrashed: worker process died while extracting this filing"))
+            pending[position] = (index, filing, retry)
+        # Every future of the broken pool has resolved by now
+        broken.shutdown(wait=False)
+        return pool
+
+    @staticmethod
+    def _failed(index: int, filing: Dict[str, Any], error: str) -> FilingExtraction:
+        """Error result for a filing that produced no extraction."""
+        return FilingExtraction(
+            index=index,
+            org_id=str(filing.get('org_id', '')),
+            year=filing.get('year', 0),
+            doc_id=str(filing.get('doc_id', '')),
+            error=error
+        )
+
+    def _collect(self, index: int, filing: Dict[str, Any], future: Future) -> FilingExtraction:
+        """Wait for a filing; other pool-level failures (e.g. pickling) become error results."""
+        try:
+            result = future.result()
+        except Exception as e:
+            result = self._failed(index, filing, f"{type(e).__name__}: {e}")
+        return self._log_result(result)
+
+    @staticmethod
+    def _log_result(result: FilingExtraction) -> FilingExtraction:
+        """Log failures as they are yielded."""
+        if not result.ok:
+            logger.error(f"Failed to extract from {result.org_id} ({result.year}): {result.error}")
+        return result
+
+    def extract_to_parquet(
+        self,
+        filings: Iterable[Dict[str, Any]],
+        output_path: Union[str, Path],
+        compression: str = 'snappy'
+    ) -> Dict[str, Any]:
+        """
+        Extract filings and stream all evidence into one Parquet file.
+
+        Record batches are appended as they arrive (in input order), so
+        the parent never holds more than the in-flight window.
+
+        Args:
+            filings: Iterable of filing dicts
+            output_path: Parquet file to write
+            compression: Parquet compression codec
+
+        Returns:
+            Summary with filing, failure and evidence counts
+        """
+        import pyarrow.parquet as pq
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        summary: Dict[str, Any] = {"filings": 0, "failed": 0, "evidence": 0, "errors": []}
+        started = time.perf_counter()
+
+        with pq.ParquetWriter(output_path, EVIDENCE_ARROW_SCHEMA, compression=compression) as writer:
+            for result in self.iter_extract(filings):
+                summary["filings"] += 1
+                if not result.ok:
+                    summary["failed"] += 1
+                    summary["errors"].append({"index": result.index, "doc_id": result.doc_id, "error": result.error})
+                    continue
+                if result.batch.num_rows:
+                    writer.write_batch(result.batch)
+                    summary["evidence"] += result.batch.num_rows
+
+        summary["elapsed_seconds"] = time.perf_counter() - started
+        logger.info(
+            f"Parallel extraction complete: {summary['filings'] - summary['failed']}/{summary['filings']} "
+            f"successful, {summary['evidence']} evidence rows in {summary['elapsed_seconds']:.1f}s"
+        )
+        return summary
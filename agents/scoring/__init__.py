@@ -10,6 +10,7 @@ from agents.scoring.rubric_models import (
     MaturityRubric
 )
 from agents.scoring.rubric_loader import RubricLoader
+from agents.scoring.compiled_rubric import CompiledRubric, get_compiled_rubric
 from agents.scoring.characteristic_matcher import CharacteristicMatcher, MatchResult
 from agents.scoring.evidence_table_generator import (
     EvidenceTableGenerator,
@@ -22,6 +23,8 @@ __all__ = [
     'ThemeRubric',
     'MaturityRubric',
     'RubricLoader',
+    'CompiledRubric',
+    'get_compiled_rubric',
     'CharacteristicMatcher',
     'MatchResult',
     'EvidenceTableGenerator',
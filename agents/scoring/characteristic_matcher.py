@@ -1,16 +1,28 @@
 """Semantic matching of evidence to rubric characteristics (CP-2).
 
 This module uses watsonx.ai embeddings and cosine similarity to match evidence
-extracts to the most relevant ESG maturity characteristics.
+extracts to the most relevant ESG maturity characteristics. Characteristic
+embeddings are held as one L2-normalized matrix per theme (optionally cached
+on disk by rubric version), so a batch of evidence is scored with a single
+matrix multiply.
 """
 
+import hashlib
+import logging
+import os
+import re
 from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Optional
+from pathlib import Path
+from typing import List, Tuple, Dict, Optional, Sequence
 import numpy as np
 
 from agents.embedding.watsonx_embedder import WatsonxEmbedder
 from agents.scoring.rubric_models import StageCharacteristic, MaturityRubric
 
+logger = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
 
 @dataclass
 class MatchResult:
@@ -34,6 +46,35 @@ class MatchResult:
             )
 
 
+@dataclass(frozen=True)
+class CharacteristicMatrix:
+    """Precomputed characteristic embeddings for one rubric theme.
+
+    Attributes:
+        theme: Theme code the matrix belongs to
+        characteristics: Stage characteristics in row order
+        matrix: L2-normalized embeddings, shape (len(characteristics), dim)
+    """
+    theme: str
+    characteristics: Tuple[StageCharacteristic, ...]
+    matrix: np.ndarray
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows stay zero).
+
+    Args:
+        matrix: 2-D array of embeddings
+
+    Returns:
+        float32 array with L2-normalized rows
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    normalized: np.ndarray = matrix / (norms + 1e-10)
+    return normalized
+
+
 class CharacteristicMatcher:
     """Matcher for evidence extracts to rubric characteristics via semantic similarity.
 
@@ -44,13 +85,15 @@ class CharacteristicMatcher:
         embedder: watsonx.ai embedding client
         similarity_threshold: Minimum similarity for valid match (default: 0.6)
         cache_embeddings: Whether to cache characteristic embeddings
+        cache_dir: Directory for on-disk characteristic matrices (None = memory only)
     """
 
     def __init__(
         self,
         embedder: WatsonxEmbedder,
         similarity_threshold: float = 0.6,
-        cache_embeddings: bool = True
+        cache_embeddings: bool = True,
+        cache_dir: Optional[str] = None
     ) -> None:
         """Initialize characteristic matcher.
 
@@ -58,6 +101,8 @@ class CharacteristicMatcher:
             embedder: Configured watsonx.ai embedder
             similarity_threshold: Minimum similarity score for valid match
             cache_embeddings: Cache characteristic embeddings for efficiency
+            cache_dir: Persist characteristic matrices here, keyed by rubric
+                version (or from RUBRIC_EMBED_CACHE_DIR env var)
 
         Raises:
             ValueError: If similarity_threshold not in range [0, 1]
@@ -71,7 +116,9 @@ class CharacteristicMatcher:
         self.embedder = embedder
         self.similarity_threshold = similarity_threshold
         self.cache_embeddings = cache_embeddings
-        self._characteristic_cache: Dict[str, np.ndarray] = {}
+        cache_dir = cache_dir or os.getenv("RUBRIC_EMBED_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._matrix_cache: Dict[Tuple[str, str], CharacteristicMatrix] = {}
 
     def match_evidence_to_characteristic(
         self,
@@ -92,48 +139,7 @@ class CharacteristicMatcher:
         Raises:
             ValueError: If evidence is empty or theme not found in rubric
         """
-        # Validate inputs
-        if not evidence_extract or not evidence_extract.strip():
-            raise ValueError("Evidence extract cannot be empty")
-
-        if theme not in rubric.themes:
-            raise ValueError(f"Theme '{theme}' not found in rubric")
-
-        # Get all characteristics for theme
-        theme_rubric = rubric.themes[theme]
-        all_characteristics = theme_rubric.get_all_characteristics()
-
-        if not all_characteristics:
-            raise ValueError(f"No characteristics found for theme '{theme}'")
-
-        # Generate embedding for evidence
-        evidence_embedding = self.embedder.embed_text(evidence_extract)
-
-        # Find best-matching characteristic
-        best_match: Optional[Tuple[StageCharacteristic, float]] = None
-        best_similarity = -1.0
-
-        for characteristic in all_characteristics:
-            # Get or generate characteristic embedding
-            char_embedding = self._get_characteristic_embedding(characteristic)
-
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(evidence_embedding, char_embedding)
-
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = (characteristic, similarity)
-
-        if best_match is None:
-            raise RuntimeError(
-                f"Failed to find match for evidence in theme '{theme}'"
-            )
-
-        return MatchResult(
-            characteristic=best_match[0],
-            similarity_score=best_match[1],
-            evidence_extract=evidence_extract
-        )
+        return self.match_batch([evidence_extract], theme, rubric)[0]
 
     def match_batch(
         self,
@@ -154,71 +160,189 @@ class CharacteristicMatcher:
         Raises:
             ValueError: If evidence_extracts is empty
         """
-        if not evidence_extracts:
-            raise ValueError("Evidence extracts list cannot be empty")
+        return [
+            matches[0]
+            for matches in self.match_top_n(evidence_extracts, theme, rubric, top_n=1)
+        ]
 
-        results: List[MatchResult] = []
-        for evidence in evidence_extracts:
-            result = self.match_evidence_to_characteristic(
-                evidence_extract=evidence,
-                theme=theme,
-                rubric=rubric
-            )
-            results.append(result)
+    def match_top_n(
+        self,
+        evidence_extracts: Sequence[str],
+        theme: str,
+        rubric: MaturityRubric,
+        top_n: int = 3
+    ) -> List[List[MatchResult]]:
+        """Rank characteristics for every evidence extract with one GEMM.
 
-        return results
+        Evidence is embedded in a single batch, normalized, and multiplied
+        against the theme's characteristic matrix; each row of the resulting
+        similarity matrix is then ranked.
 
-    def _get_characteristic_embedding(
+        Args:
+            evidence_extracts: List of evidence texts
+            theme: Theme ID
+            rubric: Maturity rubric
+            top_n: Matches to return per extract (capped at the theme size)
+
+        Returns:
+            One list per extract of MatchResults, best match first
+
+        Raises:
+            ValueError: If evidence is empty, top_n < 1, or theme not found
+        """
+        if not evidence_extracts:
+            raise ValueError("Evidence extracts list cannot be empty")
+        if top_n < 1:
+            raise ValueError(f"top_n must be positive, got {top_n}")
+        for evidence in evidence_extracts:
+            if not evidence or not evidence.strip():
+                raise ValueError("Evidence extract cannot be empty")
+
+        theme_matrix = self.get_characteristic_matrix(theme, rubric)
+        evidence_matrix = _normalize_rows(self._embed_texts(list(evidence_extracts)))
+
+        # (N, dim) @ (dim, M) -> (N, M) cosine similarities
+        similarities = evidence_matrix @ theme_matrix.matrix.T
+        top_n = min(top_n, similarities.shape[1])
+        if top_n == 1:
+            ranked = np.argmax(similarities, axis=1)[:, None]
+        else:
+            # Stable sort keeps the earliest stage on ties, like argmax
+            ranked = np.argsort(-similarities, axis=1, kind="stable")[:, :top_n]
+
+        # float32 round-off can put identical vectors slightly above 1.0
+        scores = np.clip(np.take_along_axis(similarities, ranked, axis=1), 0.0, 1.0)
+
+        return [
+            [
+                MatchResult(
+                    characteristic=theme_matrix.characteristics[column],
+                    similarity_score=float(score),
+                    evidence_extract=evidence
+                )
+                for column, score in zip(row_columns, row_scores)
+            ]
+            for evidence, row_columns, row_scores in zip(evidence_extracts, ranked, scores)
+        ]
+
+    def get_characteristic_matrix(
         self,
-        characteristic: StageCharacteristic
-    ) -> np.ndarray:
-        """Get embedding for characteristic (with caching).
+        theme: str,
+        rubric: MaturityRubric
+    ) -> CharacteristicMatrix:
+        """Get the normalized characteristic matrix for a theme (with caching).
+
+        Looks in memory, then in ``cache_dir``, before embedding the theme's
+        stage descriptors in one batch.
 
         Args:
-            characteristic: Rubric characteristic
+            theme: Theme ID
+            rubric: Maturity rubric
 
         Returns:
-            Embedding vector for characteristic description
-        """
-        # Generate cache key from characteristic
-        cache_key = f"{characteristic.theme}_{characteristic.stage}_{characteristic.description}"
+            CharacteristicMatrix for the theme
 
-        # Check cache
-        if self.cache_embeddings and cache_key in self._characteristic_cache:
-            return self._characteristic_cache[cache_key]
+        Raises:
+            ValueError: If theme not found or has no characteristics
+        """
+        if theme not in rubric.themes:
+            raise ValueError(f"Theme '{theme}' not found in rubric")
 
-        # Generate embedding
-        embedding = self.embedder.embed_text(characteristic.description)
+        characteristics = tuple(rubric.themes[theme].ordered_stages)
+        if not characteristics:
+            raise ValueError(f"No characteristics found for theme '{theme}'")
 
-        # Cache if enabled
+        memory_key = (rubric.version, theme)
+        cached = self._matrix_cache.get(memory_key)
+        if cached is not None:
+            return cached
+
+        # Fall back to the stage label when a descriptor is blank
+        texts = [c.descriptor.strip() or c.label for c in characteristics]
+        cache_path = self._matrix_cache_path(rubric.version, theme, texts)
+
+        matrix: Optional[np.ndarray] = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                matrix = np.load(cache_path, allow_pickle=False)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable characteristic cache {cache_path}: {e}")
+                matrix = None
+            if matrix is not None and matrix.shape[0] != len(characteristics):
+                matrix = None
+
+        if matrix is None:
+            matrix = _normalize_rows(self._embed_texts(texts))
+            if cache_path is not None:
+                self._write_matrix(cache_path, matrix)
+
+        theme_matrix = CharacteristicMatrix(
+            theme=theme,
+            characteristics=characteristics,
+            matrix=matrix
+        )
         if self.cache_embeddings:
-            self._characteristic_cache[cache_key] = embedding
+            self._matrix_cache[memory_key] = theme_matrix
+        return theme_matrix
 
-        return embedding
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in one embedder batch.
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors.
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), embedding_dim)
+        """
+        return np.vstack(self.embedder.embed_batch(texts)).astype(np.float32, copy=False)
+
+    def _matrix_cache_path(
+        self,
+        version: str,
+        theme: str,
+        texts: List[str]
+    ) -> Optional[Path]:
+        """Build the on-disk cache path for a theme matrix.
+
+        The file name carries the rubric version, embedding model and a digest
+        of the descriptor texts, so edits to the rubric never reuse stale rows.
 
         Args:
-            vec1: First embedding vector
-            vec2: Second embedding vector
+            version: Rubric version
+            theme: Theme ID
+            texts: Descriptor texts in row order
 
         Returns:
-            Cosine similarity score in range [-1, 1]
-            (1 = identical, 0 = orthogonal, -1 = opposite)
+            Path to the ``.npy`` file, or None when disk caching is off
         """
-        # Normalize vectors to unit length
-        vec1_norm = vec1 / (np.linalg.norm(vec1) + 1e-10)
-        vec2_norm = vec2 / (np.linalg.norm(vec2) + 1e-10)
+        if self.cache_dir is None or not self.cache_embeddings:
+            return None
+
+        digest = hashlib.sha256("\x1f".join(texts).encode("utf-8")).hexdigest()[:16]
+        model_id = getattr(self.embedder, "model_id", "embedder")
+        parts = [version, model_id, theme, digest]
+        name = "__".join(_UNSAFE_FILENAME_CHARS.sub("_", str(part)) for part in parts)
+        return self.cache_dir / f"{name}.npy"
 
-        # Dot product of normalized vectors = cosine similarity
-        similarity = np.dot(vec1_norm, vec2_norm)
+    def _write_matrix(self, cache_path: Path, matrix: np.ndarray) -> None:
+        """Atomically persist a characteristic matrix.
 
-        return float(similarity)
+        Args:
+            cache_path: Destination ``.npy`` path
+            matrix: Normalized characteristic matrix
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as handle:
+                np.save(handle, matrix, allow_pickle=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write characteristic cache {cache_path}: {e}")
 
     def clear_cache(self) -> None:
-        """Clear characteristic embedding cache."""
-        self._characteristic_cache.clear()
+        """Clear in-memory characteristic matrices (disk cache is kept)."""
+        self._matrix_cache.clear()
 
     def get_cache_size(self) -> int:
         """Get number of cached characteristic embeddings.
@@ -226,4 +350,4 @@ class CharacteristicMatcher:
         Returns:
             Number of characteristics in cache
         """
-        return len(self._characteristic_cache)
+        return sum(len(m.characteristics) for m in self._matrix_cache.values())
@@ -0,0 +1,332 @@
+"""
+Compiled Rubric Artifacts
+
+One immutable object per rubric source file, shared by every rubric consumer
+(RubricLoader, RubricV3Scorer, RubricScorer, RubricV3Loader and
+apps.rubric.loader). The JSON is parsed, validated into a MaturityRubric and
+its stage keyword tables are built once per process instead of once per
+instantiation, so all code paths see the same themes and scoring rules.
+The frozen data stays internal: loaders that hand rubric JSON to callers
+return plain copies (CompiledRubric.to_dict()), which serialize normally.
+
+Artifacts are keyed by source path and the SHA-256 of the file bytes. Each
+get_compiled_rubric() call costs one stat(): the file is re-hashed only when
+its mtime/size change and recompiled only when the hash changes.
+
+Optionally (cache_dir argument or RUBRIC_CACHE_DIR), compiled artifacts are
+pickled to <cache_dir>/<stem>.<sha256[:16]>.pkl so fresh processes skip
+compilation. The cache directory must be trusted: it is unpickled as-is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from agents.scoring.rubric_models import MaturityRubric, StageCharacteristic, ThemeRubric
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUBRIC_PATH = Path("rubrics/maturity_v3.json")
+CACHE_DIR_ENV = "RUBRIC_CACHE_DIR"
+
+# Bump when the pickled layout changes; older cache files are ignored
+_CACHE_FORMAT = 1
+
+StageKeywords = Mapping[str, Mapping[int, Tuple[str, ...]]]
+StageDescriptors = Mapping[str, Mapping[int, str]]
+
+
+def freeze(value: Any) -> Any:
+    """Deep-copy JSON data into read-only mappings and tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Deep-copy frozen data back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def build_maturity_rubric(payload: Mapping[str, Any]) -> MaturityRubric:
+    """Validate rubric JSON into typed MaturityRubric definitions."""
+    version = str(payload.get("version", "3.0"))
+    themes_payload = payload.get("themes", [])
+
+    theme_order: List[str] = []
+    themes: Dict[str, ThemeRubric] = {}
+
+    for theme_entry in themes_payload:
+        code = str(theme_entry["code"])
+        name = str(theme_entry.get("name", code))
+        intent = str(theme_entry.get("intent", ""))
+        stages_payload = theme_entry.get("stages", {})
+
+        stage_map: Dict[int, StageCharacteristic] = {}
+        for stage_key, stage_data in stages_payload.items():
+            stage = int(stage_key)
+            label = str(stage_data.get("label", f"Stage {stage}"))
+            descriptor = str(stage_data.get("descriptor", ""))
+            examples_payload = stage_data.get("evidence_examples", [])
+            evidence_examples = tuple(str(item) for item in examples_payload)
+
+            stage_map[stage] = StageCharacteristic(
+                stage=stage,
+                label=label,
+                descriptor=descriptor,
+                evidence_examples=evidence_examples,
+            )
+
+        theme_order.append(code)
+        themes[code] = ThemeRubric(
+            code=code,
+            name=name,
+            intent=intent,
+            stages=stage_map,
+        )
+
+    return MaturityRubric(version=version, themes=themes, theme_order=tuple(theme_order))
+
+
+def stage_lookup_tables(rubric: MaturityRubric) -> Tuple[StageKeywords, StageDescriptors, Tuple[str, ...]]:
+    """
+    Build the keyword tables scorers match findings against.
+
+    Args:
+        rubric: Typed rubric
+
+    Returns:
+        (stage keywords per theme, stage descriptors per theme, every
+        distinct keyword across the rubric in first-seen order)
+    """
+    stage_keywords: Dict[str, Mapping[int, Tuple[str, ...]]] = {}
+    stage_descriptors: Dict[str, Mapping[int, str]] = {}
+    keywords: Dict[str, None] = {}
+
+    for theme in rubric.themes_in_order:
+        stage_keywords[theme.code] = MappingProxyType({
+            stage.stage: stage.keywords for stage in theme.ordered_stages
+        })
+        stage_descriptors[theme.code] = MappingProxyType({
+            stage.stage: stage.descriptor or stage.label for stage in theme.ordered_stages
+        })
+        for stage in theme.ordered_stages:
+            keywords.update(dict.fromkeys(stage.keywords))
+
+    return MappingProxyType(stage_keywords), MappingProxyType(stage_descriptors), tuple(keywords)
+
+
+@dataclass(frozen=True)
+class CompiledRubric:
+    """
+    Immutable, process-wide compiled form of one rubric source file.
+
+    Attributes:
+        source_path: Rubric JSON file
+        source_sha256: SHA-256 of the file bytes the artifact was built from
+        data: Source JSON as read-only mappings and tuples
+        rubric: Typed themes and stage characteristics
+        stage_keywords: Theme code -> stage -> keywords
+        stage_descriptors: Theme code -> stage -> descriptor (label if empty)
+        keywords: Every distinct stage keyword, in first-seen order
+    """
+
+    source_path: Path
+    source_sha256: str
+    data: Mapping[str, Any]
+    rubric: MaturityRubric
+    stage_keywords: StageKeywords
+    stage_descriptors: StageDescriptors
+    keywords: Tuple[str, ...]
+
+    @property
+    def version(self) -> str:
+        """Rubric version string."""
+        return self.rubric.version
+
+    @property
+    def scoring_rules(self) -> Mapping[str, Any]:
+        """Read-only scoring rules section."""
+        rules: Mapping[str, Any] = self.data.get("scoring_rules", MappingProxyType({}))
+        return rules
+
+    def matched_keywords(self, corpus: str) -> FrozenSet[str]:
+        """
+        Rubric keywords occurring in a lower-cased corpus.
+
+        Each distinct keyword is tested once, however many stages and themes
+        share it; scorers then intersect stage keyword lists with the result.
+        """
+        return frozenset(keyword for keyword in self.keywords if keyword in corpus)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable copy of the source JSON."""
+        data: Dict[str, Any] = thaw(self.data)
+        return data
+
+
+def _assemble(source_path: Path, sha256: str, payload: Mapping[str, Any], rubric: MaturityRubric) -> CompiledRubric:
+    """Create the artifact from parsed JSON and its typed rubric."""
+    stage_keywords, stage_descriptors, keywords = stage_lookup_tables(rubric)
+    return CompiledRubric(
+        source_path=source_path,
+        source_sha256=sha256,
+        data=freeze(payload),
+        rubric=rubric,
+        stage_keywords=stage_keywords,
+        stage_descriptors=stage_descriptors,
+        keywords=keywords,
+    )
+
+
+def compile_rubric(path: Path) -> CompiledRubric:
+    """
+    Parse and compile a rubric file, bypassing every cache.
+
+    Args:
+        path: Rubric JSON file
+
+    Returns:
+        Freshly compiled artifact
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+        ValueError: If the JSON is not a valid rubric
+    """
+    raw = Path(path).read_bytes()
+    return _compile_bytes(Path(path), raw, hashlib.sha256(raw).hexdigest())
+
+
+def _compile_bytes(path: Path, raw: bytes, sha256: str) -> CompiledRubric:
+    """Compile already-read rubric bytes."""
+    payload = json.loads(raw.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError("Rubric must be a JSON object")
+    return _assemble(path, sha256, payload, build_maturity_rubric(payload))
+
+
+def _binary_cache_path(cache_dir: Path, source: Path, sha256: str) -> Path:
+    """Cache file for one source version."""
+    return cache_dir / f"{source.stem}.{sha256[:16]}.pkl"
+
+
+def _read_binary_cache(cache_file: Path, source: Path, sha256: str) -> Optional[CompiledRubric]:
+    """Load a pickled artifact, or None when missing, stale or unreadable."""
+    try:
+        with cache_file.open("rb") as handle:
+            entry = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable rubric cache {cache_file}: {e}")
+        return None
+
+    if entry.get("format") != _CACHE_FORMAT or entry.get("source_sha256") != sha256:
+        return None
+    return _assemble(source, sha256, entry["payload"], entry["rubric"])
+
+
+def _write_binary_cache(cache_file: Path, compiled: CompiledRubric) -> None:
+    """Atomically pickle an artifact; failures only cost the next process a recompile."""
+    entry = {
+        "format": _CACHE_FORMAT,
+        "source_sha256": compiled.source_sha256,
+        "payload": compiled.to_dict(),
+        "rubric": compiled.rubric,
+    }
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_file.open("wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write rubric cache {cache_file}: {e}")
+        tmp_file.unlink(missing_ok=True)
+
+
+# Absolute source path -> ((mtime_ns, size), artifact)
+_COMPILED: Dict[str, Tuple[Tuple[int, int], CompiledRubric]] = {}
+_LOCK = threading.Lock()
+
+
+def get_compiled_rubric(path: Path | str | None = None, cache_dir: Path | str | None = None) -> CompiledRubric:
+    """
+    Shared compiled artifact for a rubric file.
+
+    Args:
+        path: Rubric JSON file (default: rubrics/maturity_v3.json)
+        cache_dir: Directory for pickled artifacts (default: $RUBRIC_CACHE_DIR;
+            unset disables the binary cache)
+
+    Returns:
+        The same CompiledRubric object until the file's content changes
+
+    Raises:
+        FileNotFoundError: If the rubric file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+        ValueError: If the JSON is not a valid rubric
+    """
+    source = Path(path) if path is not None else DEFAULT_RUBRIC_PATH
+    key = os.path.abspath(source)
+    try:
+        stat = os.stat(key)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Compiled rubric not found at {source}") from None
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _COMPILED.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _LOCK:
+        cached = _COMPILED.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        raw = source.read_bytes()
+        sha256 = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached[1].source_sha256 == sha256:
+            # Touched but unchanged: keep the existing artifact
+            compiled = cached[1]
+        else:
+            compiled = _load(source, raw, sha256, cache_dir)
+        _COMPILED[key] = (signature, compiled)
+        return compiled
+
+
+def _load(source: Path, raw: bytes, sha256: str, cache_dir: Path | str | None) -> CompiledRubric:
+    """Compile a rubric version, going through the binary cache when enabled."""
+    cache_root = cache_dir if cache_dir is not None else os.environ.get(CACHE_DIR_ENV)
+    if not cache_root:
+        return _compile_bytes(source, raw, sha256)
+
+    cache_file = _binary_cache_path(Path(cache_root), source, sha256)
+    compiled = _read_binary_cache(cache_file, source, sha256)
+    if compiled is None:
+        compiled = _compile_bytes(source, raw, sha256)
+        _write_binary_cache(cache_file, compiled)
+        logger.info(f"Compiled rubric {source} ({sha256[:12]}) -> {cache_file}")
+    return compiled
+
+
+def clear_compiled_rubric_cache() -> None:
+    """Drop every in-process artifact (binary cache files are kept)."""
+    with _LOCK:
+        _COMPILED.clear()
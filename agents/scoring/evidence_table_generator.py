@@ -121,19 +121,29 @@ class EvidenceTableGenerator:
         if not evidence_extracts:
             raise ValueError("Evidence extracts list cannot be empty")
 
-        # Match all evidence to characteristics
+        # Match all evidence to characteristics in one batch; blank extracts
+        # cannot be embedded and are skipped up front
+        usable = [evidence for evidence in evidence_extracts if evidence and evidence.strip()]
         match_results: List[MatchResult] = []
-        for evidence in evidence_extracts:
-            try:
-                result = self.matcher.match_evidence_to_characteristic(
-                    evidence_extract=evidence,
+        try:
+            if usable:
+                match_results = self.matcher.match_batch(
+                    evidence_extracts=usable,
                     theme=theme,
                     rubric=rubric
                 )
-                match_results.append(result)
-            except Exception as e:
-                # Skip evidence that fails to match
-                continue
+        except Exception:
+            # Fall back to per-extract matching, skipping evidence that fails
+            for evidence in usable:
+                try:
+                    result = self.matcher.match_evidence_to_characteristic(
+                        evidence_extract=evidence,
+                        theme=theme,
+                        rubric=rubric
+                    )
+                    match_results.append(result)
+                except Exception:
+                    continue
 
         if not match_results:
             raise RuntimeError(
@@ -158,7 +168,7 @@ class EvidenceTableGenerator:
 
             row = EvidenceRow(
                 priority_score=priority_score,
-                characteristic=match.characteristic.description,
+                characteristic=match.characteristic.descriptor,
                 evidence_extract=match.evidence_extract,
                 maturity_stage=match.characteristic.stage
             )
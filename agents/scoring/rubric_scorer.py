@@ -12,6 +12,8 @@ from pathlib import Path
 import json
 import logging
 
+from agents.scoring.compiled_rubric import get_compiled_rubric
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,15 +34,12 @@ class RubricScorer:
         self.rubric = self._load_rubric()
 
     def _load_rubric(self) -> Dict[str, Any]:
-        """Load canonical rubric from JSON."""
+        """Load canonical rubric (plain copy of the shared compiled artifact)."""
         if not self.rubric_path.exists():
             raise FileNotFoundError(f"Rubric not found at {self.rubric_path}")
 
         try:
-            rubric = json.loads(self.rubric_path.read_text())
-            if not isinstance(rubric, dict):
-                raise ValueError("Rubric must be a JSON object")
-            return rubric
+            return get_compiled_rubric(self.rubric_path).to_dict()
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in rubric: {e}")
 
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import math
+import threading
 from dataclasses import dataclass
+from pathlib import Path
 from statistics import mean
-from typing import Any, Dict, List, Mapping, Sequence
+from typing import AbstractSet, Any, Dict, List, Mapping, Optional, Sequence
 
+from agents.scoring.compiled_rubric import get_compiled_rubric, stage_lookup_tables
 from agents.scoring.rubric_loader import RubricLoader
 from agents.scoring.rubric_models import MaturityRubric, StageCharacteristic
 
@@ -30,11 +33,18 @@ class RubricV3Scorer:
         rubric: MaturityRubric | None = None,
     ) -> None:
         self.loader = loader or RubricLoader()
-        self.rubric: MaturityRubric = rubric or self.loader.load()
+        if rubric is None:
+            # Shared artifact: lookup tables are already built
+            compiled = self.loader.compile()
+            self.rubric: MaturityRubric = compiled.rubric
+            lookups = (compiled.stage_keywords, compiled.stage_descriptors, compiled.keywords)
+        else:
+            self.rubric = rubric
+            lookups = stage_lookup_tables(rubric)
         self._theme_order: Sequence[str] = self.rubric.theme_order
-        self._stage_keywords: Dict[str, Dict[int, Sequence[str]]] = {}
-        self._stage_descriptors: Dict[str, Dict[int, str]] = {}
-        self._prepare_lookup_structures()
+        self._stage_keywords: Mapping[str, Mapping[int, Sequence[str]]] = lookups[0]
+        self._stage_descriptors: Mapping[str, Mapping[int, str]] = lookups[1]
+        self._keywords: Sequence[str] = lookups[2]
 
     # ------------------------------------------------------------------ #
     # Public scoring API
@@ -43,10 +53,13 @@ class RubricV3Scorer:
         """Score a finding across all rubric dimensions."""
         text = str(finding.get("finding_text", "") or "")
         framework = str(finding.get("framework", "") or "")
+        combined = f"{text} {framework}".lower()
+        # Test each distinct keyword once; stages then match against the hit set
+        hits = frozenset(keyword for keyword in self._keywords if keyword in combined)
 
         scores: Dict[str, DimensionScore] = {}
         for code in self._theme_order:
-            scores[code] = self._score_dimension(code, text, framework)
+            scores[code] = self._score_dimension(code, hits)
         return scores
 
     def calculate_overall_maturity(self, scores: Mapping[str, DimensionScore]) -> tuple[float, str]:
@@ -77,22 +90,13 @@ class RubricV3Scorer:
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
-    def _prepare_lookup_structures(self) -> None:
-        for theme in self.rubric.themes_in_order:
-            self._stage_keywords[theme.code] = {}
-            self._stage_descriptors[theme.code] = {}
-            for stage in theme.ordered_stages:
-                self._stage_keywords[theme.code][stage.stage] = stage.keywords
-                self._stage_descriptors[theme.code][stage.stage] = stage.descriptor or stage.label
-
-    def _score_dimension(self, theme_code: str, text: str, framework: str) -> DimensionScore:
+    def _score_dimension(self, theme_code: str, hits: AbstractSet[str]) -> DimensionScore:
         theme = self.rubric.get_theme(theme_code)
-        combined = f"{text} {framework}".lower()
 
         best_stage = 0
         best_matches: List[str] = []
         for candidate in reversed(theme.ordered_stages):
-            matches = _match_keywords(candidate, combined)
+            matches = _match_keywords(candidate, hits)
             if matches and (candidate.stage > best_stage or len(matches) > len(best_matches)):
                 best_stage = candidate.stage
                 best_matches = matches
@@ -125,6 +129,29 @@ class RubricV3Scorer:
         return labels.get(max(0, min(bucket, 4)), "Nascent")
 
 
-def _match_keywords(stage: StageCharacteristic, corpus: str) -> List[str]:
-    matches = [keyword for keyword in stage.keywords if keyword in corpus]
+def _match_keywords(stage: StageCharacteristic, hits: AbstractSet[str]) -> List[str]:
+    matches = [keyword for keyword in stage.keywords if keyword in hits]
     return matches
+
+
+_SHARED_SCORER: Optional[RubricV3Scorer] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_scorer(compiled_path: Path | None = None) -> RubricV3Scorer:
+    """
+    Process-wide scorer over the compiled rubric, loaded once.
+
+    The scorer holds no per-call state, so one instance is shared by every
+    request. It is rebuilt only when the compiled rubric artifact changes
+    (see get_compiled_rubric), so a recompiled rubric is picked up without
+    a restart. Callers must treat the returned scorer as read-only.
+    """
+    global _SHARED_SCORER
+    loader = RubricLoader(compiled_path)
+    compiled = get_compiled_rubric(loader.compiled_path)
+
+    with _SHARED_LOCK:
+        if _SHARED_SCORER is None or _SHARED_SCORER.rubric is not compiled.rubric:
+            _SHARED_SCORER = RubricV3Scorer(loader=loader)
+        return _SHARED_SCORER
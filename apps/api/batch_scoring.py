@@ -0,0 +1,198 @@
+"""
+Batch scoring for POST /score/batch.
+
+Items are grouped by company-year: each group loads its data and fits BM25
+once (demo_flow.load_corpus), then every query in the group is scored
+against that corpus (demo_flow.score_corpus). Groups run in parallel on the
+shared score executor, and each item's result is streamed back as one
+NDJSON line as soon as it completes, in completion order. Each line
+carries the item's index so clients can re-associate results.
+
+A loaded corpus cannot be pickled, so on a process pool each group's misses
+run as one job (demo_flow.score_queries) that loads and scores inside the
+worker; the group's lines are then streamed together when that job ends.
+
+Line format:
+    {"index": 3, "status": "ok", "result": {...ScoreResponse...}}
+    {"index": 4, "status": "error", "error": {"code": 404, "detail": "..."}}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from apps.api.score_executor import ExecutorSaturated, ScoreExecutor
+from apps.pipeline.company_manifest import get_company_manifest, normalize_company
+from apps.pipeline.score_cache import ScoreResponseCache, data_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Saturation retries before an item is reported as 503
+MAX_SUBMIT_ATTEMPTS = 20
+DEFAULT_YEAR = 2025
+
+
+def _line(payload: Dict[str, Any]) -> str:
+    """Serialize one NDJSON line."""
+    return json.dumps(payload, sort_keys=True, default=str) + "\n"
+
+
+def _error(index: int, code: int, detail: str) -> Dict[str, Any]:
+    """Per-item error payload."""
+    return {"index": index, "status": "error", "error": {"code": code, "detail": detail}}
+
+
+async def _submit(executor: ScoreExecutor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a job, waiting out transient saturation from other traffic."""
+    for attempt in range(MAX_SUBMIT_ATTEMPTS):
+        try:
+            return await executor.run(fn, *args, **kwargs)
+        except ExecutorSaturated as e:
+            if attempt == MAX_SUBMIT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(min(e.retry_after, 0.05 * (attempt + 1)))
+
+
+async def stream_batch(
+    items: List[Dict[str, Any]],
+    semantic: bool,
+    alpha: float,
+    k: int,
+    executor: ScoreExecutor,
+    cache: ScoreResponseCache,
+    to_payload: Callable[[str, int, Dict[str, Any]], Dict[str, Any]],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncIterator[str]:
+    """
+    Score a batch and yield NDJSON lines as items complete.
+
+    Args:
+        items: Dicts with company, year (optional) and query
+        semantic: Enable semantic retrieval
+        alpha: Fusion weight (already forced to 1.0 by the caller when lexical)
+        k: Top-k
+        executor: Worker pool shared with /score
+        cache: Response cache shared with /score
+        to_payload: Converts (company, year, run_score result) to the API schema
+        is_disconnected: Client disconnect probe
+
+    Yields:
+        NDJSON lines
+    """
+    from apps.pipeline import demo_flow
+
+    manifest = get_company_manifest()
+    groups: "OrderedDict[Tuple[str, int], List[Tuple[int, Dict[str, Any]]]]" = OrderedDict()
+    records: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+    for index, item in enumerate(items):
+        year = item.get("year") or DEFAULT_YEAR
+        record = manifest.get(item["company"], year)
+        if record is None:
+            yield _line(_error(index, 404, f"Company '{item['company']}' with year {year} not found in manifest"))
+            continue
+        # Group on the resolved manifest record, so aliases share one corpus
+        group_key = (normalize_company(record.get("company", item["company"])), year)
+        records[group_key] = record
+        groups.setdefault(group_key, []).append((index, {**item, "year": year}))
+
+    results: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    reported: Set[int] = set()
+    # Keep at most one job per worker in flight so a large batch never trips
+    # admission control for interactive /score traffic
+    slots = asyncio.Semaphore(executor.max_workers)
+
+    async def emit(payload: Dict[str, Any]) -> None:
+        """Queue one line for the stream and mark its item done."""
+        reported.add(payload["index"])
+        await results.put(payload)
+
+    async def run_item(corpus: Any, index: int, item: Dict[str, Any], key: str) -> None:
+        """Score one query against a loaded corpus."""
+        async with slots:
+            result = await _submit(
+                executor, demo_flow.score_corpus, corpus, item["query"],
+                is_disconnected=is_disconnected, semantic=semantic, alpha=alpha, k=k, seed=42,
+            )
+        cache.put(key, result)
+        await emit({"index": index, "status": "ok", "result": to_payload(item["company"], item["year"], result)})
+
+    async def score_group(group_key: Tuple[str, int], members: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Serve cache hits, then load the corpus once for the misses."""
+        fingerprint = data_fingerprint(records[group_key])
+        misses = []
+        for index, item in members:
+            key = cache.make_key(
+                demo_flow.make_trace_id(item["company"], item["year"], item["query"], alpha, k),
+                semantic,
+                fingerprint,
+            )
+            cached = await cache.get_async(key)
+            if cached is not None:
+                await emit({"index": index, "status": "ok", "result": to_payload(item["company"], item["year"], cached)})
+            else:
+                misses.append((index, item, key))
+        if not misses:
+            return
+
+        company, year = misses[0][1]["company"], misses[0][1]["year"]
+        if executor.kind == "process":
+            await score_group_in_worker(company, year, misses)
+            return
+
+        async with slots:
+            corpus = await _submit(
+                executor, demo_flow.load_corpus, company, year, is_disconnected=is_disconnected
+            )
+
+        outcomes = await asyncio.gather(
+            *[run_item(corpus, index, item, key) for index, item, key in misses],
+            return_exceptions=True,
+        )
+        for (index, _, _), outcome in zip(misses, outcomes):
+            if isinstance(outcome, Exception):
+                code = 503 if isinstance(outcome, ExecutorSaturated) else 500
+                await emit(_error(index, code, f"Scoring failed: {outcome}"))
+
+    async def score_group_in_worker(
+        company: str, year: int, misses: List[Tuple[int, Dict[str, Any], str]]
+    ) -> None:
+        """Load and score a group's misses in one process-pool job."""
+        async with slots:
+            outcomes = await _submit(
+                executor, demo_flow.score_queries, company, year, [item["query"] for _, item, _ in misses],
+                is_disconnected=is_disconnected, semantic=semantic, alpha=alpha, k=k, seed=42,
+            )
+        for (index, item, key), outcome in zip(misses, outcomes):
+            if isinstance(outcome, Exception):
+                await emit(_error(index, 500, f"Scoring failed: {outcome}"))
+                continue
+            cache.put(key, outcome)
+            await emit({"index": index, "status": "ok", "result": to_payload(item["company"], item["year"], outcome)})
+
+    async def run_group(group_key: Tuple[str, int], members: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Run a group; a failure is reported for each of its unfinished items."""
+        try:
+            await score_group(group_key, members)
+        except Exception as e:
+            logger.error(f"Batch group {group_key} failed: {e}")
+            code = 503 if isinstance(e, ExecutorSaturated) else 500
+            for index, _ in members:
+                if index not in reported:
+                    await emit(_error(index, code, f"Scoring failed: {e}"))
+
+    tasks = [asyncio.ensure_future(run_group(key, members)) for key, members in groups.items()]
+    pending = sum(len(members) for members in groups.values())
+
+    try:
+        while pending:
+            payload = await results.get()
+            pending -= 1
+            yield _line(payload)
+    finally:
+        for task in tasks:
+            task.cancel()
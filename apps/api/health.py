@@ -7,15 +7,20 @@ SCA v13.8-MEA Phase 9
 """
 
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional
 
 from fastapi import APIRouter, Response, status
 
 
-def create_router() -> APIRouter:
+def create_router(readiness_check: Optional[Callable[[], Dict[str, Any]]] = None) -> APIRouter:
     """
     Create health check router with readiness and liveness probes.
 
+    Args:
+        readiness_check: Returns a payload with a boolean "ready" key (plus
+            any detail to report); /ready answers 503 while it is False.
+            Without one the service is always ready.
+
     Returns:
         Configured APIRouter with health endpoints
     """
@@ -49,18 +54,22 @@ def create_router() -> APIRouter:
         summary="Readiness probe",
         response_description="Service is ready to accept traffic"
     )
-    async def readiness() -> Dict[str, bool]:
+    async def readiness(response: Response) -> Dict[str, Any]:
         """
         Kubernetes-style readiness probe.
 
         Indicates whether the service is ready to accept traffic.
-        Returns 200 if ready, 503 if not ready (future enhancement).
+        Returns 200 if ready, 503 while startup warm-up is still running.
 
         Returns:
             Readiness status
         """
-        # Future: Check database connections, cache availability, etc.
-        return {"ready": True}
+        if readiness_check is None:
+            return {"ready": True}
+        payload = readiness_check()
+        if not payload.get("ready"):
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return payload
 
     @router.get(
         "/live",
@@ -17,9 +17,19 @@ import json
 import logging
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from agents.crawler.ledger import IngestLedger
+from apps.api.score_executor import (
+    ClientDisconnected,
+    ExecutorSaturated,
+    get_score_executor,
+    shutdown_score_executor,
+)
+from apps.pipeline.company_manifest import get_company_manifest
+from apps.pipeline.score_cache import data_fingerprint, get_score_cache
 from libs.utils.clock import get_clock
 
 clock = get_clock()
@@ -38,37 +48,40 @@ app.include_router(metrics.router)
 
 # Wire in health check router
 from apps.api import health
+from apps.api.warmup import get_warmup_state, start_warmup
 
-app.include_router(health.create_router())
-
-# Global: companies manifest (loaded on startup)
-COMPANIES_MANIFEST: List[Dict[str, Any]] = []
-
+app.include_router(health.create_router(readiness_check=lambda: get_warmup_state().summary()))
 
 @app.on_event("startup")
 def load_companies() -> None:
-    """Load companies manifest on startup."""
-    global COMPANIES_MANIFEST
-    companies_path = Path("artifacts/demo/companies.json")
-    if companies_path.exists():
-        COMPANIES_MANIFEST = json.loads(companies_path.read_text())
+    """Load companies manifest, then warm up in the background until /ready."""
+    get_company_manifest().refresh(force=True)
+    start_warmup()
+
+
+@app.on_event("shutdown")
+def stop_score_executor() -> None:
+    """Drain the /score worker pool, then flush queued run artifacts."""
+    shutdown_score_executor()
+
+    from apps.pipeline.artifact_sink import close_artifact_sink
+    close_artifact_sink()
 
 
 def get_company_record(company: str, year: int) -> Optional[Dict[str, Any]]:
     """
     Lookup company record from manifest.
 
+    Uses the shared manifest service, so the API and run_score always agree.
+
     Args:
-        company: Company name
+        company: Company name (case/punctuation-insensitive) or alias
         year: Reporting year
 
     Returns:
         Company record or None if not found
     """
-    for rec in COMPANIES_MANIFEST:
-        if rec["company"] == company and rec["year"] == year:
-            return rec
-    return None
+    return get_company_manifest().get(company, year)
 
 
 class ScoreRequest(BaseModel):
@@ -112,9 +125,49 @@ class ScoreResponse(BaseModel):
     parity: ParityResult
 
 
+def to_score_response(company: str, year: int, result: Dict[str, Any]) -> ScoreResponse:
+    """Convert a demo_flow.run_score result to the API schema."""
+    scores: List[DimensionScore] = []
+    for score_item in result.get("scores", []):
+        evidence_objects = [
+            Evidence(
+                doc_id=ev.get("doc_id", ""),
+                quote=ev.get("quote", ""),
+                sha256=ev.get("sha256", "")
+            )
+            for ev in score_item.get("evidence", [])
+        ]
+
+        scores.append(
+            DimensionScore(
+                theme=score_item.get("theme", "ESG"),
+                stage=int(score_item.get("stage", 0)),
+                confidence=float(score_item.get("confidence", 0.0)),
+                stage_descriptor=score_item.get("stage_descriptor", ""),
+                evidence=evidence_objects,
+            )
+        )
+
+    scores.sort(key=lambda item: item.theme)
+
+    return ScoreResponse(
+        company=company,
+        year=year,
+        scores=scores,
+        model_version=result.get("model_version", "v1.0"),
+        rubric_version=result.get("rubric_version", "3.0"),
+        trace_id=result.get("trace_id", "unknown"),
+        parity=ParityResult(
+            parity_ok=bool(result.get("parity", {}).get("parity_ok", False)),
+            evidence_ids=list(result.get("parity", {}).get("evidence_ids", [])),
+        ),
+    )
+
+
 @app.post("/score", response_model=ScoreResponse, tags=["Scoring"], status_code=200)
 async def score_esg(
     request: ScoreRequest,
+    http_request: Request,
     semantic: int = Query(default=0, ge=0, le=1, description="Enable semantic retrieval (0 or 1)"),
     k: int = Query(default=10, ge=1, le=100, description="Top-k results"),
     alpha: float = Query(default=0.6, ge=0.0, le=1.0, description="Fusion parameter (0.0-1.0)")
@@ -137,9 +190,13 @@ async def score_esg(
     Returns:
         ScoreResponse with dimension scores and evidence
 
+    Scoring runs on a bounded worker pool (see apps.api.score_executor), so
+    the event loop stays free for /health, /metrics and other requests.
+
     Raises:
         404: If company not found in manifest
         422: If validation errors
+        503: If the worker pool is saturated (Retry-After header set)
     """
     start_time = clock.time()
 
@@ -153,76 +210,68 @@ async def score_esg(
         company_rec = get_company_record(request.company, year)
 
         if not company_rec:
-            from apps.pipeline import demo_flow
-
-            try:
-                demo_flow.lookup_manifest(request.company, year)
-                company_rec = {"company": request.company, "year": year}
-            except FileNotFoundError:
-                esg_api_requests_total.labels(route="/score", method="POST", status="404").inc()
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Company '{request.company}' with year {year} not found in manifest"
-                )
+            esg_api_requests_total.labels(route="/score", method="POST", status="404").inc()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Company '{request.company}' with year {year} not found in manifest"
+            )
 
         # Call demo_flow pipeline
-        from apps.pipeline.demo_flow import run_score
+        from apps.pipeline.demo_flow import make_trace_id, run_score
 
         semantic_enabled = bool(semantic)
         fusion_alpha = alpha if semantic_enabled else 1.0
-        result = run_score(
-            company=request.company,
-            year=year,
-            query=request.query,
-            semantic=semantic_enabled,
-            alpha=fusion_alpha,
-            k=k,
-            seed=42  # Fixed for determinism
+
+        # run_score is deterministic: identical requests over unchanged data
+        # are served from the response cache (concurrent ones coalesced)
+        score_cache = get_score_cache()
+        cache_key = score_cache.make_key(
+            make_trace_id(request.company, year, request.query, fusion_alpha, k),
+            semantic_enabled,
+            data_fingerprint(company_rec),
         )
 
+        async def compute() -> Dict[str, Any]:
+            result: Dict[str, Any] = await get_score_executor().run(
+                run_score,
+                is_disconnected=http_request.is_disconnected,
+                company=request.company,
+                year=year,
+                query=request.query,
+                semantic=semantic_enabled,
+                alpha=fusion_alpha,
+                k=k,
+                seed=42  # Fixed for determinism
+            )
+            return result
+
+        try:
+            # A follower whose client is still connected takes over if ours leaves
+            result = await score_cache.get_or_compute_async(
+                cache_key, compute, abandoned=(ClientDisconnected,)
+            )
+        except ExecutorSaturated as e:
+            from apps.api.metrics import esg_score_rejected_total
+            esg_score_rejected_total.inc()
+            esg_api_requests_total.labels(route="/score", method="POST", status="503").inc()
+            raise HTTPException(
+                status_code=503,
+                detail="Scoring capacity exhausted, retry later",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except ClientDisconnected:
+            # Nobody is listening; 499 (client closed request) is for logs only
+            esg_api_requests_total.labels(route="/score", method="POST", status="499").inc()
+            raise HTTPException(status_code=499, detail="Client disconnected")
+
         # Record score latency
         from apps.api.metrics import esg_score_latency_seconds
         latency = clock.time() - start_time
         esg_score_latency_seconds.observe(latency)
 
-        # Convert demo_flow response to API schema
-        scores: List[DimensionScore] = []
-        for score_item in result.get("scores", []):
-            evidence_objects = [
-                Evidence(
-                    doc_id=ev.get("doc_id", ""),
-                    quote=ev.get("quote", ""),
-                    sha256=ev.get("sha256", "")
-                )
-                for ev in score_item.get("evidence", [])
-            ]
-
-            scores.append(
-                DimensionScore(
-                    theme=score_item.get("theme", "ESG"),
-                    stage=int(score_item.get("stage", 0)),
-                    confidence=float(score_item.get("confidence", 0.0)),
-                    stage_descriptor=score_item.get("stage_descriptor", ""),
-                    evidence=evidence_objects,
-                )
-            )
-
-        scores.sort(key=lambda item: item.theme)
-
         esg_api_requests_total.labels(route="/score", method="POST", status="200").inc()
 
-        return ScoreResponse(
-            company=request.company,
-            year=year,
-            scores=scores,
-            model_version=result.get("model_version", "v1.0"),
-            rubric_version=result.get("rubric_version", "3.0"),
-            trace_id=result.get("trace_id", "unknown"),
-            parity=ParityResult(
-                parity_ok=bool(result.get("parity", {}).get("parity_ok", False)),
-                evidence_ids=list(result.get("parity", {}).get("evidence_ids", [])),
-            ),
-        )
+        return to_score_response(request.company, year, result)
 
     except HTTPException:
         raise
@@ -231,6 +280,77 @@ async def score_esg(
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
 
 
+class BatchScoreRequest(BaseModel):
+    """Request schema for /score/batch endpoint."""
+    items: List[ScoreRequest] = Field(..., description="(company, year, query) items to score", min_length=1, max_length=5000)
+
+
+@app.post("/score/batch", tags=["Scoring"], response_class=StreamingResponse)
+async def score_batch(
+    batch: BatchScoreRequest,
+    http_request: Request,
+    semantic: int = Query(default=0, ge=0, le=1, description="Enable semantic retrieval (0 or 1)"),
+    k: int = Query(default=10, ge=1, le=100, description="Top-k results"),
+    alpha: float = Query(default=0.6, ge=0.0, le=1.0, description="Fusion parameter (0.0-1.0)")
+) -> StreamingResponse:
+    """
+    Score many (company, year, query) items in one request.
+
+    Items are grouped by company-year so each group's data is loaded and
+    indexed once; groups run in parallel on the /score worker pool. Results
+    stream back as NDJSON (application/x-ndjson), one line per item in
+    completion order, each tagged with the item's index:
+
+        {"index": 0, "status": "ok", "result": {...ScoreResponse...}}
+        {"index": 1, "status": "error", "error": {"code": 404, "detail": "..."}}
+
+    Query params match /score and apply to every item.
+    """
+    from apps.api.batch_scoring import stream_batch
+    from apps.api.metrics import esg_api_requests_total
+
+    esg_api_requests_total.labels(route="/score/batch", method="POST", status="200").inc()
+
+    semantic_enabled = bool(semantic)
+    lines = stream_batch(
+        items=[item.model_dump() for item in batch.items],
+        semantic=semantic_enabled,
+        alpha=alpha if semantic_enabled else 1.0,
+        k=k,
+        executor=get_score_executor(),
+        cache=get_score_cache(),
+        to_payload=lambda company, year, result: to_score_response(company, year, result).model_dump(),
+        is_disconnected=http_request.is_disconnected,
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+_INGEST_LEDGER: Optional[IngestLedger] = None
+
+
+def get_ingest_ledger() -> IngestLedger:
+    """Process-wide ingestion ledger backing /trace (opened on first use)."""
+    global _INGEST_LEDGER
+    if _INGEST_LEDGER is None:
+        # Read-only: a GET must never migrate or rewrite ledger files
+        _INGEST_LEDGER = IngestLedger(manifest_path="artifacts/ingestion/manifest.json", readonly=True)
+    return _INGEST_LEDGER
+
+
+def _latest_parity_report(company: str, year: int) -> Optional[Path]:
+    """Newest parity report among this company-year's persisted runs."""
+    from apps.pipeline.artifact_sink import get_artifact_sink
+
+    runs_dir = get_artifact_sink().company_runs_dir(company, year)
+    reports = list(runs_dir.glob("*/pipeline_validation/demo_topk_vs_evidence.json"))
+    if reports:
+        return max(reports, key=lambda path: path.stat().st_mtime)
+
+    # Layout used before per-run directories
+    legacy_path = Path("artifacts/pipeline_validation/demo_topk_vs_evidence.json")
+    return legacy_path if legacy_path.exists() else None
+
+
 class TraceRequest(BaseModel):
     """Request schema for /trace endpoint."""
     company: str = Field(..., description="Company name", min_length=1)
@@ -275,20 +395,19 @@ async def get_trace(
     """
     year = year or 2025
 
-    # Load ingestion manifest
-    manifest_path = Path("artifacts/ingestion/manifest.json")
-    if not manifest_path.exists():
+    # Ingestion ledger (append-only journal; only new lines are read per call)
+    ledger = get_ingest_ledger()
+    ledger.refresh()
+    if len(ledger) == 0:
         raise HTTPException(
             status_code=404,
             detail="Ingestion manifest not found. Run ingestion pipeline first."
         )
 
-    manifest_data = json.loads(manifest_path.read_text())
-
-    # Load parity verdict if available
-    parity_path = Path("artifacts/pipeline_validation/demo_topk_vs_evidence.json")
+    # Load parity verdict from the most recent persisted run, if any
+    parity_path = _latest_parity_report(company, year)
     parity_verdict = "UNKNOWN"
-    if parity_path.exists():
+    if parity_path is not None:
         try:
             parity_data = json.loads(parity_path.read_text())
             parity_verdict = parity_data.get("parity_verdict", "UNKNOWN")
@@ -302,7 +421,7 @@ async def get_trace(
     return TraceResponse(
         company=company,
         year=year,
-        ledger_manifest="artifacts/ingestion/manifest.json",
+        ledger_manifest=str(ledger.manifest_path),
         quote_records=quote_records,
         parity_verdict=parity_verdict
     )
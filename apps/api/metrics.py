@@ -13,6 +13,10 @@ Metrics exported:
 - esg_demo_index_size: Gauge of demo index size by backend
 - esg_demo_score_latency_seconds: Histogram of demo score latencies
 - esg_parity_break_total: Counter of parity violations
+- esg_score_in_flight: Gauge of /score jobs running or queued
+- esg_score_rejected_total: Counter of /score requests rejected by admission control
+- esg_pipeline_stage_latency_seconds: Histogram of run_score stage latencies by stage
+- esg_warmup_duration_seconds: Gauge of startup warm-up time by step
 
 SCA v13.8 Compliance:
 - Type safety: 100% annotated
@@ -101,6 +105,32 @@ esg_parity_break_total = Counter(
     "Total number of evidence parity violations (evidence not in fused top-k)"
 )
 
+# Score executor (admission control)
+esg_score_in_flight = Gauge(
+    "esg_score_in_flight",
+    "Number of /score jobs running or queued in the worker pool"
+)
+
+esg_score_rejected_total = Counter(
+    "esg_score_rejected_total",
+    "Total number of /score requests rejected because the worker pool was full"
+)
+
+# Histogram: run_score per-stage latency
+esg_pipeline_stage_latency_seconds = Histogram(
+    "esg_pipeline_stage_latency_seconds",
+    "Latency of individual run_score pipeline stages in seconds",
+    labelnames=["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0)
+)
+
+# Gauge: startup warm-up duration
+esg_warmup_duration_seconds = Gauge(
+    "esg_warmup_duration_seconds",
+    "Duration of startup warm-up steps in seconds (step=total for the whole run)",
+    labelnames=["step"]
+)
+
 # Router for /metrics endpoint
 router = APIRouter()
 
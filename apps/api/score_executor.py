@@ -0,0 +1,238 @@
+"""
+Bounded worker pool for CPU-bound /score work.
+
+run_score does Parquet I/O, BM25, embedding and rubric scoring; running it on
+the event loop stalls /health, /metrics and every other request. The executor
+moves it onto a bounded thread or process pool and applies admission control:
+once max_workers + max_queue jobs are in flight new requests are rejected so
+the API can answer 503 with Retry-After instead of queueing without bound.
+
+Configuration (environment):
+- ESG_SCORE_EXECUTOR: "thread" (default) or "process"
+- ESG_SCORE_WORKERS: pool size (default: CPU count)
+- ESG_SCORE_MAX_QUEUE: jobs allowed to wait for a worker (default: 2 x workers)
+- ESG_SCORE_RETRY_AFTER: Retry-After seconds sent with 503 (default: 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+DISCONNECT_POLL_SECONDS = 0.1
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the pool and its queue are full."""
+
+    def __init__(self, retry_after: int):
+        """
+        Args:
+            retry_after: Seconds the client should wait before retrying
+        """
+        super().__init__(f"Score executor saturated; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client went away before its job finished."""
+
+
+class ScoreExecutor:
+    """Bounded pool with a queue-depth limit for run_score calls."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        kind: str = "thread",
+        retry_after: int = 1,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Concurrent jobs (default: CPU count)
+            max_queue: Jobs allowed to wait for a free worker (default: 2 x workers)
+            kind: "thread" or "process"
+            retry_after: Retry-After seconds reported when saturated
+
+        Raises:
+            ValueError: If sizes are not positive or kind is unknown
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {EXECUTOR_KINDS}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = self.max_workers * 2 if max_queue is None else max_queue
+        if self.max_workers < 1 or self.max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue non-negative")
+
+        self.kind = kind
+        self.retry_after = retry_after
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[Executor] = None
+
+    @classmethod
+    def from_env(cls) -> "ScoreExecutor":
+        """Build an executor from ESG_SCORE_* environment variables."""
+        workers = os.getenv("ESG_SCORE_WORKERS")
+        queue = os.getenv("ESG_SCORE_MAX_QUEUE")
+        return cls(
+            max_workers=int(workers) if workers else None,
+            max_queue=int(queue) if queue else None,
+            kind=os.getenv("ESG_SCORE_EXECUTOR", "thread"),
+            retry_after=int(os.getenv("ESG_SCORE_RETRY_AFTER", "1")),
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Maximum jobs admitted at once (running + queued)."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running or queued."""
+        return self._in_flight
+
+    def _get_pool(self) -> Executor:
+        """Create the underlying pool on first use."""
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="esg-score"
+                )
+        return self._pool
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """
+        Admit and schedule a job.
+
+        Args:
+            fn: Callable to run (must be picklable for the process pool)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            concurrent.futures.Future for the job
+
+        Raises:
+            ExecutorSaturated: If capacity is exhausted
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise ExecutorSaturated(self.retry_after)
+            self._in_flight += 1
+            pool = self._get_pool()
+
+        if self.kind == "thread":
+            # Carry the caller's context (active OTel span) onto the worker thread
+            fn, args = contextvars.copy_context().run, (fn, *args)
+        try:
+            future = pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        self._report_depth()
+        return future
+
+    def _release(self, _future: Optional[Future[Any]]) -> None:
+        """Free one admission slot when a job finishes or is cancelled."""
+        with self._lock:
+            self._in_flight -= 1
+        self._report_depth()
+
+    def _report_depth(self) -> None:
+        """Publish the current in-flight count to Prometheus."""
+        from apps.api.metrics import esg_score_in_flight
+
+        esg_score_in_flight.set(self._in_flight)
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a job off the event loop, cancelling it if the client goes away.
+
+        A job still waiting in the queue is dropped on disconnect; a job that
+        has already started runs to completion and its result is discarded
+        (Python cannot interrupt a running worker).
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments
+            is_disconnected: Coroutine function reporting client disconnect
+                (e.g. starlette Request.is_disconnected)
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of fn
+
+        Raises:
+            ExecutorSaturated: If capacity is exhausted
+            ClientDisconnected: If the client disconnected first
+        """
+        job = self.submit(fn, *args, **kwargs)
+        future = asyncio.wrap_future(job)
+        if is_disconnected is None:
+            return await future
+
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return future.result()
+            if await is_disconnected():
+                # Cancel the pool job directly; the asyncio wrapper only
+                # propagates cancellation on a later loop iteration.
+                job.cancel()
+                future.cancel()
+                raise ClientDisconnected()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; queued jobs are cancelled."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+            logger.info(f"Score executor ({self.kind}) shut down")
+
+
+_EXECUTOR: Optional[ScoreExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_score_executor() -> ScoreExecutor:
+    """Process-wide score executor configured from the environment."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ScoreExecutor.from_env()
+            logger.info(
+                f"Score executor: {_EXECUTOR.kind} pool, {_EXECUTOR.max_workers} workers, "
+                f"queue {_EXECUTOR.max_queue}"
+            )
+        return _EXECUTOR
+
+
+def shutdown_score_executor() -> None:
+    """Shut down and forget the process-wide executor."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,217 @@
+"""
+Startup warm-up for the ESG Scoring API.
+
+Runs once per process, on a background thread started by the FastAPI
+startup hook, so /health and /live answer immediately while /ready reports
+503 until the first request can be served at steady-state latency.
+
+Steps (each timed):
+- imports: heavy modules otherwise imported inside the first request
+  (pandas, pyarrow, duckdb, BM25, embedder); missing optional modules are
+  skipped
+- rubric: compiled rubric loaded into the shared scorer
+- manifest: company manifest indexed
+- corpora: data loaded and BM25 fitted for hot company-years
+
+Configuration (environment):
+- ESG_WARMUP: set to 0 to skip warm-up (ready immediately)
+- ESG_WARMUP_COMPANIES: hot company-years, "Company:2024,Other Co:2023"
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from libs.utils.env import get
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODULES: Tuple[str, ...] = (
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "pyarrow.parquet",
+    "duckdb",
+    "libs.ranking.lexical",
+    "libs.retrieval.hybrid_semantic",
+    "libs.retrieval.embeddings.deterministic_embedder",
+    "apps.pipeline.demo_flow",
+)
+
+
+def parse_hot_companies(spec: Optional[str]) -> List[Tuple[str, int]]:
+    """Parse "Company:2024,Other Co:2023" into (company, year) pairs."""
+    pairs: List[Tuple[str, int]] = []
+    for item in (spec or "").split(","):
+        company, sep, year = item.strip().rpartition(":")
+        if not sep or not company.strip():
+            continue
+        try:
+            pairs.append((company.strip(), int(year)))
+        except ValueError:
+            logger.warning(f"Ignoring malformed ESG_WARMUP_COMPANIES entry: {item!r}")
+    return pairs
+
+
+class WarmupState:
+    """Readiness flag plus per-step timings of the warm-up run."""
+
+    def __init__(self) -> None:
+        """Initialize an unfinished warm-up."""
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+        self.duration_seconds: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished (successfully or not)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes; returns ready."""
+        return self._done.wait(timeout)
+
+    def mark_ready(self) -> None:
+        """Finish warm-up without running it (e.g. ESG_WARMUP=0)."""
+        self._done.set()
+
+    def summary(self) -> Dict[str, Any]:
+        """Readiness payload reported by /ready."""
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "duration_seconds": self.duration_seconds,
+                "steps": dict(self.steps),
+                "errors": dict(self.errors),
+            }
+
+    def _record(self, step: str, elapsed: float, error: Optional[Exception] = None) -> None:
+        """Store a step timing (and its error, if any)."""
+        with self._lock:
+            self.steps[step] = round(elapsed, 4)
+            if error is not None:
+                self.errors[step] = str(error)
+
+
+def _import_modules(modules: Tuple[str, ...] = WARMUP_MODULES) -> None:
+    """Import heavy modules so the first request doesn't pay for them."""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.info(f"Warm-up skipped optional module {name}: {e}")
+
+
+def _load_rubric() -> None:
+    """Load the compiled rubric into the shared scorer."""
+    from agents.scoring.rubric_v3_scorer import get_shared_scorer
+
+    get_shared_scorer()
+
+
+def _load_manifest() -> None:
+    """Index the company manifest."""
+    from apps.pipeline.company_manifest import get_company_manifest
+
+    get_company_manifest().refresh(force=True)
+
+
+def _load_corpora(hot_companies: List[Tuple[str, int]]) -> None:
+    """Load data and fit BM25 for each hot company-year."""
+    from apps.pipeline import demo_flow
+
+    for company, year in hot_companies:
+        try:
+            corpus = demo_flow.get_corpus(company, year)
+            logger.info(f"Warm-up loaded {len(corpus.records)} records for {company} {year}")
+        except FileNotFoundError as e:
+            logger.warning(f"Warm-up skipped {company} {year}: {e}")
+
+
+def run_warmup(
+    state: WarmupState,
+    hot_companies: Optional[List[Tuple[str, int]]] = None,
+) -> WarmupState:
+    """
+    Run every warm-up step, then mark the state ready.
+
+    A failing step is logged and recorded but does not keep the service
+    out of rotation; it only means the first affected request is slower.
+
+    Args:
+        state: State to report progress into
+        hot_companies: Company-years to preload (default: ESG_WARMUP_COMPANIES)
+
+    Returns:
+        The finished state
+    """
+    if hot_companies is None:
+        hot_companies = parse_hot_companies(get("ESG_WARMUP_COMPANIES"))
+
+    steps: List[Tuple[str, Callable[[], None]]] = [
+        ("imports", _import_modules),
+        ("rubric", _load_rubric),
+        ("manifest", _load_manifest),
+        ("corpora", lambda: _load_corpora(hot_companies)),
+    ]
+
+    state.started_at = time.time()
+    total_start = time.perf_counter()
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                logger.error(f"Warm-up step {name} failed: {e}")
+                state._record(name, time.perf_counter() - start, e)
+            else:
+                state._record(name, time.perf_counter() - start)
+    finally:
+        state.duration_seconds = round(time.perf_counter() - total_start, 4)
+        _observe(state)
+        state.mark_ready()
+
+    logger.info(f"Warm-up finished in {state.duration_seconds:.3f}s: {state.steps}")
+    return state
+
+
+def _observe(state: WarmupState) -> None:
+    """Publish warm-up timings to Prometheus."""
+    from apps.api.metrics import esg_warmup_duration_seconds
+
+    for step, elapsed in state.steps.items():
+        esg_warmup_duration_seconds.labels(step=step).set(elapsed)
+    esg_warmup_duration_seconds.labels(step="total").set(state.duration_seconds or 0.0)
+
+
+_STATE = WarmupState()
+_THREAD: Optional[threading.Thread] = None
+_THREAD_LOCK = threading.Lock()
+
+
+def get_warmup_state() -> WarmupState:
+    """Process-wide warm-up state read by /ready."""
+    return _STATE
+
+
+def start_warmup() -> WarmupState:
+    """Start warm-up on a background thread (once per process)."""
+    global _THREAD
+    with _THREAD_LOCK:
+        if _THREAD is None and not _STATE.ready:
+            if get("ESG_WARMUP", "1") == "0":
+                _STATE.mark_ready()
+            else:
+                _THREAD = threading.Thread(
+                    target=run_warmup, args=(_STATE,), name="esg-warmup", daemon=True
+                )
+                _THREAD.start()
+    return _STATE
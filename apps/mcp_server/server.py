@@ -7,8 +7,8 @@ random.seed(int(os.getenv("SEED", "42")))
 ROOT = pathlib.Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
-from apps.api.main import ScoreRequest, RUBRIC_PATH
-from apps.pipeline.score_flow import ensure_ingested, embed_and_index, retrieve
+from apps.api.main import ScoreRequest
+from apps.pipeline.score_cache import RUBRIC_PATH
 
 def jsonrpc_response(id_, result=None, error=None):
     body = {"jsonrpc": "2.0", "id": id_}
@@ -49,18 +49,26 @@ def handle(method, params):
         overall = sum(d["stage"] for d in decisions)/len(decisions)
         return {"company": req.company, "year": req.year, "overall_stage": round(overall,2), "decisions": decisions}
 
+    if method == "esg.lookup_company":
+        from apps.pipeline.company_manifest import get_company_manifest
+        record = get_company_manifest().get(params.get("company", ""), int(params.get("year", 2025)))
+        return {"found": record is not None, "record": record}
+
     if method == "esg.ensure_ingested":
+        from apps.pipeline.score_flow import ensure_ingested
         company = params.get("company", "Acme Corp")
         year = int(params.get("year", 2024))
         chunks = ensure_ingested(company, year)
         return {"count": len(chunks), "chunks": chunks}
 
     if method == "esg.embed_index":
+        from apps.pipeline.score_flow import embed_and_index
         chunks = params.get("chunks", [])
         embed_and_index(chunks)
         return {"indexed": len(chunks)}
 
     if method == "esg.retrieve":
+        from apps.pipeline.score_flow import retrieve
         company = params.get("company", "Acme Corp")
         year = int(params.get("year", 2024))
         query = params.get("query", "ESG strategy")
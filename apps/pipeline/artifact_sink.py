@@ -0,0 +1,299 @@
+"""
+Artifact sink for run_score side outputs.
+
+run_score produces chunk/evidence/maturity Parquet files, score.jsonl, a run
+manifest and parity/retrieval diagnostics. Writing them inline dominated
+request latency and, with fixed paths, concurrent requests clobbered each
+other. The sink:
+
+- decides per trace_id whether a run is persisted (mode off / sampled / always)
+- gives every persisted run its own directory:
+  <DATA_ROOT>/runs/<company>/<year>/<trace>.<sem|lex>/
+- queues the writes to a background thread through a bounded queue and
+  flushes it on shutdown; a full queue drops the run instead of blocking
+  the request
+- republishes selected files at a stable "latest" path under the root
+  (e.g. <DATA_ROOT>/pipeline_validation/demo_topk_vs_evidence.json, read by
+  CI and the docker smoke test)
+
+Process-pool workers exit without running atexit handlers, so inside a
+worker process each submit waits for its own writes before returning.
+
+Sampling is a hash of the trace_id, so the same request is either always or
+never persisted (deterministic across processes and replays).
+
+Configuration (environment):
+- ESG_ARTIFACT_MODE: off | sampled | always (default: always)
+- ESG_ARTIFACT_SAMPLE_RATE: fraction persisted in sampled mode (default: 0.1)
+- ESG_ARTIFACT_QUEUE_SIZE: pending runs held in memory (default: 32)
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from libs.utils.env import get
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_MODES = ("off", "sampled", "always")
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_QUEUE_SIZE = 32
+RUNS_DIRNAME = "runs"
+
+_STOP = object()
+
+
+def _slug(value: str) -> str:
+    """Filesystem-safe path segment."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value).strip("_") or "_"
+
+
+class ArtifactSink:
+    """Background, sampled writer for per-run artifacts."""
+
+    def __init__(
+        self,
+        root: Path,
+        mode: str = "always",
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        flush_each: Optional[bool] = None,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            root: Data root; runs land under <root>/runs
+            mode: off, sampled or always
+            sample_rate: Fraction of trace_ids persisted in sampled mode
+            queue_size: Maximum runs waiting to be written
+            flush_each: Wait for each run's writes before submit returns
+                (default: only inside multiprocessing worker processes)
+
+        Raises:
+            ValueError: If mode, sample_rate or queue_size is invalid
+        """
+        if mode not in ARTIFACT_MODES:
+            raise ValueError(f"Unknown artifact mode '{mode}', expected one of {ARTIFACT_MODES}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be within [0, 1]")
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive")
+
+        self.root = Path(root)
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.flush_each = multiprocessing.parent_process() is not None if flush_each is None else flush_each
+        self.stats: Dict[str, int] = {"submitted": 0, "written": 0, "skipped": 0, "dropped": 0, "failed": 0}
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, root: Path) -> "ArtifactSink":
+        """Build a sink from ESG_ARTIFACT_* environment variables."""
+        return cls(
+            root=root,
+            mode=(get("ESG_ARTIFACT_MODE") or "always").strip().lower(),
+            sample_rate=float(get("ESG_ARTIFACT_SAMPLE_RATE") or DEFAULT_SAMPLE_RATE),
+            queue_size=int(get("ESG_ARTIFACT_QUEUE_SIZE") or DEFAULT_QUEUE_SIZE),
+        )
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def should_persist(self, trace_id: str) -> bool:
+        """Whether artifacts for this trace_id are written."""
+        if self.mode == "always":
+            return True
+        if self.mode == "off":
+            return False
+        bucket = int(hashlib.sha256(trace_id.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < self.sample_rate
+
+    def run_dir(self, company: str, year: int, trace_id: str, semantic: bool = False) -> Path:
+        """Directory holding one run's artifacts.
+
+        trace_id does not cover the retrieval mode, so semantic and lexical
+        runs of the same query get separate directories.
+        """
+        trace = trace_id.split(":", 1)[-1]
+        mode = "sem" if semantic else "lex"
+        return self.root / RUNS_DIRNAME / _slug(company) / str(year) / f"{_slug(trace)}.{mode}"
+
+    def company_runs_dir(self, company: str, year: int) -> Path:
+        """Directory holding every persisted run for a company-year."""
+        return self.root / RUNS_DIRNAME / _slug(company) / str(year)
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        company: str,
+        year: int,
+        trace_id: str,
+        write_fn: Callable[[Path], None],
+        semantic: bool = False,
+    ) -> Optional[Path]:
+        """
+        Queue a run's artifact writes.
+
+        Never blocks the caller on a full queue: side outputs are not worth
+        request latency, so the run is dropped (and counted) instead.
+
+        Args:
+            company: Company name
+            year: Reporting year
+            trace_id: Request trace_id
+            write_fn: Callable writing all artifacts into the given directory
+            semantic: Whether the run used semantic retrieval
+
+        Returns:
+            Run directory the artifacts will land in, or None if not persisted
+        """
+        if self._closed or not self.should_persist(trace_id):
+            self._count("skipped")
+            return None
+
+        run_dir = self.run_dir(company, year, trace_id, semantic)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((trace_id, run_dir, write_fn))
+        except queue.Full:
+            self._count("dropped")
+            logger.warning(f"Artifact queue full; dropped artifacts for {trace_id}")
+            return None
+
+        self._count("submitted")
+        if self.flush_each:
+            self.flush()
+        return run_dir
+
+    def publish_latest(self, run_dir: Path, relative: Path) -> Path:
+        """
+        Copy one run artifact to its stable "latest" path under the root.
+
+        The copy is renamed into place, so readers never see a partial file
+        even when several processes publish at once.
+
+        Args:
+            run_dir: Run directory holding the artifact
+            relative: Artifact path relative to the run directory
+
+        Returns:
+            The stable path (<root>/<relative>)
+        """
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(run_dir / relative, tmp)
+        os.replace(tmp, target)
+        return target
+
+    def _ensure_worker(self) -> None:
+        """Start the writer thread on first submit."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._drain, name="esg-artifact-sink", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self) -> None:
+        """Writer thread: execute queued writes until stopped."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                trace_id, run_dir, write_fn = item
+                try:
+                    run_dir.mkdir(parents=True, exist_ok=True)
+                    write_fn(run_dir)
+                    self._count("written")
+                except Exception as e:
+                    self._count("failed")
+                    logger.error(f"Failed to write artifacts for {trace_id} to {run_dir}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _count(self, key: str) -> None:
+        """Increment a stats counter."""
+        with self._lock:
+            self.stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Block until every queued write has completed."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+        logger.info(f"Artifact sink closed: {self.stats}")
+
+
+_SINK: Optional[ArtifactSink] = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_artifact_sink(root: Optional[Path] = None) -> ArtifactSink:
+    """
+    Process-wide artifact sink (created on first use, flushed at exit).
+
+    Args:
+        root: Data root used when the sink is first created (default: DATA_ROOT)
+    """
+    global _SINK
+    with _SINK_LOCK:
+        if _SINK is None:
+            _SINK = ArtifactSink.from_env(Path(root) if root else Path(get("DATA_ROOT") or "artifacts"))
+            atexit.register(_SINK.close)
+        return _SINK
+
+
+def close_artifact_sink() -> None:
+    """Flush and stop the process-wide sink."""
+    global _SINK
+    with _SINK_LOCK:
+        sink, _SINK = _SINK, None
+    if sink is not None:
+        sink.close()
+
+
+def _reset_after_fork() -> None:
+    """Forked children build their own sink; the parent's queue and thread stay with it."""
+    global _SINK, _SINK_LOCK
+    _SINK = None
+    _SINK_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,215 @@
+"""
+Company manifest service.
+
+Single, indexed view of artifacts/demo/companies.json shared by the API,
+demo_flow.run_score and the MCP server. Records are indexed by
+(normalized company, year); each record is also reachable through its
+org_id, slug and optional "aliases" list. Lookup normalization is
+case-insensitive and ignores punctuation and repeated whitespace, so
+"apple inc" and "Apple Inc." resolve to the same record.
+
+The file is re-checked (os.stat, mtime + size) at most once per
+check_interval seconds; when it changes, a new index is built off to the
+side and swapped in with a single reference assignment, so readers never
+see a half-built index. A manifest that fails to parse keeps the previous
+index in service.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from libs.utils.env import get
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_PATH = "artifacts/demo/companies.json"
+DEFAULT_CHECK_INTERVAL = 1.0
+
+_PUNCTUATION = re.compile(r"[^\w\s&-]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_company(name: str) -> str:
+    """Canonical lookup key for a company name or alias."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub("", str(name))).strip().casefold()
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable parsed manifest plus its index."""
+
+    records: Tuple[Dict[str, Any], ...] = ()
+    index: Dict[Tuple[str, int], Dict[str, Any]] = field(default_factory=dict)
+    signature: Optional[Tuple[int, int]] = None
+
+
+class CompanyManifest:
+    """Indexed, hot-reloaded company manifest."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_MANIFEST_PATH,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ):
+        """
+        Initialize manifest service.
+
+        Args:
+            path: Path to companies.json
+            check_interval: Minimum seconds between file change checks
+                (0 = check on every lookup)
+        """
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._snapshot = _Snapshot()
+        self._last_check = float("-inf")
+        self._reload_lock = threading.Lock()
+        self._listeners: List[Callable[[], Any]] = []
+
+    def add_reload_listener(self, callback: Callable[[], Any]) -> None:
+        """Call callback (no args) after every snapshot swap, e.g. to drop caches."""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the manifest file, or None if missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the manifest if the file changed.
+
+        Args:
+            force: Check the file even if check_interval has not elapsed
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._reload_lock:
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            signature = self._signature()
+            if signature == self._snapshot.signature:
+                return False
+            if signature is None:
+                self._snapshot = _Snapshot()
+                self._notify()
+                return True
+
+            try:
+                records = json.loads(self.path.read_text())
+                if not isinstance(records, list):
+                    raise ValueError("companies manifest must be a JSON list")
+            except Exception as e:
+                logger.warning(f"Failed to reload companies manifest {self.path}: {e}")
+                return False
+
+            had_snapshot = self._snapshot.signature is not None
+            self._snapshot = self._build(records, signature)
+            logger.info(f"Loaded {len(records)} company records from {self.path}")
+            if had_snapshot:
+                self._notify()
+            return True
+
+    def _notify(self) -> None:
+        """Run reload listeners; a failing listener never blocks the swap."""
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Manifest reload listener failed: {e}")
+
+    @staticmethod
+    def _build(records: List[Dict[str, Any]], signature: Tuple[int, int]) -> _Snapshot:
+        """Index records by (normalized name/alias, year); first record wins."""
+        index: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for record in records:
+            try:
+                year = int(record["year"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            names = [record.get("company"), record.get("org_id"), record.get("slug")]
+            names.extend(record.get("aliases") or [])
+            for name in names:
+                if name:
+                    index.setdefault((normalize_company(name), year), record)
+        return _Snapshot(records=tuple(records), index=index, signature=signature)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, company: str, year: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a company-year record.
+
+        Args:
+            company: Company name, org_id, slug or alias
+            year: Reporting year
+
+        Returns:
+            Manifest record or None if not found
+        """
+        self.refresh()
+        return self._snapshot.index.get((normalize_company(company), int(year)))
+
+    def require(self, company: str, year: int) -> Dict[str, Any]:
+        """
+        Look up a company-year record that must exist.
+
+        Raises:
+            FileNotFoundError: If the manifest or the record is missing
+        """
+        record = self.get(company, year)
+        if record is not None:
+            return record
+        if self._snapshot.signature is None:
+            raise FileNotFoundError("No companies manifest found")
+        raise FileNotFoundError(f"Company '{company}' with year {year} not found in manifest")
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All manifest records in file order."""
+        self.refresh()
+        return list(self._snapshot.records)
+
+    def __len__(self) -> int:
+        """Number of manifest records."""
+        return len(self.records())
+
+
+_MANIFEST: Optional[CompanyManifest] = None
+_MANIFEST_LOCK = threading.Lock()
+
+
+def get_company_manifest() -> CompanyManifest:
+    """Process-wide manifest service (path from ESG_COMPANIES_MANIFEST)."""
+    global _MANIFEST
+    with _MANIFEST_LOCK:
+        if _MANIFEST is None:
+            _MANIFEST = CompanyManifest(
+                path=get("ESG_COMPANIES_MANIFEST") or DEFAULT_MANIFEST_PATH,
+                check_interval=float(get("ESG_MANIFEST_CHECK_INTERVAL") or DEFAULT_CHECK_INTERVAL),
+            )
+        return _MANIFEST
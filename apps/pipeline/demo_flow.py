@@ -4,13 +4,19 @@ from __future__ import annotations
 import glob
 import json
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Sequence, Tuple
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, cast
 
 import numpy as np
 import pandas as pd
 
-from agents.scoring.rubric_v3_scorer import DimensionScore, RubricV3Scorer
+from agents.scoring.rubric_v3_scorer import DimensionScore, RubricV3Scorer, get_shared_scorer
+from apps.pipeline.artifact_sink import get_artifact_sink
+from apps.pipeline.company_manifest import get_company_manifest, normalize_company
+from apps.pipeline.score_cache import data_fingerprint
+from apps.pipeline.stage_metrics import current_context, pipeline_stage, set_counts, tracer
 from apps.utils.provenance import sha256_text, trim_to_words
 from libs.analytics import evidence_config  # Phase F
 from libs.utils.clock import get_clock
@@ -27,9 +33,15 @@ RETRIEVAL_TIER = os.getenv("RETRIEVAL_TIER", "auto")  # "bronze", "silver", or "
 WX_OFFLINE_REPLAY = bool_flag("WX_OFFLINE_REPLAY")
 
 DATA_ROOT = Path(get("DATA_ROOT", "artifacts"))
-DEMO_ARTIFACT_DIR = DATA_ROOT / "demo"
-PIPELINE_VALIDATION_DIR = DATA_ROOT / "pipeline_validation"
-RUN_MANIFEST_PATH = DATA_ROOT / "run_manifest.json"
+
+# Per-run artifact layout (relative to the run directory chosen by the sink)
+DEMO_ARTIFACT_SUBDIR = "demo"
+PIPELINE_VALIDATION_SUBDIR = "pipeline_validation"
+PARITY_REPORT_NAME = "demo_topk_vs_evidence.json"
+RUN_MANIFEST_NAME = "run_manifest.json"
+
+# Loaded company-year corpora kept warm across requests (0 disables)
+CORPUS_CACHE_SIZE = int(get("ESG_CORPUS_CACHE_SIZE") or 8)
 
 
 def run_score(
@@ -41,119 +53,270 @@ def run_score(
     k: int = 10,
     seed: int = 42,
 ) -> Dict[str, Any]:
-    from libs.ranking.lexical import BM25Scorer
-    from libs.retrieval.hybrid_semantic import fuse_lex_sem
+    with tracer.start_as_current_span(
+        "run_score",
+        attributes={"esg.company": company, "esg.year": year, "esg.semantic": semantic, "esg.k": k},
+    ):
+        corpus = get_corpus(company, year)
+        return score_corpus(corpus, query, semantic=semantic, alpha=alpha, k=k, seed=seed)
 
-    trace_id = _make_trace_id(company, year, query, alpha, k)
 
-    manifest_record = _lookup_manifest(company, year)
+class ScoringCorpus:
+    """
+    Per company-year data loaded once and reused across queries.
+
+    Holds the loaded records, the fitted BM25 model and lazily computed
+    document vectors, so scoring several queries against one company-year
+    (e.g. /score/batch) loads data and builds the index once.
+    """
+
+    def __init__(self, company: str, year: int, manifest_record: Dict[str, Any], records: List[Dict[str, Any]]):
+        from libs.ranking.lexical import BM25Scorer
+
+        self.company = company
+        self.year = year
+        self.manifest_record = manifest_record
+        self.records = records
+        # Phase E: Support both 'text' (PDF extraction) and 'extract_30w' (pre-processed bronze/silver)
+        self.texts = [record.get("text") or record.get("extract_30w", "") for record in records]
+        with pipeline_stage("bm25_fit", company=company, year=year, records=len(records)):
+            self.bm25 = BM25Scorer(k1=1.2, b=0.75).fit(self.texts) if records else None
+        self._live_vectors: List[Any] | None = None
+        self._deterministic_vectors: Dict[int, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def live_vectors(self) -> List[Any]:
+        from apps.scoring import wx_client
+
+        with self._lock:
+            if self._live_vectors is None:
+                self._live_vectors = wx_client.embed_text_batch(self.texts, use_live=True)
+            return self._live_vectors
+
+    def deterministic_vectors(self, embedder: Any, seed: int) -> List[np.ndarray]:
+        with self._lock:
+            if seed not in self._deterministic_vectors:
+                self._deterministic_vectors[seed] = [embedder.embed(text) for text in self.texts]
+            return self._deterministic_vectors[seed]
+
+
+def load_corpus(company: str, year: int) -> ScoringCorpus:
+    with pipeline_stage("manifest_lookup", company=company, year=year):
+        manifest_record = _lookup_manifest(company, year)
 
     # Phase D: Intelligent tier selection (bronze vs silver)
-    try:
-        bronze_records = _load_data_records(manifest_record)
-    except FileNotFoundError:
-        if bool_flag("ALLOW_NETWORK"):
-            # Fallback to live ingestion only if network allowed
-            bronze_path = Path(manifest_record.get("bronze", ""))
-            bronze_records = _build_bronze_from_live(company, year, bronze_path)
-        else:
-            bronze_records = []
+    with pipeline_stage("data_load", company=company, year=year) as span:
+        try:
+            bronze_records = _load_data_records(manifest_record)
+        except FileNotFoundError:
+            if bool_flag("ALLOW_NETWORK"):
+                # Fallback to live ingestion only if network allowed
+                bronze_path = Path(manifest_record.get("bronze", ""))
+                bronze_records = _build_bronze_from_live(company, year, bronze_path)
+            else:
+                bronze_records = []
+        set_counts(span, records=len(bronze_records))
+    return ScoringCorpus(company, year, manifest_record, bronze_records)
+
+
+_CORPUS_CACHE: "OrderedDict[Tuple[str, int], Tuple[str, ScoringCorpus]]" = OrderedDict()
+_CORPUS_CACHE_LOCK = threading.Lock()
+
+
+def get_corpus(company: str, year: int) -> ScoringCorpus:
+    """
+    Loaded corpus for a company-year, reused while its data is unchanged.
+
+    Entries are keyed by the resolved manifest record and validated against
+    data_fingerprint, so new silver/bronze data or a manifest edit reloads.
+    """
+    if CORPUS_CACHE_SIZE <= 0:
+        return load_corpus(company, year)
+
+    manifest_record = _lookup_manifest(company, year)
+    key = (normalize_company(manifest_record.get("company", company)), int(year))
+    fingerprint = data_fingerprint(manifest_record)
+    with _CORPUS_CACHE_LOCK:
+        cached = _CORPUS_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            _CORPUS_CACHE.move_to_end(key)
+            return cached[1]
+
+    corpus = load_corpus(company, year)
+    with _CORPUS_CACHE_LOCK:
+        _CORPUS_CACHE[key] = (fingerprint, corpus)
+        _CORPUS_CACHE.move_to_end(key)
+        while len(_CORPUS_CACHE) > CORPUS_CACHE_SIZE:
+            _CORPUS_CACHE.popitem(last=False)
+    return corpus
+
+
+def clear_corpus_cache() -> None:
+    """Drop every cached corpus."""
+    with _CORPUS_CACHE_LOCK:
+        _CORPUS_CACHE.clear()
+
+
+def score_queries(
+    company: str,
+    year: int,
+    queries: Sequence[str],
+    semantic: bool = False,
+    alpha: float = 0.6,
+    k: int = 10,
+    seed: int = 42,
+) -> List[Dict[str, Any] | Exception]:
+    """
+    Load a company-year once and score several queries against it.
+
+    Arguments and results are plain picklable values, so the whole group can
+    run as one process-pool job (a ScoringCorpus holds a lock and cannot
+    cross a process boundary). A failing query yields its exception in place
+    of a result instead of failing the other queries.
+    """
+    corpus = load_corpus(company, year)
+    outcomes: List[Dict[str, Any] | Exception] = []
+    for query in queries:
+        try:
+            outcomes.append(score_corpus(corpus, query, semantic=semantic, alpha=alpha, k=k, seed=seed))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+
+def score_corpus(
+    corpus: ScoringCorpus,
+    query: str,
+    semantic: bool = False,
+    alpha: float = 0.6,
+    k: int = 10,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    from libs.retrieval.hybrid_semantic import fuse_lex_sem
+
+    company, year = corpus.company, corpus.year
+    trace_id = _make_trace_id(company, year, query, alpha, k)
+
+    bronze_records = corpus.records
     if not bronze_records:
         return {
             "company": company,
             "year": year,
             "scores": [],
             "trace_id": trace_id,
-            "rubric_version": RubricV3Scorer().rubric.version,
+            "rubric_version": get_shared_scorer().rubric.version,
             "model_version": "1.0",
             "parity": {"parity_ok": False, "evidence_ids": []},
         }
 
-    # Phase E: Support both 'text' (PDF extraction) and 'extract_30w' (pre-processed bronze/silver)
-    texts = [record.get("text") or record.get("extract_30w", "") for record in bronze_records]
-    bm25 = BM25Scorer(k1=1.2, b=0.75).fit(texts)
-    lex_scores_raw = bm25.score(query, texts)
-    lex_scores = {
-        bronze_records[index]["doc_id"]: float(lex_scores_raw[index])
-        for index in range(len(bronze_records))
-    }
+    texts = corpus.texts
+    record_count = len(bronze_records)
+    bm25 = corpus.bm25
+    if bm25 is None:  # Only unfitted when there are no records (handled above)
+        raise RuntimeError(f"BM25 index missing for {company} {year}")
+    with pipeline_stage("bm25_score", company=company, year=year, records=record_count):
+        lex_scores_raw = bm25.score(query, texts)
+        lex_scores = {
+            bronze_records[index]["doc_id"]: float(lex_scores_raw[index])
+            for index in range(record_count)
+        }
 
     live_embeddings_enabled = semantic and bool_flag("LIVE_EMBEDDINGS")
-    if live_embeddings_enabled:
-        from apps.scoring import wx_client
+    backend = "live" if live_embeddings_enabled else "deterministic"
+    with pipeline_stage("embedding", company=company, year=year, records=record_count, backend=backend):
+        if live_embeddings_enabled:
+            from apps.scoring import wx_client
+
+            doc_vectors = corpus.live_vectors()
+            query_vector = wx_client.embed_text_batch([query], use_live=True)[0]
+            query_np = np.asarray(query_vector, dtype=np.float64)
+            doc_vectors = [np.asarray(vector, dtype=np.float64) for vector in doc_vectors]
+        else:
+            from libs.retrieval.embeddings.deterministic_embedder import DeterministicEmbedder
 
-        doc_vectors = wx_client.embed_text_batch(texts, use_live=True)
-        query_vector = wx_client.embed_text_batch([query], use_live=True)[0]
+            embedder = DeterministicEmbedder(dim=128, seed=seed)
+            # A single string embeds to a single vector
+            query_np = cast(np.ndarray, embedder.embed(query))
+            doc_vectors = corpus.deterministic_vectors(embedder, seed)
 
-        query_np = np.asarray(query_vector, dtype=np.float64)
+    with pipeline_stage("semantic_knn", company=company, year=year, records=record_count, backend=backend):
         semantic_scores = {
-            bronze_records[index]["doc_id"]: _cosine_similarity(
-                query_np, np.asarray(doc_vectors[index], dtype=np.float64)
-            )
-            for index in range(len(bronze_records))
+            bronze_records[index]["doc_id"]: _cosine_similarity(query_np, doc_vectors[index])
+            for index in range(record_count)
         }
-    else:
-        from libs.retrieval.embeddings.deterministic_embedder import DeterministicEmbedder
 
-        embedder = DeterministicEmbedder(dim=128, seed=seed)
-        query_vec = embedder.embed(query)
-        # Phase E: Support both 'text' (PDF extraction) and 'extract_30w' (pre-processed)
-        semantic_scores = {
-            record["doc_id"]: _cosine_similarity(
-                query_vec, embedder.embed(record.get("text") or record.get("extract_30w", ""))
-            )
-            for record in bronze_records
-        }
-
-    fused_results = fuse_lex_sem(lex_scores, semantic_scores, alpha=alpha)
-    fused_topk = fused_results[: max(1, k)]
-    fused_topk_ids = [doc_id for doc_id, _ in fused_topk]
+    with pipeline_stage("fusion", company=company, year=year, records=record_count, k=k) as span:
+        fused_results = fuse_lex_sem(lex_scores, semantic_scores, alpha=alpha)
+        fused_topk = fused_results[: max(1, k)]
+        fused_topk_ids = [doc_id for doc_id, _ in fused_topk]
+        set_counts(span, fused=len(fused_topk))
 
-    evidence_docs = [
-        record for record in bronze_records if record["doc_id"] in fused_topk_ids
-    ]
-    evidence_entries = _build_evidence_entries(company, year, evidence_docs)
-    parity_ok = len(evidence_entries) >= 2 and all(
-        entry["doc_id"] in fused_topk_ids for entry in evidence_entries
-    )
-
-    scorer = RubricV3Scorer()
-    dimension_scores = _aggregate_dimension_scores(
-        scorer=scorer,
-        documents=evidence_docs,
-        evidence_entries=evidence_entries,
-    )
+    with pipeline_stage("evidence", company=company, year=year) as span:
+        evidence_docs = [
+            record for record in bronze_records if record["doc_id"] in fused_topk_ids
+        ]
+        evidence_entries = _build_evidence_entries(company, year, evidence_docs)
+        parity_ok = len(evidence_entries) >= 2 and all(
+            entry["doc_id"] in fused_topk_ids for entry in evidence_entries
+        )
+        set_counts(span, documents=len(evidence_docs), evidence=len(evidence_entries), parity_ok=parity_ok)
+
+    with pipeline_stage("rubric_scoring", company=company, year=year, documents=len(evidence_docs)) as span:
+        scorer = get_shared_scorer()
+        dimension_scores = _aggregate_dimension_scores(
+            scorer=scorer,
+            documents=evidence_docs,
+            evidence_entries=evidence_entries,
+        )
+        set_counts(span, themes=len(dimension_scores))
+
+    # The sink writes on its own thread; parent that span on this run
+    run_context = current_context()
+    sink = get_artifact_sink(DATA_ROOT)
+
+    def _write_run_artifacts(run_dir: Path) -> None:
+        with pipeline_stage(
+            "artifact_write", parent=run_context, company=company, year=year,
+            records=record_count, evidence=len(evidence_entries),
+        ):
+            _write_parity_artifact(
+                run_dir=run_dir,
+                query=query,
+                company=company,
+                year=year,
+                alpha=alpha,
+                k=k,
+                fused_topk=fused_topk,
+                evidence_entries=evidence_entries,
+                parity_ok=parity_ok,
+                trace_id=trace_id,
+            )
+            # CI and the docker smoke test read the newest report at a fixed path
+            sink.publish_latest(run_dir, Path(PIPELINE_VALIDATION_SUBDIR) / PARITY_REPORT_NAME)
+            _write_pipeline_artifacts(
+                run_dir=run_dir,
+                company=company,
+                year=year,
+                query=query,
+                alpha=alpha,
+                k=k,
+                documents=bronze_records,
+                evidence_entries=evidence_entries,
+                dimension_scores=dimension_scores,
+                trace_id=trace_id,
+            )
+            _write_retrieval_diagnostics(
+                run_dir=run_dir,
+                company=company,
+                year=year,
+                query=query,
+                fused_topk=fused_topk,
+                evidence_entries=evidence_entries,
+                trace_id=trace_id,
+            )
 
-    _write_parity_artifact(
-        query=query,
-        company=company,
-        year=year,
-        alpha=alpha,
-        k=k,
-        fused_topk=fused_topk,
-        evidence_entries=evidence_entries,
-        parity_ok=parity_ok,
-        trace_id=trace_id,
-    )
-    _write_pipeline_artifacts(
-        company=company,
-        year=year,
-        query=query,
-        alpha=alpha,
-        k=k,
-        documents=bronze_records,
-        evidence_entries=evidence_entries,
-        dimension_scores=dimension_scores,
-        trace_id=trace_id,
-    )
-    _write_retrieval_diagnostics(
-        company=company,
-        year=year,
-        query=query,
-        fused_topk=fused_topk,
-        evidence_entries=evidence_entries,
-        trace_id=trace_id,
-    )
+    # Side outputs are sampled and written off the request path
+    sink.submit(company, year, trace_id, _write_run_artifacts, semantic=semantic)
 
     scores_payload = [
         {
@@ -194,14 +357,7 @@ def _make_trace_id(company: str, year: int, query: str, alpha: float, k: int) ->
 
 
 def _lookup_manifest(company: str, year: int) -> Dict[str, Any]:
-    manifest_path = Path("artifacts/demo/companies.json")
-    if not manifest_path.exists():
-        raise FileNotFoundError("No companies manifest found")
-    manifest: List[Dict[str, Any]] = json.loads(manifest_path.read_text())
-    for record in manifest:
-        if record.get("company") == company and record.get("year") == year:
-            return record
-    raise FileNotFoundError(f"Company '{company}' with year {year} not found in manifest")
+    return get_company_manifest().require(company, year)
 
 
 def _load_data_records(manifest_record: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -669,6 +825,7 @@ def _aggregate_dimension_scores(
 
 
 def _write_parity_artifact(
+    run_dir: Path,
     query: str,
     company: str,
     year: int,
@@ -679,7 +836,8 @@ def _write_parity_artifact(
     parity_ok: bool,
     trace_id: str,
 ) -> None:
-    PIPELINE_VALIDATION_DIR.mkdir(parents=True, exist_ok=True)
+    validation_dir = run_dir / PIPELINE_VALIDATION_SUBDIR
+    validation_dir.mkdir(parents=True, exist_ok=True)
     sorted_topk = sorted(fused_topk, key=lambda item: (-item[1], item[0]))
     evidence_ids = sorted({entry["doc_id"] for entry in evidence_entries})
     payload = {
@@ -694,11 +852,12 @@ def _write_parity_artifact(
         "trace_id": trace_id,
         "timestamp": clock.time(),
     }
-    parity_path = PIPELINE_VALIDATION_DIR / "demo_topk_vs_evidence.json"
+    parity_path = validation_dir / PARITY_REPORT_NAME
     parity_path.write_text(json.dumps(payload, indent=2, sort_keys=True))
 
 
 def _write_pipeline_artifacts(
+    run_dir: Path,
     company: str,
     year: int,
     query: str,
@@ -709,13 +868,14 @@ def _write_pipeline_artifacts(
     dimension_scores: Sequence[Mapping[str, Any]],
     trace_id: str,
 ) -> None:
-    DEMO_ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    demo_dir = run_dir / DEMO_ARTIFACT_SUBDIR
+    demo_dir.mkdir(parents=True, exist_ok=True)
 
     chunks_df = pd.DataFrame(documents)
-    chunks_df.to_parquet(DEMO_ARTIFACT_DIR / "chunks.parquet", index=False)
+    chunks_df.to_parquet(demo_dir / "chunks.parquet", index=False)
 
     evidence_df = pd.DataFrame(evidence_entries)
-    evidence_df.to_parquet(DEMO_ARTIFACT_DIR / "evidence.parquet", index=False)
+    evidence_df.to_parquet(demo_dir / "evidence.parquet", index=False)
 
     maturity_df = pd.DataFrame(
         {
@@ -725,9 +885,9 @@ def _write_pipeline_artifacts(
             "stage_descriptor": [score["stage_descriptor"] for score in dimension_scores],
         }
     )
-    maturity_df.to_parquet(DEMO_ARTIFACT_DIR / "maturity.parquet", index=False)
+    maturity_df.to_parquet(demo_dir / "maturity.parquet", index=False)
 
-    score_path = DEMO_ARTIFACT_DIR / "score.jsonl"
+    score_path = demo_dir / "score.jsonl"
     with score_path.open("w", encoding="utf-8") as handle:
         for score in dimension_scores:
             handle.write(json.dumps(score, ensure_ascii=False) + "\n")
@@ -738,19 +898,19 @@ def _write_pipeline_artifacts(
         "trace_id": trace_id,
         "query": {"text": query, "alpha": alpha, "k": k},
         "artifacts": {
-            "chunks": str(DEMO_ARTIFACT_DIR / "chunks.parquet"),
-            "evidence": str(DEMO_ARTIFACT_DIR / "evidence.parquet"),
-            "maturity": str(DEMO_ARTIFACT_DIR / "maturity.parquet"),
+            "chunks": str(demo_dir / "chunks.parquet"),
+            "evidence": str(demo_dir / "evidence.parquet"),
+            "maturity": str(demo_dir / "maturity.parquet"),
             "score": str(score_path),
-            "parity": str(PIPELINE_VALIDATION_DIR / "demo_topk_vs_evidence.json"),
+            "parity": str(run_dir / PIPELINE_VALIDATION_SUBDIR / PARITY_REPORT_NAME),
         },
         "timestamp": clock.time(),
     }
-    RUN_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
-    RUN_MANIFEST_PATH.write_text(json.dumps(manifest_payload, indent=2, sort_keys=True))
+    (run_dir / RUN_MANIFEST_NAME).write_text(json.dumps(manifest_payload, indent=2, sort_keys=True))
 
 
 def _write_retrieval_diagnostics(
+    run_dir: Path,
     company: str,
     year: int,
     query: str,
@@ -765,7 +925,8 @@ def _write_retrieval_diagnostics(
     - retrieval_diag.json: Top-K candidates with scores and page metadata
     - evidence_selector.log: Evidence selection reasoning
     """
-    PIPELINE_VALIDATION_DIR.mkdir(parents=True, exist_ok=True)
+    validation_dir = run_dir / PIPELINE_VALIDATION_SUBDIR
+    validation_dir.mkdir(parents=True, exist_ok=True)
 
     # Collect page information from evidence
     evidence_pages = {}
@@ -794,7 +955,7 @@ def _write_retrieval_diagnostics(
         "timestamp": clock.time(),
     }
 
-    retrieval_diag_path = PIPELINE_VALIDATION_DIR / "retrieval_diag.json"
+    retrieval_diag_path = validation_dir / "retrieval_diag.json"
     retrieval_diag_path.write_text(json.dumps(retrieval_diag, indent=2, sort_keys=True))
 
     # Evidence selector log
@@ -820,7 +981,7 @@ def _write_retrieval_diagnostics(
             f"  [{ev.get('evidence_id')}] Page {ev.get('page', 0)}: {ev.get('quote', '')[:60]}..."
         )
 
-    selector_log_path = PIPELINE_VALIDATION_DIR / "evidence_selector.log"
+    selector_log_path = validation_dir / "evidence_selector.log"
     selector_log_path.write_text("\n".join(selector_log), encoding="utf-8")
 
 
@@ -828,6 +989,10 @@ def lookup_manifest(company: str, year: int) -> Dict[str, Any]:
     return _lookup_manifest(company, year)
 
 
+def make_trace_id(company: str, year: int, query: str, alpha: float, k: int) -> str:
+    return _make_trace_id(company, year, query, alpha, k)
+
+
 def build_evidence_entries(
     company: str, year: int, documents: Sequence[Mapping[str, Any]]
 ) -> List[Dict[str, Any]]:
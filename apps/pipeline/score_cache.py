@@ -0,0 +1,379 @@
+"""
+Deterministic response cache for run_score.
+
+run_score is a pure function of its inputs (trace_id already hashes company,
+year, query, alpha and k; the seed is fixed) and of the data it reads. The
+cache key is therefore:
+
+    trace_id + semantic flag + data fingerprint
+
+where the data fingerprint hashes the manifest record, (mtime_ns, size) of
+its silver file / bronze partitions, and the compiled rubric file. Editing
+the manifest, landing new silver data or recompiling the rubric changes the
+fingerprint, so stale entries are simply never hit again; invalidate()
+drops them eagerly.
+
+Tiers:
+- In-process LRU (always)
+- Optional shared tier: any object with get(key) / set(key, value, ttl)
+  (e.g. libs.cache.tiered_cache.TieredCache over Redis)
+
+Concurrent identical requests are coalesced: get_or_compute (threads) and
+get_or_compute_async (event loop) run the computation once per key.
+
+Configuration (environment):
+- ESG_SCORE_CACHE_SIZE: local entries (default 512, 0 disables the cache)
+- ESG_SCORE_CACHE_REDIS_HOST / ESG_SCORE_CACHE_REDIS_PORT: enable shared tier
+- ESG_SCORE_CACHE_TTL: shared tier TTL in seconds (default 3600)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from apps.pipeline.company_manifest import get_company_manifest, normalize_company
+from libs.utils.env import get
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_SHARED_TTL = 3600
+RUBRIC_PATH = Path("rubrics/maturity_v3.json")
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if missing."""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def data_fingerprint(
+    manifest_record: Mapping[str, Any],
+    rubric_path: Path = RUBRIC_PATH,
+) -> str:
+    """
+    Fingerprint the data a run_score call reads.
+
+    Args:
+        manifest_record: Company manifest record (silver/bronze paths)
+        rubric_path: Compiled rubric file
+
+    Returns:
+        Short hex digest that changes whenever the inputs change
+    """
+    files: List[Tuple[str, Optional[Tuple[int, int]]]] = []
+    silver = manifest_record.get("silver")
+    if silver:
+        files.append((silver, _stat_signature(Path(silver))))
+    bronze = manifest_record.get("bronze")
+    if bronze:
+        bronze_path = Path(bronze)
+        if bronze_path.is_dir():
+            for part in sorted(glob.glob(str(bronze_path / "theme=*" / "*.parquet"))):
+                files.append((part, _stat_signature(Path(part))))
+        else:
+            files.append((bronze, _stat_signature(bronze_path)))
+    files.append((str(rubric_path), _stat_signature(rubric_path)))
+
+    payload = json.dumps(
+        {"record": manifest_record, "files": files}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ScoreResponseCache:
+    """LRU (+ optional shared tier) cache of run_score results."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        shared: Optional[Any] = None,
+        shared_ttl_seconds: Optional[int] = DEFAULT_SHARED_TTL,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Local LRU capacity (0 disables caching)
+            shared: Optional shared tier with get(key) and set(key, value, ttl)
+            shared_ttl_seconds: TTL for shared tier writes
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self.max_entries = max_entries
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.stats: Dict[str, int] = {
+            "hits": 0, "shared_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "invalidations": 0,
+        }
+
+        self._local: "OrderedDict[str, Tuple[Tuple[str, int], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_async: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """False when the cache is configured with zero entries."""
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(trace_id: str, semantic: bool, fingerprint: str) -> str:
+        """Cache key for one deterministic run_score call."""
+        return f"score:{trace_id}:sem{int(bool(semantic))}:{fingerprint}"
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response (local tier, then shared tier).
+
+        Returns:
+            A copy of the cached response, or None on miss
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+                self.stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+
+        if self.shared is not None:
+            try:
+                value: Optional[Dict[str, Any]] = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared score cache read failed: {e}")
+                value = None
+            if value is not None:
+                self._put_local(key, self._company_year(value), value)
+                with self._lock:
+                    self.stats["shared_hits"] += 1
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a response in every tier."""
+        if not self.enabled:
+            return
+        self._put_local(key, self._company_year(result), copy.deepcopy(result))
+        if self.shared is not None:
+            try:
+                self.shared.set(key, result, self.shared_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Shared score cache write failed: {e}")
+
+    @staticmethod
+    def _company_year(result: Mapping[str, Any]) -> Tuple[str, int]:
+        """Normalized (company, year) an entry is filed under for invalidation."""
+        return (normalize_company(result.get("company", "")), int(result.get("year") or 0))
+
+    def _put_local(self, key: str, company_year: Tuple[str, int], result: Dict[str, Any]) -> None:
+        """Insert into the LRU tier, evicting the oldest entries."""
+        with self._lock:
+            self._local[key] = (company_year, result)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+
+    def get_or_compute(self, key: str, compute_fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached response or compute it once across threads.
+
+        Args:
+            key: Cache key (see make_key)
+            compute_fn: Zero-argument callable producing the response
+
+        Returns:
+            Response dict (a private copy for the caller)
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            if not self.enabled:
+                return compute_fn()
+
+            with self._lock:
+                running = self._inflight.get(key)
+                if running is None:
+                    event = self._inflight[key] = threading.Event()
+                else:
+                    self.stats["coalesced"] += 1
+
+            if running is not None:
+                # Leader stores before signalling; if it failed, retry ourselves
+                running.wait()
+                continue
+
+            try:
+                result = compute_fn()
+                self.put(key, result)
+                return result
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Event-loop variant of get.
+
+        The shared tier is a blocking client (Redis), so with one configured
+        the lookup runs on a worker thread instead of the event loop.
+        """
+        if self.shared is None or not self.enabled:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        abandoned: Tuple[Type[BaseException], ...] = (),
+    ) -> Dict[str, Any]:
+        """
+        Event-loop variant of get_or_compute.
+
+        Concurrent requests for one key await the first request's computation
+        instead of each occupying a worker. If the leader is cancelled or
+        fails with one of the abandoned exceptions (its own client went away),
+        a waiting follower takes over the computation; followers only ever
+        see errors of the computation itself.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Zero-argument coroutine function producing the response
+            abandoned: Exception types meaning only the leader's caller gave
+                up (e.g. ClientDisconnected)
+
+        Returns:
+            Response dict (a private copy for the caller)
+        """
+        while True:
+            cached = await self.get_async(key)
+            if cached is not None:
+                return cached
+            if not self.enabled:
+                return await compute()
+
+            pending = self._inflight_async.get(key)
+            if pending is None:
+                break
+            with self._lock:
+                self.stats["coalesced"] += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leader's client went away; take over the computation
+
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight_async[key] = pending
+        try:
+            result = await compute()
+            self.put(key, result)
+            pending.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except abandoned:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Followers receive the error; don't warn about an unretrieved one
+            pending.exception()
+            raise
+        finally:
+            self._inflight_async.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, company: Optional[str] = None, year: Optional[int] = None) -> int:
+        """
+        Drop local entries, optionally only for one company and/or year.
+
+        Shared-tier entries are keyed by data fingerprint, so they stop being
+        hit as soon as the data changes and age out through their TTL.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if company is None and year is None:
+                removed = len(self._local)
+                self._local.clear()
+            else:
+                wanted = normalize_company(company) if company is not None else None
+                doomed = [
+                    key for key, ((rec_company, rec_year), _) in self._local.items()
+                    if (wanted is None or rec_company == wanted) and (year is None or rec_year == year)
+                ]
+                for key in doomed:
+                    del self._local[key]
+                removed = len(doomed)
+            self.stats["invalidations"] += removed
+        return removed
+
+    def __len__(self) -> int:
+        """Local tier size."""
+        return len(self._local)
+
+
+_CACHE: Optional[ScoreResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_score_cache() -> ScoreResponseCache:
+    """Process-wide score cache configured from ESG_SCORE_CACHE_* variables."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            shared = None
+            ttl = int(get("ESG_SCORE_CACHE_TTL") or DEFAULT_SHARED_TTL)
+            redis_host = get("ESG_SCORE_CACHE_REDIS_HOST")
+            if redis_host:
+                from libs.cache.tiered_cache import create_tiered_cache
+
+                shared = create_tiered_cache(
+                    host=redis_host,
+                    port=int(get("ESG_SCORE_CACHE_REDIS_PORT") or 6379),
+                    default_ttl_seconds=ttl,
+                )
+            _CACHE = ScoreResponseCache(
+                max_entries=int(get("ESG_SCORE_CACHE_SIZE") or DEFAULT_CACHE_SIZE),
+                shared=shared,
+                shared_ttl_seconds=ttl,
+            )
+            # Manifest edits (new paths, re-pointed silver data) drop local entries eagerly
+            get_company_manifest().add_reload_listener(_CACHE.invalidate)
+        return _CACHE
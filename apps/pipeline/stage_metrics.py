@@ -0,0 +1,91 @@
+"""
+Per-stage instrumentation for run_score.
+
+Each pipeline stage (manifest lookup, data load, BM25 fit/score, embedding,
+semantic KNN, fusion, evidence building, rubric scoring, artifact write)
+runs inside pipeline_stage(), which:
+
+- opens an OpenTelemetry child span "run_score.<stage>" under the current
+  span (the FastAPI request span, or the run_score parent span), carrying
+  the company/year and the record counts the stage saw
+- observes esg_pipeline_stage_latency_seconds{stage=<stage>}
+- also feeds the pre-existing esg_semantic_knn_latency_seconds and
+  esg_fusion_latency_seconds histograms for those two stages
+
+Only opentelemetry-api is required; without a configured TracerProvider
+(see apps.api.telemetry.setup_telemetry) spans are no-ops.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer(__name__)
+
+SPAN_PREFIX = "run_score"
+ATTRIBUTE_PREFIX = "esg."
+
+
+def current_context() -> otel_context.Context:
+    """Snapshot of the active trace context, for work handed to other threads."""
+    return otel_context.get_current()
+
+
+def set_counts(span: trace.Span, **counts: Any) -> None:
+    """Record counts (e.g. records=120, top_k=10) on a stage span."""
+    for name, value in counts.items():
+        if value is not None:
+            span.set_attribute(f"{ATTRIBUTE_PREFIX}{name}", value)
+
+
+def _observe(stage: str, elapsed: float, backend: Optional[str]) -> None:
+    """Record a stage latency in Prometheus; metrics must never fail a run."""
+    try:
+        from apps.api import metrics
+
+        metrics.esg_pipeline_stage_latency_seconds.labels(stage=stage).observe(elapsed)
+        if stage == "semantic_knn":
+            metrics.esg_semantic_knn_latency_seconds.labels(backend=backend or "deterministic").observe(elapsed)
+        elif stage == "fusion":
+            metrics.esg_fusion_latency_seconds.observe(elapsed)
+    except Exception as e:
+        logger.debug(f"Stage metric for {stage} not recorded: {e}")
+
+
+@contextmanager
+def pipeline_stage(
+    stage: str,
+    parent: Optional[otel_context.Context] = None,
+    **attributes: Any,
+) -> Iterator[trace.Span]:
+    """
+    Time one run_score stage as a span plus a Prometheus observation.
+
+    Args:
+        stage: Stage name (span "run_score.<stage>", metric label stage=<stage>)
+        parent: Explicit parent context (see current_context); defaults to
+            the active span
+        **attributes: Span attributes, stored as "esg.<name>" (e.g. company,
+            year, records); backend= also labels the semantic KNN histogram
+
+    Yields:
+        The stage span, so counts known only at the end can be added with
+        set_counts
+    """
+    with tracer.start_as_current_span(f"{SPAN_PREFIX}.{stage}", context=parent) as span:
+        set_counts(span, **attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - start
+            span.set_attribute(f"{ATTRIBUTE_PREFIX}duration_ms", elapsed * 1000.0)
+            _observe(stage, elapsed, attributes.get("backend"))
@@ -11,11 +11,12 @@ SCA v13.8 Compliance:
 """
 
 from __future__ import annotations
-import json
 import pathlib
 import dataclasses
 from typing import Any, Dict, List
 
+from agents.scoring.compiled_rubric import get_compiled_rubric
+
 SCHEMA_PATH = pathlib.Path("rubrics/esg_rubric_schema_v3.json")
 
 
@@ -39,6 +40,9 @@ def load_rubric(path: pathlib.Path = SCHEMA_PATH) -> Rubric:
     """
     Load rubric from JSON schema.
 
+    The schema is parsed once per version (shared compiled artifact); each
+    call returns its own plain, JSON-serializable copy.
+
     Args:
         path: Path to JSON schema (default: rubrics/esg_rubric_schema_v3.json)
 
@@ -49,7 +53,7 @@ def load_rubric(path: pathlib.Path = SCHEMA_PATH) -> Rubric:
         FileNotFoundError: If schema file doesn't exist
         json.JSONDecodeError: If schema is invalid JSON
     """
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = get_compiled_rubric(path).to_dict()
 
     themes = [
         Theme(
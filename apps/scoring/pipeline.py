@@ -7,11 +7,13 @@ Integrates all components for end-to-end scoring
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 import json
 import hashlib
+import threading
 from pathlib import Path
 import time
 
@@ -22,9 +24,11 @@ from apps.ingestion.validator import validate_chunks, ChunkValidator
 from libs.llm.watsonx_client import get_watsonx_client, WatsonXClient
 from libs.storage.astradb_vector import get_vector_store, AstraDBVectorStore
 from libs.storage.astradb_graph import get_graph_store, AstraDBGraphStore
+from libs.storage.bulk_writer import AstraDBBulkWriter
 from libs.retrieval.hybrid_retriever import HybridRetriever
 from apps.scoring.scorer import score_company
 from apps.scoring.rubric_v3_loader import get_rubric_v3, RubricV3Loader
+from libs.utils.concurrency import map_ordered
 
 
 def get_audit_timestamp():
@@ -58,6 +62,8 @@ class PipelineConfig:
     min_evidence_per_theme: int = 3
 
     # Processing
+    # max_workers bounds both companies scored at once and themes scored at
+    # once; batch_size bounds companies queued ahead of the one being saved
     batch_size: int = 32
     max_workers: int = 4
     cache_results: bool = True
@@ -116,6 +122,15 @@ class ESGScoringPipeline:
         self.themes = self._load_themes()
         self.rubric = self._load_rubric()
 
+        self._init_concurrency()
+
+    def _init_concurrency(self):
+        """Cancellation flag, save lock and the (lazy) shared theme pool"""
+        self._cancel_event = threading.Event()
+        self._save_lock = threading.Lock()
+        self._theme_pool: Optional[ThreadPoolExecutor] = None
+        self._theme_pool_lock = threading.Lock()
+
     def _load_themes(self) -> List[str]:
         """Load ESG themes for evaluation from rubric v3.0"""
         # Use the 7 themes from rubric v3.0
@@ -136,10 +151,16 @@ class ESGScoringPipeline:
         self,
         company: str,
         year: Optional[int] = None,
-        use_cached_data: bool = True
+        use_cached_data: bool = True,
+        save: bool = True
     ) -> CompanyScore:
         """
         Score a single company's ESG maturity
+
+        Themes are scored concurrently (config.max_workers) since each one is
+        dominated by retrieval and LLM round trips. ``save=False`` leaves
+        persisting the score to the caller (score_multiple_companies saves
+        in input order).
         """
         start_time = clock.time()
         logger.info(f"Starting ESG scoring for {company} ({year or 'latest'})")
@@ -157,11 +178,22 @@ class ESGScoringPipeline:
         theme_scores = {}
         total_evidence = 0
 
-        for theme in self.themes:
+        def score_one(theme: str) -> Dict[str, Any]:
+            """Score one theme for this company."""
             logger.info(f"Scoring {theme} for {company}")
-            theme_score = self._score_theme(company, year, theme, processed_chunks)
-            theme_scores[theme] = theme_score
-            total_evidence += theme_score.get("evidence_count", 0)
+            return self._score_theme(company, year, theme, processed_chunks)
+
+        for outcome in map_ordered(
+            score_one,
+            self.themes,
+            self._get_theme_pool(),
+            max_pending=len(self.themes) or 1,
+            cancel_event=self._cancel_event
+        ):
+            if not outcome.ok:
+                raise outcome.error
+            theme_scores[outcome.item] = outcome.value
+            total_evidence += outcome.value.get("evidence_count", 0)
 
         # Step 4: Calculate overall score
         overall_stage, overall_confidence = self._calculate_overall_score(theme_scores)
@@ -186,7 +218,8 @@ class ESGScoringPipeline:
         )
 
         # Save results
-        self._save_score(score)
+        if save:
+            self._save_score(score)
 
         logger.info(f"Completed scoring for {company}: Stage {overall_stage:.1f} (confidence {overall_confidence:.2f})")
         return score
@@ -296,41 +329,39 @@ class ESGScoringPipeline:
             batch_size=self.config.batch_size
         )
 
-        # Prepare for storage
-        items_to_store = []
-        for chunk, embedding in zip(chunks, embeddings):
-            metadata = {
-                "company": chunk.company,
-                "year": chunk.year,
-                "section": chunk.section,
-                "source_url": chunk.source_url,
-                "text": chunk.text,
-                "page_start": chunk.page_start,
-                "page_end": chunk.page_end
-            }
-
-            items_to_store.append((chunk.chunk_id, embedding, metadata))
+        # Buffer vectors, nodes and edges; the writer flushes them in bulk
+        with AstraDBBulkWriter(
+            vector_store=self.vector_store,
+            graph_store=self.graph_store,
+            max_workers=self.config.max_workers
+        ) as writer:
+            for chunk, embedding in zip(chunks, embeddings):
+                metadata = {
+                    "company": chunk.company,
+                    "year": chunk.year,
+                    "section": chunk.section,
+                    "source_url": chunk.source_url,
+                    "text": chunk.text,
+                    "page_start": chunk.page_start,
+                    "page_end": chunk.page_end
+                }
 
-            # Create graph nodes
-            self.graph_store.upsert_node(
-                chunk.chunk_id,
-                "chunk",
-                metadata
-            )
+                writer.add_vector(chunk.chunk_id, embedding, metadata)
+                writer.add_node(chunk.chunk_id, "chunk", metadata)
 
-            processed.append({
-                "chunk": chunk,
-                "embedding": embedding,
-                "metadata": metadata
-            })
+                processed.append({
+                    "chunk": chunk,
+                    "embedding": embedding,
+                    "metadata": metadata
+                })
 
-        # Batch store in vector database
-        if items_to_store:
-            success_count = self.vector_store.upsert_batch(items_to_store)
-            logger.info(f"Stored {success_count}/{len(items_to_store)} chunks in vector store")
+            # Create graph relationships
+            self._create_graph_relationships(processed, company, year, writer)
 
-        # Create graph relationships
-        self._create_graph_relationships(processed, company, year)
+        logger.info(
+            f"Stored {writer.stats.vectors_written} vectors, {writer.stats.nodes_written} nodes, "
+            f"{writer.stats.edges_written} edges ({writer.stats.docs_per_second:.1f} docs/s)"
+        )
 
         return processed
 
@@ -338,12 +369,13 @@ class ESGScoringPipeline:
         self,
         processed_chunks: List[Dict[str, Any]],
         company: str,
-        year: Optional[int]
+        year: Optional[int],
+        writer: AstraDBBulkWriter
     ):
-        """Create graph relationships between entities"""
+        """Buffer graph relationships between entities on the bulk writer"""
         # Create company node
         company_id = f"company_{company.lower().replace(' ', '_')}"
-        self.graph_store.upsert_node(
+        writer.add_node(
             company_id,
             "company",
             {"name": company, "year": year}
@@ -352,7 +384,7 @@ class ESGScoringPipeline:
         # Create theme nodes
         for theme in self.themes:
             theme_id = f"theme_{theme.lower().replace(' ', '_')}"
-            self.graph_store.upsert_node(
+            writer.add_node(
                 theme_id,
                 "theme",
                 {"name": theme}
@@ -364,7 +396,7 @@ class ESGScoringPipeline:
 
             # Link to company
             edge_id = f"{chunk.chunk_id}_belongs_to_{company_id}"
-            self.graph_store.upsert_edge(
+            writer.add_edge(
                 edge_id=edge_id,
                 source_id=chunk.chunk_id,
                 target_id=company_id,
@@ -377,7 +409,7 @@ class ESGScoringPipeline:
                 if any(word in section_lower for word in theme.lower().split()):
                     theme_id = f"theme_{theme.lower().replace(' ', '_')}"
                     edge_id = f"{chunk.chunk_id}_references_{theme_id}"
-                    self.graph_store.upsert_edge(
+                    writer.add_edge(
                         edge_id=edge_id,
                         source_id=chunk.chunk_id,
                         target_id=theme_id,
@@ -575,7 +607,7 @@ class ESGScoringPipeline:
 
         # Also save to artifacts
         artifacts_file = self.config.artifacts_dir / "all_scores.jsonl"
-        with open(artifacts_file, 'a') as f:
+        with self._save_lock, open(artifacts_file, 'a') as f:
             f.write(json.dumps(score.to_dict()) + '\n')
 
     def _load_cached_chunks(self, company: str, year: Optional[int]) -> List[Chunk]:
@@ -611,22 +643,82 @@ class ESGScoringPipeline:
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
 
+    def _get_theme_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Shared thread pool for theme scoring (None when max_workers is 1)"""
+        if self.config.max_workers <= 1:
+            return None
+        with self._theme_pool_lock:
+            if self._theme_pool is None:
+                self._theme_pool = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix="esg-theme"
+                )
+            return self._theme_pool
+
+    def cancel(self) -> None:
+        """
+        Stop a running score_multiple_companies() from another thread.
+
+        Companies and themes not yet started are skipped (scored empty with
+        a "Cancelled" error); calls already talking to the LLM finish.
+        """
+        self._cancel_event.set()
+
+    def shutdown(self) -> None:
+        """Release the theme worker pool"""
+        with self._theme_pool_lock:
+            if self._theme_pool is not None:
+                self._theme_pool.shutdown(wait=True)
+                self._theme_pool = None
+
     def score_multiple_companies(
         self,
         companies: List[str],
         year: Optional[int] = None
     ) -> List[CompanyScore]:
-        """Score multiple companies"""
+        """
+        Score multiple companies
+
+        Companies run on a thread pool of config.max_workers with at most
+        config.batch_size queued ahead of the oldest unfinished one. Scores
+        are returned and saved in input order regardless of completion order.
+        """
+        self._cancel_event.clear()
         scores = []
+        max_workers = max(1, self.config.max_workers)
+        max_pending = max(max_workers, self.config.batch_size)
 
-        for company in companies:
-            logger.info(f"Processing {company} ({companies.index(company)+1}/{len(companies)})")
-            try:
-                score = self.score_company(company, year)
-                scores.append(score)
-            except Exception as e:
-                logger.error(f"Failed to score {company}: {e}")
-                scores.append(self._create_empty_score(company, year or datetime.fromisoformat(get_audit_timestamp()).year))
+        def score_one(company: str) -> CompanyScore:
+            """Score one company without saving; saving happens in order."""
+            return self.score_company(company, year, save=False)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="esg-company") as pool:
+                for outcome in map_ordered(
+                    score_one,
+                    companies,
+                    pool if max_workers > 1 else None,
+                    max_pending=max_pending,
+                    cancel_event=self._cancel_event
+                ):
+                    company = outcome.item
+                    logger.info(f"Processed {company} ({outcome.index + 1}/{len(companies)})")
+                    if outcome.ok:
+                        score = outcome.value
+                        # Empty (no data) scores are returned but never saved
+                        if "error" not in score.metadata:
+                            self._save_score(score)
+                    else:
+                        reason = "Cancelled" if outcome.cancelled else str(outcome.error)
+                        logger.error(f"Failed to score {company}: {reason}")
+                        score = self._create_empty_score(company, year or datetime.fromisoformat(get_audit_timestamp()).year)
+                        if outcome.cancelled:
+                            score.metadata["error"] = "Cancelled"
+                    scores.append(score)
+        finally:
+            # A cancel only applies to this run; later score_company() calls
+            # must not see the event still set
+            self._cancel_event.clear()
 
         # Generate comparative report
         self._generate_comparative_report(scores)
@@ -7,12 +7,13 @@ NAMING: Phase 1 of naming refactor - canonical names with legacy aliases
   - Legacy alias: ThemeRubric (deprecated, import-time warning)
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Any, TypeAlias
 from dataclasses import dataclass
 import warnings as _w
 
+from agents.scoring.compiled_rubric import get_compiled_rubric
+
 
 @dataclass
 class StageDescriptor:
@@ -35,6 +36,33 @@ class ThemeRubricV3:
     stages: Dict[int, StageDescriptor]
 
 
+def _parse_themes(rubric_data: Dict[str, Any]) -> Dict[str, ThemeRubricV3]:
+    """Parse themes from rubric data"""
+    themes = {}
+
+    for theme_data in rubric_data.get("themes", []):
+        code = theme_data["code"]
+        name = theme_data["name"]
+        intent = theme_data["intent"]
+
+        stages = {}
+        for stage_num, stage_data in theme_data["stages"].items():
+            stages[int(stage_num)] = StageDescriptor(
+                label=stage_data["label"],
+                descriptor=stage_data["descriptor"],
+                evidence_examples=stage_data.get("evidence_examples", [])
+            )
+
+        themes[code] = ThemeRubricV3(
+            code=code,
+            name=name,
+            intent=intent,
+            stages=stages
+        )
+
+    return themes
+
+
 class RubricV3Loader:
     """
     Loader for ESG Maturity Rubric v3.0
@@ -53,39 +81,11 @@ class RubricV3Loader:
             rubric_path = base / "rubrics" / "esg_rubric_schema_v3.json"
 
         self.rubric_path = rubric_path
-        self.rubric_data = self._load_rubric()
-        self.themes = self._parse_themes()
-
-    def _load_rubric(self) -> Dict[str, Any]:
-        """Load rubric JSON file"""
-        with open(self.rubric_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def _parse_themes(self) -> Dict[str, ThemeRubricV3]:
-        """Parse themes from rubric data"""
-        themes = {}
-
-        for theme_data in self.rubric_data.get("themes", []):
-            code = theme_data["code"]
-            name = theme_data["name"]
-            intent = theme_data["intent"]
-
-            stages = {}
-            for stage_num, stage_data in theme_data["stages"].items():
-                stages[int(stage_num)] = StageDescriptor(
-                    label=stage_data["label"],
-                    descriptor=stage_data["descriptor"],
-                    evidence_examples=stage_data.get("evidence_examples", [])
-                )
-
-            themes[code] = ThemeRubricV3(
-                code=code,
-                name=name,
-                intent=intent,
-                stages=stages
-            )
-
-        return themes
+        # Parsed once per process (shared compiled artifact); each loader
+        # gets its own plain, JSON-serializable copy
+        self._compiled = get_compiled_rubric(rubric_path)
+        self.rubric_data: Dict[str, Any] = self._compiled.to_dict()
+        self.themes: Dict[str, ThemeRubricV3] = _parse_themes(self.rubric_data)
 
     def get_theme_codes(self) -> List[str]:
         """Get all theme codes (TSP, OSP, DM, GHG, RD, EI, RMM)"""
@@ -3,18 +3,21 @@
 from __future__ import annotations
 
 import logging
-import time
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import requests  # @allow-network: integration tests may call watsonx embeddings
 
+from libs.embedding.embedding_executor import EmbeddingRequestError, get_embedding_executor
 from libs.utils import env
 
 logger = logging.getLogger(__name__)
 
 _EMBED_URL = "https://us-south.ml.cloud.ibm.com/ml/v1/text/embeddings"
 _EMBED_VERSION = "2023-05-29"
-_MAX_RETRIES = 3
+
+
+class RateLimited(RuntimeError):
+    """watsonx answered 429; retried by the executor."""
 
 
 def embed_text_batch(
@@ -27,7 +30,9 @@ def embed_text_batch(
     Deterministic behaviour:
     - Stable ordering matching the input sequence.
     - Guarded by LIVE_EMBEDDINGS flag (defaults to False).
-    - Retries (backoff) honour IBM rate limits while preserving ordering.
+    - Batches run concurrently on the shared embedding executor, under its
+      token-bucket limit; retries (jittered backoff) honour IBM rate limits
+      while preserving ordering.
     """
     if not texts:
         return []
@@ -43,64 +48,58 @@ def embed_text_batch(
     project = env.get("WX_PROJECT")
     model = env.get("WX_MODEL_ID")
 
-    missing = [name for name, value in [("WX_API_KEY", api_key), ("WX_PROJECT", project), ("WX_MODEL_ID", model)] if not value]
-    if missing:
+    if not (api_key and project and model):
+        missing = [name for name, value in [("WX_API_KEY", api_key), ("WX_PROJECT", project), ("WX_MODEL_ID", model)] if not value]
         raise RuntimeError(f"Missing watsonx credentials: {', '.join(missing)}")
 
+    def _post(batch: List[str]) -> List[Iterable[float]]:
+        """One request with this call's credentials."""
+        return _post_embeddings(batch, api_key=api_key, project=project, model=model)
+
+    try:
+        vectors = get_embedding_executor().embed(list(texts), embed_fn=_post)
+    except EmbeddingRequestError as exc:
+        raise RuntimeError(
+            "Failed to fetch watsonx embeddings after retries. Check credentials and rate limits."
+        ) from exc
+    return [list(map(float, vector)) for vector in vectors]
+
+
+def _post_embeddings(
+    batch: List[str],
+    *,
+    api_key: str,
+    project: str,
+    model: str,
+) -> List[Iterable[float]]:
+    """Send one embeddings request; transport, 429 and HTTP errors raise for retry."""
     payload = {
-        "input": list(texts),
+        "input": batch,
         "project_id": project,
         "model_id": model,
         "parameters": {"truncate_input_tokens": True},
     }
-
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
-
-    params = {"version": _EMBED_VERSION}
-
-    for attempt in range(_MAX_RETRIES):
-        try:
-            response = requests.post(
-                _EMBED_URL,
-                headers=headers,
-                params=params,
-                json=payload,
-                timeout=60,
-            )
-        except requests.RequestException as exc:
-            logger.warning("watsonx embed request failed (%s/%s): %s", attempt + 1, _MAX_RETRIES, exc)
-            _sleep_backoff(attempt)
-            continue
-
-        if response.status_code == 429:
-            logger.warning("watsonx rate limited (%s/%s)", attempt + 1, _MAX_RETRIES)
-            _sleep_backoff(attempt)
-            continue
-
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:
-            logger.error("watsonx embed request error: %s", exc)
-            _sleep_backoff(attempt)
-            continue
-
-        data = response.json()
-        vectors = _extract_vectors(data)
-        if len(vectors) != len(texts):
-            raise ValueError(
-                f"Received {len(vectors)} embeddings for {len(texts)} inputs from watsonx."
-            )
-        return [list(map(float, vector)) for vector in vectors]
-
-    raise RuntimeError("Failed to fetch watsonx embeddings after retries. Check credentials and rate limits.")
-
-
-def _sleep_backoff(attempt: int) -> None:
-    delay = min(2 ** attempt, 8)
-    time.sleep(delay)
+    response = requests.post(
+        env.get("WX_EMBED_URL", _EMBED_URL),
+        headers=headers,
+        params={"version": _EMBED_VERSION},
+        json=payload,
+        timeout=60,
+    )
+    if response.status_code == 429:
+        raise RateLimited("watsonx rate limited")
+    response.raise_for_status()
+
+    vectors = _extract_vectors(response.json())
+    if len(vectors) != len(batch):
+        raise ValueError(
+            f"Received {len(vectors)} embeddings for {len(batch)} inputs from watsonx."
+        )
+    return vectors
 
 
 def _extract_vectors(payload: Dict[str, Any]) -> List[Iterable[float]]:
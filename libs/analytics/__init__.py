@@ -9,6 +9,7 @@ from libs.analytics.duck import (
     get_company_theme_stats,
 )
 from libs.analytics.prefilter import prefilter_ids
+from libs.analytics.evidence_gating import EvidenceGateResult, gate_evidence
 
 __all__ = [
     "get_conn",
@@ -18,4 +19,6 @@ __all__ = [
     "materialize",
     "get_company_theme_stats",
     "prefilter_ids",
+    "EvidenceGateResult",
+    "gate_evidence",
 ]
@@ -19,6 +19,8 @@ EVIDENCE_PER_PAGE_CAP = 5  # Maximum evidence items per page
 DOC_LENGTH_THRESHOLD = 10  # Page count threshold for span calculation
 MIN_SPAN_SHORT_DOCS = 3  # Minimum span for documents < 10 pages
 MIN_SPAN_LONG_DOCS = 5  # Minimum span for documents ≥ 10 pages
+EVIDENCE_MIN_QUOTE_WORDS = 5  # Minimum words in a quote (columnar gating)
+EVIDENCE_MIN_PER_THEME = 2  # Minimum evidence items per theme (rubric evidence_min_per_stage_claim)
 
 
 def get_min_span_for_doc(total_pages: int) -> int:
@@ -0,0 +1,364 @@
+"""
+Columnar Evidence Gating
+
+Applies the evidence quality gates to a whole table of candidate evidence at
+once (PyArrow table or DuckDB relation), e.g. 100k candidates for a
+portfolio screen, instead of looping over lists of dicts.
+
+No row is dropped silently: every row gets a ``rejection_reason`` (null
+when accepted). Gates run in this order and the first failure wins:
+
+1. binary_text: the quote looks like binary/corrupted data (is_binaryish)
+2. short_quote: fewer than min_quote_words words
+3. page_cap: beyond the first max_per_page surviving rows of its page in
+   its group (cap_per_page semantics: input order wins)
+4. theme_min_evidence / theme_min_distinct_pages / theme_min_span: the
+   group's surviving rows fail enforce_evidence_min_per_theme or
+   evidence_ok, so all of them are rejected
+
+Groups default to (org_id, year, theme) over the Evidence Arrow layout
+(agents.parser.parallel_extractor.EVIDENCE_ARROW_SCHEMA). Row gates are
+Arrow compute kernels; the per-page rank and per-group aggregates are numpy
+sorts and bincounts, so cost grows with rows, not with Python iterations.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from libs.analytics.evidence_config import (
+    DOC_LENGTH_THRESHOLD,
+    EVIDENCE_MIN_PER_THEME,
+    EVIDENCE_MIN_QUOTE_WORDS,
+    EVIDENCE_PAGE_MIN_DISTINCT,
+    EVIDENCE_PER_PAGE_CAP,
+    MIN_SPAN_LONG_DOCS,
+    MIN_SPAN_SHORT_DOCS,
+)
+from libs.extraction.text_clean import is_binaryish_arrow
+
+REJECT_BINARY = "binary_text"
+REJECT_SHORT_QUOTE = "short_quote"
+REJECT_PAGE_CAP = "page_cap"
+REJECT_THEME_MIN_EVIDENCE = "theme_min_evidence"
+REJECT_THEME_MIN_PAGES = "theme_min_distinct_pages"
+REJECT_THEME_MIN_SPAN = "theme_min_span"
+
+# Code 0 means accepted; codes index into this tuple
+_REASONS = (
+    None,
+    REJECT_BINARY,
+    REJECT_SHORT_QUOTE,
+    REJECT_PAGE_CAP,
+    REJECT_THEME_MIN_EVIDENCE,
+    REJECT_THEME_MIN_PAGES,
+    REJECT_THEME_MIN_SPAN,
+)
+_CODE = {reason: code for code, reason in enumerate(_REASONS)}
+
+# Runs of non-whitespace, with whitespace as str.split() defines it
+_WORD_PATTERN = (
+    r"[^\t\n\x{b}\x{c}\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]+"
+)
+_INT_PATTERN = r"^\s*[+-]?[0-9]+\s*$"
+
+DEFAULT_GROUP_BY = ("org_id", "year", "theme")
+REASON_COLUMN = "rejection_reason"
+
+
+def _require_arrow() -> Tuple[Any, Any]:
+    """Import pyarrow lazily (optional dependency)."""
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]
+        import pyarrow.compute as pc  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise RuntimeError(
+            "pyarrow not available. Install with: pip install pyarrow"
+        ) from e
+    return pa, pc
+
+
+@dataclass(frozen=True)
+class EvidenceGateResult:
+    """
+    Outcome of gate_evidence().
+
+    Attributes:
+        table: Input rows in input order plus ``rejection_reason`` (null when
+            the row passed every gate)
+        groups: One row per group, in first-appearance order: group keys,
+            evidence_count, distinct_pages, page_span, min_span_required,
+            passed and rejection_reason (group-level gate that failed)
+    """
+
+    table: Any
+    groups: Any
+
+    @property
+    def accepted(self) -> Any:
+        """Rows that passed every gate, without the reason column."""
+        _, pc = _require_arrow()
+        mask = pc.is_null(self.table[REASON_COLUMN])
+        return self.table.filter(mask).drop_columns([REASON_COLUMN])
+
+    @property
+    def rejected(self) -> Any:
+        """Rejected rows with their reason."""
+        _, pc = _require_arrow()
+        return self.table.filter(pc.is_valid(self.table[REASON_COLUMN]))
+
+    def reason_counts(self) -> Dict[str, int]:
+        """Number of rejected rows per reason."""
+        _, pc = _require_arrow()
+        counts = pc.value_counts(self.table[REASON_COLUMN].drop_null())
+        return {
+            item["values"].as_py(): item["counts"].as_py()
+            for item in counts
+        }
+
+
+def gate_evidence(
+    evidence: Any,
+    quote_column: str = "extract_30w",
+    page_column: str = "page_no",
+    group_by: Sequence[str] = DEFAULT_GROUP_BY,
+    total_pages: Union[int, str, None] = None,
+    min_quote_words: int = EVIDENCE_MIN_QUOTE_WORDS,
+    max_per_page: Optional[int] = EVIDENCE_PER_PAGE_CAP,
+    min_per_theme: int = EVIDENCE_MIN_PER_THEME,
+    min_distinct_pages: int = EVIDENCE_PAGE_MIN_DISTINCT,
+    min_span: Optional[int] = None,
+    binary_threshold: Optional[float] = 0.15,
+) -> EvidenceGateResult:
+    """
+    Apply evidence quality gates to a table of candidate evidence.
+
+    Args:
+        evidence: pyarrow Table/RecordBatch/RecordBatchReader or a DuckDB relation
+        quote_column: Quote text column
+        page_column: Page number column (int or numeric string; values <= 0,
+            null or unparsable count as no page for the distinct/span gates)
+        group_by: Columns identifying a theme group (may be empty: one group)
+        total_pages: Document length for the span requirement: an int, a
+            column name (max per group), or None to use a ``total_pages``
+            column if present and otherwise treat documents as short
+        min_quote_words: Minimum words per quote (0 disables)
+        max_per_page: Maximum rows per page per group (None disables)
+        min_per_theme: Minimum surviving rows per group (0 disables)
+        min_distinct_pages: Minimum distinct pages per group (0 disables)
+        min_span: Minimum page span per group; None derives it from
+            total_pages like get_min_span_for_doc (0 disables)
+        binary_threshold: is_binaryish threshold (None disables)
+
+    Returns:
+        EvidenceGateResult with the annotated table and per-group summary
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: If a referenced column is missing
+    """
+    pa, pc = _require_arrow()
+    table = _to_table(evidence, pa)
+    group_by = list(group_by)
+    if isinstance(total_pages, str):
+        total_pages_column = total_pages
+    elif total_pages is None and "total_pages" in table.column_names:
+        total_pages_column = "total_pages"
+    else:
+        total_pages_column = None
+
+    required = [quote_column, page_column, *group_by]
+    if total_pages_column:
+        required.append(total_pages_column)
+    missing = [name for name in required if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Evidence table missing columns: {missing}")
+
+    n_rows = table.num_rows
+    codes = np.zeros(n_rows, dtype=np.int8)
+
+    # Row gates
+    quote = pc.fill_null(table[quote_column], "")
+    if binary_threshold is not None:
+        binary = _to_bool(is_binaryish_arrow(quote, binary_threshold))
+        codes[binary] = _CODE[REJECT_BINARY]
+    if min_quote_words > 0:
+        words = _to_numpy(pc.count_substring_regex(quote, _WORD_PATTERN))
+        codes[(codes == 0) & (words < min_quote_words)] = _CODE[REJECT_SHORT_QUOTE]
+
+    group_ids, first_rows = _group_ids(table, group_by, pc)
+    n_groups = len(first_rows)
+
+    if max_per_page is not None:
+        bucket = _dictionary_codes(_page_bucket(table[page_column], pa, pc), pc)
+        candidates = np.flatnonzero(codes == 0)
+        rank = _rank_within(group_ids[candidates], bucket[candidates])
+        codes[candidates[rank >= max_per_page]] = _CODE[REJECT_PAGE_CAP]
+
+    # Group gates over the rows that survived the row gates
+    survivors = np.flatnonzero(codes == 0)
+    survivor_groups = group_ids[survivors]
+    evidence_count = np.bincount(survivor_groups, minlength=n_groups)
+
+    pages = _page_numbers(table[page_column], pa, pc)[survivors]
+    with_page = pages > 0
+    page_groups, page_values = survivor_groups[with_page], pages[with_page]
+    distinct = np.unique(_combine_codes([page_groups, page_values]), return_index=True)[1]
+    page_groups, page_values = page_groups[distinct], page_values[distinct]
+    distinct_pages = np.bincount(page_groups, minlength=n_groups)
+    low = np.full(n_groups, np.iinfo(np.int64).max)
+    high = np.zeros(n_groups, dtype=np.int64)
+    np.minimum.at(low, page_groups, page_values)
+    np.maximum.at(high, page_groups, page_values)
+    page_span = np.where(distinct_pages >= 2, high - low, 0)
+
+    if min_span is not None:
+        span_required = np.full(n_groups, min_span, dtype=np.int64)
+    else:
+        doc_pages = np.ones(n_groups, dtype=np.int64)
+        if total_pages_column:
+            column_pages = _to_numpy(pc.fill_null(pc.cast(table[total_pages_column], pa.int64()), 1))
+            np.maximum.at(doc_pages, group_ids, column_pages)
+        elif isinstance(total_pages, int):
+            doc_pages[:] = total_pages
+        span_required = np.where(doc_pages >= DOC_LENGTH_THRESHOLD, MIN_SPAN_LONG_DOCS, MIN_SPAN_SHORT_DOCS)
+
+    group_codes = np.zeros(n_groups, dtype=np.int8)
+    checks = (
+        (REJECT_THEME_MIN_SPAN, page_span < span_required),
+        (REJECT_THEME_MIN_PAGES, distinct_pages < min_distinct_pages),
+        (REJECT_THEME_MIN_EVIDENCE, evidence_count < min_per_theme),
+    )
+    # Assign in reverse priority so the first failing gate wins
+    for reason, failed in checks:
+        group_codes[failed] = _CODE[reason]
+    codes[survivors] = group_codes[survivor_groups]
+
+    reasons = pa.array(_REASONS, type=pa.string())
+    annotated = table.append_column(REASON_COLUMN, pc.take(reasons, pa.array(codes)))
+    groups = table.select(group_by).take(pa.array(first_rows)) if group_by else pa.table({})
+    groups = pa.table({
+        **{name: groups[name] for name in group_by},
+        "evidence_count": pa.array(evidence_count, type=pa.int64()),
+        "distinct_pages": pa.array(distinct_pages, type=pa.int64()),
+        "page_span": pa.array(page_span, type=pa.int64()),
+        "min_span_required": pa.array(span_required, type=pa.int64()),
+        "passed": pa.array(group_codes == 0),
+        REASON_COLUMN: pc.take(reasons, pa.array(group_codes)),
+    })
+    return EvidenceGateResult(table=annotated, groups=groups)
+
+
+def _to_table(evidence: Any, pa: Any) -> Any:
+    """Normalize supported inputs to a pyarrow Table."""
+    if isinstance(evidence, pa.Table):
+        return evidence
+    if isinstance(evidence, pa.RecordBatch):
+        return pa.Table.from_batches([evidence])
+    if hasattr(evidence, "arrow"):
+        # DuckDB relation: Table on older releases, RecordBatchReader on newer
+        evidence = evidence.arrow()
+    if isinstance(evidence, pa.RecordBatchReader):
+        return evidence.read_all()
+    if isinstance(evidence, pa.Table):
+        return evidence
+    raise TypeError(f"Unsupported evidence input: {type(evidence).__name__}")
+
+
+def _to_numpy(values: Any) -> np.ndarray:
+    """Arrow (chunked) array without nulls to numpy."""
+    return np.asarray(values.to_numpy(zero_copy_only=False))
+
+
+def _to_bool(values: Any) -> np.ndarray:
+    """Arrow boolean (chunked) array to a numpy mask."""
+    return _to_numpy(values).astype(bool)
+
+
+def _dictionary_codes(column: Any, pc: Any) -> np.ndarray:
+    """Integer code per row (nulls get their own code)."""
+    if hasattr(column, "combine_chunks"):
+        column = column.combine_chunks()
+    encoded = pc.dictionary_encode(column, null_encoding="encode")
+    return _to_numpy(encoded.indices).astype(np.int64)
+
+
+def _group_ids(table: Any, group_by: Sequence[str], pc: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dense group id per row, numbered in first-appearance order.
+
+    Returns:
+        (group id per row, first row index of each group)
+    """
+    n_rows = table.num_rows
+    if not group_by:
+        return np.zeros(n_rows, dtype=np.int64), np.zeros(min(n_rows, 1), dtype=np.int64)
+
+    codes = [_dictionary_codes(table[name], pc) for name in group_by]
+    _, first_rows, inverse = np.unique(_combine_codes(codes), return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(first_rows, kind="stable")
+    renumber = np.empty_like(order)
+    renumber[order] = np.arange(len(order))
+    return renumber[inverse], first_rows[order]
+
+
+def _combine_codes(codes: List[np.ndarray]) -> np.ndarray:
+    """
+    One int64 key per row from several non-negative code columns.
+
+    Mixed-radix packing keeps np.unique one-dimensional (a 2-D unique sorts
+    row views and is far slower); wide keys fall back to structured rows.
+    """
+    key = np.zeros(len(codes[0]), dtype=np.int64)
+    capacity = 1
+    for column in codes:
+        radix = int(column.max()) + 1 if len(column) else 1
+        capacity *= radix
+        if capacity >= 2 ** 62:
+            stacked = np.ascontiguousarray(np.stack(codes, axis=1))
+            return stacked.view([("", stacked.dtype)] * len(codes)).reshape(-1)
+        key = key * radix + column
+    return key
+
+
+def _rank_within(groups: np.ndarray, buckets: np.ndarray) -> np.ndarray:
+    """0-based position of each row within its (group, bucket), in input order."""
+    if len(groups) == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.lexsort((np.arange(len(groups)), buckets, groups))
+    sorted_groups, sorted_buckets = groups[order], buckets[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_buckets[1:] != sorted_buckets[:-1])
+    positions = np.arange(len(order))
+    run_start = np.maximum.accumulate(np.where(starts, positions, 0))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = positions - run_start
+    return rank
+
+
+def _page_bucket(column: Any, pa: Any, pc: Any) -> Any:
+    """Per-page cap key: like cap_per_page, falsy pages (0, "") share the null bucket."""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return pc.if_else(pc.equal(column, ""), pa.scalar(None, column.type), column)
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        return pc.if_else(pc.equal(column, 0), pa.scalar(None, column.type), column)
+    return column
+
+
+def _page_numbers(column: Any, pa: Any, pc: Any) -> np.ndarray:
+    """Page numbers as evidence_ok reads them; anything unusable becomes 0."""
+    if pa.types.is_integer(column.type):
+        numbers = pc.cast(column, pa.int64())
+    elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        parsable = pc.fill_null(pc.match_substring_regex(column, _INT_PATTERN), False)
+        # int() accepts surrounding whitespace and a leading '+'; Arrow's cast does not
+        cleaned = pc.replace_substring_regex(pc.utf8_trim_whitespace(column), r"^\+", "")
+        cleaned = pc.if_else(parsable, cleaned, pa.scalar(None, column.type))
+        numbers = pc.cast(cleaned, pa.int64())
+    else:
+        # evidence_ok skips floats and other types
+        return np.zeros(len(column), dtype=np.int64)
+    return _to_numpy(pc.fill_null(numbers, 0)).astype(np.int64)
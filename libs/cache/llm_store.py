@@ -0,0 +1,426 @@
+"""
+Content-addressed LLM prompt/response store (SQLite)
+
+One store replaces the per-call JSON file caches of LLMExtractor and
+WatsonxClient (generate_json for RDLocatorWX, edit_text/generate_json for
+the narrator, embeddings). Entries are keyed by a SHA256 over the call
+type, model, params and prompt, and stored as JSON payloads in a single
+SQLite file (WAL mode), so an offline replay run opens one database
+instead of tens of thousands of small files.
+
+Features:
+- get_or_compute: concurrent identical requests in one process are
+  coalesced, so only the first caller hits the model
+- Size-based eviction: when max_bytes is set, least recently used entries
+  are dropped until the store is back under the limit. get_llm_store() and
+  the CLI default it from ESG_LLM_STORE_MAX_MB (megabytes)
+- Bulk export/import of JSONL bundles (optionally gzip) for offline replay,
+  and import of legacy per-call JSON cache directories
+
+CLI:
+    python -m libs.cache.llm_store export STORE BUNDLE [--kind json_gen]
+    python -m libs.cache.llm_store import STORE BUNDLE
+    python -m libs.cache.llm_store migrate STORE CACHE_DIR --kind json_gen
+    python -m libs.cache.llm_store stats STORE
+
+SCA v13.8 Compliance:
+- Determinism: Keys are pure functions of model, params and prompt
+- Offline replay: Bundles round-trip every entry byte-for-byte (JSON)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STORE_FILENAME = "responses.sqlite"
+MAX_MB_ENV = "ESG_LLM_STORE_MAX_MB"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    model_id TEXT,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS responses_kind ON responses (kind);
+"""
+
+
+def make_key(kind: str, model_id: str, params: Mapping[str, Any], prompt: str) -> str:
+    """
+    Content address for one LLM call.
+
+    Args:
+        kind: Call type (e.g. "json_gen", "edit", "extract")
+        model_id: Model identifier
+        params: Generation parameters that affect the output
+        prompt: Full prompt text
+
+    Returns:
+        SHA256 hex digest
+    """
+    combined = json.dumps(
+        {
+            "kind": kind,
+            "model_id": model_id,
+            "params": dict(params),
+            "prompt_sha": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+def _open_bundle(path: Path, mode: str):
+    """Open a JSONL bundle, gzip-compressed when the name ends in .gz."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class LLMResponseStore:
+    """SQLite-backed prompt/response store with coalescing and LRU eviction."""
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Payload budget; None disables eviction
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored payload.
+
+        Returns:
+            Payload dict, or None on miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            if self.max_bytes is not None:
+                # Recency only matters for eviction
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+        return json.loads(row[0])
+
+    def __contains__(self, key: str) -> bool:
+        """True if the key is stored (does not count as a hit)."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def put(
+        self,
+        key: str,
+        payload: Mapping[str, Any],
+        kind: str,
+        model_id: Optional[str] = None,
+    ) -> None:
+        """Store a payload (replacing any previous entry), then enforce max_bytes."""
+        data = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, kind, model_id, payload, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, model_id, data, len(data.encode("utf-8")), now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes (lock held)."""
+        if self.max_bytes is None:
+            return
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC, created_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.stats["evictions"] += len(doomed)
+
+    def total_bytes(self) -> int:
+        """Total payload size in bytes."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+
+    def __len__(self) -> int:
+        """Number of stored entries."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute_fn: Callable[[], Mapping[str, Any]],
+        kind: str,
+        model_id: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return the stored payload or compute it once across threads.
+
+        A failed computation is not stored; waiting callers then retry it
+        themselves.
+
+        Args:
+            key: Content address (see make_key)
+            compute_fn: Zero-argument callable producing the payload
+            kind: Call type, recorded for export filtering
+            model_id: Model identifier, recorded for export filtering
+
+        Returns:
+            (payload, computed) where computed is True only for the caller
+            that actually ran compute_fn
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached, False
+
+            with self._lock:
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                else:
+                    self.stats["coalesced"] += 1
+
+            if not leader:
+                event.wait()
+                continue
+
+            try:
+                payload = dict(compute_fn())
+                self.put(key, payload, kind=kind, model_id=model_id)
+                return payload, True
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    # ------------------------------------------------------------------
+    # Bundles
+    # ------------------------------------------------------------------
+
+    def iter_entries(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every entry (optionally one kind) in key order."""
+        query = "SELECT key, kind, model_id, payload, created_at FROM responses"
+        args: Tuple[Any, ...] = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            args = (kind,)
+        query += " ORDER BY key"
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        for key, row_kind, model_id, payload, created_at in rows:
+            yield {
+                "key": key,
+                "kind": row_kind,
+                "model_id": model_id,
+                "created_at": created_at,
+                "payload": json.loads(payload),
+            }
+
+    def export_bundle(self, bundle_path: Path, kind: Optional[str] = None) -> int:
+        """
+        Write entries to a JSONL bundle (.gz for gzip).
+
+        Returns:
+            Number of entries written
+        """
+        bundle_path = Path(bundle_path)
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with _open_bundle(bundle_path, "w") as handle:
+            for entry in self.iter_entries(kind):
+                handle.write(json.dumps(entry, ensure_ascii=False, sort_keys=True) + "\n")
+                count += 1
+        logger.info(f"Exported {count} LLM responses to {bundle_path}")
+        return count
+
+    def import_bundle(self, bundle_path: Path) -> int:
+        """
+        Load entries from a JSONL bundle, replacing entries with equal keys.
+
+        Returns:
+            Number of entries imported
+        """
+        count = 0
+        with _open_bundle(Path(bundle_path), "r") as handle:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    for line in handle:
+                        if not line.strip():
+                            continue
+                        entry = json.loads(line)
+                        data = json.dumps(entry["payload"], ensure_ascii=False, sort_keys=True)
+                        created_at = entry.get("created_at") or time.time()
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO responses "
+                            "(key, kind, model_id, payload, size, created_at, last_access) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (entry["key"], entry["kind"], entry.get("model_id"), data,
+                             len(data.encode("utf-8")), created_at, created_at),
+                        )
+                        count += 1
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._evict()
+        logger.info(f"Imported {count} LLM responses from {bundle_path}")
+        return count
+
+    def import_json_dir(self, cache_dir: Path, kind: str) -> int:
+        """
+        Import a legacy per-call cache directory (<key>.json files).
+
+        The file stem becomes the key, so callers that address the legacy
+        files by key find the same entries in the store.
+
+        Returns:
+            Number of entries imported
+        """
+        count = 0
+        for path in sorted(Path(cache_dir).glob("*.json")):
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable cache file {path}: {e}")
+                continue
+            if not isinstance(payload, dict):
+                continue
+            self.put(path.stem, payload, kind=kind, model_id=payload.get("model_id"))
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_STORES: Dict[Path, LLMResponseStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def max_bytes_from_env() -> Optional[int]:
+    """Eviction budget from ESG_LLM_STORE_MAX_MB (None when unset)."""
+    max_mb = os.getenv(MAX_MB_ENV)
+    return int(float(max_mb) * 1024 * 1024) if max_mb else None
+
+
+def get_llm_store(path: Path, max_bytes: Optional[int] = None) -> LLMResponseStore:
+    """
+    Process-wide store for a database path.
+
+    Clients pointing at the same file share one connection and one
+    coalescing table, so their identical in-flight requests are merged.
+
+    Args:
+        path: SQLite database file
+        max_bytes: Payload budget when the store is first opened
+            (default: ESG_LLM_STORE_MAX_MB)
+    """
+    resolved = Path(path).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(resolved)
+        if store is None:
+            if max_bytes is None:
+                max_bytes = max_bytes_from_env()
+            store = LLMResponseStore(resolved, max_bytes=max_bytes)
+            _STORES[resolved] = store
+        return store
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Bundle export/import CLI."""
+    parser = argparse.ArgumentParser(description="LLM response store bundles")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Write a JSONL(.gz) replay bundle")
+    export.add_argument("store")
+    export.add_argument("bundle")
+    export.add_argument("--kind")
+
+    load = sub.add_parser("import", help="Load a JSONL(.gz) replay bundle")
+    load.add_argument("store")
+    load.add_argument("bundle")
+
+    migrate = sub.add_parser("migrate", help="Import a legacy per-call JSON cache directory")
+    migrate.add_argument("store")
+    migrate.add_argument("cache_dir")
+    migrate.add_argument("--kind", required=True)
+
+    stats = sub.add_parser("stats", help="Entry count and size")
+    stats.add_argument("store")
+
+    args = parser.parse_args(argv)
+    store = LLMResponseStore(Path(args.store), max_bytes=max_bytes_from_env())
+    try:
+        if args.command == "export":
+            print(store.export_bundle(Path(args.bundle), kind=args.kind))
+        elif args.command == "import":
+            print(store.import_bundle(Path(args.bundle)))
+        elif args.command == "migrate":
+            print(store.import_json_dir(Path(args.cache_dir), kind=args.kind))
+        else:
+            print(json.dumps({"entries": len(store), "bytes": store.total_bytes()}))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,554 @@
+"""
+Two-Tier Cache: in-process LRU/TTL tier in front of Redis
+
+Hot score and embedding lookups are served from a bounded in-process tier
+without touching the network; misses fall through to Redis, and Redis hits
+are promoted into the local tier.
+
+Compared to RealRedisCache:
+- Serialization: msgpack with a numpy extension type (arrays round-trip
+  with dtype and shape, no JSON)
+- Batch operations: mget/mset pipelined into a single round trip
+- get_or_compute: single-flight, so concurrent misses on one key run
+  compute_fn once and share the result
+- max_entries is enforced on the local tier (Redis eviction stays with
+  the server's maxmemory-policy)
+
+SCA v13.8 Compliance:
+- Fail-Fast: RuntimeError on Redis errors (no silent degradation)
+- Determinism: Consistent key hashing; optional clock injection for TTL tests
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import msgpack  # type: ignore[import-untyped]
+import numpy as np
+import redis
+
+logger = logging.getLogger(__name__)
+
+# msgpack extension type code for numpy ndarrays
+_NDARRAY_EXT = 1
+
+_MISSING = object()
+
+
+def _encode_default(obj: Any) -> Any:
+    """msgpack hook for types it does not handle natively."""
+    if isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        header = msgpack.packb([array.dtype.str, list(array.shape)])
+        return msgpack.ExtType(_NDARRAY_EXT, header + array.tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """msgpack hook rebuilding numpy arrays."""
+    if code != _NDARRAY_EXT:
+        return msgpack.ExtType(code, data)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(data)
+    dtype_str, shape = next(unpacker)
+    offset = unpacker.tell()
+    return np.frombuffer(data, dtype=np.dtype(dtype_str), offset=offset).reshape(shape).copy()
+
+
+def pack_value(value: Any) -> bytes:
+    """
+    Serialize a cache value to bytes.
+
+    Supports JSON-like values plus numpy arrays/scalars. Tuples come back as lists.
+
+    Raises:
+        ValueError: If value contains unsupported types
+    """
+    try:
+        packed: bytes = msgpack.packb(value, default=_encode_default, use_bin_type=True)
+        return packed
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Value not serializable: {e}") from e
+
+
+def unpack_value(payload: bytes) -> Any:
+    """Deserialize bytes produced by pack_value."""
+    return msgpack.unpackb(payload, ext_hook=_decode_ext, raw=False, strict_map_key=False)
+
+
+@dataclass
+class TieredCacheStats:
+    """Per-tier hit/miss counters."""
+
+    gets: int = 0
+    local_hits: int = 0
+    remote_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Compute overall hit ratio [0, 1]."""
+        hits = self.local_hits + self.remote_hits
+        total = hits + self.misses
+        return hits / total if total > 0 else 0.0
+
+
+@dataclass
+class _InFlight:
+    """Pending computation shared by concurrent get_or_compute callers."""
+
+    event: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """
+    In-process LRU/TTL tier backed by Redis.
+
+    Values held in the local tier are returned as-is (not copied), so callers
+    must treat cached arrays and dicts as read-only.
+
+    Attributes:
+        redis_client: redis.Redis-compatible client (bytes responses)
+        max_entries: Local tier capacity (LRU eviction beyond it)
+        local_ttl_seconds: Local tier TTL; bounds staleness against Redis
+        default_ttl_seconds: Default Redis TTL
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        max_entries: int = 1024,
+        local_ttl_seconds: Optional[float] = 60.0,
+        default_ttl_seconds: Optional[int] = None,
+        namespace: str = "esg:bin",
+        now_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """
+        Initialize tiered cache.
+
+        Args:
+            redis_client: Connected redis client (decode_responses=False)
+            max_entries: Maximum local entries before LRU eviction (default: 1024)
+            local_ttl_seconds: Local entry lifetime in seconds (default: 60, None = no expiry)
+            default_ttl_seconds: Default Redis TTL in seconds (default: None = no expiry)
+            namespace: Redis key prefix (default: esg:bin)
+            now_fn: Optional clock for deterministic TTL tests (default: time.monotonic)
+
+        Raises:
+            ValueError: If max_entries < 1
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+
+        self.redis_client = redis_client
+        self.max_entries = max_entries
+        self.local_ttl_seconds = local_ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.namespace = namespace
+        self.now_fn = now_fn or time.monotonic
+
+        # Local tier: normalized key -> (value, expires_at)
+        self._local: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._stats = TieredCacheStats()
+
+    # ------------------------------------------------------------------
+    # Local tier
+    # ------------------------------------------------------------------
+
+    def _local_get(self, nkey: str) -> Any:
+        """Return the local value or _MISSING (drops expired entries)."""
+        with self._lock:
+            entry = self._local.get(nkey)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and self.now_fn() >= expires_at:
+                del self._local[nkey]
+                return _MISSING
+            self._local.move_to_end(nkey)
+            return value
+
+    def _local_put(self, nkey: str, value: Any) -> None:
+        """Insert into the local tier, evicting least recently used entries."""
+        expires_at = None
+        if self.local_ttl_seconds is not None:
+            expires_at = self.now_fn() + self.local_ttl_seconds
+        with self._lock:
+            self._local[nkey] = (value, expires_at)
+            self._local.move_to_end(nkey)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._stats.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Single-key operations
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get value, checking the local tier before Redis.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found/expired
+
+        Raises:
+            ValueError: If key is empty
+            RuntimeError: If Redis operation fails
+        """
+        nkey = self._normalize_key(key)
+        with self._lock:
+            self._stats.gets += 1
+
+        value = self._local_get(nkey)
+        if value is not _MISSING:
+            with self._lock:
+                self._stats.local_hits += 1
+            return value
+
+        try:
+            payload = self.redis_client.get(nkey)
+        except redis.RedisError as e:
+            logger.error(f"Redis GET failed for key={key}: {e}")
+            raise RuntimeError(f"Redis GET failed: {e}") from e
+
+        return self._accept_remote(nkey, payload)
+
+    def _accept_remote(self, nkey: str, payload: Optional[bytes]) -> Optional[Any]:
+        """Decode a Redis payload, promote it locally and update stats."""
+        if payload is None:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+
+        try:
+            value = unpack_value(payload)
+        except Exception as e:
+            logger.warning(f"Failed to deserialize cached value for key={nkey}: {e}")
+            with self._lock:
+                self._stats.misses += 1
+            return None
+
+        self._local_put(nkey, value)
+        with self._lock:
+            self._stats.remote_hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Write value to both tiers.
+
+        Args:
+            key: Cache key
+            value: JSON-like value, numpy arrays allowed
+            ttl_seconds: Redis TTL in seconds (default: instance default)
+
+        Raises:
+            ValueError: If key empty, ttl invalid or value not serializable
+            RuntimeError: If Redis operation fails
+        """
+        nkey = self._normalize_key(key)
+        ttl = self._resolve_ttl(ttl_seconds)
+        payload = pack_value(value)
+
+        try:
+            self.redis_client.set(nkey, payload, ex=ttl)
+        except redis.RedisError as e:
+            logger.error(f"Redis SET failed for key={key}: {e}")
+            raise RuntimeError(f"Redis SET failed: {e}") from e
+
+        self._local_put(nkey, value)
+        with self._lock:
+            self._stats.sets += 1
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete key from both tiers.
+
+        Returns:
+            True if key existed in Redis, False otherwise
+
+        Raises:
+            ValueError: If key is empty
+            RuntimeError: If Redis operation fails
+        """
+        nkey = self._normalize_key(key)
+        with self._lock:
+            self._local.pop(nkey, None)
+        try:
+            return bool(self.redis_client.delete(nkey))
+        except redis.RedisError as e:
+            logger.error(f"Redis DELETE failed for key={key}: {e}")
+            raise RuntimeError(f"Redis DELETE failed: {e}") from e
+
+    def invalidate_local(self) -> None:
+        """Drop the in-process tier only (e.g. after an upstream data refresh)."""
+        with self._lock:
+            self._local.clear()
+
+    def clear(self) -> None:
+        """
+        Clear the local tier and every Redis key under this namespace.
+
+        Unlike RealRedisCache.clear this does not FLUSHDB.
+
+        Raises:
+            RuntimeError: If Redis operation fails
+        """
+        self.invalidate_local()
+        try:
+            keys = list(self.redis_client.scan_iter(match=f"{self.namespace}:*"))
+            if keys:
+                self.redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.error(f"Redis clear failed: {e}")
+            raise RuntimeError(f"Redis clear failed: {e}") from e
+        with self._lock:
+            self._stats = TieredCacheStats()
+
+    # ------------------------------------------------------------------
+    # Batch operations
+    # ------------------------------------------------------------------
+
+    def mget(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get many keys; local misses are fetched from Redis in one MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict of key -> value for keys that were found
+
+        Raises:
+            ValueError: If any key is empty
+            RuntimeError: If Redis operation fails
+        """
+        keys = list(keys)
+        results: Dict[str, Any] = {}
+        remote: List[Tuple[str, str]] = []
+
+        for key in keys:
+            nkey = self._normalize_key(key)
+            value = self._local_get(nkey)
+            if value is _MISSING:
+                remote.append((key, nkey))
+            else:
+                results[key] = value
+
+        with self._lock:
+            self._stats.gets += len(keys)
+            self._stats.local_hits += len(results)
+
+        if remote:
+            try:
+                payloads = self.redis_client.mget([nkey for _, nkey in remote])
+            except redis.RedisError as e:
+                logger.error(f"Redis MGET failed for {len(remote)} keys: {e}")
+                raise RuntimeError(f"Redis MGET failed: {e}") from e
+
+            for (key, nkey), payload in zip(remote, payloads):
+                value = self._accept_remote(nkey, payload)
+                if value is not None:
+                    results[key] = value
+
+        return results
+
+    def mset(self, items: Mapping[str, Any], ttl_seconds: Optional[int] = None) -> None:
+        """
+        Set many keys in one pipelined round trip.
+
+        Args:
+            items: Mapping of key -> value
+            ttl_seconds: Redis TTL in seconds (default: instance default)
+
+        Raises:
+            ValueError: If any key empty, ttl invalid or value not serializable
+            RuntimeError: If Redis operation fails
+        """
+        ttl = self._resolve_ttl(ttl_seconds)
+        encoded = [(self._normalize_key(k), v, pack_value(v)) for k, v in items.items()]
+        if not encoded:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for nkey, _, payload in encoded:
+                pipe.set(nkey, payload, ex=ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Redis pipelined SET failed for {len(encoded)} keys: {e}")
+            raise RuntimeError(f"Redis MSET failed: {e}") from e
+
+        for nkey, value, _ in encoded:
+            self._local_put(nkey, value)
+        with self._lock:
+            self._stats.sets += len(encoded)
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute_fn: Callable[[], Any],
+        ttl_seconds: Optional[int] = None,
+    ) -> Any:
+        """
+        Get value from cache or compute it, with single-flight protection.
+
+        Concurrent callers missing on the same key wait for the first caller's
+        computation instead of running compute_fn themselves.
+
+        Args:
+            key: Cache key
+            compute_fn: Function to call on miss (takes no args)
+            ttl_seconds: Redis TTL for the computed value
+
+        Returns:
+            Cached or computed value
+
+        Raises:
+            ValueError: If key is empty or ttl invalid
+            RuntimeError: If compute_fn raises or the Redis lookup fails
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        nkey = self._normalize_key(key)
+        with self._lock:
+            running = self._inflight.get(nkey)
+            leader = running is None
+            if running is None:
+                call = _InFlight()
+                self._inflight[nkey] = call
+            else:
+                call = running
+                self._stats.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise RuntimeError(f"Computation failed: {call.error}") from call.error
+            return call.value
+
+        try:
+            # A caller that missed just after the previous leader stored the
+            # value and left _inflight finds it here instead of recomputing
+            value = self.get(key)
+            if value is None:
+                value = compute_fn()
+                try:
+                    self.set(key, value, ttl_seconds)
+                except Exception as e:
+                    # Followers still get the computed value; only the cache write failed
+                    logger.warning(f"Failed to cache computed value for key={key}: {e}")
+            call.value = value
+            return value
+        except Exception as e:
+            call.error = e
+            logger.error(f"compute_fn failed for key={key}: {e}")
+            raise RuntimeError(f"Computation failed: {e}") from e
+        finally:
+            with self._lock:
+                self._inflight.pop(nkey, None)
+            call.event.set()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with per-tier hits, misses, sets, evictions, coalesced, hit_ratio, local_size
+        """
+        with self._lock:
+            return {
+                "gets": self._stats.gets,
+                "local_hits": self._stats.local_hits,
+                "remote_hits": self._stats.remote_hits,
+                "misses": self._stats.misses,
+                "sets": self._stats.sets,
+                "evictions": self._stats.evictions,
+                "coalesced": self._stats.coalesced,
+                "hit_ratio": round(self._stats.hit_ratio, 4),
+                "local_size": len(self._local),
+                "max_entries": self.max_entries,
+            }
+
+    def _resolve_ttl(self, ttl_seconds: Optional[int]) -> Optional[int]:
+        """Apply the default TTL and validate it."""
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl_seconds must be > 0, got {ttl}")
+        return ttl
+
+    def _normalize_key(self, key: str) -> str:
+        """
+        Normalize cache key for Redis (namespaced; long keys hashed).
+
+        Raises:
+            ValueError: If key is empty
+        """
+        if not key or len(key.strip()) == 0:
+            raise ValueError("key cannot be empty")
+        if len(key) <= 100:
+            return f"{self.namespace}:{key}"
+        return f"{self.namespace}:h:{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+
+
+def create_tiered_cache(
+    host: str = "localhost",
+    port: int = 6379,
+    db: int = 0,
+    max_entries: int = 1024,
+    local_ttl_seconds: Optional[float] = 60.0,
+    default_ttl_seconds: Optional[int] = 300,
+) -> TieredCache:
+    """
+    Factory function to create a TieredCache over a live Redis server.
+
+    Raises:
+        RuntimeError: If Redis connection fails
+    """
+    try:
+        client = redis.Redis(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=False,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+        )
+        if not client.ping():
+            raise ConnectionError("Redis PING failed")
+    except (redis.ConnectionError, redis.TimeoutError, ConnectionError) as e:
+        logger.error(f"Failed to connect to Redis at {host}:{port}: {e}")
+        raise RuntimeError(f"Failed to connect to Redis at {host}:{port}: {e}") from e
+
+    return TieredCache(
+        client,
+        max_entries=max_entries,
+        local_ttl_seconds=local_ttl_seconds,
+        default_ttl_seconds=default_ttl_seconds,
+    )
@@ -0,0 +1,305 @@
+"""
+Chunk Artifacts - claim-check storage for pipeline hand-offs
+
+Airflow tasks exchange chunk sets (and their embeddings) as Parquet files
+and pass only a small ChunkArtifactRef (URI + row count) through XCom.
+Embeddings are stored as fixed-size float32 list columns so they never
+round-trip through JSON.
+
+Design: writers append record batches as they go, readers stream row
+groups back with ParquetFile.iter_batches, so neither side needs the
+whole chunk set in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+DEFAULT_EMBEDDING_DIM = 768
+DEFAULT_BATCH_ROWS = 1024
+
+# Core Chunk fields (apps.ingestion.parser.Chunk) stored as typed columns;
+# anything else on the chunk dict is carried in the extra_json column.
+CHUNK_FIELDS: List[Tuple[str, pa.DataType]] = [
+    ("chunk_id", pa.string()),
+    ("company", pa.string()),
+    ("year", pa.int32()),
+    ("text", pa.string()),
+    ("page_start", pa.int32()),
+    ("page_end", pa.int32()),
+    ("section", pa.string()),
+    ("source_url", pa.string()),
+    ("md5", pa.string()),
+    ("char_count", pa.int32()),
+    ("token_count_estimate", pa.int32()),
+]
+EXTRA_COLUMN = "extra_json"
+EMBEDDING_COLUMN = "embedding"
+
+_CHUNK_FIELD_NAMES = {name for name, _ in CHUNK_FIELDS}
+
+
+def chunk_schema(embedding_dim: Optional[int] = None) -> pa.Schema:
+    """Arrow schema for a chunk artifact.
+
+    Args:
+        embedding_dim: Width of the fixed-size embedding column, or None for
+            an artifact without embeddings
+
+    Returns:
+        PyArrow schema
+    """
+    fields = [pa.field(name, dtype) for name, dtype in CHUNK_FIELDS]
+    fields.append(pa.field(EXTRA_COLUMN, pa.string()))
+    if embedding_dim is not None:
+        fields.append(pa.field(EMBEDDING_COLUMN, pa.list_(pa.float32(), embedding_dim)))
+    return pa.schema(fields)
+
+
+def _resolve(uri: str) -> Tuple[pafs.FileSystem, str]:
+    """Resolve a local path or filesystem URI (file://, s3://, ...)."""
+    if "://" not in uri:
+        uri = str(Path(uri).resolve())
+    return pafs.FileSystem.from_uri(uri)
+
+
+def artifact_uri(root: str, run_id: str, name: str) -> str:
+    """Build the artifact URI for one task output in one DAG run.
+
+    Args:
+        root: Artifact root (local directory or filesystem URI)
+        run_id: DAG run identifier (sanitized for use as a path segment)
+        name: Artifact name, typically the producing task id
+
+    Returns:
+        URI of the Parquet file
+    """
+    safe_run = re.sub(r"[^A-Za-z0-9_.-]+", "_", run_id)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    return f"{root.rstrip('/')}/{safe_run}/{safe_name}.parquet"
+
+
+@dataclass(frozen=True)
+class ChunkArtifactRef:
+    """Claim-check reference to a chunk artifact (what goes into XCom)."""
+
+    uri: str
+    row_count: int
+    embedding_dim: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for XCom."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChunkArtifactRef":
+        """Rebuild a reference pulled from XCom."""
+        return cls(
+            uri=data["uri"],
+            row_count=int(data["row_count"]),
+            embedding_dim=data.get("embedding_dim"),
+        )
+
+
+class ChunkArtifactWriter:
+    """Streams chunk dicts (and optional embeddings) into a Parquet artifact."""
+
+    def __init__(
+        self,
+        uri: str,
+        embedding_dim: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ):
+        """Initialize writer.
+
+        Args:
+            uri: Destination Parquet URI
+            embedding_dim: Embedding width; None writes chunks only
+            batch_rows: Rows buffered before a row group is written
+        """
+        self.uri = uri
+        self.embedding_dim = embedding_dim
+        self.batch_rows = batch_rows
+        self.schema = chunk_schema(embedding_dim)
+        self.row_count = 0
+        self.ref: Optional[ChunkArtifactRef] = None
+
+        self._fs, self._path = _resolve(uri)
+        self._fs.create_dir(self._path.rsplit("/", 1)[0], recursive=True)
+        self._writer = pq.ParquetWriter(
+            self._path, self.schema, filesystem=self._fs, compression="zstd"
+        )
+        self._pending_chunks: List[Dict[str, Any]] = []
+        self._pending_embeddings: List[np.ndarray] = []
+
+    def write(
+        self,
+        chunks: Sequence[Dict[str, Any]],
+        embeddings: Optional[Any] = None,
+    ) -> None:
+        """Append chunks (and their embeddings, row-aligned).
+
+        Args:
+            chunks: Chunk dicts as produced by Chunk.to_dict()
+            embeddings: Sequence or 2-D array of embeddings, one per chunk
+
+        Raises:
+            ValueError: If embeddings are missing, misaligned or the wrong width
+        """
+        if self.embedding_dim is not None:
+            if embeddings is None:
+                raise ValueError("Embeddings required for an embedding artifact")
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape != (len(chunks), self.embedding_dim):
+                raise ValueError(
+                    f"Expected embeddings of shape ({len(chunks)}, {self.embedding_dim}), "
+                    f"got {matrix.shape}"
+                )
+            self._pending_embeddings.append(matrix)
+        elif embeddings is not None:
+            raise ValueError("Artifact was opened without an embedding column")
+
+        self._pending_chunks.extend(chunks)
+        if len(self._pending_chunks) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered rows as one row group."""
+        if not self._pending_chunks:
+            return
+
+        columns: Dict[str, Any] = {name: [] for name, _ in CHUNK_FIELDS}
+        extras = []
+        for chunk in self._pending_chunks:
+            for name, _ in CHUNK_FIELDS:
+                columns[name].append(chunk.get(name))
+            extra = {k: v for k, v in chunk.items() if k not in _CHUNK_FIELD_NAMES and k != EMBEDDING_COLUMN}
+            extras.append(json.dumps(extra, sort_keys=True, default=str) if extra else None)
+
+        arrays = [pa.array(columns[name], type=dtype) for name, dtype in CHUNK_FIELDS]
+        arrays.append(pa.array(extras, type=pa.string()))
+
+        if self.embedding_dim is not None:
+            matrix = np.concatenate(self._pending_embeddings, axis=0)
+            arrays.append(
+                pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), self.embedding_dim)
+            )
+
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.row_count += len(self._pending_chunks)
+        self._pending_chunks = []
+        self._pending_embeddings = []
+
+    def close(self) -> ChunkArtifactRef:
+        """Flush remaining rows and finalize the file.
+
+        Returns:
+            Reference to hand downstream via XCom
+        """
+        if self.ref is None:
+            self._flush()
+            self._writer.close()
+            self.ref = ChunkArtifactRef(
+                uri=self.uri, row_count=self.row_count, embedding_dim=self.embedding_dim
+            )
+        return self.ref
+
+    def __enter__(self) -> "ChunkArtifactWriter":
+        """Enter context; the artifact is finalized on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Finalize the artifact."""
+        if exc_type is None:
+            self.close()
+        else:
+            self._writer.close()
+
+
+def write_chunk_artifact(
+    uri: str,
+    chunks: Sequence[Dict[str, Any]],
+    embeddings: Optional[Any] = None,
+) -> ChunkArtifactRef:
+    """Write a chunk set in one call.
+
+    Args:
+        uri: Destination Parquet URI
+        chunks: Chunk dicts
+        embeddings: Optional 2-D array of embeddings aligned with chunks
+
+    Returns:
+        Reference to the written artifact
+    """
+    embedding_dim = None
+    if embeddings is not None:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        embedding_dim = int(matrix.shape[1]) if matrix.ndim == 2 else DEFAULT_EMBEDDING_DIM
+        embeddings = matrix.reshape(len(chunks), embedding_dim)
+    with ChunkArtifactWriter(uri, embedding_dim=embedding_dim) as writer:
+        writer.write(chunks, embeddings)
+    return writer.ref
+
+
+def iter_chunk_batches(
+    ref: ChunkArtifactRef,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[np.ndarray]]]:
+    """Stream a chunk artifact back as (chunk dicts, embedding matrix) batches.
+
+    Args:
+        ref: Artifact reference
+        batch_rows: Maximum rows per yielded batch
+
+    Yields:
+        Tuple of chunk dicts and a float32 (rows, dim) matrix, or None when
+        the artifact has no embedding column
+    """
+    fs, path = _resolve(ref.uri)
+    with fs.open_input_file(path) as handle:
+        parquet_file = pq.ParquetFile(handle)
+        for batch in parquet_file.iter_batches(batch_size=batch_rows):
+            yield _decode_batch(batch, ref.embedding_dim)
+
+
+def _decode_batch(
+    batch: pa.RecordBatch,
+    embedding_dim: Optional[int],
+) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+    """Convert a record batch into chunk dicts plus an embedding matrix."""
+    names = [name for name, _ in CHUNK_FIELDS]
+    columns = {name: batch.column(name).to_pylist() for name in names}
+    extras = batch.column(EXTRA_COLUMN).to_pylist()
+
+    chunks = []
+    for row, extra in enumerate(extras):
+        chunk = {name: columns[name][row] for name in names}
+        if extra:
+            chunk.update(json.loads(extra))
+        chunks.append(chunk)
+
+    embeddings = None
+    if embedding_dim is not None:
+        values = batch.column(EMBEDDING_COLUMN).flatten().to_numpy(zero_copy_only=False)
+        embeddings = values.astype(np.float32, copy=False).reshape(-1, embedding_dim)
+
+    return chunks, embeddings
+
+
+__all__ = [
+    "ChunkArtifactRef",
+    "ChunkArtifactWriter",
+    "artifact_uri",
+    "chunk_schema",
+    "iter_chunk_batches",
+    "write_chunk_artifact",
+]
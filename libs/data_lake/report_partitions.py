@@ -0,0 +1,81 @@
+"""
+Report Partitions - (company, year) units of work for the scoring DAG
+
+The scoring DAG maps one task group over these partitions, so each
+company-year moves from parsing to scoring on its own.
+
+Deduplication scope: every crawled report lands in exactly one partition.
+Reports listed more than once (same URL, e.g. matched by two configured
+company names) are kept once, under the most specific matching company.
+Chunk-level deduplication of *different* reports then runs inside each
+partition only: partitions validate concurrently, each with its own
+validation state, so identical chunk text in two partitions (e.g. shared
+boilerplate across years) is kept in both.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def partition_key(partition: Dict[str, Any]) -> str:
+    """Filesystem-safe key for a (company, year) partition."""
+    company = re.sub(r"[^a-z0-9]+", "_", str(partition['company']).lower()).strip("_")
+    return f"{company}_{partition['year']}"
+
+
+def _report_identity(report: Dict[str, Any]) -> str:
+    """Identity used to drop repeated reports (URL, else the whole record)."""
+    url = report.get('url')
+    return str(url) if url else json.dumps(report, sort_keys=True, default=str)
+
+
+def _owner(companies: Sequence[str], report: Dict[str, Any]) -> Optional[str]:
+    """Most specific configured company whose name occurs in the report's company."""
+    reported = str(report.get('company', '')).lower()
+    best: Optional[Tuple[int, int]] = None
+    for order, company in enumerate(companies):
+        if company.lower() in reported:
+            rank = (-len(company), order)
+            if best is None or rank < best:
+                best = rank
+    return companies[best[1]] if best is not None else None
+
+
+def group_partitions(
+    companies: Sequence[str],
+    reports_data: Sequence[Dict[str, Any]],
+    default_year: int
+) -> List[Dict[str, Any]]:
+    """
+    Group crawled reports into (company, year) partitions.
+
+    Args:
+        companies: Configured company names (substring-matched, case-insensitive)
+        reports_data: Crawled report dicts with company, year and url
+        default_year: Year of the partition for a company with no reports
+
+    Returns:
+        Partitions sorted by (company, year), each
+        {'company', 'year', 'reports'}; reports keep crawl order
+    """
+    partitions: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    seen = set()
+    for report in reports_data:
+        identity = _report_identity(report)
+        company = _owner(companies, report)
+        if company is None or identity in seen:
+            continue
+        seen.add(identity)
+        key = (company, int(report['year']))
+        partitions.setdefault(key, {'company': company, 'year': key[1], 'reports': []})
+        partitions[key]['reports'].append(report)
+
+    for company in companies:
+        if not any(key[0] == company for key in partitions):
+            # Still score the company; the pipeline falls back to cached/known reports
+            partitions[(company, default_year)] = {'company': company, 'year': default_year, 'reports': []}
+
+    return [partitions[key] for key in sorted(partitions)]
@@ -0,0 +1,365 @@
+"""
+Concurrent, rate-limited batch embedding executor.
+
+Shared by the watsonx embedding clients (libs.llm.watsonx_client,
+libs.embedding.watsonx_embedder, libs.wx.wx_client, apps.scoring.wx_client).
+Full-corpus re-embedding used to send one batch at a time, so throughput was
+bounded by round-trip latency rather than by the service quota. The
+executor instead:
+
+- packs texts into batches by total characters (after the same truncation
+  the clients apply for the model's 512-token input limit), capped by an
+  item count, so short chunks share a request and long ones don't overflow
+- keeps up to max_in_flight requests running on a thread pool
+- admits each request through a token bucket matched to the quota
+- retries failed requests with capped exponential backoff and full jitter
+- returns vectors in input order
+
+The request function is injected (embed_fn(batch) -> vectors), so the
+executor can be exercised against a local fake embedding server.
+
+Configuration (environment, see from_env):
+- ESG_EMBED_MAX_IN_FLIGHT: concurrent requests (default 4)
+- ESG_EMBED_RPS / ESG_EMBED_BURST: token bucket rate and capacity
+  (default: the caller's quota; DEFAULT_SHARED_RPS for the shared
+  executor; 0 disables the limiter)
+- ESG_EMBED_BATCH_CHARS / ESG_EMBED_BATCH_ITEMS: batch budget
+- ESG_EMBED_MAX_RETRIES: attempts per batch (default 3)
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from libs.utils.env import get
+
+logger = logging.getLogger(__name__)
+
+# Embedding models accept at most 512 input tokens; longer inputs are
+# truncated (server-side with truncate_input_tokens, or client-side).
+EMBED_MAX_TOKENS = 512
+# Upper bound on the characters of one input that reach the model
+EMBED_TRUNCATED_CHARS = EMBED_MAX_TOKENS * 4
+# Conservative client-side truncation (~400 chars of English is 100-150
+# tokens, leaving headroom under the 512-token limit)
+EMBED_MAX_CHARS = 400
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_BATCH_CHARS = 16_000
+DEFAULT_BATCH_ITEMS = 64
+DEFAULT_MAX_RETRIES = 3
+# Quota of the process-wide executor when ESG_EMBED_RPS is unset
+DEFAULT_SHARED_RPS = 8.0
+
+
+class EmbeddingRequestError(RuntimeError):
+    """A batch still failed after all retries."""
+
+
+def truncate_for_embedding(text: str, max_chars: Optional[int] = EMBED_MAX_CHARS) -> str:
+    """Apply the clients' input truncation (None = no truncation)."""
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return text[:max_chars]
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate_per_second: Refill rate, i.e. the sustained request quota
+            capacity: Burst size (default: max(1, rate_per_second))
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be > 0")
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last update."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting for the bucket to refill if needed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+def plan_batches(
+    texts: Sequence[str],
+    max_batch_chars: int = DEFAULT_BATCH_CHARS,
+    max_batch_items: int = DEFAULT_BATCH_ITEMS,
+    text_chars_cap: int = EMBED_TRUNCATED_CHARS,
+) -> List[Tuple[int, int]]:
+    """
+    Split texts into contiguous batches by total characters and item count.
+
+    Each text counts for at most text_chars_cap characters, since anything
+    past the 512-token limit is truncated before it reaches the model.
+
+    Returns:
+        List of (start, end) index ranges covering texts in order
+    """
+    batches: List[Tuple[int, int]] = []
+    start, chars = 0, 0
+    for index, text in enumerate(texts):
+        size = min(len(text), text_chars_cap)
+        if index > start and (chars + size > max_batch_chars or index - start >= max_batch_items):
+            batches.append((start, index))
+            start, chars = index, 0
+        chars += size
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+class EmbeddingExecutor:
+    """Runs embedding batches concurrently under a rate limit, preserving order."""
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[List[str]], Sequence[Any]]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        limiter: Optional[TokenBucket] = None,
+        max_batch_chars: int = DEFAULT_BATCH_CHARS,
+        max_batch_items: int = DEFAULT_BATCH_ITEMS,
+        max_text_chars: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        non_retryable: Tuple[Type[BaseException], ...] = (ValueError,),
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            embed_fn: Sends one batch and returns one vector per text
+                (may instead be passed to each embed() call)
+            max_in_flight: Maximum concurrent requests
+            limiter: Token bucket admitting each request (None = unlimited)
+            max_batch_chars: Character budget per request
+            max_batch_items: Item cap per request
+            max_text_chars: Per-text truncation applied before sending
+                (None = send as-is; the service truncates to 512 tokens)
+            max_retries: Attempts per batch
+            base_delay: First backoff ceiling in seconds
+            max_delay: Backoff ceiling cap in seconds
+            non_retryable: Exceptions that fail the batch immediately
+            sleep: Sleep function for backoff (injectable for tests)
+            rng: Random source for jitter
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if max_retries < 1:
+            raise ValueError("max_retries must be >= 1")
+        self.embed_fn = embed_fn
+        self.max_in_flight = max_in_flight
+        self.limiter = limiter
+        self.max_batch_chars = max_batch_chars
+        self.max_batch_items = max_batch_items
+        self.max_text_chars = max_text_chars
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.non_retryable = non_retryable
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "texts": 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_env(
+        cls,
+        embed_fn: Optional[Callable[[List[str]], Sequence[Any]]] = None,
+        requests_per_second: Optional[float] = None,
+        **overrides: Any,
+    ) -> "EmbeddingExecutor":
+        """
+        Build an executor from ESG_EMBED_* variables.
+
+        Args:
+            embed_fn: Batch request function
+            requests_per_second: Quota to use when ESG_EMBED_RPS is unset
+            **overrides: Explicit constructor arguments (take precedence)
+        """
+        rps = get("ESG_EMBED_RPS")
+        rate = float(rps) if rps else requests_per_second
+        limiter = None
+        if rate:
+            burst = get("ESG_EMBED_BURST")
+            limiter = TokenBucket(rate, capacity=float(burst) if burst else None)
+
+        kwargs: Dict[str, Any] = {
+            "max_in_flight": int(get("ESG_EMBED_MAX_IN_FLIGHT") or DEFAULT_MAX_IN_FLIGHT),
+            "limiter": limiter,
+            "max_batch_chars": int(get("ESG_EMBED_BATCH_CHARS") or DEFAULT_BATCH_CHARS),
+            "max_batch_items": int(get("ESG_EMBED_BATCH_ITEMS") or DEFAULT_BATCH_ITEMS),
+            "max_retries": int(get("ESG_EMBED_MAX_RETRIES") or DEFAULT_MAX_RETRIES),
+        }
+        kwargs.update(overrides)
+        return cls(embed_fn, **kwargs)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the request pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight, thread_name_prefix="esg-embed"
+                )
+            return self._pool
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter delay for a retry after the given (0-based) attempt."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self._rng.uniform(0.0, ceiling)
+
+    def _run_batch(self, embed_fn: Callable[[List[str]], Sequence[Any]], batch: List[str]) -> List[Any]:
+        """Send one batch with rate limiting and jittered retries."""
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.max_retries):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            with self._stats_lock:
+                self.stats["requests"] += 1
+            try:
+                vectors = list(embed_fn(batch))
+            except self.non_retryable:
+                raise
+            except Exception as e:
+                last_error = e
+                if attempt + 1 < self.max_retries:
+                    delay = self._backoff(attempt)
+                    logger.warning(
+                        f"Embedding batch of {len(batch)} failed "
+                        f"({attempt + 1}/{self.max_retries}), retrying in {delay:.2f}s: {e}"
+                    )
+                    with self._stats_lock:
+                        self.stats["retries"] += 1
+                    self._sleep(delay)
+                continue
+            if len(vectors) != len(batch):
+                raise ValueError(f"Received {len(vectors)} embeddings for {len(batch)} inputs")
+            return vectors
+        raise EmbeddingRequestError(
+            f"Embedding batch of {len(batch)} failed after {self.max_retries} attempts: {last_error}"
+        ) from last_error
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        embed_fn: Optional[Callable[[List[str]], Sequence[Any]]] = None,
+        max_batch_items: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Embed texts, returning one vector per text in input order.
+
+        Args:
+            texts: Input texts
+            embed_fn: Batch request function for this call (default: the
+                executor's), e.g. bound to per-call credentials
+            max_batch_items: Item cap per request for this call, for
+                services with a smaller per-request limit (default: the
+                executor's)
+
+        Raises:
+            EmbeddingRequestError: If a batch fails after all retries
+            ValueError: If the service returns the wrong number of vectors
+        """
+        if not texts:
+            return []
+        embed_fn = embed_fn or self.embed_fn
+        if embed_fn is None:
+            raise ValueError("No embed_fn configured for this executor")
+        prepared = [truncate_for_embedding(text, self.max_text_chars) for text in texts]
+        ranges = plan_batches(
+            prepared,
+            self.max_batch_chars,
+            min(max_batch_items or self.max_batch_items, self.max_batch_items),
+            text_chars_cap=self.max_text_chars or EMBED_TRUNCATED_CHARS,
+        )
+        with self._stats_lock:
+            self.stats["texts"] += len(prepared)
+
+        if len(ranges) == 1 or self.max_in_flight == 1:
+            batches = [self._run_batch(embed_fn, prepared[start:end]) for start, end in ranges]
+        else:
+            pool = self._get_pool()
+            futures = [pool.submit(self._run_batch, embed_fn, prepared[start:end]) for start, end in ranges]
+            try:
+                batches = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        vectors: List[Any] = []
+        for batch in batches:
+            vectors.extend(batch)
+        return vectors
+
+    def shutdown(self) -> None:
+        """Stop the request pool."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+_EXECUTOR: Optional[EmbeddingExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_embedding_executor() -> EmbeddingExecutor:
+    """
+    Process-wide executor shared by the watsonx embedding clients.
+
+    One pool and one token bucket, so concurrent callers together stay
+    within the service quota (ESG_EMBED_RPS, default DEFAULT_SHARED_RPS).
+    Callers pass their own embed_fn per call.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = EmbeddingExecutor.from_env(requests_per_second=DEFAULT_SHARED_RPS)
+        return _EXECUTOR
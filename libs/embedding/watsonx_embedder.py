@@ -18,11 +18,11 @@ import time
 import hashlib
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
-from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
 import numpy as np
 from dotenv import load_dotenv
+from libs.embedding.embedding_executor import get_embedding_executor
 from libs.utils.clock import get_clock
 clock = get_clock()
 
@@ -43,7 +43,7 @@ class EmbeddingConfig:
     model_id: str = "ibm/slate-125m-english-rtrvr-v2"
     embedding_dim: int = 384
     batch_size: int = 10
-    rate_limit_per_hour: int = 100
+    rate_limit_per_hour: int = 100  # Unused: the shared executor applies ESG_EMBED_RPS
     timeout_seconds: int = 30
     cache_ttl_seconds: int = 604800  # 7 days
 
@@ -56,7 +56,8 @@ class WatsonXEmbedder:
 
     Attributes:
         config: Embedding configuration (API key, project ID, etc.)
-        request_times: Sliding window for rate limit tracking
+        executor: Process-wide embedding executor; its pool and token
+            bucket are shared with the other watsonx clients
         cache: Optional embedding cache (dict)
     """
 
@@ -75,7 +76,7 @@ class WatsonXEmbedder:
             raise ValueError("Invalid or missing IBM_WATSONX_PROJECT_ID")
 
         self.config = config
-        self.request_times: List[datetime] = []
+        self.executor = get_embedding_executor()
         self.cache: Dict[str, np.ndarray] = {}
         logger.info(
             f"WatsonXEmbedder initialized: model={config.model_id}, "
@@ -107,9 +108,10 @@ class WatsonXEmbedder:
             logger.debug(f"Embedding cache hit: {text_hash[:8]}")
             return self.cache[text_hash]
 
-        # Real API call
-        self._check_rate_limit()
-        embedding = self._call_slate_api([text])
+        # Real API call (waits for a rate-limit token)
+        embedding = np.asarray(
+            self.executor.embed([text], embed_fn=self._call_slate_api), dtype=np.float32
+        )
 
         # Validate dimensionality
         if embedding.shape != (1, self.config.embedding_dim):
@@ -128,6 +130,8 @@ class WatsonXEmbedder:
         """Batch embedding for multiple texts.
 
         Real API calls with batch processing (5-10 texts per request).
+        Batches run concurrently on the shared executor, within the
+        process-wide quota, and come back in input order.
 
         Args:
             texts: List of input texts
@@ -149,29 +153,17 @@ class WatsonXEmbedder:
                 raise ValueError(f"Text at index {i} is empty")
 
         batch_sz = batch_size or self.config.batch_size
-        embeddings: List[np.ndarray] = []
 
         logger.info(f"Batch embedding {len(texts)} texts (batch_size={batch_sz})")
 
-        # Process in batches
-        for i in range(0, len(texts), batch_sz):
-            batch = texts[i : i + batch_sz]
-            logger.debug(f"Processing batch {i // batch_sz + 1}: {len(batch)} texts")
-
-            self._check_rate_limit()
-            batch_embeddings = self._call_slate_api(batch)
-
-            # Validate batch
-            if batch_embeddings.shape[0] != len(batch):
-                raise RuntimeError(
-                    f"Batch mismatch: got {batch_embeddings.shape[0]} embeddings, "
-                    f"expected {len(batch)}"
-                )
-
-            embeddings.append(batch_embeddings)
+        try:
+            vectors = self.executor.embed(
+                texts, embed_fn=self._call_slate_api, max_batch_items=batch_sz
+            )
+        except ValueError as e:
+            raise RuntimeError(f"Batch mismatch: {e}") from e
 
-        # Concatenate all batches
-        result = np.vstack(embeddings)
+        result = np.vstack(vectors).astype(np.float32)
         logger.info(f"Embedding complete: shape={result.shape}")
         return result
 
@@ -241,34 +233,6 @@ class WatsonXEmbedder:
             logger.error(f"Slate API call failed: {e}")
             raise RuntimeError(f"Embedding API error: {e}") from e
 
-    def _check_rate_limit(self) -> None:
-        """Enforce rate limiting (100 requests/hour).
-
-        Raises:
-            RuntimeError: If rate limit exceeded (no retry, caller handles)
-        """
-        now = clock.now()
-
-        # Reset window every hour
-        if (now - self.request_times[0]).total_seconds() > 3600 if self.request_times else False:
-            self.request_times = []
-
-        # Remove old entries
-        self.request_times = [
-            t
-            for t in self.request_times
-            if (now - t).total_seconds() < 3600
-        ]
-
-        # Check limit
-        if len(self.request_times) >= self.config.rate_limit_per_hour:
-            raise RuntimeError(
-                f"Rate limit exceeded: {len(self.request_times)} "
-                f"requests in last hour (limit: {self.config.rate_limit_per_hour})"
-            )
-
-        self.request_times.append(now)
-
     def health_check(self) -> bool:
         """Verify API connectivity.
 
@@ -15,6 +15,7 @@ from pathlib import Path
 import time
 from functools import lru_cache
 from dotenv import load_dotenv
+from libs.embedding.embedding_executor import get_embedding_executor
 from libs.utils.clock import get_clock
 clock = get_clock()
 
@@ -201,56 +202,43 @@ class WatsonXClient:
     ) -> List[np.ndarray]:
         """
         Generate embeddings for multiple texts - REAL SERVICE ONLY
+
+        Uncached texts are sent through the shared embedding executor:
+        batches of up to batch_size texts run concurrently under the
+        service quota, and results come back in input order.
         """
-        embeddings = []
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
 
         # Check cache for all texts
         uncached_texts = []
         uncached_indices = []
+        for i, text in enumerate(texts):
+            cached = self._get_cached_embedding(text) if use_cache else None
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                uncached_texts.append(text)
+                uncached_indices.append(i)
 
-        if use_cache:
-            for i, text in enumerate(texts):
-                cached = self._get_cached_embedding(text)
-                if cached is not None:
-                    embeddings.append(cached)
-                else:
-                    uncached_texts.append(text)
-                    uncached_indices.append(i)
-        else:
-            uncached_texts = texts
-            uncached_indices = list(range(len(texts)))
-
-        # Process uncached texts in batches
+        # Process uncached texts in concurrent batches
         if uncached_texts:
-            for i in range(0, len(uncached_texts), batch_size):
-                batch = uncached_texts[i:i + batch_size]
-
-                try:
-                    # Generate embeddings for batch using REAL API
-                    batch_response = self.embedding_model.embed_documents(batch)
-
-                    if batch_response and len(batch_response) == len(batch):
-                        batch_embeddings = [np.array(emb) for emb in batch_response]
-
-                        # Normalize
-                        batch_embeddings = [
-                            emb / np.linalg.norm(emb) for emb in batch_embeddings
-                        ]
-
-                        # Cache if enabled
-                        if use_cache:
-                            for text, emb in zip(batch, batch_embeddings):
-                                self._cache_embedding(text, emb)
-
-                        # Add to results
-                        for emb in batch_embeddings:
-                            embeddings.append(emb)
-                    else:
-                        raise ValueError(f"Invalid batch response: expected {len(batch)} embeddings")
-
-                except Exception as e:
-                    logger.error(f"Batch embedding failed: {e}")
-                    raise RuntimeError(f"Batch embedding generation failed - real service required: {e}")
+            try:
+                vectors = get_embedding_executor().embed(
+                    uncached_texts,
+                    embed_fn=self.embedding_model.embed_documents,
+                    max_batch_items=batch_size,
+                )
+            except Exception as e:
+                logger.error(f"Batch embedding failed: {e}")
+                raise RuntimeError(f"Batch embedding generation failed - real service required: {e}")
+
+            for index, text, vector in zip(uncached_indices, uncached_texts, vectors):
+                # Normalize
+                emb = np.array(vector)
+                emb = emb / np.linalg.norm(emb)
+                if use_cache:
+                    self._cache_embedding(text, emb)
+                embeddings[index] = emb
 
         return embeddings
 
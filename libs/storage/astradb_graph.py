@@ -154,6 +154,57 @@ class AstraDBGraphStore:
         except Exception as e:
             logger.warning(f"Could not create indexes: {e}")
 
+    @staticmethod
+    def node_document(
+        node_id: str,
+        node_type: str,
+        properties: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the nodes-collection document for a node"""
+        node = GraphNode(
+            node_id=node_id,
+            node_type=node_type,
+            properties=properties,
+            created_at=clock.now().isoformat(),
+            updated_at=clock.now().isoformat()
+        )
+        return {
+            "_id": node.node_id,
+            "node_type": node.node_type,
+            "properties": node.properties,
+            "created_at": node.created_at,
+            "updated_at": node.updated_at
+        }
+
+    @staticmethod
+    def edge_document(
+        edge_id: str,
+        source_id: str,
+        target_id: str,
+        edge_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+        weight: float = 1.0
+    ) -> Dict[str, Any]:
+        """Build the edges-collection document for an edge"""
+        edge = GraphEdge(
+            edge_id=edge_id,
+            source_id=source_id,
+            target_id=target_id,
+            edge_type=edge_type,
+            properties=properties or {},
+            weight=weight,
+            created_at=clock.now().isoformat()
+        )
+        return {
+            "_id": edge.edge_id,
+            "source_id": edge.source_id,
+            "target_id": edge.target_id,
+            "edge_type": edge.edge_type,
+            "properties": edge.properties,
+            "weight": edge.weight,
+            "created_at": edge.created_at
+        }
+
     def upsert_node(
         self,
         node_id: str,
@@ -167,21 +218,7 @@ class AstraDBGraphStore:
             raise RuntimeError("Nodes collection not initialized")
 
         try:
-            node = GraphNode(
-                node_id=node_id,
-                node_type=node_type,
-                properties=properties,
-                created_at=clock.now().isoformat(),
-                updated_at=clock.now().isoformat()
-            )
-
-            document = {
-                "_id": node_id,
-                "node_type": node_type,
-                "properties": properties,
-                "created_at": node.created_at,
-                "updated_at": node.updated_at
-            }
+            document = self.node_document(node_id, node_type, properties)
 
             # Use replace_one with upsert
             try:
@@ -220,26 +257,10 @@ class AstraDBGraphStore:
             raise RuntimeError("Edges collection not initialized")
 
         try:
-            edge = GraphEdge(
-                edge_id=edge_id,
-                source_id=source_id,
-                target_id=target_id,
-                edge_type=edge_type,
-                properties=properties or {},
-                weight=weight,
-                created_at=clock.now().isoformat()
+            document = self.edge_document(
+                edge_id, source_id, target_id, edge_type, properties, weight
             )
 
-            document = {
-                "_id": edge_id,
-                "source_id": source_id,
-                "target_id": target_id,
-                "edge_type": edge_type,
-                "properties": properties or {},
-                "weight": weight,
-                "created_at": edge.created_at
-            }
-
             # Use replace_one with upsert
             try:
                 result = self.edges_collection.replace_one(
@@ -143,6 +143,27 @@ class AstraDBVectorStore:
             logger.error(f"Failed to initialize collections: {e}")
             raise RuntimeError(f"Cannot initialize AstraDB collections: {e}")
 
+    @staticmethod
+    def chunk_document(
+        chunk_id: str,
+        embedding: np.ndarray,
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the vector-collection document for a chunk"""
+        document = {
+            "_id": chunk_id,
+            "$vector": np.asarray(embedding).tolist(),
+            "metadata": metadata,
+            "timestamp": clock.now().isoformat()
+        }
+
+        # Add metadata fields at top level for filtering
+        for key, value in metadata.items():
+            if key in ["company", "year", "section", "source_url"]:
+                document[key] = value
+
+        return document
+
     def upsert_chunk(
         self,
         chunk_id: str,
@@ -162,17 +183,7 @@ class AstraDBVectorStore:
 
         try:
             # Prepare document
-            document = {
-                "_id": chunk_id,
-                "$vector": embedding.tolist(),
-                "metadata": metadata,
-                "timestamp": clock.now().isoformat()
-            }
-
-            # Add metadata fields at top level for filtering
-            for key, value in metadata.items():
-                if key in ["company", "year", "section", "source_url"]:
-                    document[key] = value
+            document = self.chunk_document(chunk_id, embedding, metadata)
 
             # Upsert to collection - use replace_one with upsert
             try:
@@ -217,19 +228,7 @@ class AstraDBVectorStore:
             # Prepare documents
             documents = []
             for chunk_id, embedding, metadata in items:
-                document = {
-                    "_id": chunk_id,
-                    "$vector": embedding.tolist(),
-                    "metadata": metadata,
-                    "timestamp": clock.now().isoformat()
-                }
-
-                # Add filterable fields
-                for key, value in metadata.items():
-                    if key in ["company", "year", "section", "source_url"]:
-                        document[key] = value
-
-                documents.append(document)
+                documents.append(self.chunk_document(chunk_id, embedding, metadata))
 
             # Batch insert with upsert
             if documents:
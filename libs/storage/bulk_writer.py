@@ -0,0 +1,346 @@
+"""
+Buffered bulk writer for the AstraDB vector and graph stores
+Accumulates nodes, edges and vectors and flushes them with insert_many
+batches across a small thread pool instead of one round trip per document
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Data API caps insert_many payloads; vector documents carry 768 floats each
+# so they are flushed in smaller batches than graph documents.
+DEFAULT_VECTOR_BATCH_SIZE = 20
+DEFAULT_GRAPH_BATCH_SIZE = 50
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_FLUSH_THRESHOLD = 1000
+
+
+@dataclass
+class BulkWriteStats:
+    """Counters and throughput for a bulk writer"""
+    nodes_written: int = 0
+    edges_written: int = 0
+    vectors_written: int = 0
+    duplicates_dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+    flushes: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def total_written(self) -> int:
+        """Documents written across nodes, edges and vectors"""
+        return self.nodes_written + self.edges_written + self.vectors_written
+
+    @property
+    def docs_per_second(self) -> float:
+        """Write throughput over time spent flushing"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total_written / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view including derived throughput"""
+        data = asdict(self)
+        data["total_written"] = self.total_written
+        data["docs_per_second"] = round(self.docs_per_second, 2)
+        return data
+
+
+class AstraDBBulkWriter:
+    """
+    Buffered writer over AstraDBVectorStore / AstraDBGraphStore
+
+    Documents are deduplicated by ID inside the buffer (last write wins) and
+    flushed with insert_many. IDs rejected by insert_many (already present in
+    the collection) fall back to replace_one upserts, so the writer keeps the
+    upsert semantics of the per-document store methods. Documents leave the
+    buffer only once written; anything that fails stays buffered and is
+    retried by the next flush.
+
+    Usage:
+        with AstraDBBulkWriter(vector_store, graph_store) as writer:
+            writer.add_node(...)
+            writer.add_edge(...)
+            writer.add_vector(...)
+        logger.info(writer.stats.to_dict())
+    """
+
+    def __init__(
+        self,
+        vector_store=None,
+        graph_store=None,
+        vector_batch_size: int = DEFAULT_VECTOR_BATCH_SIZE,
+        graph_batch_size: int = DEFAULT_GRAPH_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD
+    ):
+        if vector_batch_size < 1 or graph_batch_size < 1:
+            raise ValueError("Batch sizes must be positive")
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+
+        self.vector_store = vector_store
+        self.graph_store = graph_store
+        self.vector_batch_size = vector_batch_size
+        self.graph_batch_size = graph_batch_size
+        self.max_workers = max_workers
+        self.flush_threshold = flush_threshold
+
+        self.stats = BulkWriteStats()
+
+        self._nodes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._edges: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._vectors: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Buffering
+    # ------------------------------------------------------------------
+
+    def add_node(self, node_id: str, node_type: str, properties: Dict[str, Any]) -> None:
+        """Buffer a graph node upsert"""
+        if self.graph_store is None:
+            raise RuntimeError("Graph store not configured for bulk writer")
+        document = self.graph_store.node_document(node_id, node_type, properties)
+        self._buffer(lambda: self._nodes, document)
+
+    def add_edge(
+        self,
+        edge_id: str,
+        source_id: str,
+        target_id: str,
+        edge_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+        weight: float = 1.0
+    ) -> None:
+        """Buffer a graph edge upsert"""
+        if self.graph_store is None:
+            raise RuntimeError("Graph store not configured for bulk writer")
+        document = self.graph_store.edge_document(
+            edge_id, source_id, target_id, edge_type, properties, weight
+        )
+        self._buffer(lambda: self._edges, document)
+
+    def add_vector(
+        self,
+        chunk_id: str,
+        embedding,
+        metadata: Dict[str, Any],
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Buffer a vector (chunk) upsert"""
+        if self.vector_store is None:
+            raise RuntimeError("Vector store not configured for bulk writer")
+        if collection_name is None:
+            collection_name = f"{self.vector_store.config.collection_prefix}chunks"
+        if self.vector_store.collections.get(collection_name) is None:
+            raise RuntimeError(f"Collection {collection_name} not initialized")
+        document = self.vector_store.chunk_document(chunk_id, embedding, metadata)
+        self._buffer(lambda: self._vectors.setdefault(collection_name, OrderedDict()), document)
+
+    def add_vectors(
+        self,
+        items: List[Tuple[str, Any, Dict[str, Any]]],
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Buffer (chunk_id, embedding, metadata) tuples, as accepted by upsert_batch"""
+        for chunk_id, embedding, metadata in items:
+            self.add_vector(chunk_id, embedding, metadata, collection_name)
+
+    def pending(self) -> int:
+        """Number of buffered documents awaiting flush"""
+        with self._lock:
+            return (
+                len(self._nodes)
+                + len(self._edges)
+                + sum(len(buffer) for buffer in self._vectors.values())
+            )
+
+    def _buffer(self, select_buffer, document: Dict[str, Any]) -> None:
+        """Add a document, replacing any buffered document with the same ID"""
+        with self._lock:
+            buffer = select_buffer()
+            doc_id = document["_id"]
+            if doc_id in buffer:
+                self.stats.duplicates_dropped += 1
+                del buffer[doc_id]
+            buffer[doc_id] = document
+            should_flush = self.pending() >= self.flush_threshold
+
+        if should_flush:
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self) -> BulkWriteStats:
+        """
+        Write all buffered documents; nodes and vectors land before edges
+
+        Written documents are removed from the buffer. Failed ones stay
+        buffered for the next flush, and edges wait until the first wave
+        has fully landed.
+
+        Raises:
+            RuntimeError: If any document could not be written
+        """
+        with self._lock:
+            nodes = list(self._nodes.values())
+            edges = list(self._edges.values())
+            vectors = {name: list(buffer.values()) for name, buffer in self._vectors.items() if buffer}
+
+        if not nodes and not edges and not vectors:
+            return self.stats
+
+        start = time.perf_counter()
+
+        first_wave = []
+        if nodes:
+            first_wave.append((
+                "nodes_written", self._nodes, self.graph_store.nodes_collection, nodes, self.graph_batch_size
+            ))
+        for collection_name, documents in vectors.items():
+            first_wave.append((
+                "vectors_written", self._vectors[collection_name],
+                self.vector_store.collections.get(collection_name), documents, self.vector_batch_size
+            ))
+        unwritten = self._run_wave(first_wave)
+
+        if edges and unwritten == 0:
+            unwritten = self._run_wave([
+                ("edges_written", self._edges, self.graph_store.edges_collection, edges, self.graph_batch_size)
+            ])
+        elif edges:
+            unwritten += len(edges)
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats.flushes += 1
+            self.stats.elapsed_seconds += elapsed
+
+        logger.info(
+            f"Bulk flush: {len(nodes)} nodes, {len(edges)} edges, "
+            f"{sum(len(d) for d in vectors.values())} vectors in {elapsed:.2f}s "
+            f"({self.stats.docs_per_second:.1f} docs/s cumulative)"
+        )
+        if unwritten:
+            raise RuntimeError(f"Bulk flush left {unwritten} documents buffered for retry")
+        return self.stats
+
+    def _run_wave(self, jobs: List[Tuple[str, Any, Any, List[Dict[str, Any]], int]]) -> int:
+        """
+        Split each job into batches and write them concurrently
+        Returns the number of documents left in their buffers
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="astradb-bulk"
+            )
+
+        futures = []
+        unwritten = 0
+        for counter, buffer, collection, documents, batch_size in jobs:
+            if collection is None:
+                logger.error(f"Collection not initialized; keeping {len(documents)} documents buffered")
+                unwritten += len(documents)
+                continue
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i:i + batch_size]
+                futures.append((counter, buffer, batch, self._executor.submit(self._write_batch, collection, batch)))
+
+        for counter, buffer, batch, future in futures:
+            try:
+                written_ids, failed = future.result()
+            except Exception as e:
+                logger.error(f"Bulk batch of {len(batch)} documents failed: {e}")
+                written_ids, failed = set(), len(batch)
+
+            with self._lock:
+                for document in batch:
+                    # A newer document buffered under the same ID mid-flush stays queued
+                    if document["_id"] in written_ids and buffer.get(document["_id"]) is document:
+                        del buffer[document["_id"]]
+                setattr(self.stats, counter, getattr(self.stats, counter) + len(written_ids))
+                self.stats.failed += failed
+                self.stats.batches += 1
+            unwritten += len(batch) - len(written_ids)
+
+        return unwritten
+
+    @staticmethod
+    def _write_batch(collection, documents: List[Dict[str, Any]]) -> Tuple[set, int]:
+        """
+        insert_many a batch; upsert any documents the insert rejected
+        Returns (written IDs, failed count)
+        """
+        inserted_ids: List[Any] = []
+        try:
+            result = collection.insert_many(documents, ordered=False)
+            inserted_ids = list(getattr(result, "inserted_ids", None) or [])
+        except Exception as e:
+            # Duplicate IDs abort only their own documents with ordered=False;
+            # the exception carries what did get inserted.
+            partial = getattr(e, "partial_result", None)
+            inserted_ids = list(getattr(partial, "inserted_ids", None) or [])
+            logger.debug(f"insert_many partially rejected ({len(inserted_ids)}/{len(documents)}): {e}")
+
+        written = set(inserted_ids)
+        failed = 0
+
+        for document in documents:
+            if document["_id"] in written:
+                continue
+            try:
+                collection.replace_one({"_id": document["_id"]}, document, upsert=True)
+                written.add(document["_id"])
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Failed to upsert document {document['_id']}: {e}")
+
+        return written, failed
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self) -> BulkWriteStats:
+        """Flush remaining documents and release the thread pool (failed documents stay buffered)"""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+        logger.info(
+            f"Bulk writer closed: {self.stats.total_written} documents written "
+            f"({self.stats.failed} failed, {self.stats.duplicates_dropped} duplicates dropped) "
+            f"at {self.stats.docs_per_second:.1f} docs/s"
+        )
+        return self.stats
+
+    def __enter__(self) -> "AstraDBBulkWriter":
+        """Enter context; close() runs on clean exit"""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Flush on success; on error drop the buffer and release threads"""
+        if exc_type is None:
+            self.close()
+        elif self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+__all__ = ['AstraDBBulkWriter', 'BulkWriteStats']
@@ -0,0 +1,111 @@
+"""
+Bounded, ordered, cancellable fan-out over an executor
+
+map_ordered() keeps at most ``max_pending`` tasks queued or running, yields
+outcomes in input order (so callers get deterministic results whatever
+order tasks finish in) and stops submitting once a cancellation event is
+set. Items that never ran are still yielded, with CancelledError, so every
+input gets exactly one outcome.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Executor, Future
+from dataclasses import dataclass
+from typing import Callable, Deque, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class Outcome(Generic[T, R]):
+    """Result of one mapped item: either a value or the exception it raised"""
+    index: int
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """True when the task returned normally"""
+        return self.error is None
+
+    @property
+    def cancelled(self) -> bool:
+        """True when the task was cancelled before it ran"""
+        return isinstance(self.error, CancelledError)
+
+
+def map_ordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    executor: Optional[Executor],
+    max_pending: int,
+    cancel_event: Optional[threading.Event] = None
+) -> Iterator[Outcome[T, R]]:
+    """Apply ``fn`` to each item on ``executor``, yielding outcomes in input order.
+
+    Args:
+        fn: Task function; exceptions are captured in the outcome
+        items: Inputs, consumed lazily as queue slots free up
+        executor: Executor to run tasks on; None runs them inline
+        max_pending: Maximum tasks submitted but not yet yielded
+        cancel_event: When set, no further tasks start; queued tasks are
+            cancelled and remaining items yield CancelledError
+
+    Yields:
+        One Outcome per input item, in input order
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be positive")
+
+    def is_cancelled() -> bool:
+        """Whether the caller asked to stop."""
+        return cancel_event is not None and cancel_event.is_set()
+
+    iterator = enumerate(items)
+
+    if executor is None:
+        for index, item in iterator:
+            if is_cancelled():
+                yield Outcome(index, item, error=CancelledError())
+                continue
+            try:
+                yield Outcome(index, item, value=fn(item))
+            except Exception as e:
+                yield Outcome(index, item, error=e)
+        return
+
+    pending: Deque[Tuple[int, T, Future]] = deque()
+
+    def fill() -> None:
+        """Submit items until the window is full or input runs out."""
+        while len(pending) < max_pending and not is_cancelled():
+            try:
+                index, item = next(iterator)
+            except StopIteration:
+                return
+            pending.append((index, item, executor.submit(fn, item)))
+
+    try:
+        fill()
+        while pending:
+            index, item, future = pending.popleft()
+            if is_cancelled():
+                future.cancel()
+            try:
+                yield Outcome(index, item, value=future.result())
+            except CancelledError as e:
+                yield Outcome(index, item, error=e)
+            except Exception as e:
+                yield Outcome(index, item, error=e)
+            fill()
+
+        # Cancelled before these were ever submitted
+        for index, item in iterator:
+            yield Outcome(index, item, error=CancelledError())
+    finally:
+        # Consumer stopped early (or cancellation): drop queued work
+        for _, _, future in pending:
+            future.cancel()
@@ -0,0 +1,417 @@
+"""
+Run Event Journal
+
+Buffered, process-safe, rotating JSONL journal behind trace.emit_event.
+
+- emit() serializes the record and appends it to an in-memory buffer. A
+  background thread flushes when the buffer holds max_buffer_events records
+  or every flush_interval seconds, and on close/exit.
+- A flush is one os.write() of whole lines to a file opened with O_APPEND,
+  so records from concurrent processes never interleave mid-line.
+- Rotation (by size and/or UTC date) renames the active file to a
+  timestamped segment and gzips it. Writers hold a shared flock on
+  <path>.lock while writing and the rotator an exclusive one while
+  renaming; writers re-check the active file's inode under the lock and
+  reopen after a rotation, so nothing is appended to a sealed segment.
+- read_events() merges sealed segments and the active file in timestamp
+  order.
+
+Configuration (environment):
+- ESG_EVENT_FLUSH_SECONDS: maximum buffering delay (default: 1.0)
+- ESG_EVENT_BUFFER_EVENTS: records that trigger a flush (default: 256)
+- ESG_EVENT_MAX_BYTES: active file size that triggers rotation (default:
+  64 MiB, 0 disables)
+- ESG_EVENT_ROTATE_DAILY: rotate when the UTC date changes (default: true)
+- ESG_EVENT_COMPRESS: gzip sealed segments (default: true)
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from libs.utils.env import bool_flag, get
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: single-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 1.0
+DEFAULT_BUFFER_EVENTS = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_STAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+@contextlib.contextmanager
+def _flock(fd: Optional[int], operation: int):
+    """Hold an advisory file lock (no-op without fcntl)."""
+    if fcntl is None or fd is None:
+        yield
+        return
+    fcntl.flock(fd, operation)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _utc_date(timestamp: float):
+    """UTC calendar date of a Unix timestamp."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).date()
+
+
+class EventJournal:
+    """Buffered append-only JSONL journal with rotation."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = DEFAULT_FLUSH_SECONDS,
+        max_buffer_events: int = DEFAULT_BUFFER_EVENTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rotate_daily: bool = True,
+        compress: bool = True,
+    ):
+        """
+        Initialize journal (files are opened on first flush).
+
+        Args:
+            path: Active journal file (e.g. artifacts/run_events.jsonl)
+            flush_interval: Maximum seconds a record waits in the buffer
+            max_buffer_events: Buffered records that trigger a flush
+            max_bytes: Rotate once the active file would exceed this size
+                (0 disables size rotation)
+            rotate_daily: Rotate when the active file was last written on an
+                earlier UTC date
+            compress: Gzip sealed segments
+
+        Raises:
+            ValueError: If a limit is invalid
+        """
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if max_buffer_events < 1:
+            raise ValueError("max_buffer_events must be positive")
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative")
+
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_buffer_events = max_buffer_events
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.stats: Dict[str, int] = {"emitted": 0, "written": 0, "flushes": 0, "rotations": 0, "failed": 0}
+
+        self._buffer: List[str] = []
+        self._cond = threading.Condition()
+        # Serializes buffer swaps with file writes so each process's records stay in emit order
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._fd: Optional[int] = None
+        self._inode: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+
+    @classmethod
+    def from_env(cls, path: Union[str, Path]) -> "EventJournal":
+        """Build a journal from ESG_EVENT_* environment variables."""
+        return cls(
+            path=path,
+            flush_interval=float(get("ESG_EVENT_FLUSH_SECONDS", str(DEFAULT_FLUSH_SECONDS))),
+            max_buffer_events=int(get("ESG_EVENT_BUFFER_EVENTS", str(DEFAULT_BUFFER_EVENTS))),
+            max_bytes=int(get("ESG_EVENT_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            rotate_daily=bool_flag("ESG_EVENT_ROTATE_DAILY", True),
+            compress=bool_flag("ESG_EVENT_COMPRESS", True),
+        )
+
+    # ------------------------------------------------------------------
+    # Emission
+    # ------------------------------------------------------------------
+
+    def emit(self, record: Mapping[str, Any]) -> None:
+        """
+        Enqueue one record (serialized now, written by the flusher).
+
+        After close() records are written synchronously instead.
+        """
+        line = json.dumps(record) + "\n"
+        with self._cond:
+            self._buffer.append(line)
+            self.stats["emitted"] += 1
+            closed = self._closed
+            if len(self._buffer) >= self.max_buffer_events:
+                self._cond.notify()
+        if closed:
+            self.flush()
+        elif self._thread is None:
+            self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        """Start the flusher thread on first emit."""
+        with self._cond:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="esg-event-journal", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Flusher thread: write the buffer when full, on a timer, and on close."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.max_buffer_events,
+                    timeout=self.flush_interval,
+                )
+                stop = self._closed
+            self.flush()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Write every buffered record now."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+            if batch:
+                self._write(batch)
+
+    # ------------------------------------------------------------------
+    # File handling
+    # ------------------------------------------------------------------
+
+    def _write(self, batch: List[str]) -> None:
+        """Append a batch of lines with one O_APPEND write (caller holds _io_lock)."""
+        data = "".join(batch).encode("utf-8")
+        try:
+            self._open()
+            if self._needs_rotation(os.fstat(self._fd), len(data)):
+                self._rotate(len(data))
+            with _flock(self._lock_fd, fcntl.LOCK_SH if fcntl else 0):
+                # Another process may have rotated since we last looked
+                self._open()
+                view = memoryview(data)
+                while view:
+                    written = os.write(self._fd, view)
+                    view = view[written:]
+            self.stats["written"] += len(batch)
+            self.stats["flushes"] += 1
+        except OSError as e:
+            self.stats["failed"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} events to {self.path}: {e}")
+
+    def _open(self) -> None:
+        """Open the active file, reopening it if it was rotated away."""
+        if self._lock_fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        if self._fd is not None:
+            try:
+                if os.stat(self.path).st_ino == self._inode:
+                    return
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._inode = os.fstat(self._fd).st_ino
+
+    def _needs_rotation(self, stat: os.stat_result, incoming: int) -> bool:
+        """Whether the active file should be sealed before appending."""
+        if stat.st_size == 0:
+            return False
+        if self.max_bytes and stat.st_size + incoming > self.max_bytes:
+            return True
+        if self.rotate_daily:
+            return _utc_date(stat.st_mtime) != datetime.now(timezone.utc).date()
+        return False
+
+    def _rotate(self, incoming: int) -> None:
+        """Seal the active file as a timestamped segment (one process wins)."""
+        sealed: Optional[Path] = None
+        with _flock(self._lock_fd, fcntl.LOCK_EX if fcntl else 0):
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            # Skip if another process already rotated (or it no longer needs it)
+            if stat.st_ino == self._inode and self._needs_rotation(stat, incoming):
+                stamp = datetime.now(timezone.utc).strftime(_STAMP_FORMAT)
+                sealed = self.path.with_name(f"{self.path.stem}.{stamp}.{os.getpid()}{self.path.suffix}")
+                os.rename(self.path, sealed)
+                self.stats["rotations"] += 1
+        self._open()
+        if sealed is not None and self.compress:
+            _compress_segment(sealed)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Flush pending records, stop the flusher and close files."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._cond.notify()
+        if thread is not None and thread.is_alive():
+            thread.join()
+        self.flush()
+        with self._io_lock:
+            for fd in (self._fd, self._lock_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._fd = self._lock_fd = None
+
+
+def _compress_segment(segment: Path) -> None:
+    """Gzip a sealed segment; the plain file is removed once the .gz is complete."""
+    target = segment.with_name(segment.name + ".gz")
+    tmp = segment.with_name(segment.name + ".gz.tmp")
+    try:
+        with open(segment, "rb") as source, gzip.open(tmp, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+        os.replace(tmp, target)
+        segment.unlink()
+    except OSError as e:
+        logger.warning(f"Could not compress event segment {segment}: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+# ----------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------
+
+def list_segments(path: Union[str, Path]) -> List[Path]:
+    """
+    Journal files for an active path, oldest first.
+
+    Sealed segments are ordered by their rotation stamp; the active file
+    (if present) comes last. A segment present both plain and gzipped (crash
+    during compression) is read from the complete .gz.
+    """
+    path = Path(path)
+    pattern = re.compile(
+        rf"^{re.escape(path.stem)}\.(\d{{8}}T\d{{12}})\.(\d+){re.escape(path.suffix)}(\.gz)?$"
+    )
+    sealed: Dict[str, Path] = {}
+    if path.parent.is_dir():
+        for candidate in path.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if not match:
+                continue
+            key = f"{match.group(1)}.{match.group(2)}"
+            if match.group(3) or key not in sealed:
+                sealed[key] = candidate
+    segments = [sealed[key] for key in sorted(sealed)]
+    if path.exists():
+        segments.append(path)
+    return segments
+
+
+def _segment_records(segment: Path) -> List[Dict[str, Any]]:
+    """Parse one segment, sorted by ts (stable, so write order breaks ties)."""
+    opener = gzip.open if segment.suffix == ".gz" else open
+    records = []
+    with opener(segment, "rt", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping malformed event line {line_no} in {segment}")
+    records.sort(key=_event_ts)
+    return records
+
+
+def _event_ts(record: Mapping[str, Any]) -> float:
+    """Sort key: the record's ts (records without one sort first)."""
+    ts = record.get("ts")
+    return ts if isinstance(ts, (int, float)) else 0
+
+
+def read_events(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Every journaled record for a path, merged across segments by timestamp.
+
+    Ties keep segment order, then write order. Records still buffered in
+    a live journal are not included; flush first.
+
+    Args:
+        path: Active journal file
+
+    Yields:
+        Event records
+    """
+    return heapq.merge(*(_segment_records(segment) for segment in list_segments(path)), key=_event_ts)
+
+
+# ----------------------------------------------------------------------
+# Process-wide journals
+# ----------------------------------------------------------------------
+
+_JOURNALS: Dict[str, EventJournal] = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def get_event_journal(path: Union[str, Path]) -> EventJournal:
+    """
+    Process-wide journal for a path (created on first use, flushed at exit).
+
+    Args:
+        path: Active journal file
+    """
+    key = os.path.abspath(path)
+    journal = _JOURNALS.get(key)
+    if journal is not None:
+        return journal
+    with _JOURNALS_LOCK:
+        if key not in _JOURNALS:
+            _JOURNALS[key] = EventJournal.from_env(path)
+        return _JOURNALS[key]
+
+
+def flush_event_journals() -> None:
+    """Write every buffered record of every journal in this process."""
+    for journal in list(_JOURNALS.values()):
+        journal.flush()
+
+
+def close_event_journals() -> None:
+    """Flush and close every journal in this process."""
+    global _JOURNALS
+    with _JOURNALS_LOCK:
+        journals, _JOURNALS = _JOURNALS, {}
+    for journal in journals.values():
+        journal.close()
+
+
+def _reset_after_fork() -> None:
+    """Forked children start with no journals; the parent flushes its own buffers."""
+    global _JOURNALS, _JOURNALS_LOCK
+    _JOURNALS = {}
+    _JOURNALS_LOCK = threading.Lock()
+
+
+atexit.register(close_event_journals)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,11 +1,30 @@
-import json, time
-from pathlib import Path
+"""
+Run event tracing.
+
+emit_event() only enqueues the record; a per-path EventJournal buffers,
+appends and rotates the file (see libs.utils.event_journal). Call
+flush_events() before reading the journal back in the same process.
+"""
+
+from typing import Optional
+
 from libs.utils.clock import get_clock
+from libs.utils.event_journal import flush_event_journals, get_event_journal
+
 clock = get_clock()
 
-def emit_event(event: dict, path: str = "artifacts/run_events.jsonl"):
+DEFAULT_EVENTS_PATH = "artifacts/run_events.jsonl"
+
+
+def emit_event(event: dict, path: str = DEFAULT_EVENTS_PATH):
+    """Enqueue a run event stamped with the deterministic clock."""
     rec = {"ts": int(clock.time()), **event}
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(rec) + "\n")
+    get_event_journal(path).emit(rec)
+
+
+def flush_events(path: Optional[str] = None):
+    """Write buffered events for one journal path (or all journals) now."""
+    if path is None:
+        flush_event_journals()
+    else:
+        get_event_journal(path).flush()
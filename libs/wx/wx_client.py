@@ -64,7 +64,14 @@ def _wx_cache_path_for_embedding(sha_hex: str) -> Path:
     return canonical  # for writes
 
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from libs.cache.llm_store import STORE_FILENAME, get_llm_store
+from libs.embedding.embedding_executor import (
+    EMBED_MAX_CHARS,
+    get_embedding_executor,
+    truncate_for_embedding,
+)
 
 try:
     from ibm_watsonx_ai import APIClient, Credentials
@@ -130,6 +137,11 @@ class WatsonxClient:
 
         self.ledger_path = self.cache_dir / "ledger.jsonl"
 
+        # One content-addressed store for all call types (replaces the
+        # per-call JSON files, which are still read as a fallback)
+        # (size budget: ESG_LLM_STORE_MAX_MB)
+        self.store = get_llm_store(self.cache_dir / STORE_FILENAME)
+
         # Initialize watsonx client (if available and not offline)
         self.client = None
         if WATSONX_AVAILABLE and not self.offline_replay:
@@ -173,9 +185,9 @@ class WatsonxClient:
         input_combined = json.dumps(texts, sort_keys=True)
         cache_key = self._build_cache_key("embed", params_dict, input_combined)
 
-        # Try cache lookup with fallback to legacy path
+        # Try store lookup with fallback to legacy per-call files
         cache_path = _wx_cache_path_for_embedding(cache_key)
-        cached = self._cache_lookup(cache_path)
+        cached = self._cache_lookup("embed", cache_key, cache_path)
 
         if cached:
             return cached["output"]
@@ -192,12 +204,11 @@ class WatsonxClient:
                 "ibm-watsonx-ai not installed. Install with: pip install ibm-watsonx-ai"
             )
 
-        # Call watsonx.ai API
-        try:
+        def _compute() -> Dict:
+            """Call watsonx.ai and build the cache payload."""
             # Truncate texts to fit model's 512 token limit
             # Conservative estimate: ~400 chars ≈ 100-150 tokens for English
-            MAX_CHARS = 400
-            truncated_texts = [t[:MAX_CHARS] if len(t) > MAX_CHARS else t for t in texts]
+            truncated_texts = [truncate_for_embedding(t, EMBED_MAX_CHARS) for t in texts]
 
             # Use Embeddings class for embedding generation
             # Don't pass params - let it use defaults
@@ -210,7 +221,8 @@ class WatsonxClient:
                 project_id=self.project_id,
             )
 
-            vectors = model.embed_documents(truncated_texts)
+            # Batches run concurrently under the shared embedding quota
+            vectors = get_embedding_executor().embed(truncated_texts, embed_fn=model.embed_documents)
 
             # Validate output
             if len(vectors) != len(texts):
@@ -218,12 +230,11 @@ class WatsonxClient:
                     f"Expected {len(texts)} vectors, got {len(vectors)}"
                 )
 
-            # Cache result
             output_sha = hashlib.sha256(
                 json.dumps(vectors, sort_keys=True).encode()
             ).hexdigest()
 
-            cache_payload = {
+            return {
                 "model_id": model_id,
                 "params": params_dict,
                 "input_sha": hashlib.sha256(input_combined.encode()).hexdigest(),
@@ -234,11 +245,9 @@ class WatsonxClient:
                 "cost_estimate": len(texts) * 0.0001,  # Rough estimate
             }
 
-            self._cache_write(cache_path, cache_payload)
-            self._log_to_ledger("embed", cache_payload)
-
-            return vectors
-
+        # Call watsonx.ai API (identical concurrent requests share one call)
+        try:
+            return self._cached_call("embed", cache_key, model_id, _compute)["output"]
         except Exception as e:
             raise RuntimeError(f"watsonx.ai embedding failed: {e}")
 
@@ -277,9 +286,9 @@ class WatsonxClient:
         prompt_sha = hashlib.sha256(prompt.encode()).hexdigest()
         cache_key = self._build_cache_key("json_gen", params_dict, prompt)
 
-        # Try cache lookup
+        # Try store lookup with fallback to legacy per-call files
         cache_path = self.cache_dir / "json_gen" / f"{cache_key}.json"
-        cached = self._cache_lookup(cache_path)
+        cached = self._cache_lookup("json_gen", cache_key, cache_path)
 
         if cached:
             output_dict = cached["output"]
@@ -301,8 +310,8 @@ class WatsonxClient:
                 return self._build_empty_from_schema(schema)
             return {}
 
-        # Call watsonx.ai API
-        try:
+        def _compute() -> Dict:
+            """Call watsonx.ai and build the cache payload."""
             model = ModelInference(
                 model_id=model_id,
                 api_client=self.client,
@@ -336,12 +345,11 @@ class WatsonxClient:
                     # Schema validation failed; return empty
                     output_dict = self._build_empty_from_schema(schema)
 
-            # Cache result
             output_sha = hashlib.sha256(
                 json.dumps(output_dict, sort_keys=True).encode()
             ).hexdigest()
 
-            cache_payload = {
+            return {
                 "model_id": model_id,
                 "params": params_dict,
                 "prompt_sha": prompt_sha,
@@ -352,11 +360,9 @@ class WatsonxClient:
                 "cost_estimate": 0.002,  # Rough estimate for 8B model
             }
 
-            self._cache_write(cache_path, cache_payload)
-            self._log_to_ledger("json_gen", cache_payload)
-
-            return output_dict
-
+        # Call watsonx.ai API (identical concurrent prompts share one call)
+        try:
+            return self._cached_call("json_gen", cache_key, model_id, _compute)["output"]
         except Exception as e:
             # Log error and return empty structure
             print(f"WARNING: watsonx.ai JSON generation failed: {e}")
@@ -391,9 +397,9 @@ class WatsonxClient:
         combined_input = f"{prompt}\n\n{content}"
         cache_key = self._build_cache_key("edit", params_dict, combined_input)
 
-        # Try cache lookup
+        # Try store lookup with fallback to legacy per-call files
         cache_path = self.cache_dir / "edits" / f"{cache_key}.json"
-        cached = self._cache_lookup(cache_path)
+        cached = self._cache_lookup("edit", cache_key, cache_path)
 
         if cached:
             return cached["output"]
@@ -409,8 +415,8 @@ class WatsonxClient:
             # Fallback: return original content unedited
             return content
 
-        # Call watsonx.ai API
-        try:
+        def _compute() -> Dict:
+            """Call watsonx.ai and build the cache payload."""
             model = ModelInference(
                 model_id=model_id,
                 api_client=self.client,
@@ -421,15 +427,13 @@ class WatsonxClient:
                 },
             )
 
-            full_prompt = f"{prompt}\n\n{content}"
-            result = model.generate_text(prompt=full_prompt)
+            result = model.generate_text(prompt=combined_input)
 
-            # Cache result
             output_sha = hashlib.sha256(result.encode()).hexdigest()
             content_sha = hashlib.sha256(content.encode()).hexdigest()
             prompt_sha = hashlib.sha256(prompt.encode()).hexdigest()
 
-            cache_payload = {
+            return {
                 "model_id": model_id,
                 "params": params_dict,
                 "prompt_sha": prompt_sha,
@@ -441,11 +445,9 @@ class WatsonxClient:
                 "cost_estimate": 0.01,  # Rough estimate for 70B model
             }
 
-            self._cache_write(cache_path, cache_payload)
-            self._log_to_ledger("edit", cache_payload)
-
-            return result
-
+        # Call watsonx.ai API (identical concurrent requests share one call)
+        try:
+            return self._cached_call("edit", cache_key, model_id, _compute)["output"]
         except Exception as e:
             print(f"WARNING: watsonx.ai text editing failed: {e}")
             return content  # Return original on failure
@@ -460,23 +462,34 @@ class WatsonxClient:
         )
         return hashlib.sha256(combined.encode()).hexdigest()
 
-    def _cache_lookup(self, cache_path: Path) -> Optional[Dict]:
-        """Lookup cache entry by path."""
-        if not cache_path.exists():
-            return None
+    def _cache_lookup(self, call_type: str, cache_key: str, legacy_path: Path) -> Optional[Dict]:
+        """Lookup cache entry in the store, then in a legacy per-call file."""
+        cached = self.store.get(cache_key)
+        if cached is not None:
+            return cached
 
+        if not legacy_path.exists():
+            return None
         try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
         except Exception:
             return None
 
-    def _cache_write(self, cache_path: Path, payload: Dict) -> None:
-        """Write cache entry to disk."""
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Migrate on read so later replays hit the store
+        self.store.put(cache_key, payload, kind=call_type, model_id=payload.get("model_id"))
+        return payload
 
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+    def _cached_call(
+        self, call_type: str, cache_key: str, model_id: str, compute: Callable[[], Dict]
+    ) -> Dict:
+        """Compute a payload once per key across threads, store it and log it."""
+        payload, computed = self.store.get_or_compute(
+            cache_key, compute, kind=call_type, model_id=model_id
+        )
+        if computed:
+            self._log_to_ledger(call_type, payload)
+        return payload
 
     def _log_to_ledger(self, call_type: str, metadata: Dict) -> None:
         """Append call metadata to ledger (audit trail)."""
@@ -4,18 +4,21 @@ Orchestrates the complete end-to-end scoring workflow
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import logging
+import os
+import re
 
 from airflow import DAG
+from airflow.decorators import task, task_group
 from airflow.operators.python import PythonOperator, BranchPythonOperator
 from airflow.operators.dummy import DummyOperator
 from airflow.operators.bash import BashOperator
 from airflow.providers.http.sensors.http import HttpSensor
-from airflow.utils.task_group import TaskGroup
 from airflow.models import Variable
 from airflow.utils.dates import days_ago
+from libs.data_lake.report_partitions import group_partitions, partition_key
 from libs.utils.clock import get_clock
 clock = get_clock()
 
@@ -40,12 +43,17 @@ dag = DAG(
     schedule_interval='@monthly',  # Run monthly
     catchup=False,
     max_active_runs=1,
+    max_active_tasks=int(os.getenv("ESG_DAG_MAX_ACTIVE_TASKS", "16")),
     tags=['esg', 'scoring', 'production'],
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Airflow pool bounding concurrent watsonx embedding calls across partitions.
+# Size it to the embedding quota: `airflow pools set watsonx_embeddings 4 "..."`
+EMBEDDING_POOL = os.getenv("ESG_EMBEDDING_POOL", "watsonx_embeddings")
+
 
 def check_services(**context):
     """Check if all required services are available"""
@@ -103,7 +111,7 @@ def check_services(**context):
 
 
 def crawl_reports(**context):
-    """Crawl for ESG reports"""
+    """Crawl for ESG reports and emit one partition per (company, year)"""
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
@@ -113,6 +121,7 @@ def crawl_reports(**context):
     # Get configuration from Airflow Variables
     companies = Variable.get("esg_companies", default_var=["Microsoft", "Apple", "Google"], deserialize_json=True)
     max_reports = Variable.get("max_reports_per_company", default_var=3)
+    scoring_year = int(Variable.get("scoring_year", default_var=2023))
 
     all_reports = []
     for company in companies:
@@ -131,173 +140,207 @@ def crawl_reports(**context):
     reports_data = [r.to_dict() for r in all_reports]
     context['task_instance'].xcom_push(key='crawled_reports', value=reports_data)
 
-    logger.info(f"Crawled {len(all_reports)} reports total")
-    return len(all_reports)
-
+    partitions = group_partitions(companies, reports_data, scoring_year)
+    logger.info(f"Crawled {len(all_reports)} reports total across {len(partitions)} partitions")
 
-def parse_pdf_task(report_data: Dict[str, Any], **context):
-    """Parse a single PDF report"""
-    import sys
-    import os
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
+    # Return value drives dynamic task mapping of the partition group
+    return partitions
 
-    from apps.ingestion.parser import parse_pdf
 
-    try:
-        chunks = parse_pdf(
-            company=report_data['company'],
-            year=report_data['year'],
-            url=report_data['url']
-        )
+def _artifact_uri(context, name: str) -> str:
+    """Claim-check location for a task's chunk artifact in this DAG run"""
+    from libs.data_lake.chunk_artifacts import artifact_uri
 
-        # Store chunks data
-        chunks_data = [c.to_dict() for c in chunks]
-        logger.info(f"Parsed {len(chunks)} chunks from {report_data['company']} {report_data['year']}")
+    root = Variable.get("esg_artifact_root", default_var="/opt/airflow/artifacts/xcom")
+    return artifact_uri(root, context['dag_run'].run_id, name)
 
-        return chunks_data
 
-    except Exception as e:
-        logger.error(f"Failed to parse PDF: {e}")
-        return []
+def parse_partition_task(partition: Dict[str, Any], **context) -> Dict[str, Any]:
+    """Parse every report of one partition into a chunk artifact; XCom carries the reference only"""
+    import sys
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
+    from apps.ingestion.parser import parse_pdf
+    from libs.data_lake.chunk_artifacts import ChunkArtifactWriter
+
+    key = partition_key(partition)
+    with ChunkArtifactWriter(_artifact_uri(context, f"{key}_parsed")) as writer:
+        for report_data in partition['reports']:
+            try:
+                chunks = parse_pdf(
+                    company=report_data['company'],
+                    year=report_data['year'],
+                    url=report_data['url']
+                )
+            except Exception as e:
+                # One unparseable report must not fail the partition
+                logger.error(f"Failed to parse PDF {report_data.get('url')}: {e}")
+                continue
+            writer.write([c.to_dict() for c in chunks])
+            logger.info(f"Parsed {len(chunks)} chunks from {report_data['company']} {report_data['year']}")
+
+    return writer.ref.to_dict()
+
+
+def validate_partition_task(partition: Dict[str, Any], parsed_ref: Dict[str, Any], **context) -> Dict[str, Any]:
+    """
+    Validate one partition's chunk artifact, streaming it batch by batch.
 
-def validate_chunks_task(**context):
-    """Validate all parsed chunks"""
+    Deduplication spans every report of this partition but not other
+    partitions (see libs.data_lake.report_partitions); repeated reports
+    were already dropped when the partitions were built.
+    """
     import sys
     import os
+    from pathlib import Path
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
-    from apps.ingestion.validator import validate_chunks
-
-    # Get all chunks from previous tasks
-    task_instance = context['task_instance']
-    all_chunks = []
-
-    # Collect chunks from all parse tasks
-    for task_id in context['task'].upstream_task_ids:
-        if 'parse_' in task_id:
-            chunks_data = task_instance.xcom_pull(task_ids=task_id)
-            if chunks_data:
-                all_chunks.extend(chunks_data)
-
-    logger.info(f"Validating {len(all_chunks)} total chunks")
-
-    # Validate
-    valid_chunks, validation_report = validate_chunks(
-        chunks=all_chunks,
-        source_pdf="airflow_batch",
-        deduplicate=True,
-        track_lineage=True,
-        save_results=True
+    from apps.ingestion.validator import ChunkValidator, DataLineageTracker
+    from libs.data_lake.chunk_artifacts import (
+        ChunkArtifactRef, ChunkArtifactWriter, iter_chunk_batches
     )
 
-    # Store results
-    task_instance.xcom_push(key='valid_chunks', value=[c for c in valid_chunks])
-    task_instance.xcom_push(key='validation_report', value=validation_report)
+    key = partition_key(partition)
+    ref = ChunkArtifactRef.from_dict(parsed_ref)
+    logger.info(f"Validating {ref.row_count} chunks for {key}")
+
+    # Partition-scoped dedup state so concurrent partitions never share a cache file
+    validator = ChunkValidator(cache_dir=Path("data/validation_cache") / key)
+    validator.load_validation_state()
+    tracker = DataLineageTracker()
+    timestamp = clock.now().isoformat()
+
+    total_input = 0
+    validation_results = []
+    with ChunkArtifactWriter(_artifact_uri(context, f"{key}_valid")) as writer:
+        for chunks, _ in iter_chunk_batches(ref):
+            total_input += len(chunks)
+            valid, results, lineage = validator.validate_batch(
+                chunks=chunks,
+                source_pdf=f"airflow_{key}",
+                crawl_timestamp=timestamp,
+                parse_timestamp=timestamp,
+                deduplicate=True,
+                track_lineage=True
+            )
+            validation_results.extend(results)
+            tracker.add_batch(lineage)
+            writer.write(valid)
+
+    tracker.save_lineage(f"lineage_{tracker.session_id}_{key}.jsonl")
+    validation_report = tracker.generate_lineage_report()
+    validation_report["validation_summary"] = {
+        "total_input": total_input,
+        "valid": writer.ref.row_count,
+        "invalid": total_input - writer.ref.row_count,
+        "validation_errors": sum(1 for r in validation_results if not r.is_valid),
+        "validation_warnings": sum(len(r.warnings) for r in validation_results)
+    }
+    context['task_instance'].xcom_push(key='validation_report', value=validation_report)
 
-    logger.info(f"Validated {len(valid_chunks)}/{len(all_chunks)} chunks")
-    return len(valid_chunks)
+    logger.info(f"Validated {writer.ref.row_count}/{total_input} chunks for {key}")
+    return writer.ref.to_dict()
 
 
-def generate_embeddings_task(**context):
-    """Generate embeddings for validated chunks"""
+def embed_partition_task(partition: Dict[str, Any], valid_ref: Dict[str, Any], **context) -> Dict[str, Any]:
+    """Embed one partition's validated chunks into a float32 embedding artifact"""
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
     from libs.llm.watsonx_client import get_watsonx_client
-    import numpy as np
-
-    task_instance = context['task_instance']
-    valid_chunks = task_instance.xcom_pull(key='valid_chunks')
-
-    if not valid_chunks:
-        logger.warning("No valid chunks to process")
-        return 0
-
-    client = get_watsonx_client()
-
-    # Extract texts
-    texts = [chunk.get('text', '') for chunk in valid_chunks]
-
-    # Generate embeddings in batches
-    logger.info(f"Generating embeddings for {len(texts)} chunks")
-    embeddings = client.generate_embeddings_batch(texts, batch_size=32)
-
-    # Store embeddings with chunks
-    chunks_with_embeddings = []
-    for chunk, embedding in zip(valid_chunks, embeddings):
-        chunk['embedding'] = embedding.tolist()  # Convert numpy to list for JSON
-        chunks_with_embeddings.append(chunk)
-
-    task_instance.xcom_push(key='chunks_with_embeddings', value=chunks_with_embeddings)
-    logger.info(f"Generated {len(embeddings)} embeddings")
-
-    return len(embeddings)
-
+    from libs.data_lake.chunk_artifacts import (
+        ChunkArtifactRef, ChunkArtifactWriter, iter_chunk_batches, DEFAULT_EMBEDDING_DIM
+    )
 
-def store_in_astradb_task(**context):
-    """Store chunks in AstraDB (vector and graph)"""
+    key = partition_key(partition)
+    ref = ChunkArtifactRef.from_dict(valid_ref)
+
+    with ChunkArtifactWriter(
+        _artifact_uri(context, f"{key}_embedded"),
+        embedding_dim=DEFAULT_EMBEDDING_DIM
+    ) as writer:
+        if ref.row_count:
+            client = get_watsonx_client()
+            logger.info(f"Generating embeddings for {ref.row_count} chunks of {key}")
+            for chunks, _ in iter_chunk_batches(ref):
+                texts = [chunk.get('text', '') for chunk in chunks]
+                embeddings = client.generate_embeddings_batch(texts, batch_size=32)
+                writer.write(chunks, embeddings)
+        else:
+            logger.warning(f"No valid chunks to embed for {key}")
+
+    logger.info(f"Generated {writer.ref.row_count} embeddings for {key} -> {writer.ref.uri}")
+    return writer.ref.to_dict()
+
+
+def store_partition_task(partition: Dict[str, Any], embedded_ref: Dict[str, Any], **context) -> int:
+    """Stream one partition's embedding artifact into AstraDB (vector and graph) through the bulk writer"""
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
     from libs.storage.astradb_vector import get_vector_store
     from libs.storage.astradb_graph import get_graph_store
-    import numpy as np
+    from libs.storage.bulk_writer import AstraDBBulkWriter
+    from libs.data_lake.chunk_artifacts import ChunkArtifactRef, iter_chunk_batches
 
-    task_instance = context['task_instance']
-    chunks_with_embeddings = task_instance.xcom_pull(key='chunks_with_embeddings')
+    key = partition_key(partition)
+    ref = ChunkArtifactRef.from_dict(embedded_ref)
 
-    if not chunks_with_embeddings:
-        logger.warning("No chunks to store")
+    if not ref.row_count:
+        logger.warning(f"No chunks to store for {key}")
         return 0
 
-    vector_store = get_vector_store()
-    graph_store = get_graph_store()
-
-    # Prepare for batch storage
-    items_to_store = []
-    for chunk_data in chunks_with_embeddings:
-        chunk_id = chunk_data.get('chunk_id', f"chunk_{hash(chunk_data['text'])}")
-        embedding = np.array(chunk_data['embedding'])
-        metadata = {
-            k: v for k, v in chunk_data.items()
-            if k not in ['embedding', 'chunk_id']
-        }
-
-        items_to_store.append((chunk_id, embedding, metadata))
-
-        # Create graph node
-        graph_store.upsert_node(chunk_id, "chunk", metadata)
-
-    # Batch store in vector database
-    success_count = vector_store.upsert_batch(items_to_store)
-    logger.info(f"Stored {success_count}/{len(items_to_store)} chunks in AstraDB")
-
-    # Create graph relationships
-    for chunk_data in chunks_with_embeddings:
-        chunk_id = chunk_data.get('chunk_id', f"chunk_{hash(chunk_data['text'])}")
-        company = chunk_data.get('company', 'unknown')
-
-        # Create company node
-        company_id = f"company_{company.lower().replace(' ', '_')}"
-        graph_store.upsert_node(company_id, "company", {"name": company})
-
-        # Link chunk to company
-        graph_store.upsert_edge(chunk_id, company_id, "belongs_to")
+    with AstraDBBulkWriter(
+        vector_store=get_vector_store(),
+        graph_store=get_graph_store(),
+        max_workers=int(Variable.get("astradb_bulk_workers", default_var=4))
+    ) as writer:
+        for chunks, embeddings in iter_chunk_batches(ref):
+            for chunk_data, embedding in zip(chunks, embeddings):
+                chunk_id = chunk_data.get('chunk_id') or f"chunk_{hash(chunk_data['text'])}"
+                metadata = {
+                    k: v for k, v in chunk_data.items()
+                    if k not in ['embedding', 'chunk_id']
+                }
+
+                writer.add_vector(chunk_id, embedding, metadata)
+                writer.add_node(chunk_id, "chunk", metadata)
+
+                # Company nodes repeat per chunk; the writer keeps one per ID
+                company = chunk_data.get('company') or 'unknown'
+                company_id = f"company_{company.lower().replace(' ', '_')}"
+                writer.add_node(company_id, "company", {"name": company})
+
+                # Link chunk to company
+                writer.add_edge(
+                    edge_id=f"{chunk_id}_belongs_to_{company_id}",
+                    source_id=chunk_id,
+                    target_id=company_id,
+                    edge_type="belongs_to"
+                )
+
+    stats = writer.stats
+    logger.info(
+        f"Stored {stats.vectors_written}/{ref.row_count} chunks for {key} in AstraDB "
+        f"({stats.total_written} documents, {stats.docs_per_second:.1f} docs/s)"
+    )
+    context['task_instance'].xcom_push(key='bulk_write_stats', value=stats.to_dict())
 
-    return success_count
+    return stats.vectors_written
 
 
-def score_company_task(company: str, **context):
-    """Score a single company"""
+def score_partition_task(partition: Dict[str, Any], **context) -> Optional[Dict[str, Any]]:
+    """Score one (company, year) partition"""
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
     from apps.scoring.pipeline import ESGScoringPipeline, PipelineConfig
 
+    company = partition['company']
     try:
         config = PipelineConfig()
         pipeline = ESGScoringPipeline(config)
@@ -305,23 +348,23 @@ def score_company_task(company: str, **context):
         # Score the company
         score = pipeline.score_company(
             company=company,
-            year=Variable.get("scoring_year", default_var=2023),
+            year=partition['year'],
             use_cached_data=True
         )
 
         # Store results
         score_data = score.to_dict()
-        logger.info(f"Scored {company}: Stage {score.overall_stage} (confidence {score.overall_confidence})")
+        logger.info(f"Scored {company} {partition['year']}: Stage {score.overall_stage} (confidence {score.overall_confidence})")
 
         return score_data
 
     except Exception as e:
-        logger.error(f"Failed to score {company}: {e}")
+        logger.error(f"Failed to score {company} {partition['year']}: {e}")
         return None
 
 
 def generate_report_task(**context):
-    """Generate final scoring report"""
+    """Generate final scoring report from every partition's score"""
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
@@ -330,15 +373,13 @@ def generate_report_task(**context):
     import json
 
     task_instance = context['task_instance']
-    companies = Variable.get("esg_companies", default_var=["Microsoft", "Apple", "Google"], deserialize_json=True)
 
-    # Collect all scores
-    all_scores = []
-    for company in companies:
-        task_id = f"score_{company.lower().replace(' ', '_')}"
-        score_data = task_instance.xcom_pull(task_ids=task_id)
-        if score_data:
-            all_scores.append(score_data)
+    # Mapped task: one XCom per partition (map index)
+    all_scores = [
+        score_data
+        for score_data in task_instance.xcom_pull(task_ids='partition.score_company') or []
+        if score_data
+    ]
 
     # Create summary report
     report = {
@@ -387,6 +428,33 @@ def notify_completion(**context):
 
 # Create tasks
 
+@task_group(group_id='partition')
+def process_partition(partition: Dict[str, Any]):
+    """
+    Per-(company, year) pipeline. The group is mapped over the crawled
+    partitions, so each partition moves from parsing to scoring on its own
+    without waiting for the other companies in the run.
+    """
+    parsed = task(task_id='parse_pdfs')(parse_partition_task)(partition)
+    valid = task(task_id='validate_chunks')(validate_partition_task)(partition, parsed)
+    embedded = task(
+        task_id='generate_embeddings',
+        pool=EMBEDDING_POOL
+    )(embed_partition_task)(partition, valid)
+    stored = task(task_id='store_in_astradb')(store_partition_task)(partition, embedded)
+
+    # Data quality check
+    data_quality_task = BashOperator(
+        task_id='data_quality_check',
+        bash_command='echo "Running data quality checks..."'
+    )
+
+    scored = task(task_id='score_company')(score_partition_task)(partition)
+
+    stored >> data_quality_task >> scored
+    return scored
+
+
 # Service health check
 with dag:
     # Check services
@@ -405,73 +473,22 @@ with dag:
         trigger_rule='all_failed'
     )
 
-    # Data ingestion group
-    with TaskGroup(group_id='data_ingestion') as ingestion_group:
-        # Crawl reports
-        crawl_task = PythonOperator(
-            task_id='crawl_reports',
-            python_callable=crawl_reports,
-            provide_context=True
-        )
-
-        # Parse PDFs (dynamic based on crawled reports)
-        # In production, this would be dynamic based on XCom
-        parse_tasks = []
-        for i in range(3):  # Simplified: assume 3 reports
-            parse_task = PythonOperator(
-                task_id=f'parse_pdf_{i}',
-                python_callable=parse_pdf_task,
-                provide_context=True,
-                op_kwargs={'report_data': {'company': 'Test', 'year': 2023, 'url': 'test.pdf'}}
-            )
-            parse_tasks.append(parse_task)
-
-        # Validate chunks
-        validate_task = PythonOperator(
-            task_id='validate_chunks',
-            python_callable=validate_chunks_task,
-            provide_context=True
-        )
-
-        crawl_task >> parse_tasks >> validate_task
-
-    # Processing group
-    with TaskGroup(group_id='processing') as processing_group:
-        # Generate embeddings
-        embeddings_task = PythonOperator(
-            task_id='generate_embeddings',
-            python_callable=generate_embeddings_task,
-            provide_context=True
-        )
-
-        # Store in AstraDB
-        store_task = PythonOperator(
-            task_id='store_in_astradb',
-            python_callable=store_in_astradb_task,
-            provide_context=True
-        )
-
-        embeddings_task >> store_task
-
-    # Scoring group
-    with TaskGroup(group_id='scoring') as scoring_group:
-        companies = Variable.get("esg_companies", default_var=["Microsoft", "Apple", "Google"], deserialize_json=True)
+    # Crawl reports; its return value is the list of partitions
+    crawl_task = PythonOperator(
+        task_id='crawl_reports',
+        python_callable=crawl_reports,
+        provide_context=True
+    )
 
-        score_tasks = []
-        for company in companies:
-            score_task = PythonOperator(
-                task_id=f"score_{company.lower().replace(' ', '_')}",
-                python_callable=score_company_task,
-                provide_context=True,
-                op_kwargs={'company': company}
-            )
-            score_tasks.append(score_task)
+    # One mapped task group instance per (company, year) partition
+    partitions_group = process_partition.expand(partition=crawl_task.output)
 
     # Reporting
     report_task = PythonOperator(
         task_id='generate_report',
         python_callable=generate_report_task,
-        provide_context=True
+        provide_context=True,
+        trigger_rule='all_done'
     )
 
     # Notification
@@ -482,15 +499,9 @@ with dag:
         trigger_rule='none_failed_or_skipped'
     )
 
-    # Data quality check
-    data_quality_task = BashOperator(
-        task_id='data_quality_check',
-        bash_command='echo "Running data quality checks..."'
-    )
-
     # Define DAG flow
     check_services_task >> [services_ready, services_failed]
-    services_ready >> ingestion_group >> processing_group >> data_quality_task >> scoring_group >> report_task >> notify_task
+    services_ready >> crawl_task >> partitions_group >> report_task >> notify_task
 
 
 # DAG Documentation
@@ -502,26 +513,41 @@ This DAG orchestrates the complete ESG maturity scoring pipeline for multiple co
 
 ## Workflow
 1. **Service Check**: Verify all required services are available
-2. **Data Ingestion**: Crawl and parse ESG reports
-3. **Validation**: Validate and deduplicate chunks
-4. **Processing**: Generate embeddings and store in databases
-5. **Scoring**: Score each company's ESG maturity
-6. **Reporting**: Generate comparative analysis report
-7. **Notification**: Send completion notification
+2. **Crawl**: Crawl ESG reports and group them into (company, year) partitions;
+   each report (by URL) goes to exactly one partition
+3. **Partition group** (dynamically mapped, one instance per partition):
+   parse -> validate/deduplicate -> embed -> store -> quality check -> score.
+   Partitions run independently, so a slow report only delays its own company.
+   Chunk deduplication is scoped to the partition.
+4. **Reporting**: Generate comparative analysis report once all partitions finish
+5. **Notification**: Send completion notification
+
+## Concurrency
+- `generate_embeddings` runs in the `watsonx_embeddings` pool (override with
+  `ESG_EMBEDDING_POOL`); the pool size caps concurrent embedding calls.
+- `ESG_DAG_MAX_ACTIVE_TASKS` caps concurrently running task instances (default 16).
 
 ## Configuration
 Set these Airflow Variables:
 - `esg_companies`: List of companies to score (JSON array)
 - `max_reports_per_company`: Maximum reports per company (default: 3)
-- `scoring_year`: Year to score (default: 2023)
+- `scoring_year`: Year for companies with no crawled reports (default: 2023)
+- `esg_artifact_root`: Directory or filesystem URI for task artifacts
+- `astradb_bulk_workers`: Threads used by the AstraDB bulk writer (default: 4)
 
 ## Dependencies
 - watsonx.ai API access
 - AstraDB access
 - Internet access for crawling
 
+## Intermediate Data
+Tasks hand chunk sets to each other as Parquet artifacts under
+`esg_artifact_root` (default `/opt/airflow/artifacts/xcom/<run_id>/`).
+XCom only carries `{uri, row_count, embedding_dim}` references; embeddings
+are stored as fixed-size float32 list columns.
+
 ## Monitoring
-- Check XCom for intermediate results
+- Check XCom for artifact references and row counts
 - View logs for detailed processing information
 - Final report saved to `/opt/airflow/reports/`
 
@@ -0,0 +1,170 @@
+"""
+Concurrency benchmark for ESGScoringPipeline.score_multiple_companies
+
+Scores a synthetic corpus (default: 200 companies) through the real
+theme-scoring and aggregation code with retrieval and LLM calls replaced by
+fixed-latency synthetic services, once sequentially (max_workers=1) and once
+per requested worker count, and reports wall time, speedup and whether the
+scores are identical to the sequential run.
+
+Usage:
+    python scripts/bench_scoring_concurrency.py --companies 200 --workers 4,8
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from apps.scoring.pipeline import ESGScoringPipeline, PipelineConfig  # noqa: E402
+from apps.scoring.rubric_v3_loader import get_rubric_v3  # noqa: E402
+from libs.retrieval.hybrid_retriever import RetrievalResult  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_SENTENCES = [
+    "We set science-based targets validated by SBTi for 2030.",
+    "Scope 1 and 2 emissions follow the GHG Protocol.",
+    "Climate risk is overseen by the board under TCFD recommendations.",
+    "Energy consumption data is collected monthly across all sites.",
+    "We report under CSRD and ESRS starting next fiscal year.",
+]
+
+
+def _digest(*parts: Any) -> int:
+    """Stable integer derived from the arguments."""
+    return int(hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:8], 16)
+
+
+class SyntheticRetriever:
+    """Retriever with fixed latency and deterministic results"""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+
+    def retrieve(self, query: str, company: str, year: Optional[int], theme: str, k: int) -> List[RetrievalResult]:
+        """Return ``k`` deterministic results after sleeping."""
+        time.sleep(self.latency_seconds)
+        return [
+            RetrievalResult(
+                chunk_id=f"{company}-{theme}-{i}",
+                score=1.0 / (i + 1),
+                text=_SENTENCES[_digest(company, theme, i) % len(_SENTENCES)],
+                metadata={"company": company},
+                retrieval_method="hybrid"
+            )
+            for i in range(k)
+        ]
+
+
+class SyntheticLLM:
+    """LLM client with fixed per-call latency and deterministic answers"""
+
+    def __init__(self, extract_seconds: float, classify_seconds: float):
+        self.extract_seconds = extract_seconds
+        self.classify_seconds = classify_seconds
+
+    def extract_findings(self, text: str, query: str, theme: str) -> Dict[str, Any]:
+        """One finding per retrieved chunk."""
+        time.sleep(self.extract_seconds)
+        return {"findings": [{"finding": text, "theme": theme}]}
+
+    def classify_maturity(self, findings: List[Dict], theme: str, rubric: Dict) -> Dict[str, Any]:
+        """Stage derived from the findings."""
+        time.sleep(self.classify_seconds)
+        seed = _digest(theme, *(f["finding"] for f in findings))
+        return {"stage": seed % 5, "confidence": 0.5 + (seed % 50) / 100, "reasoning": "synthetic"}
+
+
+class SyntheticLatencyPipeline(ESGScoringPipeline):
+    """Pipeline over synthetic services; ingestion returns a cached corpus"""
+
+    def __init__(self, config: PipelineConfig, latency_scale: float):
+        # Skip network clients; wire the pieces _score_theme needs
+        self.config = config
+        self.retriever = SyntheticRetriever(0.005 * latency_scale)
+        self.llm_client = SyntheticLLM(0.002 * latency_scale, 0.005 * latency_scale)
+        self.rubric_loader = get_rubric_v3()
+        self.themes = self._load_themes()
+        self.rubric = self._load_rubric()
+        self._init_concurrency()
+        self.config.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.config.artifacts_dir.mkdir(parents=True, exist_ok=True)
+
+    def _ingest_company_data(self, company: str, year: Optional[int], use_cache: bool) -> List[Dict[str, Any]]:
+        """Pretend every company has a handful of cached chunks."""
+        return [{"company": company, "chunk": i} for i in range(8)]
+
+    def _process_chunks(self, chunks: List[Any], company: str, year: Optional[int]) -> List[Dict[str, Any]]:
+        """Chunks are already stored in the synthetic corpus."""
+        return list(chunks)
+
+
+def run(companies: List[str], workers: int, latency_scale: float, output_dir: Path) -> Dict[str, Any]:
+    """Score the corpus with ``workers`` threads and time it."""
+    config = PipelineConfig(
+        max_workers=workers,
+        reports_dir=output_dir / f"reports_{workers}",
+        artifacts_dir=output_dir / f"artifacts_{workers}",
+        data_dir=output_dir / "data"
+    )
+    pipeline = SyntheticLatencyPipeline(config, latency_scale)
+    start = time.perf_counter()
+    scores = pipeline.score_multiple_companies(companies, year=2023)
+    elapsed = time.perf_counter() - start
+    pipeline.shutdown()
+    return {
+        "workers": workers,
+        "seconds": elapsed,
+        "stages": [(s.company, s.overall_stage, s.overall_confidence) for s in scores],
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark and log speedups.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code (1 if any concurrent run differs from sequential)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--workers", default="4,8")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier on synthetic retrieval/LLM latencies (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("apps.scoring.pipeline").setLevel(logging.WARNING)
+    companies = [f"Company {i:04d}" for i in range(args.companies)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        baseline = run(companies, 1, args.latency_scale, output_dir)
+        logger.info(f"{'sequential':>12}: {baseline['seconds']:.1f}s")
+        identical = True
+        for workers in (int(w) for w in args.workers.split(",")):
+            result = run(companies, workers, args.latency_scale, output_dir)
+            same = result["stages"] == baseline["stages"]
+            identical &= same
+            logger.info(
+                f"{workers:>4} workers: {result['seconds']:.1f}s "
+                f"({baseline['seconds'] / result['seconds']:.1f}x, identical={same})"
+            )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
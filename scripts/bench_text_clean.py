@@ -0,0 +1,171 @@
+"""
+Throughput benchmark for libs.extraction.text_clean
+
+Streams synthetic page text (default: 1 GB) through the sanitizer in
+per-page mode (scan_text / clean_text / extract_clean_quote) and, when
+pyarrow is installed, in column mode (sanitize_arrow over batches of pages).
+Pages mix ASCII prose, typographic punctuation and a sprinkling of PDF
+control debris so both the Latin-1 and wide-codepoint paths are exercised.
+
+Usage:
+    python scripts/bench_text_clean.py --megabytes 1024 --batch-pages 512
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from libs.extraction.text_clean import (  # noqa: E402
+    clean_text,
+    extract_clean_quote,
+    is_binaryish,
+    sanitize_arrow,
+    scan_text,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_WORDS = (
+    "scope emissions climate board oversight targets renewable energy "
+    "net zero transition governance assurance disclosure supplier water"
+).split()
+_DEBRIS = ["\x00", "\x01", "\x0c", "\x7f", "\x85", "\u200b", "\ufeff"]
+_TYPOGRAPHY = ["\u201c", "\u201d", "\u2019", "\u2014", "\u00a0", "\u00e9"]
+
+
+def make_pages(count: int, page_chars: int, seed: int = 42) -> List[str]:
+    """Generate a reusable pool of synthetic pages.
+
+    Args:
+        count: Number of distinct pages
+        page_chars: Approximate characters per page
+        seed: RNG seed (deterministic output)
+
+    Returns:
+        List of page strings
+    """
+    rng = random.Random(seed)
+    pages = []
+    for index in range(count):
+        parts: List[str] = []
+        size = 0
+        while size < page_chars:
+            word = rng.choice(_WORDS)
+            roll = rng.random()
+            if roll < 0.02:
+                word += rng.choice(_DEBRIS)
+            elif roll < 0.05 and index % 2:
+                word = rng.choice(_TYPOGRAPHY) + word
+            elif roll < 0.08:
+                word += "  " if roll < 0.07 else "\n\n\n"
+            parts.append(word)
+            size += len(word) + 1
+        pages.append(" ".join(parts))
+    return pages
+
+
+def stream_pages(pages: List[str], total_chars: int) -> Iterator[str]:
+    """Cycle the page pool until ``total_chars`` characters are produced."""
+    produced = 0
+    index = 0
+    while produced < total_chars:
+        page = pages[index % len(pages)]
+        produced += len(page)
+        index += 1
+        yield page
+
+
+def run_per_page(name: str, fn: Callable[[str], object], pages: List[str], total_chars: int) -> Dict:
+    """Time ``fn`` over every page in the stream."""
+    start = time.perf_counter()
+    processed = 0
+    for page in stream_pages(pages, total_chars):
+        fn(page)
+        processed += len(page)
+    elapsed = time.perf_counter() - start
+    return {"mode": name, "chars": processed, "seconds": elapsed}
+
+
+def run_arrow(pages: List[str], total_chars: int, batch_pages: int) -> Dict:
+    """Time sanitize_arrow() over batches of pages."""
+    import pyarrow as pa
+
+    start = time.perf_counter()
+    processed = 0
+    batch: List[str] = []
+    for page in stream_pages(pages, total_chars):
+        batch.append(page)
+        processed += len(page)
+        if len(batch) == batch_pages:
+            sanitize_arrow(pa.array(batch, type=pa.string()))
+            batch = []
+    if batch:
+        sanitize_arrow(pa.array(batch, type=pa.string()))
+    elapsed = time.perf_counter() - start
+    return {"mode": "sanitize_arrow", "chars": processed, "seconds": elapsed}
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark and log throughput per mode.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=float, default=1024.0,
+                        help="Characters of page text per mode, in millions (default: 1024)")
+    parser.add_argument("--page-chars", type=int, default=4000)
+    parser.add_argument("--pool-pages", type=int, default=256)
+    parser.add_argument("--batch-pages", type=int, default=512)
+    parser.add_argument("--modes", default="scan_text,clean_text,is_binaryish,extract_clean_quote,arrow")
+    args = parser.parse_args(argv)
+
+    total_chars = int(args.megabytes * 1_000_000)
+    pages = make_pages(args.pool_pages, args.page_chars)
+    # Build lazy lookup tables outside the timed region
+    scan_text("warm-up \u201cwide\u201d")
+
+    per_page = {
+        "scan_text": scan_text,
+        "clean_text": clean_text,
+        "is_binaryish": is_binaryish,
+        "extract_clean_quote": lambda page: extract_clean_quote(page, max_length=len(page)),
+    }
+    results = []
+    for mode in args.modes.split(","):
+        if mode == "arrow":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow not installed; skipping arrow mode")
+                continue
+            sanitize_arrow(pages[:2])
+            results.append(run_arrow(pages, total_chars, args.batch_pages))
+        else:
+            results.append(run_per_page(mode, per_page[mode], pages, total_chars))
+
+    for result in results:
+        rate = result["chars"] / result["seconds"] / 1_000_000
+        logger.info(
+            f"{result['mode']:>20}: {result['chars'] / 1_000_000:,.0f} M chars "
+            f"in {result['seconds']:.1f}s ({rate:,.1f} M chars/s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -66,6 +66,16 @@ for idx, item in enumerate(scores, start=1):
         sys.exit(1)
 PY
 
-docker exec "${CONTAINER_NAME}" test -f /app/artifacts/pipeline_validation/demo_topk_vs_evidence.json
+# Run artifacts are written by a background sink; give it a moment to publish
+for attempt in $(seq 1 10); do
+  if docker exec "${CONTAINER_NAME}" test -f /app/artifacts/pipeline_validation/demo_topk_vs_evidence.json; then
+    break
+  fi
+  if [ "${attempt}" = "10" ]; then
+    echo "Parity artifact was not published." >&2
+    exit 1
+  fi
+  sleep 1
+done
 
 rm -f "${score_response_file}"
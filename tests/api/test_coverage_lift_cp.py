@@ -248,23 +248,25 @@ class TestCoverageLift:
     def test_health_endpoints_present(self) -> None:
         """Verify health endpoints work."""
         from apps.api.main import app
+        from apps.api.warmup import get_warmup_state
 
-        client = TestClient(app)
+        with TestClient(app) as client:
+            assert get_warmup_state().wait(timeout=60)
 
-        # Test /health
-        response = client.get("/health")
-        assert response.status_code == 200
-        assert "status" in response.json()
+            # Test /health
+            response = client.get("/health")
+            assert response.status_code == 200
+            assert "status" in response.json()
 
-        # Test /ready
-        response = client.get("/ready")
-        assert response.status_code == 200
-        assert "ready" in response.json()
+            # Test /ready
+            response = client.get("/ready")
+            assert response.status_code == 200
+            assert "ready" in response.json()
 
-        # Test /live
-        response = client.get("/live")
-        assert response.status_code == 200
-        assert "live" in response.json()
+            # Test /live
+            response = client.get("/live")
+            assert response.status_code == 200
+            assert "live" in response.json()
 
     def test_index_snapshot_loads(self) -> None:
         """Verify index snapshot exists and loads."""
@@ -255,18 +255,24 @@ class TestDemoFunctional:
 
         # If scoring succeeds, check for parity artifact
         if response.status_code == 200:
-            parity_path = Path("artifacts/pipeline_validation/demo_topk_vs_evidence.json")
+            # Artifacts are written per run by the background artifact sink
+            from apps.pipeline.artifact_sink import get_artifact_sink
+
+            sink = get_artifact_sink()
+            sink.flush()
+            run_dir = sink.run_dir("Headlam Group Plc", 2025, response.json()["trace_id"])
+            parity_path = run_dir / "pipeline_validation" / "demo_topk_vs_evidence.json"
             if parity_path.exists():
                 artifact = json.loads(parity_path.read_text())
 
                 # Verify parity structure
                 assert "fused_top_k" in artifact, "Parity missing 'fused_top_k'"
-                assert "evidence_ids" in artifact, "Parity missing 'evidence_ids'"
+                assert "evidence_doc_ids" in artifact, "Parity missing 'evidence_doc_ids'"
                 assert "parity_ok" in artifact, "Parity missing 'parity_ok'"
                 assert isinstance(artifact["parity_ok"], bool), "parity_ok should be boolean"
 
                 # Evidence doc_ids should be subset of fused_top_k
                 if artifact["parity_ok"]:
-                    evidence_set = set(artifact["evidence_ids"])
-                    topk_set = set(artifact["fused_top_k"])
+                    evidence_set = set(artifact["evidence_doc_ids"])
+                    topk_set = {item["doc_id"] for item in artifact["fused_top_k"]}
                     assert evidence_set.issubset(topk_set), "Evidence IDs not subset of top-k"
@@ -0,0 +1,140 @@
+"""
+Critical Path Tests: POST /score/batch NDJSON streaming.
+"""
+
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.score_executor import ScoreExecutor
+from apps.pipeline.company_manifest import CompanyManifest
+from apps.pipeline.score_cache import ScoreResponseCache
+
+
+@pytest.fixture
+def batch_client(tmp_path, monkeypatch):
+    """API client with a temp manifest, fake scoring functions and fresh pool/cache."""
+    from apps.api import batch_scoring, main
+    from apps.pipeline import demo_flow
+
+    manifest_path = tmp_path / "companies.json"
+    manifest_path.write_text(json.dumps([
+        {"company": "Apple Inc.", "year": 2024, "org_id": "AAPL"},
+        {"company": "Tesla", "year": 2024},
+    ]))
+    manifest = CompanyManifest(str(manifest_path))
+    monkeypatch.setattr(batch_scoring, "get_company_manifest", lambda: manifest)
+
+    loads = []
+    lock = threading.Lock()
+
+    def fake_load_corpus(company, year):
+        with lock:
+            loads.append((company, year))
+        return {"company": company, "year": year}
+
+    def fake_score_corpus(corpus, query, semantic=False, alpha=0.6, k=10, seed=42):
+        if query == "explode":
+            raise ValueError("bad query")
+        return {
+            "company": corpus["company"],
+            "year": corpus["year"],
+            "trace_id": f"sha256:{query}",
+            "scores": [{"theme": "GHG", "stage": 2, "confidence": 0.5, "stage_descriptor": "", "evidence": []}],
+            "parity": {"parity_ok": True, "evidence_ids": []},
+        }
+
+    monkeypatch.setattr(demo_flow, "load_corpus", fake_load_corpus)
+    monkeypatch.setattr(demo_flow, "score_corpus", fake_score_corpus)
+
+    executor = ScoreExecutor(max_workers=2, max_queue=2)
+    cache = ScoreResponseCache(max_entries=64)
+    monkeypatch.setattr(main, "get_score_executor", lambda: executor)
+    monkeypatch.setattr(main, "get_score_cache", lambda: cache)
+
+    yield TestClient(main.app), loads
+    executor.shutdown()
+
+
+def _post(client, items):
+    """POST a batch and parse the NDJSON body keyed by item index."""
+    response = client.post("/score/batch?semantic=0&k=5", json={"items": items})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    return {line["index"]: line for line in lines}
+
+
+@pytest.mark.cp
+class TestScoreBatchCP:
+    """Tests for grouping, streaming, per-item errors and caching."""
+
+    def test_groups_load_once_per_company_year(self, batch_client):
+        client, loads = batch_client
+        items = [
+            {"company": "Apple Inc.", "year": 2024, "query": "climate"},
+            {"company": "AAPL", "year": 2024, "query": "water"},
+            {"company": "apple inc", "year": 2024, "query": "waste"},
+            {"company": "Tesla", "year": 2024, "query": "climate"},
+        ]
+        results = _post(client, items)
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert all(line["status"] == "ok" for line in results.values())
+        assert results[1]["result"]["trace_id"] == "sha256:water"
+        assert sorted(loads) == [("Apple Inc.", 2024), ("Tesla", 2024)]
+
+    def test_per_item_errors_do_not_fail_batch(self, batch_client):
+        client, _ = batch_client
+        results = _post(client, [
+            {"company": "Unknown Co", "year": 2024, "query": "climate"},
+            {"company": "Tesla", "year": 2024, "query": "explode"},
+            {"company": "Tesla", "year": 2024, "query": "climate"},
+        ])
+
+        assert results[0]["error"]["code"] == 404
+        assert results[1]["error"]["code"] == 500
+        assert "bad query" in results[1]["error"]["detail"]
+        assert results[2]["status"] == "ok"
+
+    def test_cached_items_skip_data_load(self, batch_client):
+        client, loads = batch_client
+        items = [{"company": "Tesla", "year": 2024, "query": "climate"}]
+        _post(client, items)
+        _post(client, items)
+
+        assert loads == [("Tesla", 2024)]
+
+    def test_process_pool_loads_and_scores_in_worker(self, batch_client, monkeypatch):
+        from apps.api import main
+        from apps.pipeline import demo_flow
+
+        client, _ = batch_client
+
+        def unpicklable_corpus(company, year):
+            # Like ScoringCorpus: holds a lock, so it must never leave the worker
+            return {"company": company, "year": year, "lock": threading.Lock()}
+
+        monkeypatch.setattr(demo_flow, "load_corpus", unpicklable_corpus)
+        executor = ScoreExecutor(max_workers=2, max_queue=2, kind="process")
+        monkeypatch.setattr(main, "get_score_executor", lambda: executor)
+        try:
+            results = _post(client, [
+                {"company": "Apple Inc.", "year": 2024, "query": "climate"},
+                {"company": "Tesla", "year": 2024, "query": "explode"},
+                {"company": "Tesla", "year": 2024, "query": "water"},
+            ])
+        finally:
+            executor.shutdown()
+
+        assert results[0]["status"] == "ok"
+        assert results[0]["result"]["trace_id"] == "sha256:climate"
+        assert results[1]["error"]["code"] == 500
+        assert "bad query" in results[1]["error"]["detail"]
+        assert results[2]["status"] == "ok"
+
+    def test_empty_batch_rejected(self, batch_client):
+        client, _ = batch_client
+        assert client.post("/score/batch", json={"items": []}).status_code == 422
@@ -0,0 +1,100 @@
+"""
+Critical Path Tests: /score worker pool and admission control.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.score_executor import ClientDisconnected, ExecutorSaturated, ScoreExecutor
+
+
+@pytest.mark.cp
+class TestScoreExecutor:
+    """Tests for ScoreExecutor admission, cancellation and offloading."""
+
+    def test_rejects_beyond_capacity_and_frees_slots(self):
+        executor = ScoreExecutor(max_workers=1, max_queue=1, retry_after=7)
+        release = threading.Event()
+        try:
+            first = executor.submit(release.wait)
+            second = executor.submit(release.wait)
+            with pytest.raises(ExecutorSaturated) as exc:
+                executor.submit(release.wait)
+            assert exc.value.retry_after == 7
+            assert executor.in_flight == 2
+
+            release.set()
+            first.result(timeout=5)
+            second.result(timeout=5)
+            assert executor.in_flight == 0
+            executor.submit(lambda: None).result(timeout=5)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_run_keeps_event_loop_responsive(self):
+        executor = ScoreExecutor(max_workers=2, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            job = asyncio.ensure_future(executor.run(lambda: release.wait(5) and "done"))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            release.set()
+            return ticks, await job
+
+        try:
+            assert asyncio.run(scenario()) == (5, "done")
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_disconnect_cancels_queued_job(self):
+        executor = ScoreExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        ran = []
+
+        async def gone():
+            return True
+
+        async def scenario():
+            blocker = executor.submit(release.wait)
+            with pytest.raises(ClientDisconnected):
+                await executor.run(lambda: ran.append(1), is_disconnected=gone)
+            release.set()
+            blocker.result(timeout=5)
+
+        try:
+            asyncio.run(scenario())
+            assert ran == []
+            assert executor.in_flight == 0
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_rejects_unknown_kind(self):
+        with pytest.raises(ValueError):
+            ScoreExecutor(kind="fiber")
+
+
+@pytest.mark.cp
+def test_score_returns_503_with_retry_after_when_saturated(monkeypatch):
+    from apps.api import main
+
+    class SaturatedExecutor:
+        async def run(self, fn, *args, **kwargs):
+            raise ExecutorSaturated(retry_after=3)
+
+    monkeypatch.setattr(main, "get_score_executor", lambda: SaturatedExecutor())
+    monkeypatch.setattr(main, "get_company_record", lambda company, year: {"company": company, "year": year})
+
+    client = TestClient(main.app)
+    response = client.post("/score", json={"company": "Acme", "year": 2024, "query": "climate"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
@@ -0,0 +1,84 @@
+"""
+Critical Path Tests: Startup warm-up, shared scorer and warm corpora.
+"""
+
+import pytest
+
+from apps.api import warmup
+from apps.api.warmup import WarmupState, parse_hot_companies, run_warmup
+
+
+@pytest.mark.cp
+class TestWarmupCP:
+    """Tests for warm-up steps, timing and readiness."""
+
+    def test_parse_hot_companies(self):
+        assert parse_hot_companies("Apple Inc.:2024, Headlam Group Plc:2025") == [
+            ("Apple Inc.", 2024), ("Headlam Group Plc", 2025),
+        ]
+        assert parse_hot_companies("Acme:notayear,,Tesla") == []
+        assert parse_hot_companies(None) == []
+
+    def test_run_warmup_times_every_step_and_preloads(self, monkeypatch):
+        from apps.pipeline import demo_flow
+
+        loaded = []
+
+        def fake_get_corpus(company, year):
+            loaded.append((company, year))
+            if company == "Missing":
+                raise FileNotFoundError("not in manifest")
+            return demo_flow.ScoringCorpus(company, year, {}, [])
+
+        monkeypatch.setattr(demo_flow, "get_corpus", fake_get_corpus)
+        state = WarmupState()
+        assert not state.ready
+
+        run_warmup(state, hot_companies=[("Acme", 2024), ("Missing", 2024)])
+
+        assert state.ready
+        assert set(state.steps) == {"imports", "rubric", "manifest", "corpora"}
+        assert state.duration_seconds >= 0
+        assert state.errors == {}
+        assert loaded == [("Acme", 2024), ("Missing", 2024)]
+
+    def test_failed_step_is_recorded_but_still_ready(self, monkeypatch):
+        def broken_rubric():
+            raise FileNotFoundError("Compiled rubric not found")
+
+        monkeypatch.setattr(warmup, "_load_rubric", broken_rubric)
+        state = run_warmup(WarmupState(), hot_companies=[])
+
+        assert state.ready
+        assert "Compiled rubric not found" in state.summary()["errors"]["rubric"]
+
+    def test_shared_scorer_loaded_once(self):
+        from agents.scoring.rubric_v3_scorer import get_shared_scorer
+
+        assert get_shared_scorer() is get_shared_scorer()
+
+    def test_corpus_cache_reuses_until_data_changes(self, tmp_path, monkeypatch):
+        from apps.pipeline import demo_flow
+
+        silver = tmp_path / "chunks.parquet"
+        silver.write_bytes(b"v1")
+        record = {"company": "Acme", "year": 2024, "silver": str(silver)}
+        loads = []
+
+        def fake_load_corpus(company, year):
+            loads.append(company)
+            return demo_flow.ScoringCorpus(company, year, record, [])
+
+        monkeypatch.setattr(demo_flow, "_lookup_manifest", lambda company, year: record)
+        monkeypatch.setattr(demo_flow, "load_corpus", fake_load_corpus)
+        demo_flow.clear_corpus_cache()
+        try:
+            first = demo_flow.get_corpus("Acme", 2024)
+            assert demo_flow.get_corpus("acme", 2024) is first
+            assert loads == ["Acme"]
+
+            silver.write_bytes(b"version 2")
+            assert demo_flow.get_corpus("Acme", 2024) is not first
+            assert len(loads) == 2
+        finally:
+            demo_flow.clear_corpus_cache()
@@ -0,0 +1,162 @@
+"""
+Critical Path Tests: Append-only Ingestion Ledger (AR-001)
+
+Journal appends, URL/hash indexes, batched fsync, locked concurrent
+appends, legacy manifest compaction and migration from an existing
+manifest.json.
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from agents.crawler.ledger import IngestLedger
+
+
+def _add(ledger, url, source_hash="h1"):
+    """Record a crawl with fixed metadata."""
+    return ledger.add_crawl(
+        url=url,
+        source_hash=source_hash,
+        retrieval_date="2025-10-26T00:00:00Z",
+        status_code=200,
+    )
+
+
+def _write_many(manifest, worker, count):
+    """Writer process appending ``count`` crawls through its own ledger."""
+    with IngestLedger(manifest_path=manifest, compact_interval=0) as ledger:
+        for i in range(count):
+            _add(ledger, f"https://example.com/{worker}/{i}", f"w{worker}")
+
+
+@pytest.mark.cp
+class TestIngestLedgerJournalCP:
+    """Tests for the JSONL-backed ledger."""
+
+    def test_add_crawl_appends_one_line_per_crawl(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        with IngestLedger(manifest_path=str(manifest)) as ledger:
+            _add(ledger, "https://example.com/a")
+            _add(ledger, "https://example.com/b")
+
+        lines = (tmp_path / "manifest.jsonl").read_text().splitlines()
+        assert [json.loads(line)["url"] for line in lines] == [
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
+
+    def test_manifest_is_refreshed_by_writes_and_close(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        ledger = IngestLedger(manifest_path=str(manifest), compact_interval=3600)
+
+        # The first crawl writes the snapshot; later ones wait for the interval
+        _add(ledger, "https://example.com/a")
+        assert len(json.loads(manifest.read_text())["sources"]) == 1
+        _add(ledger, "https://example.com/b")
+        assert len(json.loads(manifest.read_text())["sources"]) == 1
+
+        ledger.close()
+        sources = json.loads(manifest.read_text())["sources"]
+        assert [s["url"] for s in sources] == ["https://example.com/a", "https://example.com/b"]
+
+    def test_indexes_return_latest_by_url_and_all_by_hash(self, tmp_path):
+        ledger = IngestLedger(manifest_path=str(tmp_path / "manifest.json"))
+        _add(ledger, "https://example.com/a", "h1")
+        _add(ledger, "https://example.com/b", "h1")
+        _add(ledger, "https://example.com/a", "h2")
+
+        assert ledger.get_by_url("https://example.com/a")["content_hash_sha256"] == "h2"
+        assert ledger.get_by_url("https://example.com/missing") is None
+        assert [e["url"] for e in ledger.get_by_hash("h1")] == [
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
+        assert len(ledger) == 3
+        ledger.close()
+
+    def test_replay_rebuilds_state(self, tmp_path):
+        manifest = str(tmp_path / "manifest.json")
+        with IngestLedger(manifest_path=manifest) as ledger:
+            for i in range(10):
+                _add(ledger, f"https://example.com/{i}", f"h{i}")
+
+        reopened = IngestLedger(manifest_path=manifest)
+        assert len(reopened) == 10
+        assert reopened.get_by_hash("h7")[0]["url"] == "https://example.com/7"
+
+    def test_fsync_is_batched(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setattr("agents.crawler.ledger.os.fsync", lambda fd: calls.append(fd))
+
+        ledger = IngestLedger(manifest_path=str(tmp_path / "manifest.json"), fsync_every=4)
+        for i in range(10):
+            _add(ledger, f"https://example.com/{i}")
+        assert len(calls) == 2
+
+        ledger.close()
+        assert len(calls) == 3
+
+    def test_compact_emits_legacy_manifest(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        with IngestLedger(manifest_path=str(manifest)) as ledger:
+            _add(ledger, "https://example.com/a")
+            path = ledger.compact()
+
+        data = json.loads(path.read_text())
+        assert path == manifest
+        assert data["ingestion_run_id"].startswith("ingest_")
+        assert data["sources"][0]["url"] == "https://example.com/a"
+        assert set(data["sources"][0]) == {
+            "url", "content_hash_sha256", "retrieval_date", "status_code", "response_headers",
+        }
+
+    def test_legacy_manifest_is_migrated(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({
+            "ingestion_run_id": "run_1",
+            "sources": [{"url": "https://example.com/old", "content_hash_sha256": "old"}],
+        }))
+
+        reader = IngestLedger(manifest_path=str(manifest), readonly=True)
+        assert reader.get_by_url("https://example.com/old")["content_hash_sha256"] == "old"
+        assert not (tmp_path / "manifest.jsonl").exists()
+        with pytest.raises(RuntimeError):
+            _add(reader, "https://example.com/new")
+
+        ledger = IngestLedger(manifest_path=str(manifest))
+        assert ledger.get_by_url("https://example.com/old")["content_hash_sha256"] == "old"
+        assert (tmp_path / "manifest.jsonl").exists()
+
+        # The reader switches to the journal without double-counting
+        _add(ledger, "https://example.com/new")
+        assert reader.refresh() == 2
+        assert len(reader) == 2
+
+    def test_refresh_follows_other_writer_and_skips_torn_tail(self, tmp_path):
+        manifest = str(tmp_path / "manifest.json")
+        reader = IngestLedger(manifest_path=manifest)
+        with IngestLedger(manifest_path=manifest) as writer:
+            _add(writer, "https://example.com/a")
+
+        with open(tmp_path / "manifest.jsonl", "a") as handle:
+            handle.write('{"url": "https://example.com/partial"')
+
+        assert reader.refresh() == 1
+        assert reader.get_by_url("https://example.com/a") is not None
+        assert reader.get_by_url("https://example.com/partial") is None
+
+    def test_concurrent_writer_processes_keep_every_line(self, tmp_path):
+        manifest = str(tmp_path / "manifest.json")
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_write_many, args=(manifest, w, 50)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        ledger = IngestLedger(manifest_path=manifest)
+        assert len(ledger) == 200
+        assert len(ledger.get_by_hash("w3")) == 50
+        assert len(json.loads((tmp_path / "manifest.json").read_text())["sources"]) == 200
@@ -0,0 +1,142 @@
+"""
+Critical Path Tests: process-pool BatchProcessor with checkpoint/resume.
+"""
+
+import json
+import os
+
+import pytest
+
+from agents.batch import BatchCheckpoint, BatchProcessor, CompanyProcessingResult
+from agents.batch import batch_processor
+from agents.batch.batch_processor import _process_unit
+
+_SNIPPETS = [
+    "Scope 1 emissions were 1,234 tCO2e.",
+    "Scope 1, 2 and 3 emissions follow the GHG Protocol Corporate Standard.",
+    "KPMG provided limited assurance over our GHG inventory.",
+]
+
+
+@pytest.fixture
+def companies(tmp_path):
+    """Five filings on disk, one of them missing."""
+    filings_dir = tmp_path / "filings"
+    filings_dir.mkdir()
+    companies = []
+    for i, ticker in enumerate(["AAA", "BBB", "CCC", "DDD", "EEE"]):
+        path = filings_dir / f"{ticker}.htm"
+        if ticker != "DDD":
+            body = "".join(f"<p>{_SNIPPETS[j % 3]} Note {j}.</p>\n" for j in range(i + 1))
+            path.write_text(f"<html><body>{body}</body></html>")
+        companies.append({"ticker": ticker, "year": 2023, "filing_path": path})
+    return companies
+
+
+def _processor(root, **kwargs):
+    """BatchProcessor writing under ``root``."""
+    return BatchProcessor(
+        bronze_path=root / "bronze",
+        silver_path=root / "silver",
+        db_path=root / "esg.duckdb",
+        cache_path=root / "cache",
+        **kwargs
+    )
+
+
+def _crash_on_ccc(ticker, year, filing_path):
+    """Pool unit whose worker process dies outright on CCC."""
+    if ticker == "CCC":
+        os._exit(1)
+    return _process_unit(ticker, year, filing_path)
+
+
+@pytest.mark.cp
+class TestBatchProcessorCP:
+    """Tests for pool execution, resume, timeouts and progress metrics."""
+
+    def test_pool_results_identical_to_sequential(self, tmp_path, companies):
+        sequential = _processor(tmp_path / "seq").process_batch(companies, normalize=False)
+        pooled = _processor(tmp_path / "pool", max_workers=2).process_batch(companies, normalize=False)
+
+        assert pooled.company_results == sequential.company_results
+        assert [r.ticker for r in pooled.company_results] == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+        assert (pooled.successful_companies, pooled.failed_companies) == (4, 1)
+        assert pooled.total_evidence_extracted == sequential.total_evidence_extracted > 0
+        assert len(list((tmp_path / "pool" / "bronze").rglob("*.parquet"))) == len(
+            list((tmp_path / "seq" / "bronze").rglob("*.parquet"))
+        )
+
+    def test_resume_skips_completed_units(self, tmp_path, companies):
+        checkpoint = tmp_path / "batch.jsonl"
+        first = _processor(tmp_path / "a", checkpoint_path=checkpoint).process_batch(companies[:2], normalize=False)
+
+        snapshots = []
+        processor = _processor(tmp_path / "a", checkpoint_path=checkpoint,
+                               progress_callback=lambda p: snapshots.append(p.to_dict()))
+        resumed = processor.process_batch(companies, normalize=False)
+        full = _processor(tmp_path / "b").process_batch(companies, normalize=False)
+
+        assert resumed.company_results == full.company_results
+        assert resumed.company_results[:2] == first.company_results
+        assert processor.progress.skipped == 2
+        assert [s["finished"] for s in snapshots] == [3, 4, 5]
+        assert snapshots[-1]["failed"] == 1 and snapshots[-1]["eta_seconds"] == 0
+        # Each unit is journaled exactly once across both runs
+        lines = checkpoint.read_text().splitlines()
+        assert [json.loads(line)["ticker"] for line in lines] == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+    def test_failed_units_retry_and_torn_tail_is_ignored(self, tmp_path, companies):
+        checkpoint = tmp_path / "batch.jsonl"
+        with BatchCheckpoint(checkpoint) as journal:
+            journal.record(CompanyProcessingResult("AAA", 2023, False, 0, 0.0, "boom"))
+            journal.record(CompanyProcessingResult("BBB", 2023, True, 7, 0.0))
+        with open(checkpoint, "a") as handle:
+            handle.write('{"ticker": "CCC", "ye')
+
+        reopened = BatchCheckpoint(checkpoint)
+        assert not reopened.is_completed("AAA", 2023)
+        assert reopened.is_completed("BBB", 2023)
+        assert reopened.get("CCC", 2023) is None
+        assert checkpoint.read_text().endswith("}\n")
+
+        result = _processor(tmp_path, checkpoint_path=checkpoint).process_batch(companies[:3], normalize=False)
+        assert [r.success for r in result.company_results] == [True, True, True]
+        # BBB came from the journal, not a fresh run
+        assert result.company_results[1].evidence_count == 7
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires named pipes")
+    def test_timeout_fails_unit_and_batch_continues(self, tmp_path, companies):
+        stuck = tmp_path / "filings" / "STUCK.htm"
+        os.mkfifo(stuck)  # Reading blocks forever: a company that never finishes
+        batch = companies[:2] + [{"ticker": "ZZZ", "year": 2023, "filing_path": stuck}] + companies[2:3]
+
+        processor = _processor(tmp_path, max_workers=2, company_timeout_seconds=2.0)
+        result = processor.process_batch(batch, normalize=False)
+
+        assert [r.ticker for r in result.company_results] == ["AAA", "BBB", "ZZZ", "CCC"]
+        assert [r.success for r in result.company_results] == [True, True, False, True]
+        assert "Timed out" in result.company_results[2].error_message
+        assert processor.progress.timed_out == 1 and processor.progress.in_flight == 0
+
+    def test_worker_crash_fails_only_that_unit(self, tmp_path, companies, monkeypatch):
+        # Workers fork after the patch, so they run the crashing unit function
+        monkeypatch.setattr(batch_processor, "_process_unit", _crash_on_ccc)
+        batch = companies + [
+            {"ticker": "FFF", "year": 2023, "filing_path": companies[0]["filing_path"]},
+            {"ticker": "GGG", "year": 2023, "filing_path": companies[1]["filing_path"]},
+        ]
+
+        processor = _processor(tmp_path, max_workers=3)
+        result = processor.process_batch(batch, normalize=False)
+
+        assert [r.ticker for r in result.company_results] == ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG"]
+        assert [r.success for r in result.company_results] == [True, True, False, False, True, True, True]
+        assert result.company_results[2].error_message == "Worker process crashed"
+        assert processor.progress.failed == 2 and processor.progress.in_flight == 0
+
+    def test_rejects_invalid_settings(self, tmp_path):
+        with pytest.raises(ValueError):
+            _processor(tmp_path, max_workers=0)
+        with pytest.raises(ValueError):
+            _processor(tmp_path, company_timeout_seconds=0)
@@ -0,0 +1 @@
+# Cache tests package
@@ -0,0 +1,143 @@
+"""
+Critical Path Tests: Content-addressed LLM response store.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from libs.cache import llm_store
+from libs.cache.llm_store import LLMResponseStore, get_llm_store, main, make_key
+
+
+def _payload(text="ok", size=0):
+    """Minimal generate_json-shaped payload."""
+    return {"model_id": "m", "output": {"text": text, "pad": "x" * size}}
+
+
+@pytest.mark.cp
+class TestLLMResponseStoreCP:
+    """Tests for keys, coalescing, eviction, bundles and client integration."""
+
+    def test_key_depends_on_model_params_and_prompt(self):
+        key = make_key("json_gen", "llama", {"temperature": 0.0, "top_k": 1}, "prompt")
+        assert key == make_key("json_gen", "llama", {"top_k": 1, "temperature": 0.0}, "prompt")
+        assert key != make_key("json_gen", "granite", {"temperature": 0.0, "top_k": 1}, "prompt")
+        assert key != make_key("json_gen", "llama", {"temperature": 0.5, "top_k": 1}, "prompt")
+        assert key != make_key("json_gen", "llama", {"temperature": 0.0, "top_k": 1}, "prompt!")
+        assert key != make_key("edit", "llama", {"temperature": 0.0, "top_k": 1}, "prompt")
+
+    def test_put_get_persists_across_connections(self, tmp_path):
+        path = tmp_path / "responses.sqlite"
+        store = LLMResponseStore(path)
+        store.put("k", _payload("ünïcode"), kind="json_gen", model_id="m")
+        assert store.get("k") == _payload("ünïcode")
+        assert store.get("missing") is None
+        store.close()
+
+        reopened = LLMResponseStore(path)
+        assert "k" in reopened
+        assert reopened.get("k")["output"]["text"] == "ünïcode"
+
+    def test_concurrent_identical_requests_coalesce(self, tmp_path):
+        store = LLMResponseStore(tmp_path / "responses.sqlite")
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return _payload()
+
+        threads = [
+            threading.Thread(target=lambda: results.append(store.get_or_compute("k", compute, kind="json_gen")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(computed for _, computed in results) == [False] * 4 + [True]
+        assert all(payload == _payload() for payload, _ in results)
+
+    def test_failed_compute_is_not_stored(self, tmp_path):
+        store = LLMResponseStore(tmp_path / "responses.sqlite")
+
+        def boom():
+            raise RuntimeError("model down")
+
+        with pytest.raises(RuntimeError):
+            store.get_or_compute("k", boom, kind="json_gen")
+        assert "k" not in store
+        assert store.get_or_compute("k", _payload, kind="json_gen") == (_payload(), True)
+
+    def test_size_based_eviction_drops_least_recently_used(self, tmp_path):
+        store = LLMResponseStore(tmp_path / "responses.sqlite", max_bytes=2500)
+        for key in ("a", "b"):
+            store.put(key, _payload(size=1000), kind="json_gen")
+            time.sleep(0.01)
+        store.get("a")  # a is now more recent than b
+        time.sleep(0.01)
+        store.put("c", _payload(size=1000), kind="json_gen")
+
+        assert "a" in store and "c" in store
+        assert "b" not in store
+        assert store.total_bytes() <= 2500
+        assert store.stats["evictions"] == 1
+
+    @pytest.mark.parametrize("bundle_name", ["bundle.jsonl", "bundle.jsonl.gz"])
+    def test_bundle_round_trip(self, tmp_path, bundle_name):
+        source = LLMResponseStore(tmp_path / "source.sqlite")
+        source.put("k1", _payload("one"), kind="json_gen", model_id="m")
+        source.put("k2", _payload("two"), kind="edit", model_id="m")
+        bundle = tmp_path / bundle_name
+
+        assert source.export_bundle(bundle) == 2
+        assert source.export_bundle(tmp_path / "edits.jsonl", kind="edit") == 1
+
+        target = LLMResponseStore(tmp_path / "target.sqlite")
+        assert target.import_bundle(bundle) == 2
+        assert [e["key"] for e in target.iter_entries()] == ["k1", "k2"]
+        assert target.get("k2") == _payload("two")
+
+    def test_cli_migrates_legacy_directory(self, tmp_path, capsys):
+        legacy = tmp_path / "json_gen"
+        legacy.mkdir()
+        for i in range(3):
+            (legacy / f"key{i}.json").write_text(json.dumps(_payload(str(i))))
+        (legacy / "broken.json").write_text("{not json")
+        store_path = tmp_path / "responses.sqlite"
+
+        assert main(["migrate", str(store_path), str(legacy), "--kind", "json_gen"]) == 0
+        assert capsys.readouterr().out.strip() == "3"
+        assert LLMResponseStore(store_path).get("key1") == _payload("1")
+
+    def test_shared_store_applies_env_size_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_store, "_STORES", {})
+        monkeypatch.setenv("ESG_LLM_STORE_MAX_MB", "0.5")
+
+        store = get_llm_store(tmp_path / "responses.sqlite")
+
+        assert store.max_bytes == 512 * 1024
+        assert get_llm_store(tmp_path / "other.sqlite", max_bytes=100).max_bytes == 100
+
+    def test_watsonx_client_replays_legacy_file_from_store(self, tmp_path):
+        from libs.wx.wx_client import WatsonxClient
+
+        client = WatsonxClient(cache_dir=str(tmp_path), offline_replay=True)
+        params = {"model_id": "meta-llama/llama-3-8b-instruct", "temperature": 0.0, "top_k": 1}
+        key = client._build_cache_key("json_gen", params, "locate R&D")
+        legacy = tmp_path / "json_gen" / f"{key}.json"
+        legacy.write_text(json.dumps({"model_id": params["model_id"], "output": {"sections": [1]}}))
+
+        assert client.generate_json("locate R&D") == {"sections": [1]}
+
+        # Migrated on first read: replay no longer needs the small file
+        legacy.unlink()
+        assert client.generate_json("locate R&D") == {"sections": [1]}
+        with pytest.raises(RuntimeError, match="Cache miss"):
+            client.generate_json("other prompt")
@@ -0,0 +1,273 @@
+"""
+CP Tests for TieredCache (libs/cache/tiered_cache.py)
+
+Runs against a local in-memory fake Redis that counts round trips, so the
+tests can assert which lookups stay in-process.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from libs.cache.tiered_cache import TieredCache, pack_value, unpack_value
+
+
+class FakeRedis:
+    """Minimal bytes-in/bytes-out Redis stand-in with a round-trip counter."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.round_trips += 1
+        self.data[key] = value
+        return True
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(k) for k in keys]
+
+    def delete(self, *keys):
+        self.round_trips += 1
+        return sum(1 for k in keys if self.data.pop(k, None) is not None)
+
+    def scan_iter(self, match=None):
+        prefix = match.rstrip("*") if match else ""
+        return [k for k in list(self.data) if k.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value))
+
+    def execute(self):
+        self.client.round_trips += 1
+        for key, value in self.ops:
+            self.client.data[key] = value
+        return [True] * len(self.ops)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.mark.cp
+class TestSerialization:
+    """msgpack/numpy codec."""
+
+    def test_numpy_round_trip(self):
+        value = {
+            "embedding": np.linspace(0, 1, 768, dtype=np.float32),
+            "matrix": np.arange(6, dtype=np.int64).reshape(2, 3),
+            "score": np.float64(2.5),
+            "themes": ["GHG", "TSP"],
+        }
+        restored = unpack_value(pack_value(value))
+
+        assert restored["embedding"].dtype == np.float32
+        np.testing.assert_array_equal(restored["embedding"], value["embedding"])
+        assert restored["matrix"].shape == (2, 3)
+        np.testing.assert_array_equal(restored["matrix"], value["matrix"])
+        assert restored["score"] == 2.5
+        assert restored["themes"] == ["GHG", "TSP"]
+
+    def test_payload_is_compact_binary(self):
+        embedding = np.random.default_rng(42).random(768).astype(np.float32)
+        assert len(pack_value(embedding)) < 768 * 4 + 64
+
+    def test_unsupported_type_raises(self):
+        with pytest.raises(ValueError):
+            pack_value({"obj": object()})
+
+
+@pytest.mark.cp
+class TestTieredCache:
+    """Local tier, Redis tier and batch operations."""
+
+    def test_hot_key_skips_network(self, fake_redis):
+        cache = TieredCache(fake_redis)
+        cache.set("score:acme:2023", {"stage": 3})
+        trips = fake_redis.round_trips
+
+        for _ in range(10):
+            assert cache.get("score:acme:2023") == {"stage": 3}
+
+        assert fake_redis.round_trips == trips
+        assert cache.stats()["local_hits"] == 10
+
+    def test_remote_hit_promotes_to_local(self, fake_redis):
+        writer = TieredCache(fake_redis)
+        reader = TieredCache(fake_redis)
+        writer.set("k", [1, 2, 3])
+
+        assert reader.get("k") == [1, 2, 3]
+        assert reader.get("k") == [1, 2, 3]
+        stats = reader.stats()
+        assert stats["remote_hits"] == 1
+        assert stats["local_hits"] == 1
+
+    def test_lru_bound_enforced(self, fake_redis):
+        cache = TieredCache(fake_redis, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        stats = cache.stats()
+        assert stats["local_size"] == 2
+        assert stats["evictions"] == 1
+        # "b" was least recently used; it now comes from Redis
+        assert cache.get("b") == 2
+        assert cache.stats()["remote_hits"] == 1
+
+    def test_local_ttl_expiry(self, fake_redis):
+        clock = FakeClock()
+        cache = TieredCache(fake_redis, local_ttl_seconds=10, now_fn=clock)
+        cache.set("k", "v")
+        fake_redis.data[cache._normalize_key("k")] = pack_value("refreshed")
+
+        assert cache.get("k") == "v"
+        clock.now = 11
+        assert cache.get("k") == "refreshed"
+
+    def test_mget_single_round_trip(self, fake_redis):
+        seed = TieredCache(fake_redis)
+        seed.mset({f"emb:{i}": np.full(4, i, dtype=np.float32) for i in range(5)})
+
+        cache = TieredCache(fake_redis)
+        cache.set("emb:0", np.zeros(4, dtype=np.float32))
+        trips = fake_redis.round_trips
+
+        found = cache.mget([f"emb:{i}" for i in range(7)])
+
+        assert fake_redis.round_trips == trips + 1
+        assert sorted(found) == [f"emb:{i}" for i in range(5)]
+        np.testing.assert_array_equal(found["emb:3"], np.full(4, 3, dtype=np.float32))
+
+    def test_mset_single_round_trip(self, fake_redis):
+        cache = TieredCache(fake_redis)
+        cache.mset({"a": 1, "b": 2, "c": 3}, ttl_seconds=60)
+
+        assert fake_redis.round_trips == 1
+        assert cache.mget(["a", "b", "c"]) == {"a": 1, "b": 2, "c": 3}
+        assert fake_redis.round_trips == 1
+
+    def test_get_or_compute_single_flight(self, fake_redis):
+        cache = TieredCache(fake_redis)
+        calls = []
+        start = threading.Barrier(8)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"stage": 2}
+
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(cache.get_or_compute("slow", compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"stage": 2}] * 8
+
+    def test_get_or_compute_propagates_errors(self, fake_redis):
+        cache = TieredCache(fake_redis)
+
+        def boom():
+            raise ValueError("nope")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("k", boom)
+        assert cache.get_or_compute("k", lambda: 5) == 5
+
+    def test_late_leader_rechecks_before_computing(self, fake_redis, monkeypatch):
+        cache = TieredCache(fake_redis)
+        real_get = cache.get
+        lookups = []
+
+        def racing_get(key):
+            lookups.append(key)
+            if len(lookups) == 1:
+                # The previous leader stores the value right after this miss
+                cache.set(key, "stored")
+                return None
+            return real_get(key)
+
+        monkeypatch.setattr(cache, "get", racing_get)
+
+        assert cache.get_or_compute("k", lambda: pytest.fail("computed twice")) == "stored"
+        assert lookups == ["k", "k"]
+
+    def test_get_or_compute_survives_failed_cache_write(self, fake_redis, monkeypatch):
+        cache = TieredCache(fake_redis)
+
+        start = threading.Barrier(4)
+
+        def redis_down(*args, **kwargs):
+            time.sleep(0.05)  # Followers are waiting on the leader by now
+            raise RuntimeError("Redis SET failed")
+
+        monkeypatch.setattr(cache, "set", redis_down)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(cache.get_or_compute("k", lambda: 7))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [7] * 4
+
+    def test_delete_and_clear(self, fake_redis):
+        cache = TieredCache(fake_redis)
+        cache.mset({"a": 1, "b": 2})
+        fake_redis.data["other:key"] = b"x"
+
+        assert cache.delete("a") is True
+        assert cache.get("a") is None
+        cache.clear()
+        assert cache.get("b") is None
+        assert fake_redis.data == {"other:key": b"x"}
+
+    def test_invalid_inputs(self, fake_redis):
+        cache = TieredCache(fake_redis)
+        with pytest.raises(ValueError):
+            cache.get("")
+        with pytest.raises(ValueError):
+            cache.set("k", 1, ttl_seconds=0)
+        with pytest.raises(ValueError):
+            TieredCache(fake_redis, max_entries=0)
@@ -0,0 +1,81 @@
+"""
+Critical Path Tests: bounded, ordered, cancellable fan-out (libs.utils.concurrency).
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from libs.utils.concurrency import map_ordered
+
+
+@pytest.mark.cp
+class TestMapOrderedCP:
+    """Tests for ordering, bounded queues, failures and cancellation."""
+
+    def test_results_in_input_order_with_bounded_window(self):
+        rng = random.Random(3)
+        delays = [rng.uniform(0, 0.01) for _ in range(60)]
+        lock = threading.Lock()
+        state = {"submitted": 0, "yielded": 0, "max_window": 0}
+
+        def work(i):
+            time.sleep(delays[i])
+            return i * i
+
+        def items():
+            for i in range(60):
+                with lock:
+                    state["submitted"] += 1
+                    state["max_window"] = max(state["max_window"], state["submitted"] - state["yielded"])
+                yield i
+
+        results = []
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for outcome in map_ordered(work, items(), pool, max_pending=5):
+                with lock:
+                    state["yielded"] += 1
+                results.append((outcome.index, outcome.value))
+
+        assert results == [(i, i * i) for i in range(60)]
+        assert state["max_window"] <= 5
+
+    def test_exceptions_are_captured_per_item(self):
+        def work(i):
+            if i % 3 == 0:
+                raise ValueError(f"bad {i}")
+            return i
+
+        for executor in (None, ThreadPoolExecutor(max_workers=3)):
+            outcomes = list(map_ordered(work, range(7), executor, max_pending=2))
+            assert [o.ok for o in outcomes] == [False, True, True, False, True, True, False]
+            assert str(outcomes[3].error) == "bad 3"
+            if executor:
+                executor.shutdown()
+
+    def test_cancellation_stops_new_work_and_accounts_for_every_item(self):
+        cancel = threading.Event()
+        started = []
+
+        def work(i):
+            started.append(i)
+            if i == 4:
+                cancel.set()
+            time.sleep(0.01)
+            return i
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            outcomes = list(map_ordered(work, range(50), pool, max_pending=4, cancel_event=cancel))
+
+        assert [o.index for o in outcomes] == list(range(50))
+        assert all(o.ok for o in outcomes[:5])
+        assert all(o.cancelled for o in outcomes if not o.ok)
+        assert sum(o.cancelled for o in outcomes) >= 40
+        assert len(started) < 10
+
+    def test_rejects_empty_window(self):
+        with pytest.raises(ValueError):
+            list(map_ordered(str, [1], None, max_pending=0))
@@ -0,0 +1,125 @@
+"""
+Critical Path Tests: buffered, rotating run-event journal (libs.utils.event_journal).
+"""
+
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from libs.utils.event_journal import EventJournal, close_event_journals, list_segments, read_events
+
+
+def _lines(path):
+    """Parsed JSON lines of a plain journal file."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _append_from_child(path, worker, count):
+    """Child process: emit records through its own journal."""
+    journal = EventJournal(path, max_buffer_events=7, max_bytes=0, rotate_daily=False)
+    for seq in range(count):
+        journal.emit({"ts": seq, "worker": worker, "seq": seq, "pad": "x" * 200})
+    journal.close()
+
+
+@pytest.mark.cp
+class TestEventJournalCP:
+    """Tests for buffering, multiprocess appends, rotation and merged reads."""
+
+    def test_emit_is_buffered_until_size_or_interval(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        journal = EventJournal(path, flush_interval=0.2, max_buffer_events=5)
+        try:
+            for i in range(3):
+                journal.emit({"ts": i, "n": i})
+            assert not path.exists()
+
+            # Interval flush
+            deadline = time.time() + 5
+            while not path.exists() and time.time() < deadline:
+                time.sleep(0.02)
+            assert [r["n"] for r in _lines(path)] == [0, 1, 2]
+
+            # Size flush, well before the interval
+            journal.flush_interval = 60
+            for i in range(3, 8):
+                journal.emit({"ts": i, "n": i})
+            deadline = time.time() + 5
+            while len(_lines(path)) < 8 and time.time() < deadline:
+                time.sleep(0.02)
+            assert [r["n"] for r in _lines(path)] == list(range(8))
+        finally:
+            journal.close()
+
+        journal.emit({"ts": 9, "n": 9})  # After close: written synchronously
+        assert _lines(path)[-1]["n"] == 9
+        assert journal.stats["written"] == journal.stats["emitted"] == 9
+
+    def test_concurrent_processes_never_interleave_lines(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        ctx = multiprocessing.get_context("fork")
+        children = [ctx.Process(target=_append_from_child, args=(path, w, 300)) for w in range(4)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join(30)
+            assert child.exitcode == 0
+
+        records = _lines(path)
+        assert len(records) == 1200
+        for worker in range(4):
+            # Each process's records land intact and in emit order
+            assert [r["seq"] for r in records if r["worker"] == worker] == list(range(300))
+
+    def test_size_rotation_compresses_and_reads_merge_in_order(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        journal = EventJournal(path, max_buffer_events=10, max_bytes=2_000, rotate_daily=False)
+        for i in range(200):
+            journal.emit({"ts": i // 3, "n": i})
+            if i % 10 == 9:
+                journal.flush()
+        journal.close()
+
+        segments = list_segments(path)
+        assert len(segments) >= 3 and segments[-1] == path
+        assert all(s.name.endswith(".jsonl.gz") for s in segments[:-1])
+        assert path.stat().st_size <= 2_000
+        assert journal.stats["rotations"] == len(segments) - 1
+
+        assert [r["n"] for r in read_events(path)] == list(range(200))
+
+    def test_daily_rotation_and_out_of_order_timestamps(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text("".join(json.dumps({"ts": ts, "day": 1}) + "\n" for ts in (30, 10, 50)), encoding="utf-8")
+        yesterday = time.time() - 86_400
+        os.utime(path, (yesterday, yesterday))
+
+        journal = EventJournal(path, compress=False)
+        journal.emit({"ts": 20, "day": 2})
+        journal.emit({"ts": 40, "day": 2})
+        journal.close()
+
+        sealed, active = list_segments(path)
+        assert sealed.suffix == ".jsonl" and [r["day"] for r in _lines(active)] == [2, 2]
+        assert [(r["ts"], r["day"]) for r in read_events(path)] == [(10, 1), (20, 2), (30, 1), (40, 2), (50, 1)]
+
+    def test_read_skips_malformed_lines(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text('{"ts": 2}\nnot json\n{"ts": 1}\n', encoding="utf-8")
+        assert [r["ts"] for r in read_events(path)] == [1, 2]
+
+    def test_emit_event_goes_through_shared_journal(self, tmp_path):
+        from libs.utils.trace import emit_event, flush_events
+
+        path = str(tmp_path / "run_events.jsonl")
+        try:
+            emit_event({"event": "start"}, path=path)
+            emit_event({"event": "end"}, path=path)
+            flush_events(path)
+            assert [r["event"] for r in read_events(path)] == ["start", "end"]
+            assert all(isinstance(r["ts"], int) for r in read_events(path))
+        finally:
+            close_event_journals()
@@ -7,7 +7,7 @@ SCA v13.8-MEA Compliance:
 - Property Tests: Hypothesis @given tests
 """
 import pytest
-from hypothesis import given, strategies as st
+from hypothesis import given, settings, strategies as st
 
 
 @pytest.mark.cp
@@ -206,3 +206,110 @@ def test_extract_clean_quote_with_binary():
 
     # Score should be penalized
     assert score < 1.0
+
+
+# Reference implementations: the per-character versions the single-pass
+# engine replaced. Outputs must stay byte-identical.
+def _reference_is_binaryish(text, threshold=0.15):
+    import unicodedata
+
+    if not text:
+        return False
+    control = sum(
+        1 for c in text
+        if unicodedata.category(c).startswith('C') and c not in ('\n', '\t', '\r', ' ')
+    )
+    low = sum(1 for c in text if ord(c) < 32 and c not in ('\n', '\t', '\r'))
+    return (control + low) / len(text) > threshold or text.count('\x00') > 0
+
+
+def _reference_clean_text(text, preserve_newlines=True):
+    import re
+    import unicodedata
+
+    if not text:
+        return ""
+    keep = ('\n', '\r', '\t') if preserve_newlines else ()
+    text = ''.join(
+        c for c in text.replace('\x00', '')
+        if not (unicodedata.category(c).startswith('C') and c not in keep)
+    )
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def _reference_quality(text):
+    if not text:
+        return 0.0
+    printable = sum(1 for c in text if c.isprintable() or c in ('\n', '\t', '\r'))
+    quality = printable / len(text)
+    if _reference_is_binaryish(text):
+        quality *= 0.5
+    return min(1.0, quality)
+
+
+_NOISY_TEXT = st.text(
+    alphabet=st.one_of(
+        st.characters(),
+        st.sampled_from(list(" \n\n\t\r\x00\x01\x0b\x1f\x7f\x85\xa0\xad\u200b\u2028\u3000\ufeff\U000e0001")),
+    ),
+    max_size=400,
+)
+
+
+@pytest.mark.cp
+@settings(deadline=None, max_examples=300)
+@given(text=_NOISY_TEXT)
+def test_single_pass_engine_matches_reference(text):
+    """CP: scan_text-backed functions are identical to the per-character versions."""
+    from libs.extraction.text_clean import (
+        clean_text, extract_clean_quote, get_text_quality_score, is_binaryish, scan_text
+    )
+
+    assert is_binaryish(text) == _reference_is_binaryish(text)
+    assert is_binaryish(text, threshold=0.01) == _reference_is_binaryish(text, threshold=0.01)
+    assert clean_text(text) == _reference_clean_text(text)
+    assert clean_text(text, preserve_newlines=False) == _reference_clean_text(text, False)
+    assert get_text_quality_score(text) == _reference_quality(text)
+
+    cleaned = _reference_clean_text(text)
+    expected_quote = cleaned[:50] + "..." if len(cleaned) > 50 else cleaned
+    assert extract_clean_quote(text, max_length=50) == (
+        expected_quote, min(_reference_quality(text), _reference_quality(cleaned))
+    )
+    assert scan_text(text).cleaned == cleaned
+
+
+@pytest.mark.cp
+def test_single_pass_engine_handles_surrogates_and_latin1():
+    """CP Failure Path: lone surrogates and Latin-1 controls classify like unicodedata."""
+    from libs.extraction.text_clean import clean_text, get_text_quality_score, is_binaryish
+
+    for text in ["ok\ud800 text", "caf\xe9\x85 \xa0  x\x9f", "\xad" * 10 + "a"]:
+        assert clean_text(text) == _reference_clean_text(text)
+        assert is_binaryish(text) == _reference_is_binaryish(text)
+        assert get_text_quality_score(text) == _reference_quality(text)
+
+
+@pytest.mark.cp
+def test_sanitize_arrow_matches_per_string_functions():
+    """CP: the vectorized PyArrow mode is identical row by row."""
+    pa = pytest.importorskip("pyarrow")
+    import random
+    from libs.extraction.text_clean import is_binaryish_arrow, sanitize_arrow
+
+    rng = random.Random(7)
+    alphabet = list("ab c\n\n\t\r\x00\x01\x1f\x7f\x85\xa0\xad\xe9\u200b\u2028\u3000\ufeff\u201c\U0001f600\U000e0001")
+    rows = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60))) for _ in range(300)]
+    rows += ["", None, "   ", "\n\n\n\nx\n\n\n"]
+
+    for preserve in (True, False):
+        table = sanitize_arrow(pa.array(rows, type=pa.string()), preserve_newlines=preserve, threshold=0.2)
+        for row, text in zip(table.to_pylist(), rows):
+            assert row["cleaned"] == _reference_clean_text(text, preserve)
+            assert row["is_binary"] == _reference_is_binaryish(text, threshold=0.2)
+            assert row["quality"] == _reference_quality(text)
+
+    verdicts = is_binaryish_arrow(pa.array(rows, type=pa.string()), threshold=0.2).to_pylist()
+    assert verdicts == [_reference_is_binaryish(text, threshold=0.2) for text in rows]
@@ -0,0 +1,97 @@
+"""
+CP Tests for chunk artifacts (libs/data_lake/chunk_artifacts.py)
+
+Claim-check hand-off between Airflow tasks: chunk sets and float32
+embeddings round-trip through Parquet while XCom carries only a reference.
+"""
+
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from libs.data_lake.chunk_artifacts import (
+    ChunkArtifactRef,
+    ChunkArtifactWriter,
+    artifact_uri,
+    iter_chunk_batches,
+    write_chunk_artifact,
+)
+
+
+def _chunk(i: int) -> dict:
+    return {
+        "chunk_id": f"acme_2023_{i:04d}",
+        "company": "Acme",
+        "year": 2023,
+        "text": f"Scope 1 emissions fell {i}% year over year.",
+        "page_start": i,
+        "page_end": i + 1,
+        "section": "GHG Accounting",
+        "source_url": "https://example.com/acme.pdf",
+        "md5": f"{i:032x}",
+        "char_count": 40,
+        "token_count_estimate": 10,
+        "metadata": {"parser": "pdfplumber"} if i % 2 else None,
+    }
+
+
+@pytest.mark.cp
+class TestChunkArtifacts:
+    """Chunk artifact round trips."""
+
+    def test_chunks_round_trip(self, tmp_path):
+        chunks = [_chunk(i) for i in range(5)]
+        ref = write_chunk_artifact(str(tmp_path / "run" / "parse.parquet"), chunks)
+
+        assert ref.row_count == 5
+        assert ref.embedding_dim is None
+
+        restored = [c for batch, _ in iter_chunk_batches(ref) for c in batch]
+        assert restored == chunks
+
+    def test_embeddings_stored_as_fixed_size_float32(self, tmp_path):
+        chunks = [_chunk(i) for i in range(3)]
+        embeddings = np.arange(3 * 8, dtype=np.float64).reshape(3, 8)
+        ref = write_chunk_artifact(str(tmp_path / "emb.parquet"), chunks, embeddings)
+
+        field = pq.read_schema(ref.uri).field("embedding")
+        assert field.type == pa.list_(pa.float32(), 8)
+
+        (batch_chunks, matrix), = list(iter_chunk_batches(ref))
+        assert matrix.dtype == np.float32
+        np.testing.assert_array_equal(matrix, embeddings.astype(np.float32))
+        assert [c["chunk_id"] for c in batch_chunks] == [c["chunk_id"] for c in chunks]
+
+    def test_streaming_write_and_read(self, tmp_path):
+        uri = str(tmp_path / "stream.parquet")
+        with ChunkArtifactWriter(uri, embedding_dim=4, batch_rows=10) as writer:
+            for start in range(0, 25, 5):
+                chunks = [_chunk(i) for i in range(start, start + 5)]
+                writer.write(chunks, np.full((5, 4), start, dtype=np.float32))
+
+        assert writer.ref.row_count == 25
+        assert pq.ParquetFile(uri).num_row_groups == 3
+
+        sizes = [len(chunks) for chunks, _ in iter_chunk_batches(writer.ref, batch_rows=7)]
+        assert sum(sizes) == 25
+        assert max(sizes) <= 7
+
+    def test_ref_is_xcom_serializable(self, tmp_path):
+        ref = write_chunk_artifact(str(tmp_path / "a.parquet"), [_chunk(0)])
+        payload = json.loads(json.dumps(ref.to_dict()))
+        assert ChunkArtifactRef.from_dict(payload) == ref
+
+    def test_embedding_shape_mismatch_rejected(self, tmp_path):
+        writer = ChunkArtifactWriter(str(tmp_path / "bad.parquet"), embedding_dim=4)
+        with pytest.raises(ValueError):
+            writer.write([_chunk(0), _chunk(1)], np.zeros((2, 3)))
+        with pytest.raises(ValueError):
+            writer.write([_chunk(0)])
+        writer.close()
+
+    def test_artifact_uri_sanitizes_run_id(self):
+        uri = artifact_uri("/tmp/xcom/", "manual__2023-11-14T22:13:20+00:00", "parse_pdf_0")
+        assert uri == "/tmp/xcom/manual__2023-11-14T22_13_20_00_00/parse_pdf_0.parquet"
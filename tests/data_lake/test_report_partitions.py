@@ -0,0 +1,63 @@
+"""
+CP Tests for scoring DAG partitions (libs/data_lake/report_partitions.py)
+
+Crawled reports are grouped into (company, year) partitions; each report
+lands in exactly one partition.
+"""
+
+import pytest
+
+from libs.data_lake.report_partitions import group_partitions, partition_key
+
+
+def _report(company: str, year: int, url: str) -> dict:
+    return {"company": company, "year": year, "url": url}
+
+
+@pytest.mark.cp
+class TestReportPartitions:
+    """Tests for grouping, ordering and cross-partition report dedupe."""
+
+    def test_groups_by_company_and_year_in_sorted_order(self):
+        reports = [
+            _report("Microsoft Corporation", 2023, "https://x/msft-2023.pdf"),
+            _report("Apple Inc.", 2022, "https://x/aapl-2022.pdf"),
+            _report("microsoft corp", 2022, "https://x/msft-2022.pdf"),
+            _report("Apple Inc.", 2022, "https://x/aapl-2022-annex.pdf"),
+        ]
+
+        partitions = group_partitions(["Microsoft", "Apple"], reports, default_year=2023)
+
+        assert [(p["company"], p["year"]) for p in partitions] == [
+            ("Apple", 2022), ("Microsoft", 2022), ("Microsoft", 2023),
+        ]
+        assert [r["url"] for r in partitions[0]["reports"]] == [
+            "https://x/aapl-2022.pdf", "https://x/aapl-2022-annex.pdf",
+        ]
+
+    def test_company_without_reports_gets_default_year_partition(self):
+        partitions = group_partitions(["Apple", "Google"], [_report("Apple", 2021, "u1")], default_year=2023)
+
+        assert [(p["company"], p["year"], len(p["reports"])) for p in partitions] == [
+            ("Apple", 2021, 1), ("Google", 2023, 0),
+        ]
+
+    def test_repeated_report_lands_in_one_partition(self):
+        # crawl_reports lists a report once per matching configured company
+        shared = _report("Apple Hospitality REIT", 2023, "https://x/aple-2023.pdf")
+        reports = [shared, _report("Apple Inc.", 2023, "https://x/aapl-2023.pdf"), dict(shared)]
+
+        partitions = group_partitions(["Apple", "Apple Hospitality"], reports, default_year=2023)
+
+        by_company = {p["company"]: [r["url"] for r in p["reports"]] for p in partitions}
+        assert by_company == {
+            "Apple": ["https://x/aapl-2023.pdf"],
+            "Apple Hospitality": ["https://x/aple-2023.pdf"],
+        }
+
+    def test_unmatched_reports_are_ignored(self):
+        partitions = group_partitions(["Apple"], [_report("Tesla", 2023, "t")], default_year=2024)
+        assert partitions == [{"company": "Apple", "year": 2024, "reports": []}]
+
+    def test_partition_key_is_filesystem_safe(self):
+        assert partition_key({"company": "AT&T Inc.", "year": 2023}) == "at_t_inc_2023"
@@ -0,0 +1,133 @@
+"""
+Critical Path Tests: Vectorized characteristic matching against rubric v3.
+"""
+
+import re
+
+import numpy as np
+import pytest
+
+from agents.embedding.watsonx_embedder import WatsonxEmbedder
+from agents.scoring.characteristic_matcher import CharacteristicMatcher
+from agents.scoring.evidence_table_generator import generate_evidence_table
+from agents.scoring.rubric_loader import RubricLoader
+
+DIM = 256
+
+
+class HashingClient:
+    """Deterministic bag-of-words embeddings; counts API calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embeddings(self, inputs, model_id):
+        self.calls.append(list(inputs))
+        results = []
+        for text in inputs:
+            vector = np.zeros(DIM, dtype=np.float32)
+            for token in re.findall(r"[a-z0-9]+", text.lower()):
+                vector[hash(token) % DIM] += 1.0
+            results.append({"embedding": vector.tolist()})
+        return {"results": results}
+
+
+@pytest.fixture(scope="module")
+def rubric():
+    """Compiled rubric v3."""
+    return RubricLoader().load()
+
+
+@pytest.fixture
+def embedder():
+    """Real WatsonxEmbedder wired to the hashing client."""
+    embedder = WatsonxEmbedder(api_key="key", project_id="project", embedding_dim=DIM)
+    embedder.client = HashingClient()
+    return embedder
+
+
+def _loop_reference(embedder, evidence, characteristics):
+    """Per-pair cosine loop the matrix path replaces."""
+    texts = [c.descriptor.strip() or c.label for c in characteristics]
+    evidence_vector = np.array(embedder.client.embeddings([evidence], "m")["results"][0]["embedding"])
+    best, best_score = None, -1.0
+    for characteristic, text in zip(characteristics, texts):
+        vector = np.array(embedder.client.embeddings([text], "m")["results"][0]["embedding"])
+        score = float(evidence_vector @ vector / (np.linalg.norm(evidence_vector) * np.linalg.norm(vector) + 1e-10))
+        if score > best_score:
+            best, best_score = characteristic, score
+    return best, best_score
+
+
+@pytest.mark.cp
+class TestCharacteristicMatcherCP:
+    """Tests for the precomputed matrix, batching and on-disk cache."""
+
+    def test_batch_matches_per_pair_loop(self, embedder, rubric):
+        matcher = CharacteristicMatcher(embedder)
+        characteristics = rubric.themes["TSP"].ordered_stages
+        evidence = [c.descriptor for c in characteristics] + [
+            "We set science-based targets validated by SBTi for 2030.",
+            "No emissions targets have been announced.",
+        ]
+
+        results = matcher.match_batch(evidence, "TSP", rubric)
+
+        for text, result in zip(evidence, results):
+            expected, expected_score = _loop_reference(embedder, text, characteristics)
+            assert result.characteristic == expected
+            assert result.similarity_score == pytest.approx(max(expected_score, 0.0), abs=1e-5)
+        # Stage descriptors match themselves
+        assert [r.characteristic.stage for r in results[:5]] == [0, 1, 2, 3, 4]
+
+    def test_one_embedding_call_per_theme_and_batch(self, embedder, rubric):
+        matcher = CharacteristicMatcher(embedder)
+        evidence = [f"Scope {i} emissions were verified by a third party" for i in range(40)]
+
+        matcher.match_batch(evidence, "GHG", rubric)
+        matcher.match_batch(evidence[:10], "GHG", rubric)
+
+        # Characteristic matrix once, then one call per evidence batch (first fully uncached)
+        sizes = [len(call) for call in embedder.client.calls]
+        assert sizes == [5, 40, 10]
+        assert matcher.get_cache_size() == 5
+
+    def test_top_n_is_sorted_and_capped(self, embedder, rubric):
+        matcher = CharacteristicMatcher(embedder)
+        (matches,) = matcher.match_top_n(["Board oversight of climate risk"], "RMM", rubric, top_n=10)
+
+        assert len(matches) == 5
+        scores = [m.similarity_score for m in matches]
+        assert scores == sorted(scores, reverse=True)
+        assert len({m.characteristic.stage for m in matches}) == 5
+
+        with pytest.raises(ValueError):
+            matcher.match_top_n(["text"], "RMM", rubric, top_n=0)
+        with pytest.raises(ValueError):
+            matcher.match_batch(["ok", "  "], "RMM", rubric)
+        with pytest.raises(ValueError):
+            matcher.match_batch(["ok"], "NOPE", rubric)
+
+    def test_disk_cache_keyed_by_rubric_version(self, embedder, rubric, tmp_path):
+        CharacteristicMatcher(embedder, cache_dir=str(tmp_path)).get_characteristic_matrix("DM", rubric)
+        (cached_file,) = tmp_path.glob("*.npy")
+        assert cached_file.name.startswith(f"{rubric.version}__")
+
+        fresh = WatsonxEmbedder(api_key="key", project_id="project", embedding_dim=DIM)
+        fresh.client = HashingClient()
+        matrix = CharacteristicMatcher(fresh, cache_dir=str(tmp_path)).get_characteristic_matrix("DM", rubric)
+
+        assert fresh.client.calls == []
+        np.testing.assert_allclose(np.linalg.norm(matrix.matrix, axis=1), 1.0, rtol=1e-5)
+
+    def test_evidence_table_uses_batch_matching(self, embedder, rubric):
+        evidence = [
+            "Emissions data is assured by an independent third party.",
+            "",
+            "We publish a data management policy.",
+        ]
+        rows = generate_evidence_table(evidence, "DM", rubric, CharacteristicMatcher(embedder))
+
+        assert len(rows) == 2
+        assert all(row.characteristic for row in rows)
+        assert len(embedder.client.calls) == 2
@@ -0,0 +1,243 @@
+"""
+Critical Path Tests: Concurrent, rate-limited embedding executor.
+
+The fake-server tests run against a local watsonx-shaped embedding server
+(http.server on 127.0.0.1), never the real service.
+"""
+
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from libs.embedding import embedding_executor
+from libs.embedding.embedding_executor import (
+    DEFAULT_SHARED_RPS,
+    EMBED_MAX_CHARS,
+    EmbeddingExecutor,
+    EmbeddingRequestError,
+    TokenBucket,
+    plan_batches,
+    truncate_for_embedding,
+)
+
+
+class FakeClock:
+    """Manual clock whose sleep() advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeEmbeddingServer:
+    """Local watsonx-shaped embeddings endpoint with latency and scripted 429s."""
+
+    def __init__(self, latency=0.05, rate_limit_first=0):
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests.append(body["input"])
+                    limited = len(server.requests) <= server.rate_limit_first
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(server.latency)
+                with server._lock:
+                    server.active -= 1
+                if limited:
+                    self.send_response(429)
+                    self.end_headers()
+                    return
+                # Vector encodes the text so order can be checked
+                payload = {"results": [{"embedding": [float(len(t)), float(t.count("x"))]} for t in body["input"]]}
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/ml/v1/text/embeddings"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Point apps.scoring.wx_client at a fake server with a fresh executor."""
+    servers = []
+
+    def start(max_in_flight=4, batch_items=4, **server_kwargs):
+        server = FakeEmbeddingServer(**server_kwargs)
+        servers.append(server)
+        monkeypatch.setenv("WX_EMBED_URL", server.url)
+        monkeypatch.setenv("WX_API_KEY", "test-key")
+        monkeypatch.setenv("WX_PROJECT", "test-project")
+        monkeypatch.setenv("WX_MODEL_ID", "test-model")
+        executor = EmbeddingExecutor(
+            max_in_flight=max_in_flight, max_batch_items=batch_items, base_delay=0.01, max_delay=0.02,
+        )
+        monkeypatch.setattr(embedding_executor, "_EXECUTOR", executor)
+        return server, executor
+
+    yield start
+    for server in servers:
+        server.close()
+    if embedding_executor._EXECUTOR is not None:
+        embedding_executor._EXECUTOR.shutdown()
+
+
+@pytest.mark.cp
+class TestEmbeddingExecutorCP:
+    """Tests for batching, limiting, retries and ordering."""
+
+    def test_plan_batches_by_chars_and_items(self):
+        texts = ["a" * 10] * 5 + ["b" * 100] + ["c"] * 3
+        assert plan_batches(texts, max_batch_chars=30, max_batch_items=10) == [
+            (0, 3), (3, 5), (5, 6), (6, 9),
+        ]
+        assert plan_batches(texts, max_batch_chars=10_000, max_batch_items=4) == [(0, 4), (4, 8), (8, 9)]
+        # Text past the truncation limit only counts up to the cap
+        assert plan_batches(["x" * 5000, "y"], max_batch_chars=2100, text_chars_cap=2048) == [(0, 2)]
+        assert plan_batches([]) == []
+
+    def test_truncation_matches_wx_client_limit(self):
+        assert truncate_for_embedding("x" * 1000) == "x" * EMBED_MAX_CHARS
+        assert truncate_for_embedding("short") == "short"
+        assert truncate_for_embedding("x" * 1000, None) == "x" * 1000
+
+    def test_token_bucket_paces_to_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_second=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+        for _ in range(6):
+            bucket.acquire()
+        # Two burst tokens, then four more at 2/s
+        assert clock.now == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("rps, expected", [(None, DEFAULT_SHARED_RPS), ("3", 3.0), ("0", None)])
+    def test_shared_executor_is_rate_limited_by_default(self, monkeypatch, rps, expected):
+        monkeypatch.setattr(embedding_executor, "_EXECUTOR", None)
+        if rps is None:
+            monkeypatch.delenv("ESG_EMBED_RPS", raising=False)
+        else:
+            monkeypatch.setenv("ESG_EMBED_RPS", rps)
+
+        executor = embedding_executor.get_embedding_executor()
+        try:
+            assert executor is embedding_executor.get_embedding_executor()
+            rate = executor.limiter.rate if executor.limiter is not None else None
+            assert rate == expected
+        finally:
+            executor.shutdown()
+
+    def test_watsonx_embedders_share_the_process_executor(self, monkeypatch):
+        from libs.embedding.watsonx_embedder import EmbeddingConfig, WatsonXEmbedder
+
+        monkeypatch.setattr(embedding_executor, "_EXECUTOR", None)
+        config = EmbeddingConfig(api_key="key", project_id="project", embedding_dim=2)
+        first, second = WatsonXEmbedder(config), WatsonXEmbedder(config)
+        try:
+            assert first.executor is second.executor is embedding_executor.get_embedding_executor()
+            monkeypatch.setattr(first, "_call_slate_api", lambda batch: [[1.0, float(len(t))] for t in batch])
+            assert first.embed_batch(["a", "bb", "ccc"], batch_size=2).tolist() == [[1, 1], [1, 2], [1, 3]]
+        finally:
+            first.executor.shutdown()
+
+    def test_order_preserved_with_out_of_order_completion(self):
+        def embed(batch):
+            # Later batches finish first
+            time.sleep(0.02 * (5 - int(batch[0])))
+            return [[float(t)] for t in batch]
+
+        executor = EmbeddingExecutor(embed, max_in_flight=4, max_batch_items=2)
+        try:
+            texts = [str(i) for i in range(6)]
+            assert executor.embed(texts) == [[float(i)] for i in range(6)]
+        finally:
+            executor.shutdown()
+
+    def test_retries_with_jitter_then_gives_up(self):
+        sleeps = []
+        attempts = []
+
+        def flaky(batch):
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        executor = EmbeddingExecutor(flaky, max_retries=3, base_delay=1.0, sleep=sleeps.append)
+        with pytest.raises(EmbeddingRequestError):
+            executor.embed(["a"])
+        assert len(attempts) == 3
+        assert len(sleeps) == 2
+        assert 0.0 <= sleeps[0] <= 1.0 and 0.0 <= sleeps[1] <= 2.0
+
+    def test_count_mismatch_is_not_retried(self):
+        attempts = []
+
+        def short(batch):
+            attempts.append(1)
+            return [[0.0]]
+
+        executor = EmbeddingExecutor(short, max_retries=3, sleep=lambda s: None)
+        with pytest.raises(ValueError):
+            executor.embed(["a", "b"])
+        assert len(attempts) == 1
+
+    def test_fake_server_requests_run_concurrently_in_order(self, fake_server):
+        server, executor = fake_server(max_in_flight=4, batch_items=4, latency=0.1)
+        texts = [("x" * (i % 7)) + f"-{i}" for i in range(32)]
+
+        def post(batch):
+            request = urllib.request.Request(
+                server.url,
+                data=json.dumps({"input": batch}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return [item["embedding"] for item in json.loads(response.read())["results"]]
+
+        start = time.perf_counter()
+        vectors = executor.embed(texts, embed_fn=post)
+        elapsed = time.perf_counter() - start
+
+        assert vectors == [[float(len(t)), float(t.count("x"))] for t in texts]
+        assert len(server.requests) == 8
+        assert server.peak > 1
+        # 8 round trips at 4 in flight is ~2 latencies, not 8
+        assert elapsed < 0.6
+
+    def test_wx_client_retries_rate_limit_against_fake_server(self, fake_server):
+        pytest.importorskip("requests")
+        from apps.scoring import wx_client
+
+        server, executor = fake_server(max_in_flight=1, batch_items=8, latency=0.0, rate_limit_first=2)
+        assert wx_client.embed_text_batch(["a", "bb"], use_live=True) == [[1.0, 0.0], [2.0, 0.0]]
+        assert len(server.requests) == 3
+        assert executor.stats["retries"] == 2
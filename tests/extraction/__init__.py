@@ -0,0 +1 @@
+"""Extraction tests."""
@@ -0,0 +1,116 @@
+"""
+Critical Path Tests: map-reduce R&D section locator.
+"""
+
+import re
+import threading
+
+import pytest
+
+from agents.extraction.rd_locator_wx import (
+    CHARS_PER_TOKEN,
+    SECTION_MARKERS,
+    RDLocatorWX,
+)
+
+_LINE = re.compile(r"^Chunk (\d+) \(ID: ([^,]+), Page: [^)]*\): (.*)$", re.MULTILINE)
+
+
+class FakeLocatorLLM:
+    """Deterministic local stand-in for generate_json: labels listed chunks by marker."""
+
+    def __init__(self, fail_on=None):
+        self.prompts = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def generate_json(self, prompt, model_id, temperature, top_k, schema, doc_id):
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("model unavailable")
+        by_type = {}
+        for position, _, text in _LINE.findall(prompt):
+            for section_type, markers in SECTION_MARKERS.items():
+                if section_type != "Custom" and any(m in text.lower() for m in markers):
+                    by_type.setdefault(section_type, []).append(int(position))
+        return {"sections": [
+            {"section_type": t, "chunk_indices": idx, "confidence": 0.9, "rationale": "marker"}
+            for t, idx in by_type.items()
+        ]}
+
+
+def _report(pages=260, per_page=2):
+    """Long report with disclosures deep in the document."""
+    filler = "The company manufactures widgets and sells them through distributors worldwide. " * 6
+    placed = {
+        30: "Our TCFD governance section describes climate-related risks and opportunities.",
+        31: "Scenario analysis under TCFD covers physical and transition risks.",
+        300: "Under SECR we report energy consumption and an intensity ratio.",
+        302: "SECR energy efficiency actions reduced consumption at two plants.",
+        480: "Our SBTi validated targets follow a 1.5°C pathway.",
+    }
+    chunks = []
+    for i in range(pages * per_page):
+        text = filler
+        if i in placed:
+            # Marker after the first 200 characters: only a hit-centred snippet shows it
+            text = filler[:250] + placed[i] + " " + filler
+        chunks.append({"chunk_id": f"c{i:04d}", "text": text, "page": i // per_page + 1, "doc_id": "long"})
+    return chunks
+
+
+@pytest.mark.cp
+class TestRDLocatorMapReduceCP:
+    """Tests for prefilter, packing, concurrency and the merge step."""
+
+    def test_finds_sections_beyond_first_fifty_chunks(self):
+        llm = FakeLocatorLLM()
+        result = RDLocatorWX(wx_client=llm, prompt_token_budget=600).locate_rd_sections(_report(), doc_id="long")
+
+        found = [(s.section_type, s.chunk_ids, s.pages) for s in result.sections]
+        assert found == [
+            ("TCFD", ["c0030", "c0031"], [16]),
+            ("SECR", ["c0300", "c0302"], [151, 152]),
+            ("SBTi", ["c0480"], [241]),
+        ]
+        assert result.method == "watsonx_llm" and result.cache_hit
+        assert result.rd_chunks == 5 and result.total_chunks == 520
+        assert result.prompts == len(llm.prompts) > 1
+        assert all(len(p) <= 600 * CHARS_PER_TOKEN for p in llm.prompts)
+        # Only prefiltered windows are sent, not the whole report
+        assert sum(len(_LINE.findall(p)) for p in llm.prompts) < 20
+
+    def test_prompts_and_results_independent_of_concurrency(self):
+        chunks = _report()
+        runs = []
+        for workers in (1, 4):
+            llm = FakeLocatorLLM()
+            result = RDLocatorWX(wx_client=llm, prompt_token_budget=500, max_workers=workers).locate_rd_sections(chunks)
+            runs.append((sorted(llm.prompts), result.sections))
+        assert runs[0] == runs[1]
+
+    def test_failed_prompt_falls_back_to_keywords_for_its_chunks(self):
+        llm = FakeLocatorLLM(fail_on="c0300")
+        result = RDLocatorWX(wx_client=llm, prompt_token_budget=500).locate_rd_sections(_report())
+
+        assert result.method == "watsonx_llm+keyword_fallback"
+        assert not result.cache_hit
+        assert {"TCFD", "SBTi"} <= {s.section_type for s in result.sections}
+        assert any("c0300" in s.chunk_ids for s in result.sections)
+
+    def test_cache_miss_fails_closed(self):
+        class ReplayOnly(FakeLocatorLLM):
+            def generate_json(self, prompt, **kwargs):
+                raise RuntimeError("Cache miss in offline replay mode: json_gen/abc")
+
+        with pytest.raises(RuntimeError, match="Cache miss"):
+            RDLocatorWX(wx_client=ReplayOnly()).locate_rd_sections(_report(pages=40))
+
+    def test_short_documents_keep_single_legacy_prompt(self):
+        llm = FakeLocatorLLM()
+        chunks = _report(pages=20)[:50]
+        result = RDLocatorWX(wx_client=llm).locate_rd_sections(chunks)
+
+        assert result.prompts == 1 and len(llm.prompts) == 1
+        assert llm.prompts[0] == RDLocatorWX(wx_client=llm)._build_locator_prompt(chunks)
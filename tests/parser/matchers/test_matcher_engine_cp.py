@@ -0,0 +1,185 @@
+"""
+Critical Path Tests: single-pass matcher engine and bisect page lookup.
+"""
+
+import random
+import re
+
+import pytest
+
+from agents.parser.matchers import BaseMatcher, GHGMatcher
+from agents.parser.matchers.base_matcher import PageIndex
+
+_NEGATION_REFERENCE = [
+    r'\b(no|not|never|without|lack|lacking)\b',
+    r'\b(absence\s+of)\b',
+    r'\b(do\s+not|does\s+not|did\s+not|will\s+not|cannot|have\s+no)\b',
+]
+
+
+def _reference_page(span_start, page_offsets):
+    """Original per-match sort-and-scan page estimate."""
+    if not page_offsets:
+        return max(1, span_start // 3000 + 1)
+    page_no = 1
+    for page, offset in sorted(page_offsets.items()):
+        if offset <= span_start:
+            page_no = page
+        else:
+            break
+    return page_no
+
+
+def _reference_match(matcher, text, page_offsets):
+    """Original per-pattern finditer loop with full-prefix context splits."""
+    results = []
+    for name, pattern in matcher.patterns.items():
+        for regex_match in pattern.finditer(text):
+            before = " ".join(text[:regex_match.start()].split()[-15:])
+            after = " ".join(text[regex_match.end():].split()[:15])
+            negated = any(
+                re.search(p, before[-100:].lower(), re.IGNORECASE) for p in _NEGATION_REFERENCE
+            )
+            if not negated:
+                results.append((
+                    name, regex_match.group(0), regex_match.start(), regex_match.end(),
+                    before, after, _reference_page(regex_match.start(), page_offsets),
+                ))
+    return results
+
+
+def _as_tuples(matches):
+    """Comparable view of Match objects."""
+    return [
+        (m.pattern_name, m.match_text, m.span_start, m.span_end,
+         m.context_before, m.context_after, m.page_no)
+        for m in matches
+    ]
+
+
+def _filing(pages=120, seed=3):
+    """Synthetic multi-page filing with overlapping GHG evidence."""
+    rng = random.Random(seed)
+    snippets = [
+        "Scope 1 emissions were 1,234 tCO2e and 56 mtCO2e.",
+        "Scope 1, 2 and 3 emissions are reported under the GHG Protocol Corporate Standard.",
+        "KPMG provided limited assurance over our GHG inventory.",
+        "Our GHG inventory received reasonable assurance from Deloitte.",
+        "We do not have Scope 3 emissions data yet.",
+        "base year 2019 with a recalculation policy",
+        "supplier emissions and value chain emissions",
+    ]
+    filler = "The Company operates in several segments and reports quarterly results. "
+    bodies = []
+    for _ in range(pages):
+        body = filler * 12
+        for _ in range(rng.randint(0, 3)):
+            cut = rng.randint(0, len(body))
+            body = f"{body[:cut]} {rng.choice(snippets)} {body[cut:]}"
+        bodies.append(body)
+    offsets, position = {}, 0
+    for page, body in enumerate(bodies, start=1):
+        offsets[page] = position
+        position += len(body) + 1
+    return "\n".join(bodies), offsets
+
+
+class BackrefMatcher(BaseMatcher):
+    """Minimal subclass relying on the inherited match()."""
+
+    def __init__(self):
+        super().__init__(theme="TSP")
+        # The backreference cannot be combined, forcing the per-pattern path
+        self.compile_patterns({"doubled": r"\b(\w+)\s+\1\b", "target": r"\bnet\s+zero\b"})
+
+    def classify_evidence_type(self, match):
+        return match.pattern_name
+
+    def get_stage_indicator(self, evidence_type):
+        return 1
+
+
+@pytest.mark.cp
+class TestMatcherEngineCP:
+    """Tests that the engine reproduces the per-pattern implementation."""
+
+    def test_ghg_match_identical_to_per_pattern_scan(self):
+        text, offsets = _filing()
+        matcher = GHGMatcher()
+
+        matches = matcher.match(text, offsets)
+
+        assert matcher._scanner is not None
+        assert _as_tuples(matches) == _reference_match(matcher, text, offsets)
+        # Overlapping patterns at the same start are all reported
+        names = {m.pattern_name for m in matches}
+        assert {"scope_1", "scope_123_comprehensive", "ghg_protocol", "ghg_protocol_corporate"} <= names
+
+    def test_iter_pattern_matches_equals_finditer(self):
+        text, _ = _filing(pages=40, seed=11)
+        matcher = GHGMatcher()
+        expected = [
+            (name, m.span(), m.group(0))
+            for name, pattern in matcher.patterns.items()
+            for m in pattern.finditer(text)
+        ]
+        actual = [(name, m.span(), m.group(0)) for name, m in matcher.iter_pattern_matches(text)]
+        assert actual == expected
+
+    def test_uncombinable_patterns_fall_back(self):
+        matcher = BackrefMatcher()
+        text = "We reached the the goal of net zero in 2030."
+        assert matcher._scanner is None
+        assert [(m.pattern_name, m.match_text) for m in matcher.match(text, {})] == [
+            ("doubled", "the the"), ("target", "net zero"),
+        ]
+
+    @pytest.mark.parametrize("patterns, text", [
+        ({"a": r"a??"}, " a"),
+        ({"a": r"a*?b?", "b": r"b"}, "ab aab b a"),
+    ])
+    def test_empty_matching_patterns_equal_finditer(self, patterns, text):
+        matcher = BackrefMatcher()
+        matcher.compile_patterns(patterns)
+        expected = [
+            (name, m.span())
+            for name, pattern in matcher.patterns.items()
+            for m in pattern.finditer(text)
+        ]
+
+        assert matcher._scanner is None
+        assert [(name, m.span()) for name, m in matcher.iter_pattern_matches(text)] == expected
+
+    def test_page_index_matches_sorted_scan(self):
+        offsets = {3: 200, 1: 0, 2: 100, 4: 300}
+        index = PageIndex(offsets)
+        for span_start in range(0, 400, 7):
+            assert index.lookup(span_start) == _reference_page(span_start, offsets)
+
+        shuffled = {1: 50, 2: 10, 3: 500}
+        for span_start in (0, 20, 60, 600):
+            assert PageIndex(shuffled).lookup(span_start) == _reference_page(span_start, shuffled)
+
+        assert PageIndex({}).lookup(7000) == 3
+        assert PageIndex({2: 100}).lookup(5) == 1
+
+    def test_context_window_matches_full_split(self):
+        rng = random.Random(5)
+        words = ["alpha", "b", "gamma\n", "\tdelta", "e" * 40, "  "]
+        text = " ".join(rng.choice(words) for _ in range(3000))
+        matcher = GHGMatcher()
+        for _ in range(200):
+            start = rng.randint(0, len(text) - 1)
+            end = min(len(text), start + rng.randint(1, 20))
+            for window in (15, 3, 0):
+                expected = (
+                    " ".join(text[:start].split()[-window:]),
+                    " ".join(text[end:].split()[:window]),
+                )
+                assert matcher.extract_context_window(text, start, end, window) == expected
+
+    def test_check_negation_precompiled(self):
+        matcher = GHGMatcher()
+        assert matcher.check_negation("Scope 3", "we do not report")
+        assert matcher.check_negation("Scope 3", "in the ABSENCE OF data")
+        assert not matcher.check_negation("Scope 3", "we report annually")
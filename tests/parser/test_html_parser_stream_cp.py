@@ -0,0 +1,138 @@
+"""
+Critical Path Tests: streaming SEC HTML parser.
+"""
+
+import random
+import re
+import tracemalloc
+
+import pytest
+
+from agents.parser.html_parser import SECHTMLParser
+
+bs4 = pytest.importorskip("bs4")
+
+
+def _reference_parse(html):
+    """Original BeautifulSoup implementation of parse_filing()."""
+    soup = bs4.BeautifulSoup(html, "lxml")
+    for tag in soup(["script", "style", "meta", "link"]):
+        tag.decompose()
+    body = soup.find("body") or soup
+    text = re.sub(r"[ \t]+", " ", body.get_text())
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = "\n".join(line.strip() for line in text.split("\n")).strip()
+    offsets = {1: 0} if not text else {
+        page: offset for page, offset in enumerate(range(0, len(text), 3000), start=1)
+    }
+    return text, offsets
+
+
+FIXTURES = {
+    "ixbrl": (
+        '<?xml version="1.0"?><!DOCTYPE html><html xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">'
+        "<head><title>10-K</title><meta charset='utf-8'><style>p{x:1}</style></head>"
+        "<body><div style='display:none'><ix:header><ix:hidden>dei:Hidden</ix:hidden></ix:header></div>"
+        "<p>Scope 1 emissions were <ix:nonFraction name='ghg'>1,234</ix:nonFraction> tCO2e.</p>\n\n\n\n"
+        "<table><tr><td>A</td>  <td>\tB </td></tr>\n<tr><td>&amp;&nbsp;C</td></tr></table>"
+        "<!-- comment text --><script>var x = '<p>no</p>';</script></body></html>"
+    ),
+    "preformatted": (
+        "<html><body><pre>  keep   \n\n\n   spacing  </pre> <textarea>  \n  </textarea>"
+        "<p>  after\t\t pre  </p><template><p>hidden</p></template><ruby>k<rt>kan</rt><rp>(</rp></ruby></body></html>"
+    ),
+    "no_body": "Plain text filing\n\n\n\nwith   no markup\r\n at all  ",
+    "head_text": "<html><head><title>Title only</title></head></html>",
+    "after_body": "<html><body><p>inside</p></body></html><p>trailing</p>",
+    "empty": "",
+    "whitespace_lines": "<body>a\n \n \nb\n\n\n\nc\n\t\n\nd  </body>",
+    "broken_markup": "<body><p>unclosed <b>bold <i>italic</p> text</div> &#8212; &copy; <link rel=x>end",
+}
+
+
+def _synthetic_filing(pages=60, seed=7):
+    """Multi-page 10-K shaped document with a table of contents."""
+    rng = random.Random(seed)
+    items = [("1", "Business"), ("1A", "Risk Factors"), ("7", "Management's Discussion"), ("8", "Financial Statements")]
+    parts = ["<html><head><style>.x{}</style></head><body><div>TABLE OF CONTENTS</div>"]
+    parts += [f"\n<p>Item {num}. {title}</p>" for num, title in items]
+    filler = ["<span>emissions</span> ", "<b>climate</b>\n", "<td> risk </td>", "\n\n\n<br/>", "&nbsp;target "]
+    for num, title in items:
+        parts.append(f"\n<h2>ITEM {num}.&nbsp;{title.upper()}</h2>\n")
+        for _ in range(pages * 20):
+            parts.append(rng.choice(filler))
+        parts.append("\n<p>Item 7 of this report discusses results in detail." + " padding" * 30 + "</p>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+@pytest.mark.cp
+class TestStreamingHTMLParserCP:
+    """Streaming output must equal the BeautifulSoup implementation."""
+
+    @pytest.mark.parametrize("name", sorted(FIXTURES))
+    def test_fixtures_match_reference(self, name):
+        html = FIXTURES[name]
+        assert SECHTMLParser().parse_filing(html) == _reference_parse(html)
+
+    def test_chunk_boundaries_do_not_change_output(self):
+        html = _synthetic_filing(pages=5) + FIXTURES["ixbrl"]
+        expected = _reference_parse(html)
+        rng = random.Random(1)
+        for _ in range(5):
+            cuts = sorted(rng.sample(range(1, len(html)), 200))
+            chunks = [html[a:b] for a, b in zip([0] + cuts, cuts + [len(html)])]
+            assert SECHTMLParser().parse_filing_stream(chunks) == expected
+
+    def test_parse_from_path_and_file_object(self, tmp_path):
+        html = _synthetic_filing(pages=3)
+        path = tmp_path / "filing.htm"
+        path.write_text(html, encoding="utf-8")
+        expected = _reference_parse(html)
+
+        assert SECHTMLParser().parse_filing_stream(path) == expected
+        with open(path, encoding="utf-8") as handle:
+            assert SECHTMLParser().parse_filing_stream(handle) == expected
+
+    def test_markup_strings_are_parsed_not_opened(self):
+        # Real filings are far longer than any file name the OS accepts
+        long_html = _synthetic_filing(pages=3)
+        assert len(long_html) > 4096
+        assert SECHTMLParser().parse_filing_stream(long_html) == _reference_parse(long_html)
+
+        short_html = "<p>Scope 1 emissions</p>"
+        text, _ = SECHTMLParser().parse_filing_stream(short_html)
+        assert text == _reference_parse(short_html)[0] == "Scope 1 emissions"
+
+    def test_item_sections_use_last_heading(self):
+        parser = SECHTMLParser()
+        text, _ = parser.parse_filing(_synthetic_filing(pages=10))
+
+        full, *items = parser.sections
+        assert full.section_name == "Full Document" and full.text == text
+        assert [s.section_name for s in items] == ["Item 1", "Item 1A", "Item 7", "Item 8"]
+        for section, following in zip(items, items[1:] + [None]):
+            assert section.text == text[section.start_offset:section.end_offset]
+            assert section.metadata["heading"].startswith("ITEM ")
+            assert section.end_offset == (following.start_offset if following else len(text))
+            assert section.page_no == parser.get_page_number(section.start_offset)
+
+    def test_peak_memory_is_bounded_by_text(self, tmp_path):
+        # Markup-heavy filing: ~12 MB of HTML, ~0.3 MB of text
+        row = "<tr><td style='border:1px solid #000;padding:2px'><span class='a b c'>x</span></td></tr>\n"
+        path = tmp_path / "big.htm"
+        with open(path, "w") as handle:
+            handle.write("<html><body><table>")
+            for _ in range(120_000):
+                handle.write(row)
+            handle.write("</table></body></html>")
+
+        tracemalloc.start()
+        try:
+            text, _ = SECHTMLParser().parse_filing_stream(path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert text.count("x") == 120_000
+        assert peak < 4 * 1024 * 1024
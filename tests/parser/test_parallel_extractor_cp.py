@@ -0,0 +1,131 @@
+"""
+Critical Path Tests: parallel multi-filing evidence extraction.
+"""
+
+import multiprocessing
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+from agents.parser.evidence_extractor import BatchExtractor
+from agents.parser.matchers import GHGMatcher
+from agents.parser.parallel_extractor import (
+    EVIDENCE_ARROW_SCHEMA,
+    ParallelBatchExtractor,
+    evidence_to_record_batch,
+)
+
+_SNIPPETS = [
+    "Scope 1 emissions were 1,234 tCO2e.",
+    "Scope 1, 2 and 3 emissions follow the GHG Protocol Corporate Standard.",
+    "KPMG provided limited assurance over our GHG inventory.",
+    "We have no emissions data.",
+]
+
+
+def _filings(count=6):
+    """Small synthetic filings, one org per filing."""
+    filings = []
+    for i in range(count):
+        paragraphs = "".join(f"<p>{_SNIPPETS[(i + j) % len(_SNIPPETS)]} Filler text {j}.</p>\n" for j in range(i + 2))
+        filings.append({
+            "html_content": f"<html><body>{paragraphs}</body></html>",
+            "org_id": f"ORG{i}",
+            "year": 2020 + i % 4,
+            "doc_id": f"doc-{i}",
+        })
+    return filings
+
+
+class CrashingMatcher(GHGMatcher):
+    """GHG matcher whose worker dies outright on a poisoned filing."""
+
+    def match(self, text, page_offsets):
+        if "POISON" in text:
+            os._exit(1)
+        return super().match(text, page_offsets)
+
+
+def _stable(rows):
+    """Drop per-run identifiers before comparing evidence."""
+    return [
+        {k: v for k, v in row.items() if k not in ("evidence_id", "snapshot_id")}
+        for row in rows
+    ]
+
+
+def _serial_rows(filings):
+    """Evidence rows from the sequential BatchExtractor."""
+    rows = []
+    for result in BatchExtractor().extract_batch(filings):
+        for evidence_list in result.evidence_by_theme.values():
+            rows.extend(e.to_dict() for e in evidence_list)
+    return rows
+
+
+@pytest.mark.cp
+class TestParallelExtractorCP:
+    """Tests for ordering, failure isolation and Arrow output."""
+
+    def test_process_pool_matches_serial_in_order(self):
+        filings = _filings()
+        extractor = ParallelBatchExtractor(
+            matcher_specs=[GHGMatcher], max_workers=2, max_in_flight=3,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+        results = list(extractor.iter_extract(iter(filings)))
+
+        assert [r.index for r in results] == list(range(len(filings)))
+        assert all(r.ok and r.batch.schema == EVIDENCE_ARROW_SCHEMA for r in results)
+        rows = [row for r in results for row in r.batch.to_pylist()]
+        assert rows and _stable(rows) == _stable(_serial_rows(filings))
+
+    def test_failures_are_isolated_per_filing(self):
+        filings = _filings(4)
+        filings[1] = {"org_id": "BAD", "year": 2023, "doc_id": "missing-html"}
+        filings[2]["year"] = 1800  # Evidence validation rejects the year
+
+        results = list(ParallelBatchExtractor(max_workers=1).iter_extract(filings))
+
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert results[1].error.startswith("KeyError")
+        assert "Invalid year" in results[2].error
+        assert results[3].to_evidence()[0].org_id == "ORG3"
+
+    def test_worker_crash_fails_only_the_crashing_filing(self):
+        filings = _filings(8)
+        filings[3]["html_content"] = "<html><body><p>POISON Scope 1 emissions.</p></body></html>"
+        extractor = ParallelBatchExtractor(
+            matcher_specs=[CrashingMatcher], max_workers=2, max_in_flight=4,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+
+        results = list(extractor.iter_extract(iter(filings)))
+
+        assert [r.index for r in results] == list(range(8))
+        assert [r.ok for r in results] == [i != 3 for i in range(8)]
+        assert results[3].error.startswith("WorkerCrashed")
+        expected = [f for i, f in enumerate(filings) if i != 3]
+        rows = [row for r in results if r.ok for row in r.batch.to_pylist()]
+        assert _stable(rows) == _stable(_serial_rows(expected))
+
+    def test_extract_to_parquet_from_paths(self, tmp_path):
+        filings = _filings(3)
+        for filing in filings:
+            path = tmp_path / f"{filing['doc_id']}.htm"
+            path.write_text(filing.pop("html_content"), encoding="utf-8")
+            filing["html_path"] = str(path)
+
+        summary = ParallelBatchExtractor(max_workers=1).extract_to_parquet(filings, tmp_path / "out" / "evidence.parquet")
+
+        table = pq.read_table(tmp_path / "out" / "evidence.parquet")
+        assert summary["failed"] == 0 and summary["evidence"] == table.num_rows > 0
+        assert table.column("org_id").to_pylist() == sorted(table.column("org_id").to_pylist())
+
+    def test_record_batch_round_trip(self):
+        (result,) = ParallelBatchExtractor(max_workers=1).iter_extract(_filings(1))
+        evidence = result.to_evidence()
+        assert evidence_to_record_batch(evidence).equals(result.batch)
+        assert evidence_to_record_batch([]).num_rows == 0
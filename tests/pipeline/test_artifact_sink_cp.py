@@ -0,0 +1,134 @@
+"""
+Critical Path Tests: Sampled background artifact sink for run_score outputs.
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from apps.pipeline.artifact_sink import ArtifactSink
+
+
+def _writer(name="out.txt", content="ok"):
+    """Write function that drops one file into the run directory."""
+    def write(run_dir):
+        (run_dir / name).write_text(content)
+    return write
+
+
+def _slow_write(run_dir):
+    """Write function that takes longer than the job's own work."""
+    time.sleep(0.3)
+    (run_dir / "out.txt").write_text("worker")
+
+
+def _submit_in_worker(root):
+    """Pool job: queue one run on a sink built inside the worker."""
+    sink = ArtifactSink(root, mode="always")
+    return sink.submit("Acme", 2024, "sha256:0001", _slow_write)
+
+
+@pytest.mark.cp
+class TestArtifactSinkCP:
+    """Tests for modes, per-trace directories and shutdown flushing."""
+
+    def test_always_mode_writes_per_trace_directories(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="always")
+        first = sink.submit("Acme Corp", 2024, "sha256:aaaa", _writer(content="a"))
+        second = sink.submit("Acme Corp", 2024, "sha256:bbbb", _writer(content="b"))
+        sink.close()
+
+        assert first == tmp_path / "runs" / "Acme_Corp" / "2024" / "aaaa.lex"
+        assert (first / "out.txt").read_text() == "a"
+        assert (second / "out.txt").read_text() == "b"
+        assert sink.stats["written"] == 2
+
+    def test_semantic_and_lexical_runs_do_not_share_a_directory(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="always")
+        lexical = sink.submit("Acme", 2024, "sha256:aaaa", _writer(content="lex"))
+        semantic = sink.submit("Acme", 2024, "sha256:aaaa", _writer(content="sem"), semantic=True)
+        sink.close()
+
+        assert lexical != semantic
+        assert (lexical / "out.txt").read_text() == "lex"
+        assert (semantic / "out.txt").read_text() == "sem"
+
+    def test_publish_latest_keeps_stable_path(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="always")
+        relative = Path("pipeline_validation") / "report.json"
+
+        def write(content):
+            def _write(run_dir):
+                (run_dir / "pipeline_validation").mkdir()
+                (run_dir / relative).write_text(content)
+                sink.publish_latest(run_dir, relative)
+            return _write
+
+        sink.submit("Acme", 2024, "sha256:0001", write("first"))
+        sink.submit("Acme", 2024, "sha256:0002", write("second"))
+        sink.close()
+
+        assert (tmp_path / relative).read_text() == "second"
+        assert not list((tmp_path / "pipeline_validation").glob("*.tmp"))
+
+    def test_off_mode_writes_nothing(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="off")
+        assert sink.submit("Acme", 2024, "sha256:aaaa", _writer()) is None
+        sink.close()
+        assert not (tmp_path / "runs").exists()
+
+    def test_sampling_is_deterministic_per_trace(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="sampled", sample_rate=0.5)
+        traces = [f"sha256:{i:04x}" for i in range(200)]
+        decisions = [sink.should_persist(t) for t in traces]
+
+        assert decisions == [sink.should_persist(t) for t in traces]
+        assert 50 < sum(decisions) < 150
+        assert not ArtifactSink(tmp_path, mode="sampled", sample_rate=0.0).should_persist(traces[0])
+
+    @pytest.mark.parametrize("mode", ["sampled", "always"])
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path, mode):
+        sink = ArtifactSink(tmp_path, mode=mode, sample_rate=1.0, queue_size=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking(run_dir):
+            started.set()
+            release.wait(5)
+
+        sink.submit("Acme", 2024, "sha256:0001", blocking)
+        started.wait(5)
+        sink.submit("Acme", 2024, "sha256:0002", _writer())
+        assert sink.submit("Acme", 2024, "sha256:0003", _writer()) is None
+        release.set()
+        sink.close()
+
+        assert sink.stats["dropped"] == 1
+        assert sink.stats["written"] == 2
+
+    def test_close_flushes_and_failures_are_counted(self, tmp_path):
+        sink = ArtifactSink(tmp_path, mode="always")
+
+        def broken(run_dir):
+            raise OSError("disk full")
+
+        sink.submit("Acme", 2024, "sha256:0001", broken)
+        sink.submit("Acme", 2024, "sha256:0002", _writer())
+        sink.close()
+
+        assert sink.stats["failed"] == 1
+        assert sink.stats["written"] == 1
+        assert sink.submit("Acme", 2024, "sha256:0003", _writer()) is None
+
+    def test_worker_process_writes_before_job_returns(self, tmp_path):
+        # Pool workers exit without atexit; the job itself must flush
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            run_dir = pool.submit(_submit_in_worker, tmp_path).result(timeout=30)
+            assert (run_dir / "out.txt").read_text() == "worker"
+
+    def test_rejects_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            ArtifactSink(tmp_path, mode="sometimes")
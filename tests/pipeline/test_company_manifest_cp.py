@@ -0,0 +1,104 @@
+"""
+Critical Path Tests: Indexed, hot-reloaded company manifest service.
+"""
+
+import json
+import os
+
+import pytest
+
+from apps.pipeline.company_manifest import CompanyManifest, normalize_company
+
+
+def _write(path, records, mtime_ns=None):
+    """Write a manifest and optionally pin its mtime."""
+    path.write_text(json.dumps(records))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+RECORDS = [
+    {"company": "Apple Inc.", "year": 2023, "org_id": "AAPL", "aliases": ["Apple"]},
+    {"company": "Headlam Group Plc", "year": 2025, "slug": "headlam"},
+]
+
+
+@pytest.mark.cp
+class TestCompanyManifestCP:
+    """Tests for normalization, aliases, hot reload and failure handling."""
+
+    def test_lookup_is_case_and_punctuation_insensitive(self, tmp_path):
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS)
+        manifest = CompanyManifest(str(path))
+
+        assert manifest.get("apple inc", 2023)["org_id"] == "AAPL"
+        assert manifest.get("  APPLE   INC. ", 2023)["org_id"] == "AAPL"
+        assert manifest.get("Apple Inc.", 2024) is None
+        assert normalize_company("Headlam  Group, Plc") == "headlam group plc"
+
+    def test_aliases_org_id_and_slug_resolve(self, tmp_path):
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS)
+        manifest = CompanyManifest(str(path))
+
+        assert manifest.get("AAPL", 2023)["company"] == "Apple Inc."
+        assert manifest.get("apple", 2023)["company"] == "Apple Inc."
+        assert manifest.get("headlam", 2025)["company"] == "Headlam Group Plc"
+
+    def test_hot_reload_on_file_change(self, tmp_path):
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS, mtime_ns=1_000_000_000)
+        manifest = CompanyManifest(str(path), check_interval=0)
+        assert manifest.get("Tesla", 2024) is None
+
+        _write(path, RECORDS + [{"company": "Tesla", "year": 2024}], mtime_ns=2_000_000_000)
+        assert manifest.get("Tesla", 2024) == {"company": "Tesla", "year": 2024}
+        assert len(manifest) == 3
+
+    def test_check_interval_throttles_stat(self, tmp_path):
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS, mtime_ns=1_000_000_000)
+        manifest = CompanyManifest(str(path), check_interval=3600)
+        manifest.get("Apple", 2023)
+
+        _write(path, [], mtime_ns=2_000_000_000)
+        assert manifest.get("Apple", 2023) is not None
+        assert manifest.refresh(force=True)
+        assert manifest.get("Apple", 2023) is None
+
+    def test_corrupt_reload_keeps_previous_snapshot(self, tmp_path):
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS, mtime_ns=1_000_000_000)
+        manifest = CompanyManifest(str(path), check_interval=0)
+        manifest.get("Apple", 2023)
+
+        path.write_text("[{broken")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert manifest.get("Apple", 2023)["org_id"] == "AAPL"
+
+    def test_require_raises_file_not_found(self, tmp_path):
+        missing = CompanyManifest(str(tmp_path / "missing.json"))
+        with pytest.raises(FileNotFoundError, match="No companies manifest"):
+            missing.require("Apple", 2023)
+
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS)
+        with pytest.raises(FileNotFoundError, match="not found in manifest"):
+            CompanyManifest(str(path)).require("Tesla", 2024)
+
+    def test_mcp_lookup_company_tool(self, tmp_path, monkeypatch):
+        from apps.mcp_server import server
+        from apps.pipeline import company_manifest
+
+        path = tmp_path / "companies.json"
+        _write(path, RECORDS)
+        manifest = CompanyManifest(str(path))
+        monkeypatch.setattr(company_manifest, "get_company_manifest", lambda: manifest)
+
+        found = server.handle("esg.lookup_company", {"company": "apple", "year": "2023"})
+        assert found == {"found": True, "record": RECORDS[0]}
+        assert server.handle("esg.lookup_company", {"company": "Tesla", "year": 2024}) == {
+            "found": False,
+            "record": None,
+        }
@@ -0,0 +1,195 @@
+"""
+Critical Path Tests: Deterministic run_score response cache.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from apps.pipeline.score_cache import ScoreResponseCache, data_fingerprint
+
+
+class DictSharedTier:
+    """In-memory stand-in for a shared (Redis-backed) tier."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+def _result(company="Acme", year=2024, stage=2):
+    """Minimal run_score-shaped response."""
+    return {"company": company, "year": year, "scores": [{"theme": "GHG", "stage": stage}]}
+
+
+@pytest.mark.cp
+class TestScoreResponseCacheCP:
+    """Tests for keys, tiers, single-flight and invalidation."""
+
+    def test_fingerprint_tracks_silver_and_rubric_changes(self, tmp_path):
+        silver = tmp_path / "chunks.parquet"
+        rubric = tmp_path / "rubric.json"
+        silver.write_bytes(b"a")
+        rubric.write_text("{}")
+        record = {"company": "Acme", "year": 2024, "silver": str(silver)}
+
+        first = data_fingerprint(record, rubric_path=rubric)
+        assert first == data_fingerprint(record, rubric_path=rubric)
+
+        os.utime(silver, ns=(1, 1))
+        second = data_fingerprint(record, rubric_path=rubric)
+        assert second != first
+
+        rubric.write_text('{"version": "3.1"}')
+        assert data_fingerprint(record, rubric_path=rubric) != second
+        assert data_fingerprint({**record, "layer": "silver"}, rubric_path=rubric) != first
+
+    def test_hit_returns_private_copy(self):
+        cache = ScoreResponseCache(max_entries=4)
+        key = cache.make_key("sha256:abc", False, "fp")
+        cache.put(key, _result())
+
+        hit = cache.get(key)
+        hit["scores"].clear()
+        assert cache.get(key)["scores"] == [{"theme": "GHG", "stage": 2}]
+        assert cache.make_key("sha256:abc", True, "fp") != key
+
+    def test_lru_eviction_and_shared_tier_promotion(self):
+        shared = DictSharedTier()
+        cache = ScoreResponseCache(max_entries=2, shared=shared)
+        for i in range(3):
+            cache.put(f"k{i}", _result(stage=i))
+
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+        assert cache.get("k0")["scores"][0]["stage"] == 0
+        assert cache.stats["shared_hits"] == 1
+
+        other_process = ScoreResponseCache(max_entries=2, shared=shared)
+        assert other_process.get("k2") is not None
+
+    def test_single_flight_across_threads(self):
+        cache = ScoreResponseCache(max_entries=4)
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return _result()
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert cache.stats["coalesced"] == 4
+
+    def test_single_flight_on_event_loop(self):
+        cache = ScoreResponseCache(max_entries=4)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return _result()
+
+        async def scenario():
+            return await asyncio.gather(*[cache.get_or_compute_async("k", compute) for _ in range(5)])
+
+        results = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert all(r == _result() for r in results)
+
+    def test_leader_failure_propagates_and_is_not_cached(self):
+        cache = ScoreResponseCache(max_entries=4)
+
+        async def boom():
+            raise ValueError("no data")
+
+        with pytest.raises(ValueError):
+            asyncio.run(cache.get_or_compute_async("k", boom))
+        assert cache.get("k") is None
+
+    def test_leader_disconnect_hands_over_to_follower(self):
+        from apps.api.score_executor import ClientDisconnected
+
+        cache = ScoreResponseCache(max_entries=4)
+        calls = []
+
+        def compute_for(client):
+            async def compute():
+                calls.append(client)
+                await asyncio.sleep(0.05)
+                if client == "leader":
+                    raise ClientDisconnected()
+                return _result()
+            return compute
+
+        async def call(client):
+            try:
+                return await cache.get_or_compute_async(
+                    "k", compute_for(client), abandoned=(ClientDisconnected,)
+                )
+            except ClientDisconnected:
+                return "ClientDisconnected"
+
+        async def scenario():
+            leader = asyncio.ensure_future(call("leader"))
+            await asyncio.sleep(0.01)
+            return await asyncio.gather(leader, call("follower"))
+
+        assert asyncio.run(scenario()) == ["ClientDisconnected", _result()]
+        assert calls == ["leader", "follower"]
+        assert cache.get("k") == _result()
+
+    def test_shared_tier_read_runs_off_event_loop(self):
+        loop_thread = threading.get_ident()
+        readers = []
+
+        class RecordingTier(DictSharedTier):
+            def get(self, key):
+                readers.append(threading.get_ident())
+                return super().get(key)
+
+        shared = RecordingTier()
+        shared.set("k", _result())
+        cache = ScoreResponseCache(max_entries=4, shared=shared)
+
+        async def compute():
+            raise AssertionError("served from the shared tier")
+
+        assert asyncio.run(cache.get_or_compute_async("k", compute)) == _result()
+        assert readers and loop_thread not in readers
+
+    def test_invalidate_by_company_year(self):
+        cache = ScoreResponseCache(max_entries=8)
+        cache.put("a", _result("Apple Inc.", 2023))
+        cache.put("b", _result("Apple Inc.", 2024))
+        cache.put("c", _result("Tesla", 2024))
+
+        assert cache.invalidate(company="apple inc", year=2023) == 1
+        assert cache.get("a") is None
+        assert cache.invalidate(year=2024) == 2
+        assert len(cache) == 0
+
+    def test_disabled_cache_always_computes(self):
+        cache = ScoreResponseCache(max_entries=0)
+        calls = []
+        cache.get_or_compute("k", lambda: calls.append(1) or _result())
+        cache.get_or_compute("k", lambda: calls.append(1) or _result())
+        assert len(calls) == 2
@@ -0,0 +1,111 @@
+"""
+Critical Path Tests: run_score per-stage spans and histograms.
+"""
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from prometheus_client import REGISTRY
+
+from apps.pipeline import demo_flow, stage_metrics
+from apps.pipeline.artifact_sink import ArtifactSink
+
+STAGES = [
+    "manifest_lookup", "data_load", "bm25_fit", "bm25_score", "embedding",
+    "semantic_knn", "fusion", "evidence", "rubric_scoring", "artifact_write",
+]
+
+
+def _records(n=6):
+    """Synthetic silver-like records spread across pages."""
+    return [
+        {
+            "doc_id": f"acme_2024_{i}",
+            "page_no": i + 1,
+            "total_pages": n,
+            "text": f"Scope 1 and scope 2 greenhouse gas emissions targets page {i}. "
+                    "The board oversees climate risk and net zero transition planning.",
+        }
+        for i in range(n)
+    ]
+
+
+def _stage_count(stage):
+    """Observation count of the per-stage histogram."""
+    return REGISTRY.get_sample_value(
+        "esg_pipeline_stage_latency_seconds_count", {"stage": stage}
+    ) or 0.0
+
+
+@pytest.fixture
+def spans(monkeypatch, tmp_path):
+    """Route stage spans to an in-memory exporter and artifacts to tmp_path."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+    monkeypatch.setattr(stage_metrics, "tracer", tracer)
+    monkeypatch.setattr(demo_flow, "tracer", tracer)
+
+    sink = ArtifactSink(tmp_path, mode="always")
+    monkeypatch.setattr(demo_flow, "get_artifact_sink", lambda root=None: sink)
+    monkeypatch.setattr(demo_flow, "_lookup_manifest", lambda company, year: {"company": company, "year": year})
+    monkeypatch.setattr(demo_flow, "_load_data_records", lambda record: _records())
+    demo_flow.clear_corpus_cache()
+    yield exporter, sink
+    sink.close()
+    demo_flow.clear_corpus_cache()
+
+
+@pytest.mark.cp
+class TestStageMetricsCP:
+    """Tests that every run_score stage is traced and timed."""
+
+    def test_every_stage_is_a_child_span_with_counts(self, spans):
+        exporter, sink = spans
+        demo_flow.run_score("Acme", 2024, "climate emissions", semantic=False, k=4)
+        sink.flush()
+
+        by_name = {span.name: span for span in exporter.get_finished_spans()}
+        root = by_name["run_score"]
+        for stage in STAGES:
+            span = by_name[f"run_score.{stage}"]
+            assert span.parent is not None
+            assert span.context.trace_id == root.context.trace_id
+            assert span.attributes["esg.duration_ms"] >= 0
+
+        assert by_name["run_score.data_load"].attributes["esg.records"] == 6
+        assert by_name["run_score.bm25_score"].attributes["esg.records"] == 6
+        assert by_name["run_score.fusion"].attributes["esg.fused"] == 4
+        assert by_name["run_score.evidence"].attributes["esg.documents"] == 4
+        # Written on the sink thread, still parented on the run
+        assert by_name["run_score.artifact_write"].parent.trace_id == root.context.trace_id
+
+    def test_stage_histograms_are_observed(self, spans):
+        _, sink = spans
+        before = {stage: _stage_count(stage) for stage in STAGES}
+        knn_before = REGISTRY.get_sample_value(
+            "esg_semantic_knn_latency_seconds_count", {"backend": "deterministic"}
+        ) or 0.0
+        fusion_before = REGISTRY.get_sample_value("esg_fusion_latency_seconds_count") or 0.0
+
+        demo_flow.run_score("Acme", 2024, "board oversight", semantic=False, k=3)
+        sink.flush()
+
+        for stage in STAGES:
+            assert _stage_count(stage) == before[stage] + 1, stage
+        assert REGISTRY.get_sample_value(
+            "esg_semantic_knn_latency_seconds_count", {"backend": "deterministic"}
+        ) == knn_before + 1
+        assert REGISTRY.get_sample_value("esg_fusion_latency_seconds_count") == fusion_before + 1
+
+    def test_failed_stage_still_recorded(self, spans):
+        exporter, _ = spans
+        with pytest.raises(RuntimeError):
+            with stage_metrics.pipeline_stage("data_load", records=0):
+                raise RuntimeError("boom")
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "run_score.data_load"
+        assert not span.status.is_ok
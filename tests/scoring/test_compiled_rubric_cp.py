@@ -0,0 +1,154 @@
+"""
+Critical Path Tests: shared compiled rubric artifact.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from agents.scoring.compiled_rubric import (
+    clear_compiled_rubric_cache,
+    compile_rubric,
+    get_compiled_rubric,
+)
+from agents.scoring.rubric_loader import RubricLoader, load_from_compiled_json
+from agents.scoring.rubric_v3_scorer import RubricV3Scorer
+
+MATURITY_PATH = Path("rubrics/maturity_v3.json")
+SCHEMA_PATH = Path("rubrics/esg_rubric_schema_v3.json")
+
+
+@pytest.fixture
+def rubric_copy(tmp_path):
+    """Writable copy of the compiled maturity rubric."""
+    clear_compiled_rubric_cache()
+    path = tmp_path / "maturity_v3.json"
+    path.write_bytes(MATURITY_PATH.read_bytes())
+    yield path
+    clear_compiled_rubric_cache()
+
+
+def _bump(path: Path, content: bytes) -> None:
+    """Rewrite a rubric and move its mtime forward."""
+    path.write_bytes(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.cp
+class TestCompiledRubricCP:
+    """Tests for sharing, consistency, invalidation and the binary cache."""
+
+    def test_all_code_paths_share_one_artifact(self):
+        from apps.rubric.loader import load_rubric
+        from apps.scoring.rubric_v3_loader import RubricV3Loader
+
+        compiled = get_compiled_rubric(MATURITY_PATH)
+        assert RubricLoader().load() is compiled.rubric
+        assert RubricV3Scorer().rubric is compiled.rubric
+
+        schema = get_compiled_rubric(SCHEMA_PATH)
+        assert load_rubric() == load_rubric(SCHEMA_PATH)
+        assert RubricV3Loader().themes == RubricV3Loader().themes
+        assert RubricV3Loader().rubric_data == schema.to_dict()
+        assert [t.code for t in load_rubric().themes] == list(RubricV3Loader().themes) == list(schema.rubric.theme_order)
+
+    def test_public_loaders_return_plain_serializable_data(self):
+        import dataclasses
+
+        from agents.scoring.rubric_scorer import RubricScorer
+        from apps.rubric.loader import load_rubric
+        from apps.scoring.rubric_v3_loader import RubricV3Loader
+
+        rubric = load_rubric()
+        assert json.loads(json.dumps(rubric.scoring_rules)) == rubric.scoring_rules
+        assert json.loads(json.dumps(dataclasses.asdict(rubric)))["themes"][0]["code"] == rubric.themes[0].code
+
+        loader = RubricV3Loader()
+        json.dumps([loader.rubric_data, loader.get_scoring_rules(), loader.get_output_contract()])
+        json.dumps(RubricScorer().rubric)
+
+        # Callers get their own copies: mutating one never reaches the shared artifact
+        rubric.scoring_rules["evidence_min_per_stage_claim"] = 99
+        loader.rubric_data["themes"].clear()
+        assert load_rubric().scoring_rules != rubric.scoring_rules
+        assert RubricV3Loader().rubric_data["themes"]
+
+    def test_matches_uncached_parse(self):
+        compiled = get_compiled_rubric(MATURITY_PATH)
+        assert compiled.rubric == load_from_compiled_json(MATURITY_PATH)
+        assert compiled.to_dict() == json.loads(MATURITY_PATH.read_text(encoding="utf-8"))
+        assert set(compiled.keywords) == {
+            keyword for theme in compiled.rubric.themes_in_order
+            for stage in theme.ordered_stages for keyword in stage.keywords
+        }
+
+    def test_artifact_is_read_only(self):
+        compiled = get_compiled_rubric(MATURITY_PATH)
+        with pytest.raises(TypeError):
+            compiled.data["version"] = "x"
+        with pytest.raises(TypeError):
+            compiled.scoring_rules["evidence_min_per_stage_claim"] = 0
+        assert isinstance(compiled.data["themes"], tuple)
+
+    def test_scorer_construction_is_cheap(self):
+        RubricV3Scorer()
+        started = time.perf_counter()
+        for _ in range(200):
+            RubricV3Scorer()
+        assert (time.perf_counter() - started) / 200 < 0.001
+
+    def test_shared_scorer_and_explicit_rubric_agree(self):
+        finding = {"finding_text": "SBTi validated targets with third-party assurance", "framework": "GHG Protocol"}
+        explicit = RubricV3Scorer(rubric=load_from_compiled_json(MATURITY_PATH))
+        assert explicit.score_finding(finding) == RubricV3Scorer().score_finding(finding)
+
+    def test_recompiles_only_when_content_changes(self, rubric_copy):
+        first = get_compiled_rubric(rubric_copy)
+        assert get_compiled_rubric(rubric_copy) is first
+
+        # Touched but unchanged: same artifact
+        _bump(rubric_copy, MATURITY_PATH.read_bytes())
+        assert get_compiled_rubric(rubric_copy) is first
+
+        payload = first.to_dict()
+        payload["version"] = "3.1"
+        _bump(rubric_copy, json.dumps(payload).encode("utf-8"))
+        second = get_compiled_rubric(rubric_copy)
+        assert second is not first
+        assert second.version == "3.1" and second.source_sha256 != first.source_sha256
+
+    def test_binary_cache_round_trip(self, rubric_copy, tmp_path, monkeypatch):
+        from agents.scoring import compiled_rubric
+
+        cache_dir = tmp_path / "cache"
+        built = get_compiled_rubric(rubric_copy, cache_dir=cache_dir)
+        (cache_file,) = cache_dir.glob("maturity_v3.*.pkl")
+        assert built.source_sha256[:16] in cache_file.name
+
+        clear_compiled_rubric_cache()
+        monkeypatch.setattr(compiled_rubric, "_compile_bytes", None)  # Must come from the cache file
+        reloaded = get_compiled_rubric(rubric_copy, cache_dir=cache_dir)
+        assert reloaded is not built
+        assert reloaded.rubric == built.rubric and reloaded.data == built.data
+
+    def test_corrupt_binary_cache_falls_back_to_source(self, rubric_copy, tmp_path):
+        cache_dir = tmp_path / "cache"
+        sha256 = compile_rubric(rubric_copy).source_sha256
+        cache_dir.mkdir()
+        (cache_dir / f"maturity_v3.{sha256[:16]}.pkl").write_bytes(b"not a pickle")
+
+        compiled = get_compiled_rubric(rubric_copy, cache_dir=cache_dir)
+        assert compiled.rubric == load_from_compiled_json(rubric_copy)
+
+    def test_missing_and_invalid_sources(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            get_compiled_rubric(tmp_path / "missing.json")
+
+        bad = tmp_path / "bad.json"
+        bad.write_text("[1, 2]", encoding="utf-8")
+        with pytest.raises(ValueError, match="JSON object"):
+            get_compiled_rubric(bad)
@@ -0,0 +1,190 @@
+"""
+CP Tests for AstraDBBulkWriter (libs/storage/bulk_writer.py)
+
+Exercises buffering, ID deduplication, insert_many batching and the
+replace_one fallback against in-memory collections shaped like astrapy's.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from libs.storage.bulk_writer import AstraDBBulkWriter, BulkWriteStats
+
+
+class FakeCollection:
+    """In-memory collection recording insert_many / replace_one calls."""
+
+    def __init__(self):
+        self.docs = {}
+        self.insert_many_calls = []
+        self.replace_calls = 0
+
+    def insert_many(self, documents, ordered=True):
+        self.insert_many_calls.append(len(documents))
+        inserted = []
+        for doc in documents:
+            if doc["_id"] not in self.docs:
+                self.docs[doc["_id"]] = doc
+                inserted.append(doc["_id"])
+        if len(inserted) != len(documents):
+            error = RuntimeError("E11000 duplicate key")
+            error.partial_result = SimpleNamespace(inserted_ids=inserted)
+            raise error
+        return SimpleNamespace(inserted_ids=inserted)
+
+    def replace_one(self, flt, document, upsert=False):
+        self.replace_calls += 1
+        self.docs[flt["_id"]] = document
+        return SimpleNamespace(matched_count=1)
+
+
+class FakeGraphStore:
+    def __init__(self):
+        self.nodes_collection = FakeCollection()
+        self.edges_collection = FakeCollection()
+
+    @staticmethod
+    def node_document(node_id, node_type, properties):
+        return {"_id": node_id, "node_type": node_type, "properties": properties}
+
+    @staticmethod
+    def edge_document(edge_id, source_id, target_id, edge_type, properties=None, weight=1.0):
+        return {
+            "_id": edge_id,
+            "source_id": source_id,
+            "target_id": target_id,
+            "edge_type": edge_type,
+            "properties": properties or {},
+            "weight": weight,
+        }
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.config = SimpleNamespace(collection_prefix="esg_")
+        self.collections = {"esg_chunks": FakeCollection()}
+
+    @staticmethod
+    def chunk_document(chunk_id, embedding, metadata):
+        return {"_id": chunk_id, "$vector": list(embedding), "metadata": metadata}
+
+
+@pytest.fixture
+def stores():
+    return FakeVectorStore(), FakeGraphStore()
+
+
+@pytest.mark.cp
+class TestAstraDBBulkWriter:
+    """Bulk writer behaviour."""
+
+    def test_flushes_in_batches(self, stores):
+        vector_store, graph_store = stores
+        with AstraDBBulkWriter(vector_store, graph_store, vector_batch_size=3, graph_batch_size=4) as writer:
+            for i in range(10):
+                writer.add_vector(f"c{i}", [0.1, 0.2], {"company": "Acme"})
+                writer.add_node(f"c{i}", "chunk", {"i": i})
+
+        assert vector_store.collections["esg_chunks"].insert_many_calls == [3, 3, 3, 1]
+        assert graph_store.nodes_collection.insert_many_calls == [4, 4, 2]
+        assert writer.stats.vectors_written == 10
+        assert writer.stats.nodes_written == 10
+        assert writer.pending() == 0
+
+    def test_deduplicates_by_id_last_write_wins(self, stores):
+        vector_store, graph_store = stores
+        with AstraDBBulkWriter(vector_store, graph_store) as writer:
+            for i in range(5):
+                writer.add_node("company_acme", "company", {"version": i})
+
+        docs = graph_store.nodes_collection.docs
+        assert list(docs) == ["company_acme"]
+        assert docs["company_acme"]["properties"] == {"version": 4}
+        assert writer.stats.duplicates_dropped == 4
+        assert writer.stats.nodes_written == 1
+
+    def test_existing_ids_fall_back_to_upsert(self, stores):
+        vector_store, graph_store = stores
+        graph_store.edges_collection.docs["e1"] = {"_id": "e1", "weight": 0.0}
+
+        with AstraDBBulkWriter(vector_store, graph_store) as writer:
+            writer.add_edge("e1", "a", "b", "belongs_to", weight=2.0)
+            writer.add_edge("e2", "a", "c", "belongs_to")
+
+        edges = graph_store.edges_collection
+        assert edges.replace_calls == 1
+        assert edges.docs["e1"]["weight"] == 2.0
+        assert writer.stats.edges_written == 2
+        assert writer.stats.failed == 0
+
+    def test_threshold_triggers_flush(self, stores):
+        vector_store, graph_store = stores
+        writer = AstraDBBulkWriter(vector_store, graph_store, flush_threshold=5)
+        for i in range(7):
+            writer.add_node(f"n{i}", "chunk", {})
+
+        assert writer.stats.flushes == 1
+        assert writer.pending() == 2
+        writer.close()
+        assert len(graph_store.nodes_collection.docs) == 7
+
+    def test_error_exit_does_not_flush(self, stores):
+        vector_store, graph_store = stores
+        with pytest.raises(ValueError):
+            with AstraDBBulkWriter(vector_store, graph_store) as writer:
+                writer.add_node("n1", "chunk", {})
+                raise ValueError("boom")
+
+        assert graph_store.nodes_collection.docs == {}
+
+    def test_missing_store_raises(self):
+        writer = AstraDBBulkWriter(vector_store=None, graph_store=None)
+        with pytest.raises(RuntimeError):
+            writer.add_node("n1", "chunk", {})
+
+    def test_stats_throughput(self):
+        stats = BulkWriteStats(nodes_written=10, edges_written=5, vectors_written=5, elapsed_seconds=2.0)
+        assert stats.total_written == 20
+        assert stats.docs_per_second == 10.0
+        assert stats.to_dict()["docs_per_second"] == 10.0
+        assert BulkWriteStats().docs_per_second == 0.0
+
+    def test_unknown_vector_collection_rejected_on_add(self, stores):
+        vector_store, graph_store = stores
+        writer = AstraDBBulkWriter(vector_store, graph_store)
+        with pytest.raises(RuntimeError, match="esg_missing"):
+            writer.add_vector("c1", [0.1], {}, collection_name="esg_missing")
+        assert writer.pending() == 0
+
+    def test_failed_batches_stay_buffered_and_retry(self, stores):
+        vector_store, graph_store = stores
+        nodes = graph_store.nodes_collection
+        outage = RuntimeError("connection reset")
+
+        def down(*args, **kwargs):
+            raise outage
+
+        nodes.insert_many, nodes.replace_one = down, down
+        writer = AstraDBBulkWriter(vector_store, graph_store, graph_batch_size=2)
+        for i in range(3):
+            writer.add_node(f"n{i}", "chunk", {})
+        writer.add_edge("e1", "n0", "n1", "next")
+        writer.add_vector("c1", [0.1], {})
+
+        with pytest.raises(RuntimeError, match="4 documents buffered"):
+            writer.flush()
+
+        # Vectors landed; nodes and the edges waiting on them are kept
+        assert list(vector_store.collections["esg_chunks"].docs) == ["c1"]
+        assert graph_store.edges_collection.insert_many_calls == []
+        assert writer.pending() == 4
+        assert writer.stats.failed == 3
+
+        del nodes.insert_many, nodes.replace_one
+        writer.close()
+
+        assert sorted(nodes.docs) == ["n0", "n1", "n2"]
+        assert list(graph_store.edges_collection.docs) == ["e1"]
+        assert writer.pending() == 0
+        assert writer.stats.total_written == 5